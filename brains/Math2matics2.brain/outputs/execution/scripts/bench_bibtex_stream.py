@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Benchmark the streaming BibTeX tokenizer (src/pipeline/bibtex_stream.py).
+
+  python scripts/bench_bibtex_stream.py --mb 6 12 25 50
+
+For each size writes a synthetic .bib, then reports a cold parse_file (hash +
+single streaming pass), a warm one (served from the in-process parse cache) and
+the throughput; constant s/MB across sizes means linear time.
+"""
+from __future__ import annotations
+
+import argparse, random, sys, tempfile, time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from pipeline.bibtex_stream import clear_cache, parse_file  # noqa: E402
+
+
+def _entry(rng: random.Random, k: int) -> str:
+    words = ["robust", "mean", "{GPU}", "estimation", "heavy-tailed", "M{\\\"o}bius", "graphs", "bounds", "survey"]
+    title = " ".join(rng.choice(words) for _ in range(rng.randint(5, 12)))
+    authors = " and ".join(f"Author{rng.randint(0, 999)}, {chr(65 + rng.randint(0, 25))}." for _ in range(rng.randint(1, 5)))
+    return (
+        f"@article{{ref{k},\n"
+        f"  title   = {{{title}}},\n"
+        f"  author  = \"{authors}\",\n"
+        f"  year    = {rng.randint(1950, 2025)},\n"
+        f"  journal = {{Journal of {{Things}} {k % 97}}},\n"
+        f"  doi     = {{10.{1000 + k % 9000}/x.{k}}},\n"
+        f"  note    = \"vol. \" # {k % 50},\n"
+        "}\n\n"
+    )
+
+
+def write_bib(path: Path, mb: float, seed: int = 0) -> int:
+    rng = random.Random(seed)
+    target, n = int(mb * 2**20), 0
+    with path.open("w", encoding="utf-8") as f:
+        f.write("% synthetic bibliography\n\n")
+        while f.tell() < target:
+            f.write(_entry(rng, n))
+            n += 1
+    return n
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--mb", type=float, nargs="+", default=[6, 12, 25, 50])
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    print(f"{'MB':>6} {'entries':>9} {'cold_s':>8} {'s/MB':>7} {'warm_s':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mb in args.mb:
+            path = Path(tmp) / f"refs_{mb:g}.bib"
+            n = write_bib(path, mb, args.seed)
+            clear_cache()
+            t0 = time.perf_counter()
+            recs = parse_file(path)
+            cold = time.perf_counter() - t0
+            assert len(recs) == n, (len(recs), n)
+            t0 = time.perf_counter()
+            parse_file(path)
+            warm = time.perf_counter() - t0
+            print(f"{mb:>6g} {n:>9} {cold:>8.2f} {cold / mb:>7.3f} {warm:>7.2f}")
+            path.unlink()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
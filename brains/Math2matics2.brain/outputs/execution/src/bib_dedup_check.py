@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 import argparse, re, sys, unicodedata
 from pathlib import Path
+from collections import Counter
 from difflib import SequenceMatcher
+from pipeline.bibtex_stream import parse_bytes, parse_file
 def _strip_outer(s: str) -> str:
     s = s.strip()
     if (s.startswith('{') and s.endswith('}')) or (s.startswith('"') and s.endswith('"')):
@@ -25,81 +27,10 @@ def title_fingerprint(title: str) -> str:
     t = re.sub(r'[^a-z0-9 ]+', ' ', t)
     toks = [w for w in t.split() if len(w) > 2 and w not in {'the','and','for','with','from','into','using','via','over'}]
     return ' '.join(toks)
+def _as_entries(records):
+    return [{'type': r.entry_type, 'key': r.key, 'fields': r.field_dict()} for r in records]
 def parse_bibtex(text: str):
-    i, n = 0, len(text)
-    entries = []
-    while True:
-        m = re.search(r'@([A-Za-z]+)\s*([({])', text[i:])
-        if not m: break
-        etype = m.group(1).lower()
-        opench = m.group(2)
-        closech = ')' if opench == '(' else '}'
-        j = i + m.end()
-        # scan to matching close for the whole entry
-        depth, in_str, esc = 1, None, False
-        k = j
-        while k < n and depth > 0:
-            ch = text[k]
-            if in_str:
-                if esc: esc = False
-                elif ch == '\\': esc = True
-                elif ch == in_str: in_str = None
-            else:
-                if ch in ('"', "'"): in_str = ch
-                elif ch == opench: depth += 1
-                elif ch == closech: depth -= 1
-            k += 1
-        body = text[j:k-1].strip()
-        # key is up to first comma at top level
-        key, rest = body, ''
-        depth2, in_str2, esc2 = 0, None, False
-        for idx, ch in enumerate(body):
-            if in_str2:
-                if esc2: esc2 = False
-                elif ch == '\\': esc2 = True
-                elif ch == in_str2: in_str2 = None
-            else:
-                if ch in ('"', "'"): in_str2 = ch
-                elif ch == '{': depth2 += 1
-                elif ch == '}': depth2 = max(0, depth2-1)
-                elif ch == ',' and depth2 == 0:
-                    key = body[:idx].strip()
-                    rest = body[idx+1:].strip()
-                    break
-        fields = {}
-        if rest:
-            # parse field=value pairs at top level separated by commas
-            parts = []
-            buf = []
-            depth3, in_str3, esc3 = 0, None, False
-            for ch in rest:
-                if in_str3:
-                    buf.append(ch)
-                    if esc3: esc3 = False
-                    elif ch == '\\': esc3 = True
-                    elif ch == in_str3: in_str3 = None
-                    continue
-                if ch in ('"', "'"):
-                    in_str3 = ch; buf.append(ch); continue
-                if ch == '{': depth3 += 1
-                elif ch == '}': depth3 = max(0, depth3-1)
-                if ch == ',' and depth3 == 0:
-                    part = ''.join(buf).strip()
-                    if part: parts.append(part)
-                    buf = []
-                else:
-                    buf.append(ch)
-            tail = ''.join(buf).strip()
-            if tail: parts.append(tail)
-            for p in parts:
-                if '=' not in p: continue
-                fn, fv = p.split('=', 1)
-                fn = fn.strip().lower()
-                fv = fv.strip()
-                fields[fn] = fv
-        entries.append({'type': etype, 'key': key.strip(), 'fields': fields})
-        i = k
-    return entries
+    return _as_entries(parse_bytes(text.encode('utf-8')))
 def canonicalize_entry(e):
     f = {k.lower().strip(): v.strip() for k, v in e['fields'].items() if k and v}
     doi = _norm_text(f.get('doi',''))
@@ -126,7 +57,84 @@ def canonicalize_entry(e):
 def sim(a: str, b: str) -> float:
     if not a or not b: return 0.0
     return SequenceMatcher(None, a, b).ratio()
-def find_duplicates(items, min_score=0.88):
+W_TITLE, W_AUTHOR = 0.75, 0.25
+def _grams(fp: str):
+    t = f' {fp} '
+    return {t[i:i+3] for i in range(len(t) - 2)}
+def _prefixes(grams, min_overlap):
+    # prefix filtering: order every gram set by global rarity; two sets sharing at least a
+    # fraction `min_overlap` of their grams must share a gram within these prefixes
+    df = {}
+    for g in grams:
+        for x in g: df[x] = df.get(x, 0) + 1
+    out = []
+    for g in grams:
+        order = sorted(g, key=lambda x: (df[x], x))
+        out.append(order[:len(order) - int(min_overlap * len(order)) + 1])
+    return out
+def candidate_pairs(items, min_overlap=0.6):
+    """Yield (j, i), j < i, for pairs worth scoring: both have a title fingerprint, their
+    years do not conflict and their title trigram prefixes intersect (grouped by i)."""
+    grams = [_grams(it['title_fp']) if it['title_fp'] else set() for it in items]
+    prefs = _prefixes(grams, min_overlap)
+    index = {}  # gram -> year ('' = unknown) -> [item idx]; blocking on year bucket
+    for i, it in enumerate(items):
+        if not it['title_fp']: continue
+        y = it['year']
+        cand = set()
+        for x in prefs[i]:
+            by_year = index.get(x)
+            if not by_year: continue
+            if y:
+                cand.update(by_year.get(y, ()))
+                cand.update(by_year.get('', ()))
+            else:
+                for lst in by_year.values(): cand.update(lst)
+        for j in sorted(cand):
+            yield j, i
+        for x in prefs[i]:
+            index.setdefault(x, {}).setdefault(y, []).append(i)
+def _all_pairs(items):
+    for i in range(len(items)):
+        if not items[i]['title_fp']: continue
+        for j in range(i):
+            if not items[j]['title_fp']: continue
+            if items[i]['year'] and items[j]['year'] and items[i]['year'] != items[j]['year']: continue
+            yield j, i
+def _bound(ca, cb, la, lb):
+    # SequenceMatcher.quick_ratio() from precomputed character counts (an upper bound on ratio())
+    if not la or not lb: return 0.0
+    return 2.0 * sum((ca & cb).values()) / (la + lb)
+def _score_group(task):
+    # scores every (a, b) = (items[j], items[i]) of one i exactly as sim() would, reusing the
+    # SequenceMatcher cache on seq2 and skipping pairs whose quick_ratio bound is too low
+    (title_b, cnt_tb), (auth_b, cnt_ab), rows, min_score = task
+    st, sa = SequenceMatcher(None, '', title_b), SequenceMatcher(None, '', auth_b)
+    out = []
+    for j, (title_a, cnt_ta), (auth_a, cnt_aa) in rows:
+        lt, la = len(title_a) + len(title_b), len(auth_a) + len(auth_b)
+        ub_t = 2.0 * min(len(title_a), len(title_b)) / lt
+        ub_a = 2.0 * min(len(auth_a), len(auth_b)) / la if auth_a and auth_b else 0.0
+        if W_TITLE*ub_t + W_AUTHOR*ub_a < min_score: continue
+        ub_t, ub_a = _bound(cnt_ta, cnt_tb, len(title_a), len(title_b)), _bound(cnt_aa, cnt_ab, len(auth_a), len(auth_b))
+        if W_TITLE*ub_t + W_AUTHOR*ub_a < min_score: continue
+        st.set_seq1(title_a)
+        s1 = st.ratio()
+        s2 = 0.0
+        if auth_a and auth_b:
+            sa.set_seq1(auth_a)
+            s2 = sa.ratio()
+        score = W_TITLE*s1 + W_AUTHOR*s2
+        if score >= min_score: out.append((j, score))
+    return out
+def find_duplicates(items, min_score=0.88, *, exhaustive=False, min_overlap=0.6, workers=1):
+    """Likely duplicate pairs as (a, b, score, why), best first.
+
+    Same-DOI pairs score 1.0. Other pairs are scored 0.75*title + 0.25*author similarity;
+    by default only pairs from candidate_pairs() are scored (trigram index over title_fp,
+    blocked by year), `exhaustive=True` scores every year-compatible pair. `workers` > 1
+    scores in a process pool; results do not depend on it.
+    """
     pairs = []
     by_doi = {}
     for it in items:
@@ -139,18 +147,32 @@ def find_duplicates(items, min_score=0.88):
                     pairs.append((grp[i], grp[j], 1.0, f"same DOI: {doi}"))
     # title+year similarity (skip same DOI already flagged)
     seen = {(a['orig_key'], b['orig_key']) for a,b,_,_ in pairs} | {(b['orig_key'], a['orig_key']) for a,b,_,_ in pairs}
-    n = len(items)
-    for i in range(n):
-        for j in range(i+1, n):
-            a, b = items[i], items[j]
-            if (a['orig_key'], b['orig_key']) in seen: continue
-            if a['year'] and b['year'] and a['year'] != b['year']: continue
-            s1 = sim(a['title_fp'], b['title_fp'])
-            s2 = sim(_norm_text(a['author']).lower(), _norm_text(b['author']).lower())
-            score = 0.75*s1 + 0.25*s2
-            if score >= min_score and (a['title_fp'] and b['title_fp']):
-                why = f"title/author similarity {score:.2f}" + (f", year={a['year']}" if a['year'] else "")
-                pairs.append((a, b, score, why))
+    title = [(it['title_fp'], Counter(it['title_fp'])) for it in items]
+    auth = [(a, Counter(a)) for a in (_norm_text(it['author']).lower() for it in items)]
+    def tasks():
+        cur, rows = None, []
+        for j, i in (_all_pairs(items) if exhaustive else candidate_pairs(items, min_overlap)):
+            if (items[j]['orig_key'], items[i]['orig_key']) in seen: continue
+            if i != cur:
+                if rows: yield cur, (title[cur], auth[cur], rows, min_score)
+                cur, rows = i, []
+            rows.append((j, title[j], auth[j]))
+        if rows: yield cur, (title[cur], auth[cur], rows, min_score)
+    if workers and workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        idx, payload = [], []
+        for i, t in tasks():
+            idx.append(i); payload.append(t)
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            chunk = max(1, len(payload) // (8*workers))
+            scored = list(zip(idx, ex.map(_score_group, payload, chunksize=chunk)))
+    else:
+        scored = ((i, _score_group(t)) for i, t in tasks())
+    hits = sorted((j, i, score) for i, grp in scored for j, score in grp)
+    for j, i, score in hits:
+        a, b = items[j], items[i]
+        why = f"title/author similarity {score:.2f}" + (f", year={a['year']}" if a['year'] else "")
+        pairs.append((a, b, score, why))
     pairs.sort(key=lambda t: (-t[2], t[0]['orig_key'], t[1]['orig_key']))
     return pairs
 def checklist(items, dups):
@@ -203,15 +225,16 @@ def main(argv=None):
     ap = argparse.ArgumentParser(description='Parse references.bib, normalize keys/fields, detect likely duplicates, and print a v1 checklist report.')
     ap.add_argument('--bib', default=str(Path('outputs')/'references.bib'), help='Path to .bib file (default: outputs/references.bib)')
     ap.add_argument('--min-score', type=float, default=0.88, help='Duplicate threshold for title/author similarity (default: 0.88)')
+    ap.add_argument('--exhaustive', action='store_true', help='Score every year-compatible pair instead of trigram-index candidates (slow, O(n^2))')
+    ap.add_argument('--workers', type=int, default=1, help='Processes used to score candidate pairs (default: 1)')
     args = ap.parse_args(argv)
     bib_path = Path(args.bib)
     if not bib_path.exists():
         print(f'ERROR: bib file not found: {bib_path}', file=sys.stderr)
         return 2
-    text = bib_path.read_text(encoding='utf-8', errors='replace')
-    raw = parse_bibtex(text)
+    raw = _as_entries(parse_file(bib_path))
     items = [canonicalize_entry(e) for e in raw]
-    dups = find_duplicates(items, min_score=args.min_score)
+    dups = find_duplicates(items, min_score=args.min_score, exhaustive=args.exhaustive, workers=args.workers)
     sys.stdout.write(checklist(items, dups))
     return 0
 
@@ -48,6 +48,31 @@ def _block_slices(n: int, n_blocks: int) -> list[tuple[int, int]]:
     return out
 
 
+def _block_means_rows(X: np.ndarray, n_blocks: int) -> np.ndarray:
+    """Per-row block means of a 2-D array; blocks as in ``_block_slices``.
+
+    Blocks of equal size are reduced as one reshaped array, which gives the same
+    floating-point result as ``np.mean`` on each slice.
+    """
+    t, n = X.shape
+    n_blocks = min(int(n_blocks), n)
+    base, rem = divmod(n, n_blocks)
+    k = rem * (base + 1)
+    parts = [X[:, :k].reshape(t, rem, base + 1).mean(axis=2)] if rem else []
+    parts.append(X[:, k:].reshape(t, n_blocks - rem, base).mean(axis=2))
+    return np.concatenate(parts, axis=1)
+
+
+def _median_rows(M: np.ndarray) -> np.ndarray:
+    """Median of each row via ``np.partition`` (same value as ``np.median``)."""
+    k = M.shape[1]
+    h = k // 2
+    if k % 2:
+        return np.partition(M, h, axis=1)[:, h]
+    P = np.partition(M, (h - 1, h), axis=1)
+    return (P[:, h - 1] + P[:, h]) / 2.0
+
+
 def block_means(
     x: Sequence[float],
     n_blocks: int = 10,
@@ -62,16 +87,11 @@ def block_means(
     if n_blocks <= 1:
         return np.asarray([np.mean(arr)], dtype=float)
 
-    idx = np.arange(n)
     if shuffle:
-        r = as_rng(rng)
-        r.shuffle(idx)
-    arr = arr[idx]
-
-    means = []
-    for s, e in _block_slices(n, n_blocks):
-        means.append(float(np.mean(arr[s:e])))
-    return np.asarray(means, dtype=float)
+        idx = np.arange(n)
+        as_rng(rng).shuffle(idx)
+        arr = arr[idx]
+    return _block_means_rows(arr.reshape(1, n), n_blocks)[0]
 
 
 def median_of_means(
@@ -93,16 +113,78 @@ def median_of_means(
     return float(np.median(means))
 
 
+def median_of_means_batch(
+    X: np.ndarray,
+    n_blocks: int = 10,
+    rng: SeedLike = None,
+    shuffle: bool = True,
+) -> np.ndarray:
+    """Median-of-means of every row of a (trials, n) array.
+
+    Rows are permuted independently (``Generator.permuted``) when ``shuffle``, so
+    the draws differ from per-row ``median_of_means`` calls; with ``shuffle=False``
+    each value equals ``median_of_means(row, shuffle=False)`` exactly.
+    """
+    X = np.asarray(X, dtype=float)
+    if X.ndim != 2 or X.shape[1] == 0:
+        raise ValueError("median_of_means_batch: expected a non-empty (trials, n) array")
+    if n_blocks <= 1:
+        return np.mean(X, axis=1)
+    if shuffle:
+        X = as_rng(rng).permuted(X, axis=1)
+    return _median_rows(_block_means_rows(X, n_blocks))
+
+
+def trimmed_mean(x: Sequence[float], trim: float = 0.1, axis: int = -1) -> Union[float, np.ndarray]:
+    """Mean after dropping floor(trim * n) smallest and largest values along ``axis``.
+
+    Uses ``np.partition`` (no full sort); a 2-D input is reduced row by row.
+    """
+    arr = np.asarray(x, dtype=float)
+    if arr.size == 0:
+        raise ValueError("trimmed_mean: empty input")
+    if not 0.0 <= trim < 0.5:
+        raise ValueError("trim must be in [0, 0.5)")
+    arr = np.moveaxis(arr, axis, -1)
+    n = arr.shape[-1]
+    k = int(np.floor(trim * n))
+    if k:
+        arr = np.partition(arr, (k, n - k - 1), axis=-1)[..., k:n - k]
+    out = np.mean(arr, axis=-1)
+    return float(out) if out.ndim == 0 else out
+
+
 @dataclass(frozen=True)
 class EstimatorSpec:
-    """Lightweight descriptor for experiment configuration."""
+    """Lightweight descriptor for experiment configuration.
+
+    Instances are callables ``spec(x, rng) -> float`` usable as ``run_trials``
+    estimators, and ``spec.batch(X, rng)`` evaluates a whole (trials, n) array.
+    """
     name: str
     n_blocks: int = 1
     shuffle: bool = True
+    trim: float = 0.1
 
     def estimate(self, x: Sequence[float], rng: SeedLike = None) -> float:
         if self.name in {"mean", "sample_mean"}:
             return sample_mean(x)
         if self.name in {"mom", "median_of_means"}:
             return median_of_means(x, n_blocks=self.n_blocks, rng=rng, shuffle=self.shuffle)
+        if self.name in {"tmean", "trimmed_mean"}:
+            return float(trimmed_mean(x, trim=self.trim))
+        raise ValueError(f"Unknown estimator name: {self.name}")
+
+    def __call__(self, x: Sequence[float], rng: SeedLike = None) -> float:
+        return self.estimate(x, rng)
+
+    def batch(self, X: np.ndarray, rng: SeedLike = None) -> np.ndarray:
+        """Row-wise estimates for a (trials, n) array."""
+        X = np.asarray(X, dtype=float)
+        if self.name in {"mean", "sample_mean"}:
+            return np.mean(X, axis=1)
+        if self.name in {"mom", "median_of_means"}:
+            return median_of_means_batch(X, n_blocks=self.n_blocks, rng=rng, shuffle=self.shuffle)
+        if self.name in {"tmean", "trimmed_mean"}:
+            return trimmed_mean(X, trim=self.trim, axis=1)
         raise ValueError(f"Unknown estimator name: {self.name}")
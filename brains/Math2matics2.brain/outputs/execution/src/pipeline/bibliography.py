@@ -8,6 +8,8 @@ import re
 import hashlib
 from typing import Dict, List, Tuple, Iterable, Optional
 
+from .bibtex_stream import parse_bytes
+
 
 SEED_BIB = r"""% Seed bibliography for the documentation-and-research pipeline.
 % This file is intentionally small and normalized; add project-specific references over time.
@@ -62,50 +64,12 @@ def ensure_seed_references(seed_path: Path) -> bool:
     return True
 
 
-def _strip_comments(text: str) -> str:
-    out = []
-    for line in text.splitlines():
-        if line.lstrip().startswith("%"):
-            continue
-        out.append(line)
-    return "\n".join(out)
-
-
-_ENTRY_RE = re.compile(r"@(?P<type>[A-Za-z]+)\s*\{\s*(?P<key>[^,\s]+)\s*,", re.M)
-_FIELD_RE = re.compile(r"(?P<k>[A-Za-z][A-Za-z0-9_\-]*)\s*=\s*(?P<v>\{(?:[^{}]|\{[^{}]*\})*\}|\"(?:\\.|[^\"])*\"|[^,\n\r]+)\s*,?", re.S)
-
-
 def parse_bibtex(text: str) -> List[BibEntry]:
-    t = _strip_comments(text)
-    entries: List[BibEntry] = []
-    i = 0
-    while True:
-        m = _ENTRY_RE.search(t, i)
-        if not m:
-            break
-        etype = m.group("type").lower()
-        key = m.group("key").strip()
-        j = m.end()
-        depth, end = 1, j
-        while end < len(t) and depth > 0:
-            c = t[end]
-            if c == "{":
-                depth += 1
-            elif c == "}":
-                depth -= 1
-            end += 1
-        body = t[j:end - 1]
-        fields: Dict[str, str] = {}
-        for fm in _FIELD_RE.finditer(body):
-            k = fm.group("k").lower().strip()
-            v = fm.group("v").strip()
-            if v.endswith(","):
-                v = v[:-1].strip()
-            fields[k] = v
-        raw = t[m.start():end]
-        entries.append(BibEntry(entry_type=etype, key=key, fields=fields, raw=raw))
-        i = end
-    return entries
+    data = text.encode("utf-8")
+    return [
+        BibEntry(entry_type=r.entry_type, key=r.key, fields=r.field_dict(), raw=data[r.start:r.end].decode("utf-8"))
+        for r in parse_bytes(data)
+    ]
 
 
 def _unbrace(v: str) -> str:
@@ -181,22 +145,26 @@ def validate_entries(entries: Iterable[BibEntry]) -> List[str]:
     return issues
 
 
-def write_normalized_bib(in_path: Path, out_path: Path) -> Dict[str, object]:
+def _write_normalized(in_path: Path, out_path: Path) -> Tuple[Dict[str, object], List[BibEntry]]:
     raw = in_path.read_text(encoding="utf-8") if in_path.exists() else ""
     entries = parse_bibtex(raw)
     norm_text, norm_warnings = normalize_bibtex(entries)
     out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text(norm_text, encoding="utf-8")
-    issues = validate_entries(parse_bibtex(norm_text))
-    return {"entries": len(entries), "warnings": norm_warnings, "issues": issues, "written": str(out_path)}
+    norm_entries = parse_bibtex(norm_text)
+    issues = validate_entries(norm_entries)
+    return {"entries": len(entries), "warnings": norm_warnings, "issues": issues, "written": str(out_path)}, norm_entries
+
+
+def write_normalized_bib(in_path: Path, out_path: Path) -> Dict[str, object]:
+    return _write_normalized(in_path, out_path)[0]
 
 
 def build_bibliography_summary(bib_path: Path, seed_path: Path, summary_md_path: Path, normalized_bib_path: Optional[Path] = None) -> Dict[str, object]:
     seeded = ensure_seed_references(seed_path)
     src_path = bib_path if bib_path.exists() else seed_path
     norm_path = normalized_bib_path or (summary_md_path.parent / "references.normalized.bib")
-    result = write_normalized_bib(src_path, norm_path)
-    entries = parse_bibtex(norm_path.read_text(encoding="utf-8"))
+    result, entries = _write_normalized(src_path, norm_path)
     by_type: Dict[str, int] = {}
     for e in entries:
         by_type[e.entry_type] = by_type.get(e.entry_type, 0) + 1
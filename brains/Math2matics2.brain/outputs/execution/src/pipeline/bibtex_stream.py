@@ -0,0 +1,259 @@
+"""Streaming BibTeX tokenizer shared by the bibliography tools.
+
+``iter_entries`` reads a binary stream in line-aligned chunks and yields one
+``BibRecord`` per entry in a single left-to-right pass: regexes jump between
+structural characters (``@``, braces, quotes, ``#``, ``,``) so Python only
+runs per delimiter, never per character, and consumed input is dropped as new
+chunks arrive.  Records carry byte offsets into the source, which lets callers
+slice out the raw entry text without re-scanning.
+
+``parse_file`` / ``parse_bytes`` wrap the tokenizer in a parse cache keyed by
+the SHA-256 of the input (in-process, and optionally a JSON file per digest in
+``cache_dir``), so re-parsing an unchanged file costs one hash.
+
+Parsing rules: lines whose first non-blank character is ``%`` are skipped
+outside entries; entries may be ``{...}`` or ``(...)`` delimited; field values
+keep their delimiters (``{...}``, ``"..."``, bare words and ``#``
+concatenations) exactly as written; ``@comment``, ``@preamble`` and ``@string``
+blocks are skipped.  Type and field names are lower-cased.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+import hashlib
+import io
+import json
+import os
+import re
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+
+PathLike = Union[str, os.PathLike, Path]
+
+CHUNK_SIZE = 1 << 20
+_CACHE_MAX = 8
+_SKIP_TYPES = {"comment", "preamble", "string"}
+
+_HEAD_RE = re.compile(rb"(?m)^[ \t]*%[^\n]*|@[ \t\r\n]*([A-Za-z][A-Za-z0-9_:-]*)[ \t\r\n]*([{(])")
+_PARTIAL_RE = re.compile(rb"@[ \t\r\n]*(?:[A-Za-z][A-Za-z0-9_:-]*[ \t\r\n]*)?\Z")
+_BRACE_RE = re.compile(rb"[{}]")
+
+
+# fast paths for the common shapes (brace nesting up to 3 levels below the outer group);
+# anything else falls back to the delimiter-by-delimiter scanners below.  Patterns are
+# "unrolled loops" (run (group run)*): every run stops at a delimiter, so a failed match
+# backtracks linearly without possessive quantifiers, which need Python 3.11.
+def _group(depth: int) -> bytes:
+    inner = b"" if depth == 0 else rb"(?:" + _group(depth - 1) + rb"[^{}]*)*"
+    return rb"\{[^{}]*" + inner + rb"\}"
+
+
+_GROUP = _group(3)
+_ENTRY_BODY_RE = re.compile(rb"[^{}]*(?:" + _GROUP + rb"[^{}]*)*\}")
+_FIELD_RE = re.compile(
+    rb"[\s,]*([^\s=,{}()\"#]+)\s*=\s*(" + _GROUP + rb'|"[^"{}]*(?:' + _GROUP + rb'[^"{}]*)*"|[^\s,#{}()"]+)\s*(?=,|\Z)'
+)
+_PAREN_RE = re.compile(rb'[{}()"]')
+_QUOTE_RE = re.compile(rb'[{}"]')
+_NAME_RE = re.compile(rb"[\s,]*([^\s=,{}()\"#]+)\s*=\s*")
+_BARE_RE = re.compile(rb"[^\s,#{}()\"]+")
+_WS_RE = re.compile(rb"\s*")
+
+
+@dataclass(frozen=True)
+class BibRecord:
+    """One parsed entry; ``start``/``end`` are byte offsets of ``@`` and one past the closing delimiter."""
+
+    entry_type: str
+    key: str
+    fields: Tuple[Tuple[str, str], ...]
+    start: int
+    end: int
+
+    def field_dict(self) -> Dict[str, str]:
+        return dict(self.fields)
+
+
+def _match_brace(buf: bytes, i: int, limit: int) -> Optional[int]:
+    """Index one past the ``}`` closing the ``{`` at ``i - 1``, or None if not within ``buf[:limit]``."""
+    depth = 1
+    for m in _BRACE_RE.finditer(buf, i, limit):
+        depth += 1 if m.group() == b"{" else -1
+        if depth == 0:
+            return m.end()
+    return None
+
+
+def _match_quote(buf: bytes, i: int, limit: int) -> Optional[int]:
+    """Index one past the ``"`` closing the quote at ``i - 1`` (quotes inside braces do not count)."""
+    depth = 0
+    for m in _QUOTE_RE.finditer(buf, i, limit):
+        c = m.group()
+        if c == b"{":
+            depth += 1
+        elif c == b"}":
+            depth = max(0, depth - 1)
+        elif depth == 0:
+            return m.end()
+    return None
+
+
+def _entry_end(buf: bytes, i: int, opener: bytes) -> Optional[int]:
+    if opener == b"{":
+        m = _ENTRY_BODY_RE.match(buf, i)
+        return m.end() if m else _match_brace(buf, i, len(buf))
+    depth, quoted = 0, False
+    for m in _PAREN_RE.finditer(buf, i):
+        c = m.group()
+        if c == b"{":
+            depth += 1
+        elif c == b"}":
+            depth = max(0, depth - 1)
+        elif depth == 0 and c == b'"':
+            quoted = not quoted
+        elif depth == 0 and not quoted and c == b")":
+            return m.end()
+    return None
+
+
+def _value_end(buf: bytes, i: int, limit: int) -> int:
+    """End of the (possibly ``#``-concatenated) value starting at ``i``."""
+    end = i
+    while i < limit:
+        c = buf[i:i + 1]
+        if c == b"{":
+            j = _match_brace(buf, i + 1, limit) or limit  # unbalanced: runs to the end of the entry
+        elif c == b'"':
+            j = _match_quote(buf, i + 1, limit) or limit
+        else:
+            m = _BARE_RE.match(buf, i, limit)
+            if m is None:
+                break
+            j = m.end()
+        end = j
+        i = _WS_RE.match(buf, j, limit).end()
+        if buf[i:i + 1] != b"#":
+            break
+        i = _WS_RE.match(buf, i + 1, limit).end()
+    return end
+
+
+def _fields(buf: bytes, i: int, limit: int, errors: str) -> Tuple[Tuple[str, str], ...]:
+    out = []
+    while i < limit:
+        m = _FIELD_RE.match(buf, i, limit)
+        if m is not None:
+            out.append((m.group(1).decode("ascii", "replace").lower(), m.group(2).decode("utf-8", errors)))
+            i = m.end()
+            continue
+        m = _NAME_RE.match(buf, i, limit)
+        if m is None:
+            nxt = buf.find(b",", i, limit)
+            if nxt < 0:
+                break
+            i = nxt + 1
+            continue
+        j = _value_end(buf, m.end(), limit)
+        name = m.group(1).decode("ascii", "replace").lower()
+        out.append((name, buf[m.end():j].decode("utf-8", errors).strip()))
+        i = j
+    return tuple(out)
+
+
+def _record(buf: bytes, m: "re.Match[bytes]", end: int, closed: bool, base: int, errors: str) -> Optional[BibRecord]:
+    etype = m.group(1).decode("ascii", "replace").lower()
+    if etype in _SKIP_TYPES:
+        return None
+    body_end = end - 1 if closed else end
+    comma = buf.find(b",", m.end(), body_end)
+    key_end = body_end if comma < 0 else comma
+    key = buf[m.end():key_end].decode("utf-8", errors).strip()
+    fields = _fields(buf, key_end + 1, body_end, errors) if comma >= 0 else ()
+    return BibRecord(etype, key, fields, base + m.start(), base + end)
+
+
+def iter_entries(stream: BinaryIO, *, chunk_size: int = CHUNK_SIZE, errors: str = "replace") -> Iterator[BibRecord]:
+    """Yield the entries of a binary BibTeX stream in order, in one linear pass."""
+    buf, base, pos, eof = b"", 0, 0, False
+    while True:
+        m = _HEAD_RE.search(buf, pos)
+        while m is not None and m.group(1) is None:
+            m = _HEAD_RE.search(buf, m.end())
+        if m is not None:
+            end = _entry_end(buf, m.end(), m.group(2))
+            if end is not None or eof:
+                rec = _record(buf, m, len(buf) if end is None else end, end is not None, base, errors)
+                if rec is not None:
+                    yield rec
+                pos = len(buf) if end is None else end
+                continue
+        if eof:
+            return
+        # need more input: keep the unfinished entry (or an '@' header split over the last lines)
+        if m is not None:
+            keep = m.start()
+        else:
+            tail = _PARTIAL_RE.search(buf, max(pos, len(buf) - 256))
+            keep = len(buf) if tail is None else tail.start()
+        chunk = stream.read(chunk_size)
+        if chunk and not chunk.endswith(b"\n"):
+            chunk += stream.readline()
+        eof = not chunk
+        base += keep
+        buf, pos = buf[keep:] + chunk, 0
+
+
+_CACHE: "OrderedDict[str, Tuple[BibRecord, ...]]" = OrderedDict()
+
+
+def file_digest(path: PathLike, chunk_size: int = CHUNK_SIZE) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _cached(digest: str, parse, cache_dir: Optional[PathLike]) -> List[BibRecord]:
+    hit = _CACHE.get(digest)
+    disk = Path(cache_dir) / f"{digest}.json" if cache_dir is not None else None
+    if hit is None and disk is not None and disk.exists():
+        try:
+            rows = json.loads(disk.read_text(encoding="utf-8"))
+            hit = tuple(BibRecord(t, k, tuple(map(tuple, f)), s, e) for t, k, f, s, e in rows)
+        except (OSError, ValueError, TypeError):
+            hit = None
+    if hit is None:
+        hit = tuple(parse())
+        if disk is not None:
+            disk.parent.mkdir(parents=True, exist_ok=True)
+            rows = [[r.entry_type, r.key, r.fields, r.start, r.end] for r in hit]
+            tmp = disk.with_suffix(".tmp")
+            tmp.write_text(json.dumps(rows, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, disk)
+    _CACHE[digest] = hit
+    _CACHE.move_to_end(digest)
+    while len(_CACHE) > _CACHE_MAX:
+        _CACHE.popitem(last=False)
+    return list(hit)
+
+
+def parse_bytes(data: bytes, *, cache_dir: Optional[PathLike] = None) -> List[BibRecord]:
+    """All entries of ``data`` (offsets index into ``data``), cached by content hash."""
+    return _cached(hashlib.sha256(data).hexdigest(), lambda: iter_entries(io.BytesIO(data)), cache_dir)
+
+
+def parse_file(path: PathLike, *, cache_dir: Optional[PathLike] = None) -> List[BibRecord]:
+    """All entries of the file at ``path``, cached by content hash."""
+    def parse() -> List[BibRecord]:
+        with open(path, "rb") as f:
+            return list(iter_entries(f))
+
+    return _cached(file_digest(path), parse, cache_dir)
+
+
+def clear_cache() -> None:
+    _CACHE.clear()
@@ -0,0 +1,87 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import bib_dedup_check as D  # noqa: E402
+
+
+BIB = r"""
+@article{lugosi2019,
+  title = {Mean estimation and regression under heavy-tailed distributions: A survey},
+  author = {Lugosi, Gabor and Mendelson, Shahar},
+  year = {2019},
+}
+@article{Lugosi_2019b,
+  title = {Mean estimation and regression under heavy tailed distributions -- a survey},
+  author = {Lugosi, G. and Mendelson, S.},
+  year = 2019,
+}
+@article{catoni2012,
+  title = {Challenging the empirical mean and empirical variance: a deviation study},
+  author = {Catoni, Olivier},
+  year = {2012},
+  doi = {10.1214/11-AIHP454},
+}
+@misc{catoni_dup,
+  title = {Challenging the empirical mean},
+  doi = {https://doi.org/10.1214/11-aihp454},
+}
+@article{minsker2015,
+  title = {Geometric median and robust estimation in Banach spaces},
+  author = {Minsker, Stanislav},
+  year = {2015},
+}
+@article{minsker2015b,
+  title = {Geometric median and robust estimation in Banach spaces},
+  author = {Minsker, Stanislav},
+  year = {2016},
+}
+"""
+
+
+def _items():
+    return [D.canonicalize_entry(e) for e in D.parse_bibtex(BIB)]
+
+
+def _brute(items, min_score):
+    out = set()
+    for i in range(len(items)):
+        for j in range(i + 1, len(items)):
+            a, b = items[i], items[j]
+            if not (a["title_fp"] and b["title_fp"]) or (a["year"] and b["year"] and a["year"] != b["year"]):
+                continue
+            s = 0.75 * D.sim(a["title_fp"], b["title_fp"]) + 0.25 * D.sim(a["author"].lower(), b["author"].lower())
+            if s >= min_score:
+                out.add((a["orig_key"], b["orig_key"]))
+    return out
+
+
+def _keys(pairs, why="title"):
+    return {(a["orig_key"], b["orig_key"]) for a, b, _, w in pairs if w.startswith(why)}
+
+
+def test_indexed_and_exhaustive_agree_with_bruteforce():
+    items = _items()
+    for min_score in (0.5, 0.7, 0.88):
+        ref = _brute(items, min_score) - {("catoni2012", "catoni_dup")}
+        assert _keys(D.find_duplicates(items, min_score, exhaustive=True)) == ref
+        assert _keys(D.find_duplicates(items, min_score)) == ref
+
+
+def test_doi_and_title_duplicates_reported_once():
+    dups = D.find_duplicates(_items())
+    assert _keys(dups, "same DOI") == {("catoni2012", "catoni_dup")}
+    assert _keys(dups) == {("lugosi2019", "Lugosi_2019b")}
+
+
+def test_candidates_respect_year_blocks_and_workers():
+    items = _items()
+    pairs = set(D.candidate_pairs(items, min_overlap=0.0))
+    keys = {(items[j]["orig_key"], items[i]["orig_key"]) for j, i in pairs}
+    assert ("minsker2015", "minsker2015b") not in keys
+    assert ("catoni2012", "catoni_dup") in keys  # no year on one side: compared across buckets
+    assert all(j < i for j, i in pairs)
+    serial = D.find_duplicates(items, 0.5)
+    assert [(a["orig_key"], b["orig_key"], s) for a, b, s, _ in D.find_duplicates(items, 0.5, workers=2)] == \
+        [(a["orig_key"], b["orig_key"], s) for a, b, s, _ in serial]
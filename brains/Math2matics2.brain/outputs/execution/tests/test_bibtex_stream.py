@@ -0,0 +1,83 @@
+import io
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import pipeline.bibtex_stream as S  # noqa: E402
+from pipeline import bibliography  # noqa: E402
+
+
+BIB = b"""% @article{commented_out, title = {skip me}}
+Free text between entries, e.g. mail me@example.org.
+
+@Article{deep2019,
+  title   = {The {GPU} {A{B{C{D}}}} paper, part 1},
+  author  = "Doe, J. and {Smith}",
+  year    = 2019,
+  note    = "vol. " # {3} # x,
+  empty   = ,
+  url     = {http://a.b/%20c}
+}
+@string{foo = "bar"}
+@comment{ anything {nested} }
+@book( paren, title = {T (p)}, publisher = "P)Q" )
+@misc
+  {nofields}
+@misc{unterminated, title = {abc
+"""
+
+
+def _entries(**kw):
+    return list(S.iter_entries(io.BytesIO(BIB), **kw))
+
+
+def test_tokenizer_fields_and_offsets():
+    recs = _entries()
+    assert [(r.entry_type, r.key) for r in recs] == [
+        ("article", "deep2019"), ("book", "paren"), ("misc", "nofields"), ("misc", "unterminated"),
+    ]
+    deep = recs[0].field_dict()
+    assert deep["title"] == "{The {GPU} {A{B{C{D}}}} paper, part 1}"
+    assert deep["author"] == '"Doe, J. and {Smith}"'
+    assert deep["note"] == '"vol. " # {3} # x'
+    assert deep["empty"] == "" and deep["year"] == "2019"
+    assert recs[1].field_dict() == {"title": "{T (p)}", "publisher": '"P)Q"'}
+    assert recs[3].field_dict() == {"title": "{abc"}
+    for r in recs[:3]:
+        raw = BIB[r.start:r.end]
+        assert raw.startswith(b"@") and raw.rstrip().endswith((b"}", b")"))
+
+
+def test_tokenizer_independent_of_chunking():
+    ref = _entries()
+    for size in (1, 3, 17, 64):
+        assert _entries(chunk_size=size) == ref
+
+
+def test_fast_paths_match_general_scanner(monkeypatch):
+    ref = _entries()
+    never = re.compile(rb"(?!)")
+    monkeypatch.setattr(S, "_FIELD_RE", never)
+    monkeypatch.setattr(S, "_ENTRY_BODY_RE", never)
+    assert _entries() == ref
+
+
+def test_parse_cache_by_content_hash(tmp_path):
+    S.clear_cache()
+    bib = tmp_path / "refs.bib"
+    bib.write_bytes(BIB)
+    first = S.parse_file(bib, cache_dir=tmp_path / "cache")
+    assert (tmp_path / "cache" / f"{S.file_digest(bib)}.json").exists()
+    S.clear_cache()
+    assert S.parse_file(bib, cache_dir=tmp_path / "cache") == first
+    assert S.parse_bytes(BIB) == first
+
+
+def test_bibliography_summary_on_shared_tokenizer(tmp_path):
+    out = bibliography.build_bibliography_summary(tmp_path / "missing.bib", tmp_path / "seed.bib", tmp_path / "summary.md")
+    assert out["counts"] == {"article": 1, "inproceedings": 1, "misc": 1}
+    entries = bibliography.parse_bibtex(bibliography.SEED_BIB)
+    assert [e.key for e in entries] == ["kingma2014adam", "devlin2019bert", "bibtex"]
+    assert entries[2].raw.startswith("@misc{bibtex,") and entries[2].raw.endswith("}")
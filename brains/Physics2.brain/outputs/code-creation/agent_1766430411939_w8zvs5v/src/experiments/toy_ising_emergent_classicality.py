@@ -1,14 +1,16 @@
 #!/usr/bin/env python3
-\"\"\"Toy 2D Ising experiment: temperature + decoherence-like noise -> classicality diagnostics.
+"""Toy 2D Ising experiment: temperature + decoherence-like noise -> classicality diagnostics.
 
 Runs Metropolis sampling on an LxL lattice with optional post-sweep bit-flip noise (p_noise),
 then reports magnetization, energy, short-range correlations, a crude correlation-length proxy,
 and single-site Shannon entropy. Produces a CSV and summary heatmaps.
-\"\"\"
+"""
 from __future__ import annotations
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+import os
 import time
 import numpy as np
 import pandas as pd
@@ -24,6 +26,48 @@ def metropolis_sweep(spins: np.ndarray, beta: float, rng: np.random.Generator) -
         if dE <= 0.0 or rng.random() < np.exp(-beta * dE):
             spins[i, j] = -s
 
+def boltzmann_table(beta: float) -> np.ndarray:
+    # Acceptance probabilities indexed by (s*nn + 4)//2, i.e. dE = 2*s*nn in {-8,-4,0,4,8}.
+    dE = 2.0 * np.arange(-4, 5, 2)
+    return np.exp(-beta * np.maximum(dE, 0.0))
+
+def checkerboard_masks(L: int) -> tuple[np.ndarray, np.ndarray]:
+    if L % 2:
+        raise ValueError("checkerboard engine requires an even L (periodic lattice must be bipartite)")
+    ii, jj = np.indices((L, L))
+    red = (ii + jj) % 2 == 0
+    return red, ~red
+
+def checkerboard_sweep(spins: np.ndarray, beta: float, rng: np.random.Generator,
+                       table: np.ndarray | None = None,
+                       masks: tuple[np.ndarray, np.ndarray] | None = None) -> None:
+    """One Metropolis sweep as two vectorized half-sweeps over the red/black sublattices.
+
+    Sites of one colour share no neighbours, so they can be updated simultaneously; the
+    chain differs from the random-site scalar sweep but has the same stationary distribution.
+    With p_noise > 0 the steady state is dynamics-dependent, so engines agree only at p_noise = 0.
+    """
+    if table is None: table = boltzmann_table(beta)
+    if masks is None: masks = checkerboard_masks(spins.shape[0])
+    for mask in masks:
+        nn = (np.roll(spins, 1, axis=0) + np.roll(spins, -1, axis=0)
+              + np.roll(spins, 1, axis=1) + np.roll(spins, -1, axis=1))
+        s = spins[mask]
+        acc = table[(s * nn[mask] + 4) >> 1]
+        flip = rng.random(s.size) < acc
+        spins[mask] = np.where(flip, -s, s)
+
+ENGINES = ("scalar", "checkerboard")
+
+def make_sweep(engine: str, beta: float, L: int):
+    """Return a ``sweep(spins, rng)`` callable for the chosen update engine."""
+    if engine == "scalar":
+        return lambda spins, rng: metropolis_sweep(spins, beta, rng)
+    if engine == "checkerboard":
+        table = boltzmann_table(beta); masks = checkerboard_masks(L)
+        return lambda spins, rng: checkerboard_sweep(spins, beta, rng, table, masks)
+    raise ValueError(f"unknown engine {engine!r}; expected one of {ENGINES}")
+
 def apply_noise(spins: np.ndarray, p: float, rng: np.random.Generator) -> None:
     if p <= 0: return
     mask = rng.random(spins.shape) < p
@@ -66,40 +110,56 @@ class Params:
     pmin: float = 0.0
     pmax: float = 0.15
     seed: int = 0
-    outdir: Path = Path(\"outputs\")
+    outdir: Path = Path("outputs")
+    engine: str = "scalar"
+    workers: int = 1  # <= 0 means os.cpu_count()
+
+def run_cell(params: Params, T: float, p: float, seed: np.random.SeedSequence) -> dict:
+    """Simulate one (T, p_noise) grid cell on its own independent random stream."""
+    rng = np.random.default_rng(seed)
+    sweep = make_sweep(params.engine, 1.0 / T, params.L)
+    spins = rng.choice(np.array([-1, 1], int), size=(params.L, params.L))
+    for _ in range(params.sweeps_eq):
+        sweep(spins, rng); apply_noise(spins, p, rng)
+    mags = []; ens = []; ent1 = []; c1 = []; xi = []
+    max_r = max(2, params.L // 4)
+    for s in range(params.sweeps_sample):
+        sweep(spins, rng); apply_noise(spins, p, rng)
+        if s % params.thin: continue
+        m = float(np.mean(spins))
+        mags.append(abs(m))
+        ens.append(energy_per_spin(spins))
+        pup = 0.5 * (1.0 + m)
+        ent1.append(binary_entropy(pup))
+        c = corr_along_x(spins, max_r)
+        c1.append(float(c[0]))
+        xi.append(corr_length_proxy(c))
+    return dict(T=T, p_noise=p, m_abs=np.mean(mags), e=np.mean(ens),
+                s1=np.mean(ent1), c1=np.mean(c1), xi=np.mean(xi))
 
 def run(params: Params) -> pd.DataFrame:
-    rng = np.random.default_rng(params.seed)
+    """Sweep the (T, p_noise) grid, optionally across a process pool.
+
+    Each cell gets a child of ``SeedSequence(params.seed)`` (row-major over T, then p_noise),
+    so the result is identical for any ``params.workers``.
+    """
     Ts = np.linspace(params.tmin, params.tmax, params.temps)
     Ps = np.linspace(params.pmin, params.pmax, params.noises)
-    rows = []
-    for T in Ts:
-        beta = 1.0 / T
-        for p in Ps:
-            spins = rng.choice(np.array([-1, 1], int), size=(params.L, params.L))
-            for _ in range(params.sweeps_eq):
-                metropolis_sweep(spins, beta, rng); apply_noise(spins, p, rng)
-            mags = []; ens = []; ent1 = []; c1 = []; xi = []
-            max_r = max(2, params.L // 4)
-            for s in range(params.sweeps_sample):
-                metropolis_sweep(spins, beta, rng); apply_noise(spins, p, rng)
-                if s % params.thin: continue
-                m = float(np.mean(spins))
-                mags.append(abs(m))
-                ens.append(energy_per_spin(spins))
-                pup = 0.5 * (1.0 + m)
-                ent1.append(binary_entropy(pup))
-                c = corr_along_x(spins, max_r)
-                c1.append(float(c[0]))
-                xi.append(corr_length_proxy(c))
-            rows.append(dict(T=T, p_noise=p, m_abs=np.mean(mags), e=np.mean(ens),
-                             s1=np.mean(ent1), c1=np.mean(c1), xi=np.mean(xi)))
+    cells = [(T, p) for T in Ts for p in Ps]
+    seeds = np.random.SeedSequence(params.seed).spawn(len(cells))
+    workers = params.workers if params.workers > 0 else (os.cpu_count() or 1)
+    if workers == 1 or len(cells) <= 1:
+        rows = [run_cell(params, T, p, ss) for (T, p), ss in zip(cells, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(cells))) as ex:
+            futs = [ex.submit(run_cell, params, T, p, ss) for (T, p), ss in zip(cells, seeds)]
+            rows = [f.result() for f in futs]
     return pd.DataFrame(rows)
 
 def plot_heatmap(df: pd.DataFrame, x: str, y: str, z: str, path: Path, title: str) -> None:
     piv = df.pivot(index=y, columns=x, values=z).sort_index(ascending=True)
     plt.figure(figsize=(6.2, 4.5))
-    im = plt.imshow(piv.values, origin=\"lower\", aspect=\"auto\",
+    im = plt.imshow(piv.values, origin="lower", aspect="auto",
                     extent=[piv.columns.min(), piv.columns.max(), piv.index.min(), piv.index.max()])
     plt.colorbar(im, label=z)
     plt.xlabel(x); plt.ylabel(y); plt.title(title)
@@ -107,32 +167,37 @@ def plot_heatmap(df: pd.DataFrame, x: str, y: str, z: str, path: Path, title: st
 
 def main() -> None:
     ap = argparse.ArgumentParser()
-    ap.add_argument(\"--L\", type=int, default=24)
-    ap.add_argument(\"--sweeps-eq\", type=int, default=200)
-    ap.add_argument(\"--sweeps-sample\", type=int, default=200)
-    ap.add_argument(\"--thin\", type=int, default=2)
-    ap.add_argument(\"--temps\", type=int, default=10)
-    ap.add_argument(\"--tmin\", type=float, default=1.5)
-    ap.add_argument(\"--tmax\", type=float, default=3.5)
-    ap.add_argument(\"--noises\", type=int, default=6)
-    ap.add_argument(\"--pmin\", type=float, default=0.0)
-    ap.add_argument(\"--pmax\", type=float, default=0.15)
-    ap.add_argument(\"--seed\", type=int, default=0)
-    ap.add_argument(\"--outdir\", type=Path, default=Path(\"outputs\"))
+    ap.add_argument("--L", type=int, default=24)
+    ap.add_argument("--sweeps-eq", type=int, default=200)
+    ap.add_argument("--sweeps-sample", type=int, default=200)
+    ap.add_argument("--thin", type=int, default=2)
+    ap.add_argument("--temps", type=int, default=10)
+    ap.add_argument("--tmin", type=float, default=1.5)
+    ap.add_argument("--tmax", type=float, default=3.5)
+    ap.add_argument("--noises", type=int, default=6)
+    ap.add_argument("--pmin", type=float, default=0.0)
+    ap.add_argument("--pmax", type=float, default=0.15)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--outdir", type=Path, default=Path("outputs"))
+    ap.add_argument("--engine", choices=ENGINES, default="scalar",
+                    help="Metropolis update engine (checkerboard is vectorized; needs even L)")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="process-pool size for the (T, p_noise) grid; <= 0 uses all cores")
     args = ap.parse_args()
     params = Params(L=args.L, sweeps_eq=args.sweeps_eq, sweeps_sample=args.sweeps_sample,
                     thin=args.thin, temps=args.temps, tmin=args.tmin, tmax=args.tmax,
                     noises=args.noises, pmin=args.pmin, pmax=args.pmax,
-                    seed=args.seed, outdir=args.outdir)
-    tstamp = time.strftime(\"%Y%m%d_%H%M%S\")
-    out = params.outdir / f\"toy_ising_emergent_classicality_{tstamp}\"
+                    seed=args.seed, outdir=args.outdir, engine=args.engine,
+                    workers=args.workers)
+    tstamp = time.strftime("%Y%m%d_%H%M%S")
+    out = params.outdir / f"toy_ising_emergent_classicality_{tstamp}"
     out.mkdir(parents=True, exist_ok=True)
     df = run(params)
-    df.to_csv(out / \"summary.csv\", index=False)
-    plot_heatmap(df, \"T\", \"p_noise\", \"m_abs\", out / \"m_abs_heatmap.png\", \"|m| (order parameter)\")
-    plot_heatmap(df, \"T\", \"p_noise\", \"s1\", out / \"s1_heatmap.png\", \"single-site Shannon entropy\")
-    plot_heatmap(df, \"T\", \"p_noise\", \"xi\", out / \"xi_heatmap.png\", \"correlation length proxy\")
-    print(f\"WROTE:{out}\")
+    df.to_csv(out / "summary.csv", index=False)
+    plot_heatmap(df, "T", "p_noise", "m_abs", out / "m_abs_heatmap.png", "|m| (order parameter)")
+    plot_heatmap(df, "T", "p_noise", "s1", out / "s1_heatmap.png", "single-site Shannon entropy")
+    plot_heatmap(df, "T", "p_noise", "xi", out / "xi_heatmap.png", "correlation length proxy")
+    print(f"WROTE:{out}")
 
-if __name__ == \"__main__\":
+if __name__ == "__main__":
     main()
@@ -11,6 +11,8 @@ from typing import Iterable, List, Sequence, Tuple, Union, Optional
 
 import numpy as np
 
+from src.lib import ptrace
+
 Array = np.ndarray
 def set_seed(seed: Optional[int] = None) -> np.random.Generator:
     """Return a reproducible RNG (NumPy Generator)."""
@@ -122,27 +124,23 @@ def partial_trace(
         dims: subsystem dimensions, e.g. [2,2,2]
         keep: indices of subsystems to keep (0-based)
     Returns:
-        Reduced density matrix on kept subsystems.
+        Reduced density matrix on kept subsystems (ascending index order).
     """
     rho = _as_complex(rho)
     dims = list(map(int, dims))
-    n = len(dims)
-    keep = list(map(int, keep))
     if rho.ndim != 2 or rho.shape[0] != rho.shape[1]:
         raise ValueError("rho must be a square matrix")
     D = int(np.prod(dims))
     if rho.shape[0] != D:
         raise ValueError("rho shape incompatible with dims")
-    if any(k < 0 or k >= n for k in keep):
-        raise ValueError("keep indices out of range")
-    trace_out = [i for i in range(n) if i not in keep]
-
-    reshaped = rho.reshape(*dims, *dims)  # (i1..in, j1..jn)
-    for ax in sorted(trace_out, reverse=True):
-        reshaped = np.trace(reshaped, axis1=ax, axis2=ax + n)
-    kept_dims = [dims[i] for i in keep]
-    dkeep = int(np.prod(kept_dims)) if kept_dims else 1
-    return reshaped.reshape(dkeep, dkeep)
+    return ptrace.reduced_density(rho, dims, keep)
+
+
+def reduced_density_from_state(psi: Array, dims: Sequence[int], keep: Sequence[int]) -> Array:
+    """Reduced density matrix of a statevector, without forming |psi><psi|."""
+    return ptrace.reduced_density_from_state(_as_complex(psi).reshape(-1), dims, keep)
+
+
 def _safe_eigvals(rho: Array, tol: float = 1e-15) -> Array:
     rho = _as_complex(rho)
     # Ensure Hermitian for numerical stability
@@ -177,3 +175,20 @@ def renyi_entropy(rho: Array, alpha: float = 2.0, base: float = 2.0) -> float:
     if val <= 0:
         return 0.0
     return float(np.log(val) / (1.0 - alpha) / np.log(base))
+
+
+def entanglement_entropy(
+    state: Array, dims: Sequence[int], keep: Sequence[int], base: float = 2.0
+) -> float:
+    """Von Neumann entropy of the reduced state on ``keep``.
+
+    ``state`` may be a ket or a density matrix; pure inputs use the Schmidt spectrum.
+    """
+    return ptrace.subsystem_entropy(_as_complex(state), dims, keep, base=base)
+
+
+def mutual_information(
+    state: Array, dims: Sequence[int], A: Sequence[int], B: Sequence[int], base: float = 2.0
+) -> float:
+    """I(A:B) = S(A) + S(B) - S(AB) for a ket or density matrix."""
+    return ptrace.mutual_information(_as_complex(state), dims, A, B, base=base)
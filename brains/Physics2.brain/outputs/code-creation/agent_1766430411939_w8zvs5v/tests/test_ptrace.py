@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from src.lib import ptrace
+from src.lib import quantum_states as qs
+
+
+def _dense_partial_trace(rho, keep, dims):
+    # dense reference: trace out one subsystem at a time from the full density matrix
+    dims = list(dims)
+    n = len(dims)
+    out = rho.reshape(dims + dims)
+    for s in sorted((i for i in range(n) if i not in set(keep)), reverse=True):
+        out = np.trace(out, axis1=s, axis2=s + n)
+        dims.pop(s)
+        n -= 1
+    d = int(np.prod(dims)) if dims else 1
+    return out.reshape(d, d)
+
+
+def _entropy(rho):
+    vals = np.clip(np.linalg.eigvalsh((rho + rho.conj().T) / 2).real, 0.0, 1.0)
+    vals = vals[vals > 1e-15]
+    return float(-(vals * np.log2(vals)).sum())
+
+
+def _ket(rng, D):
+    psi = rng.normal(size=D) + 1j * rng.normal(size=D)
+    return psi / np.linalg.norm(psi)
+
+
+def _mixed(rng, D, rank=3):
+    K = rng.normal(size=(D, rank)) + 1j * rng.normal(size=(D, rank))
+    rho = K @ K.conj().T
+    return rho / np.trace(rho).real
+
+
+@pytest.mark.parametrize("dims", [(2, 2, 2, 2), (2, 3, 2), (3, 1, 2, 2)])
+def test_partial_trace_matches_dense_reference(dims) -> None:
+    rng = np.random.default_rng(0)
+    D = int(np.prod(dims))
+    psi, rho = _ket(rng, D), _mixed(rng, D)
+    pure = np.outer(psi, psi.conj())
+    for keep in ([], [0], [2, 0], [1, 2], list(range(len(dims)))):
+        np.testing.assert_allclose(qs.partial_trace(rho, dims, keep), _dense_partial_trace(rho, keep, dims), atol=1e-12)
+        np.testing.assert_allclose(qs.partial_trace(pure, dims, keep), _dense_partial_trace(pure, keep, dims), atol=1e-12)
+        np.testing.assert_allclose(qs.reduced_density_from_state(psi, dims, keep),
+                                   _dense_partial_trace(pure, keep, dims), atol=1e-12)
+        for state, full in ((psi, pure), (pure, pure), (rho, rho)):
+            ref = _entropy(_dense_partial_trace(full, keep, dims))
+            assert qs.entanglement_entropy(state, dims, keep) == pytest.approx(ref, abs=1e-10)
+
+
+def test_mutual_information_matches_dense_reference() -> None:
+    rng = np.random.default_rng(1)
+    dims = [2, 2, 2, 2]
+    for state, full in ((lambda p: (p, np.outer(p, p.conj())))(_ket(rng, 16)), (lambda r: (r, r))(_mixed(rng, 16))):
+        for A, B in (([0], [3]), ([0, 1], [2]), ([1, 2], [2, 3])):
+            ref = sum(s * _entropy(_dense_partial_trace(full, keep, dims))
+                      for s, keep in ((1, A), (1, B), (-1, sorted(set(A + B)))))
+            assert qs.mutual_information(state, dims, A, B) == pytest.approx(ref, abs=1e-10)
+    assert ptrace.trace_plan((2, 2), (1, 0)) is ptrace.trace_plan((2, 2), (1, 0))
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.experiments import toy_ising_emergent_classicality as ising
+
+
+OBSERVABLES = ["m_abs", "e", "s1", "c1", "xi"]
+
+
+def _params(engine: str, seed: int) -> ising.Params:
+    # p_noise = 0 only: with noise the steady state depends on the update schedule.
+    return ising.Params(L=8, sweeps_eq=100, sweeps_sample=300, thin=1, temps=3,
+                        tmin=1.5, tmax=3.5, noises=1, pmin=0.0, pmax=0.0,
+                        seed=seed, engine=engine)
+
+
+def test_boltzmann_table_matches_scalar_acceptance() -> None:
+    beta = 0.4
+    table = ising.boltzmann_table(beta)
+    for snn in (-4, -2, 0, 2, 4):
+        dE = 2.0 * snn
+        expected = 1.0 if dE <= 0 else np.exp(-beta * dE)
+        assert table[(snn + 4) >> 1] == pytest.approx(expected)
+
+
+def test_checkerboard_rejects_odd_lattice() -> None:
+    with pytest.raises(ValueError):
+        ising.make_sweep("checkerboard", 0.5, 7)
+
+
+def test_unknown_engine_rejected() -> None:
+    with pytest.raises(ValueError):
+        ising.make_sweep("gpu", 0.5, 8)
+
+
+def test_checkerboard_zero_temperature_limit_never_raises_energy() -> None:
+    rng = np.random.default_rng(1)
+    spins = rng.choice(np.array([-1, 1], int), size=(8, 8))
+    e0 = ising.energy_per_spin(spins)
+    ising.checkerboard_sweep(spins, 1e6, rng)
+    assert set(np.unique(spins)) <= {-1, 1}
+    assert ising.energy_per_spin(spins) <= e0
+
+
+def test_checkerboard_statistically_matches_scalar_path() -> None:
+    # Same stationary distribution: seed-averaged observables agree within MC error.
+    scalar = [ising.run(_params("scalar", s)) for s in range(3)]
+    checker = [ising.run(_params("checkerboard", s)) for s in range(3)]
+    a = np.mean([df[OBSERVABLES].to_numpy() for df in scalar], axis=0)
+    b = np.mean([df[OBSERVABLES].to_numpy() for df in checker], axis=0)
+    assert list(scalar[0].columns) == list(checker[0].columns)
+    # m_abs, e, s1, c1 are O(1) and well sampled; xi is a noisy proxy.
+    np.testing.assert_allclose(b[:, :4], a[:, :4], atol=0.08)
+    np.testing.assert_allclose(b[:, 4], a[:, 4], rtol=0.35, atol=0.3)
+
+
+def test_grid_results_independent_of_worker_count() -> None:
+    base = dict(L=8, sweeps_eq=10, sweeps_sample=20, thin=2, temps=3, noises=2,
+                pmax=0.1, seed=7, engine="checkerboard")
+    serial = ising.run(ising.Params(**base, workers=1))
+    pooled = ising.run(ising.Params(**base, workers=3))
+    pd.testing.assert_frame_equal(serial, pooled)
+    assert len(serial) == 6
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Benchmark pairwise trajectory distance matrices (DTW, curve_rms).
+
+Run from the project root:
+  PYTHONPATH=src python scripts/bench_pairwise_distances.py --n 500 --length 300 --window 30 --workers 4
+
+Times the reference per-pair loop on a small subset (--ref-pairs) and extrapolates
+it to the full matrix, then times ``pairwise_distances`` on all N(N+1)/2 pairs and
+checks the subset values agree.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from sf_gft_diagnostics.metrics import curve_rms_distance, dtw_distance, pairwise_distances
+
+
+def _reference_dtw(x: np.ndarray, y: np.ndarray, p: float = 2.0) -> float:
+    """The original cell-by-cell DP, kept here as the timing baseline."""
+    x = x[:, None] if x.ndim == 1 else x
+    y = y[:, None] if y.ndim == 1 else y
+    n, m = x.shape[0], y.shape[0]
+    D = np.full((n + 1, m + 1), np.inf)
+    D[0, 0] = 0.0
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            cost = np.linalg.norm(x[i - 1] - y[j - 1], ord=p)
+            D[i, j] = cost + min(D[i - 1, j], D[i, j - 1], D[i - 1, j - 1])
+    return float(D[n, m])
+
+
+def _trajectories(n: int, length: int, dim: int, seed: int) -> list[np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return [np.cumsum(rng.normal(size=(length, dim)), axis=0) for _ in range(n)]
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--n", type=int, default=500, help="number of trajectories")
+    p.add_argument("--length", type=int, default=300, help="steps per trajectory")
+    p.add_argument("--dim", type=int, default=2)
+    p.add_argument("--window", type=int, default=None, help="Sakoe-Chiba half-width (default: none)")
+    p.add_argument("--workers", type=int, default=1)
+    p.add_argument("--batch", type=int, default=64)
+    p.add_argument("--ref-pairs", type=int, default=3)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args(argv)
+
+    seqs = _trajectories(args.n, args.length, args.dim, args.seed)
+    n_pairs = args.n * (args.n + 1) // 2
+
+    t0 = time.perf_counter()
+    ref = [_reference_dtw(seqs[0], seqs[k + 1]) for k in range(args.ref_pairs)]
+    t_ref = (time.perf_counter() - t0) / args.ref_pairs
+    print(f"reference dtw loop : {t_ref * 1e3:9.2f} ms/pair -> ~{t_ref * n_pairs:10.1f} s for {n_pairs} pairs")
+    if args.window is None:
+        got = [dtw_distance(seqs[0], seqs[k + 1]) for k in range(args.ref_pairs)]
+        print(f"  max |diff| vs wavefront: {np.max(np.abs(np.subtract(ref, got))):.3e}")
+
+    t0 = time.perf_counter()
+    D = pairwise_distances(seqs, "dtw", window=args.window, workers=args.workers, batch=args.batch)
+    t = time.perf_counter() - t0
+    print(f"pairwise dtw       : {t:9.2f} s  ({t / n_pairs * 1e3:.3f} ms/pair, window={args.window}, "
+          f"workers={args.workers})")
+
+    curves = [(np.linspace(0.0, 1.0, args.length), s) for s in seqs]
+    t0 = time.perf_counter()
+    for k in range(args.ref_pairs):
+        curve_rms_distance(*curves[0], *curves[k + 1])
+    t_ref = (time.perf_counter() - t0) / args.ref_pairs
+    print(f"reference curve_rms: {t_ref * 1e3:9.3f} ms/pair -> ~{t_ref * n_pairs:10.1f} s")
+    t0 = time.perf_counter()
+    R = pairwise_distances(curves, "curve_rms", workers=args.workers)
+    print(f"pairwise curve_rms : {time.perf_counter() - t0:9.2f} s")
+    assert D.shape == R.shape == (args.n, args.n)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Benchmark RG dataset loading: per-step ``RGDataset`` vs ``ColumnarRGDataset``.
+
+Run from the project root:
+  PYTHONPATH=src python scripts/bench_rg_columns.py --steps 200000 --samples 16
+
+Writes a synthetic .jsonl ensemble, then reports wall time and peak traced memory
+for ``load_rg_dataset``, a cold ``load_rg_columns`` (parse + cache write) and a
+warm one (memory-mapped cache), plus an estimator evaluated on each.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from sf_gft_diagnostics import observables
+from sf_gft_diagnostics.rg_io import load_rg_columns, load_rg_dataset
+
+
+def _write(path: Path, steps: int, samples: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    with path.open("w", encoding="utf-8") as f:
+        for i in range(steps):
+            rec = {
+                "scale": 2.0 ** -(i % 12),
+                "level": i % 12,
+                "params": {"g": float(rng.random()), "lambda4": float(rng.random())},
+                "observables": {"volume": float(rng.normal(1000, 30)), "xi": float(rng.random())},
+                "distributions": {"spin": rng.random(samples).round(6).tolist()},
+            }
+            f.write(json.dumps(rec) + "\n")
+
+
+def _timed(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    out = fn()
+    dt = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return out, dt, peak
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--steps", type=int, default=200_000)
+    p.add_argument("--samples", type=int, default=16, help="distribution samples per step")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "ensemble.jsonl"
+        _write(src, args.steps, args.samples, args.seed)
+        print(f"{args.steps} steps, {src.stat().st_size / 2**20:.1f} MB jsonl")
+
+        ds, t, m = _timed(lambda: load_rg_dataset(src))
+        v_ref = observables.compute("mean_volume", {"volume": [s.observables["volume"] for s in ds.steps]})
+        print(f"{'RGDataset':>18} {t:8.2f} s {m / 2**20:9.1f} MB  mean_volume={v_ref:.6f}")
+        del ds
+
+        for label in ("columns (cold)", "columns (mmap)"):
+            cols, t, m = _timed(lambda: load_rg_columns(src, cache_dir=Path(tmp) / "cache"))
+            v = observables.compute_columns(["mean_volume"], cols)["mean_volume"]
+            print(f"{label:>18} {t:8.2f} s {m / 2**20:9.1f} MB  mean_volume={v:.6f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -52,10 +52,11 @@ _safe_import(
     "observables",
     names=[
         "ObservableSpec",
-        "ObservableCatalog",
-        "DEFAULT_CATALOG",
-        "estimate_observable",
         "list_observables",
+        "get_observable",
+        "compute",
+        "compute_many",
+        "compute_columns",
     ],
 )
 
@@ -63,32 +64,48 @@ _safe_import(
     "scaling",
     names=[
         "effective_exponent",
-        "finite_size_collapse",
-        "hyperscaling_check",
-        "bootstrap_ci",
-        "propagate_errors",
+        "moving_window_exponent",
+        "FSSRescale",
+        "collapse_score",
+        "collapse_scores",
+        "grid_search_collapse",
+        "refine_collapse",
+        "hyperscaling_residuals",
+        "propagate_uncertainty",
+        "bootstrap",
     ],
 )
 
 _safe_import(
     "metrics",
     names=[
-        "js_distance",
-        "wasserstein_distance",
-        "kl_divergence_surrogate",
-        "curve_distance",
-        "trajectory_distance",
-        "consistency_score",
+        "kl_divergence",
+        "js_divergence",
+        "hellinger_distance",
+        "wasserstein_1d",
+        "curve_rms_distance",
+        "dtw_distance",
+        "dtw_batch",
+        "pairwise_distances",
+        "get_metric",
     ],
 )
 
 _safe_import(
     "rg_io",
     names=[
+        "RGStep",
         "RGDataset",
+        "from_records",
         "load_rg_dataset",
-        "from_tensor_network_rg",
-        "from_gft_coarse_graining_log",
+        "merge_datasets",
+        "Ragged",
+        "ColumnarRGDataset",
+        "columns_from_records",
+        "load_rg_columns",
+        "save_columns",
+        "open_columns",
+        "merge_columns",
     ],
 )
 def available_symbols() -> List[str]:
@@ -13,7 +13,7 @@ Design goals:
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+from typing import Callable, Dict, Iterable, Mapping, Optional, Sequence, Tuple
 
 import numpy as np
 Array = np.ndarray
@@ -123,25 +123,91 @@ def curve_rms_distance(
     if len(w) != len(grid):
         raise ValueError("weights must have length n_grid")
     return float(np.sqrt(np.sum(w * np.sum(d * d, axis=1))))
-def dtw_distance(seq1: Array, seq2: Array, p: float = 2.0) -> float:
+def _as_seq(a: Array) -> Array:
+    a = np.asarray(a, dtype=float)
+    return a[:, None] if a.ndim == 1 else a
+
+
+def _pointwise_cost(d: Sequence[Array], p: float) -> Array:
+    """p-norm across the feature arrays ``d`` (one per dimension), as np.linalg.norm(ord=p).
+
+    Accumulating per feature keeps every operation on long contiguous arrays,
+    which is much faster than reducing a short trailing axis.
+    """
+    if p == 2:
+        acc = d[0] * d[0]
+        for f in d[1:]:
+            acc += f * f
+        return np.sqrt(acc)
+    if p == 1 or p == np.inf:
+        acc = np.abs(d[0])
+        for f in d[1:]:
+            if p == 1:
+                acc += np.abs(f)
+            else:
+                np.maximum(acc, np.abs(f), out=acc)
+        return acc
+    if p > 0 and np.isfinite(p):
+        acc = np.abs(d[0]) ** p
+        for f in d[1:]:
+            acc += np.abs(f) ** p
+        return acc ** (1.0 / p)
+    return np.linalg.norm(np.stack(d, axis=-1), ord=p, axis=-1)
+
+
+def dtw_batch(X: Array, Y: Array, p: float = 2.0, window: Optional[int] = None) -> Array:
+    """DTW distances for a batch of equal-shape pairs X[b] vs Y[b].
+
+    X: (B, n[, d]), Y: (B, m[, d]).  The DP table is filled one anti-diagonal
+    k = i + j at a time: cell (i, j) needs only cells (i-1, j), (i, j-1) on diagonal
+    k-1 and (i-1, j-1) on k-2, so with diagonals stored by row index i every
+    update is a contiguous slice, vectorized across the diagonal and the batch.
+    Memory is O(B * n).  ``window`` is the Sakoe-Chiba band half-width |i - j| <= w
+    (widened to |n - m| so the end cell stays reachable); None = no band.
+    """
+    X = np.asarray(X, dtype=float)
+    Y = np.asarray(Y, dtype=float)
+    if X.ndim == 2:
+        X = X[:, :, None]
+    if Y.ndim == 2:
+        Y = Y[:, :, None]
+    if X.shape[0] != Y.shape[0] or X.shape[2] != Y.shape[2]:
+        raise ValueError("X and Y must hold the same number of pairs and feature dims")
+    B, n, m = X.shape[0], X.shape[1], Y.shape[1]
+    if n == 0 or m == 0:
+        return np.full(B, np.inf)
+    w = max(n, m) if window is None else max(int(window), abs(n - m))
+    Xf = np.ascontiguousarray(np.moveaxis(X, 2, 0))  # (d, B, n): feature-major
+    Yf = np.ascontiguousarray(np.moveaxis(Y, 2, 0))
+    prev2 = np.full((B, n + 1), np.inf)  # diagonal k-2, indexed by i
+    prev1 = np.full((B, n + 1), np.inf)  # diagonal k-1
+    cur = np.empty((B, n + 1))
+    prev2[:, 0] = 0.0  # D[0, 0]
+    for k in range(2, n + m + 1):
+        lo = max(1, k - m, -((w - k) // 2))  # ceil((k - w) / 2)
+        hi = min(n, k - 1, (k + w) // 2)
+        cur.fill(np.inf)
+        if lo <= hi:
+            # x[i-1] for i = lo..hi against y[j-1] for j = k-i (descending).
+            d = [xf[:, lo - 1 : hi] - yf[:, k - hi - 1 : k - lo][:, ::-1] for xf, yf in zip(Xf, Yf)]
+            best = np.minimum(np.minimum(prev1[:, lo - 1 : hi], prev1[:, lo : hi + 1]), prev2[:, lo - 1 : hi])
+            cur[:, lo : hi + 1] = _pointwise_cost(d, p) + best
+        prev2, prev1, cur = prev1, cur, prev2
+    return prev1[:, n].copy()
+
+
+def dtw_distance(seq1: Array, seq2: Array, p: float = 2.0, window: Optional[int] = None) -> float:
     """Dynamic time warping distance between two sequences (vectors allowed).
 
-    Uses O(nm) DP; intended for short RG trajectories (tens to few hundreds steps).
+    O(nm) DP (O(n*window) with a Sakoe-Chiba band) evaluated by anti-diagonal
+    wavefronts; see :func:`dtw_batch`.
     """
-    x = np.asarray(seq1, dtype=float)
-    y = np.asarray(seq2, dtype=float)
-    if x.ndim == 1:
-        x = x[:, None]
-    if y.ndim == 1:
-        y = y[:, None]
-    n, m = x.shape[0], y.shape[0]
-    D = np.full((n + 1, m + 1), np.inf, dtype=float)
-    D[0, 0] = 0.0
-    for i in range(1, n + 1):
-        for j in range(1, m + 1):
-            cost = np.linalg.norm(x[i - 1] - y[j - 1], ord=p)
-            D[i, j] = cost + min(D[i - 1, j], D[i, j - 1], D[i - 1, j - 1])
-    return float(D[n, m])
+    x, y = _as_seq(seq1), _as_seq(seq2)
+    if x.shape[1] != y.shape[1]:
+        raise ValueError("sequences must have the same feature dimension")
+    return float(dtw_batch(x[None], y[None], p=p, window=window)[0])
+
+
 @dataclass(frozen=True)
 class Metric:
     name: str
@@ -149,10 +215,12 @@ class Metric:
     fn: Callable[..., float]
     bounded: Optional[Tuple[float, float]] = None
     notes: str = ""
+    symmetric: bool = True
 
 
 METRICS: Dict[str, Metric] = {
-    "kl": Metric("kl", "distribution", kl_divergence, bounded=None, notes="KL(p||q), asymmetric"),
+    "kl": Metric("kl", "distribution", kl_divergence, bounded=None, notes="KL(p||q), asymmetric",
+                 symmetric=False),
     "js": Metric("js", "distribution", js_divergence, bounded=(0.0, 1.0), notes="JS divergence base-2"),
     "hellinger": Metric("hellinger", "distribution", hellinger_distance, bounded=(0.0, 1.0)),
     "w1": Metric("w1", "distribution", wasserstein_1d, bounded=None, notes="Wasserstein-1 on 1D grid"),
@@ -169,3 +237,152 @@ def get_metric(name: str) -> Metric:
     if name not in METRICS:
         raise KeyError(f"Unknown metric '{name}'. Available: {sorted(METRICS)}")
     return METRICS[name]
+
+
+# ---------------------------------------------------------------------------
+# Pairwise distance matrices
+# ---------------------------------------------------------------------------
+
+_POOL_STATE: Dict[str, object] = {}
+
+
+def _trajectory(item) -> Tuple[Array, Array]:
+    """(t, y) for curve_rms inputs: a (t, y) pair or a bare y sampled at 0..n-1."""
+    if isinstance(item, tuple) and len(item) == 2:
+        return _as_1d(item[0]), np.asarray(item[1], dtype=float)
+    y = np.asarray(item, dtype=float)
+    return np.arange(y.shape[0], dtype=float), y
+
+
+class _GridCache:
+    """Interpolated curves keyed by (item, grid) so each curve is resampled once per grid."""
+
+    def __init__(self, curves: Sequence[Tuple[Array, Array]], n_grid: int):
+        self.curves = curves
+        self.n_grid = int(n_grid)
+        self._grids: Dict[Tuple[float, float], Array] = {}
+        self._values: Dict[Tuple[int, float, float], Array] = {}
+
+    def span(self, i: int, j: int) -> Tuple[float, float]:
+        ti, tj = self.curves[i][0], self.curves[j][0]
+        return max(ti.min(), tj.min()), min(ti.max(), tj.max())
+
+    def values(self, i: int, span: Tuple[float, float]) -> Array:
+        key = (i, *span)
+        out = self._values.get(key)
+        if out is None:
+            grid = self._grids.get(span)
+            if grid is None:
+                grid = self._grids[span] = np.linspace(span[0], span[1], self.n_grid)
+            out = _interp_to_grid(*self.curves[i], grid).reshape(self.n_grid, -1)
+            self._values[key] = out
+        return out
+
+
+def _curve_rms_block(pairs: Array, cache: _GridCache, weights: Optional[Array]) -> Array:
+    w = None if weights is None else normalize_pmf(weights, eps=0.0)
+    if w is not None and len(w) != cache.n_grid:
+        raise ValueError("weights must have length n_grid")
+    out = np.empty(len(pairs))
+    groups: Dict[Tuple[float, float], list] = {}
+    for r, (i, j) in enumerate(pairs):
+        groups.setdefault(cache.span(i, j), []).append(r)
+    for span, rows in groups.items():
+        rows = np.asarray(rows)
+        A = np.stack([cache.values(i, span) for i in pairs[rows, 0]])
+        Bv = np.stack([cache.values(j, span) for j in pairs[rows, 1]])
+        sq = np.sum((A - Bv) ** 2, axis=2)
+        out[rows] = np.sqrt(sq.mean(axis=1) if w is None else sq @ w)
+    return out
+
+
+def _dtw_block(pairs: Array, seqs: Sequence[Array], kw: Mapping[str, object], batch: int) -> Array:
+    out = np.empty(len(pairs))
+    groups: Dict[Tuple[int, int], list] = {}
+    for r, (i, j) in enumerate(pairs):
+        groups.setdefault((seqs[i].shape[0], seqs[j].shape[0]), []).append(r)
+    for rows in groups.values():
+        for s in range(0, len(rows), batch):
+            sub = np.asarray(rows[s : s + batch])
+            X = np.stack([seqs[i] for i in pairs[sub, 0]])
+            Y = np.stack([seqs[j] for j in pairs[sub, 1]])
+            out[sub] = dtw_batch(X, Y, **kw)
+    return out
+
+
+def _pair_block(pairs: Array) -> Array:
+    st = _POOL_STATE
+    name, items, kw = st["metric"], st["items"], st["kwargs"]
+    if name == "dtw":
+        return _dtw_block(pairs, items, kw, int(st["batch"]))
+    if name == "curve_rms":
+        return _curve_rms_block(pairs, st["cache"], kw.get("weights"))
+    fn = METRICS[name].fn
+    return np.array([fn(items[i], items[j], **kw) for i, j in pairs], dtype=float)
+
+
+def _init_pool_state(name: str, items: Sequence, kwargs: Mapping[str, object], batch: int) -> None:
+    if name == "dtw":
+        items = [_as_seq(a) for a in items]
+    elif name == "curve_rms":
+        items = [_trajectory(a) for a in items]
+        _POOL_STATE["cache"] = _GridCache(items, int(kwargs.get("n_grid", 128)))
+    _POOL_STATE.update(metric=name, items=items, kwargs=dict(kwargs), batch=batch)
+
+
+def pairwise_distances(
+    datasets: Sequence,
+    metric: str = "dtw",
+    *,
+    workers: int = 1,
+    batch: int = 64,
+    chunks_per_worker: int = 4,
+    **kwargs,
+) -> Array:
+    """(N, N) matrix of ``metric`` between all pairs of ``datasets``.
+
+    Items are whatever the metric's function takes as one argument: arrays for
+    distribution/vector metrics and DTW, and (t, y) pairs (or bare y, sampled at
+    0..n-1) for ``curve_rms``.  Extra keyword arguments go to the metric.
+
+    Symmetric metrics evaluate only i <= j and mirror.  DTW pairs are grouped by
+    length and run through :func:`dtw_batch` ``batch`` pairs at a time; curve_rms
+    interpolates each curve once per distinct common grid and reuses it across
+    pairs.  ``workers > 1`` (``<= 0``: all CPUs) splits the pair list over a
+    process pool; results do not depend on the worker count.
+    """
+    m = get_metric(metric)
+    items = list(datasets)
+    N = len(items)
+    if m.symmetric:
+        iu = np.triu_indices(N)
+        pairs = np.column_stack(iu)
+    else:
+        pairs = np.column_stack([a.ravel() for a in np.indices((N, N))])
+    workers = int(workers)
+    if workers <= 0:
+        import os
+
+        workers = os.cpu_count() or 1
+    n_chunks = max(1, min(len(pairs), workers * int(chunks_per_worker))) if workers > 1 else 1
+    blocks = np.array_split(pairs, n_chunks)
+    if workers > 1 and len(pairs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_pool_state,
+            initargs=(m.name, items, kwargs, int(batch)),
+        ) as ex:
+            vals = np.concatenate(list(ex.map(_pair_block, blocks)))
+    else:
+        _init_pool_state(m.name, items, kwargs, int(batch))
+        try:
+            vals = np.concatenate([_pair_block(b) for b in blocks]) if len(pairs) else np.empty(0)
+        finally:
+            _POOL_STATE.clear()
+    out = np.empty((N, N), dtype=float)
+    out[pairs[:, 0], pairs[:, 1]] = vals
+    if m.symmetric:
+        out[pairs[:, 1], pairs[:, 0]] = vals
+    return out
@@ -4,7 +4,8 @@ This module provides a *prioritized* catalog of candidate continuum observables
 scaling quantities, with lightweight schemas and computable estimators.
 
 Conventions:
-- Estimators consume an in-memory mapping ``data: dict`` (produced by rg_io adapters).
+- Estimators consume a mapping ``data: dict`` (produced by rg_io adapters; for
+  columnar datasets use ``ColumnarRGDataset.data`` or ``compute_columns``).
 - Missing required keys raise ``KeyError`` with a clear message.
 - Returned values are numpy scalars/arrays, suitable for bootstraps/FSS in scaling.py.
 """
@@ -40,13 +41,18 @@ def _as_array(x: Any) -> Array:
     return np.asarray(x)
 
 
+def _as_float(x: Any) -> Array:
+    # No copy for float64 inputs, so memory-mapped rg_io columns are read in place.
+    return np.asarray(x, dtype=float)
+
+
 def _mean_var(x: Any) -> Tuple[float, float]:
-    a = _as_array(x).astype(float)
+    a = _as_float(x)
     return float(np.mean(a)), float(np.var(a, ddof=1) if a.size > 1 else 0.0)
 
 
 def _safe_log(x: Array, eps: float = 1e-300) -> Array:
-    return np.log(np.maximum(_as_array(x).astype(float), eps))
+    return np.log(np.maximum(_as_float(x), eps))
 # ---- Estimators (generic, dataset-key based) ---------------------------------
 
 
@@ -64,7 +70,7 @@ def est_volume_susceptibility(data: Data) -> float:
 
 def est_binder_volume(data: Data) -> float:
     """Binder cumulant of volume: 1 - <V^4>/(3 <V^2>^2)."""
-    V = _as_array(data["volume"]).astype(float)
+    V = _as_float(data["volume"])
     v2 = np.mean(V**2)
     v4 = np.mean(V**4)
     return float(1.0 - v4 / (3.0 * (v2**2 + 1e-30)))
@@ -72,28 +78,28 @@ def est_binder_volume(data: Data) -> float:
 
 def est_spin_mean(data: Data) -> float:
     """Mean spin from a histogram or sample list (proxy for area scale)."""
-    j = _as_array(data["spin"]).astype(float)
+    j = _as_float(data["spin"])
     return float(np.mean(j))
 
 
 def est_spin_entropy(data: Data) -> float:
     """Shannon entropy of spin distribution (requires prob vector 'spin_p')."""
-    p = _as_array(data["spin_p"]).astype(float)
+    p = _as_float(data["spin_p"])
     p = p / (np.sum(p) + 1e-30)
     return float(-np.sum(p * _safe_log(p)))
 
 
 def est_two_point_connected(data: Data) -> Array:
     """Connected correlator C(r)=<O_x O_{x+r}>-<O>^2 provided as raw arrays."""
-    oo = _as_array(data["two_point"]).astype(float)  # shape (R,) or (nsamp,R)
-    o = _as_array(data["one_point"]).astype(float)   # scalar or (nsamp,)
+    oo = _as_float(data["two_point"])  # shape (R,) or (nsamp,R)
+    o = _as_float(data["one_point"])   # scalar or (nsamp,)
     return np.mean(oo, axis=0) - (np.mean(o) ** 2)
 
 
 def est_corr_length_second_moment(data: Data) -> float:
     """Second-moment correlation length from C(r) and radii r."""
-    r = _as_array(data["r"]).astype(float)
-    C = _as_array(data["C_r"]).astype(float)
+    r = _as_float(data["r"])
+    C = _as_float(data["C_r"])
     C0 = np.sum(C)
     if C0 <= 0:
         return float(np.nan)
@@ -103,8 +109,8 @@ def est_corr_length_second_moment(data: Data) -> float:
 
 def est_spectral_dimension(data: Data) -> float:
     """Spectral dimension from return prob P(s): d_s=-2 d ln P / d ln s."""
-    s = _as_array(data["diffusion_time"]).astype(float)
-    P = _as_array(data["return_prob"]).astype(float)
+    s = _as_float(data["diffusion_time"])
+    P = _as_float(data["return_prob"])
     ls, lP = _safe_log(s), _safe_log(P)
     # local slope via least squares on central window if provided
     i0, i1 = data.get("fit_window", (max(1, len(s)//4), max(2, 3*len(s)//4)))
@@ -116,7 +122,7 @@ def est_spectral_dimension(data: Data) -> float:
 
 def est_regge_curvature_rms(data: Data) -> float:
     """RMS deficit angle (proxy for |R| scale) from 'deficit_angles'."""
-    d = _as_array(data["deficit_angles"]).astype(float)
+    d = _as_float(data["deficit_angles"])
     return float(np.sqrt(np.mean(d**2)))
 # ---- Prioritized catalog ------------------------------------------------------
 
@@ -218,3 +224,12 @@ def compute(name: str, data: Data) -> Any:
 def compute_many(names: Sequence[str], data: Data) -> Dict[str, Any]:
     """Compute multiple observables, returning a mapping name->value."""
     return {n: compute(n, data) for n in names}
+
+
+def compute_columns(names: Sequence[str], columns: Any, rows: Any = None) -> Dict[str, Any]:
+    """``compute_many`` on an ``rg_io.ColumnarRGDataset`` without materializing steps.
+
+    ``rows`` selects steps (indices, mask or slice); per-step scalar columns act as
+    samples and ragged columns are pooled over the selection.
+    """
+    return compute_many(names, columns.data(rows))
@@ -4,13 +4,23 @@ This module normalizes heterogeneous logs (tensor-network/lattice RG, or
 GFT/spinfoam coarse-graining) into a simple in-memory dataset: a sequence of
 "steps" with scale information, couplings/parameters, observables, and optional
 distributional payloads.
+
+For large ensembles, ``load_rg_columns`` builds the same content as a
+``ColumnarRGDataset`` (NumPy columns, ragged per-step sequences), optionally cached
+on disk and memory-mapped on reload.
 """
 from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+import hashlib
 import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
 
 
 Json = Union[dict, list, str, int, float, bool, None]
@@ -172,3 +182,439 @@ def merge_datasets(*datasets: RGDataset, name: str = "merged") -> RGDataset:
             s2.meta.setdefault("run_index", di)
             steps.append(s2)
     return RGDataset(name=name, kind="merged", meta=meta, steps=steps)
+
+
+# ---- Columnar datasets --------------------------------------------------------
+#
+# Ensemble studies with millions of steps do not fit as per-step dicts.  The
+# columnar form keeps one NumPy array per field (NaN = missing) and stores
+# per-step numeric sequences as ragged columns (flat values + row offsets).
+# Observables/distributions that are neither numeric scalars nor flat numeric
+# lists, and step meta, go to a per-step JSON blob so ``to_dataset`` round-trips.
+# Numeric scalars come back as floats.
+
+_CACHE_VERSION = 1
+
+
+class Ragged:
+    """Variable-length numeric rows: row i is ``values[offsets[i]:offsets[i + 1]]``."""
+
+    __slots__ = ("values", "offsets")
+
+    def __init__(self, values: np.ndarray, offsets: np.ndarray):
+        self.values = values
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def take(self, rows: Any = None) -> np.ndarray:
+        """Concatenated values of ``rows`` (indices, bool mask, slice or None = all)."""
+        if rows is None:
+            return self.values[self.offsets[0]:self.offsets[-1]]
+        idx = np.arange(len(self))[rows]
+        starts = np.asarray(self.offsets[:-1])[idx]
+        lens = np.asarray(self.offsets[1:])[idx] - starts
+        if not lens.size:
+            return self.values[:0]
+        shift = np.repeat(starts - (np.cumsum(lens) - lens), lens)
+        return self.values[np.arange(int(lens.sum())) + shift]
+
+    @staticmethod
+    def concat(parts: Sequence["Ragged"]) -> "Ragged":
+        values = np.concatenate([p.take() for p in parts]) if parts else np.empty(0)
+        lens = np.concatenate([p.lengths() for p in parts]) if parts else np.empty(0, np.int64)
+        offsets = np.zeros(len(lens) + 1, dtype=np.int64)
+        np.cumsum(lens, out=offsets[1:])
+        return Ragged(values, offsets)
+
+    @staticmethod
+    def empty(n: int, dtype: Any = float) -> "Ragged":
+        return Ragged(np.empty(0, dtype=dtype), np.zeros(n + 1, dtype=np.int64))
+
+
+_PLAIN_NUM = frozenset((int, float))
+
+
+def _is_num(x: Any) -> bool:
+    if type(x) in _PLAIN_NUM:
+        return True
+    return isinstance(x, (int, float, np.integer, np.floating)) and not isinstance(x, (bool, np.bool_))
+
+
+def _num_seq(x: Any) -> Optional[np.ndarray]:
+    """Non-empty flat numeric list/array as float64, else None."""
+    if isinstance(x, np.ndarray):
+        return x.astype(float) if x.ndim == 1 and x.size and x.dtype.kind in "iuf" else None
+    if not isinstance(x, (list, tuple)) or not x:
+        return None
+    if set(map(type, x)) <= _PLAIN_NUM or all(_is_num(v) for v in x):
+        return np.asarray(x, dtype=float)
+    return None
+
+
+@dataclass
+class ColumnarRGDataset:
+    """Column-oriented ``RGDataset``: one array per field, ragged per-step sequences.
+
+    ``params``/``observables`` hold scalar columns, ``series`` numeric-list
+    observables and ``distributions`` numeric-list distributions (both ragged).
+    ``run`` is the source-run index after ``merge_columns``.
+    """
+
+    name: str
+    kind: str
+    meta: Dict[str, Any]
+    index: np.ndarray
+    scale: np.ndarray
+    level: np.ndarray
+    has_level: np.ndarray
+    run: np.ndarray
+    params: Dict[str, np.ndarray] = field(default_factory=dict)
+    observables: Dict[str, np.ndarray] = field(default_factory=dict)
+    series: Dict[str, Ragged] = field(default_factory=dict)
+    distributions: Dict[str, Ragged] = field(default_factory=dict)
+    extra: Optional[Ragged] = None          # utf-8 JSON per step (see module notes)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def data(self, rows: Any = None) -> Dict[str, Any]:
+        """Estimator input over ``rows`` (indices, mask, slice or None = all steps).
+
+        Scalar params/observables become arrays across the selected steps that
+        have them (as when pooling ``RGStep`` values, missing steps are skipped,
+        so columns may differ in length); ragged columns are pooled across them.
+        Keys follow ``RGStep`` names, so e.g.
+        ``observables.compute("binder_volume", cols.data())`` treats the per-step
+        volume column as the sample.
+        """
+        sel = (lambda a: a) if rows is None else (lambda a: a[rows])
+
+        def present(a: np.ndarray) -> np.ndarray:
+            a = sel(a)
+            missing = np.isnan(a)
+            return a[~missing] if missing.any() else a
+
+        out: Dict[str, Any] = {"scale": present(self.scale), "level": sel(self.level)[sel(self.has_level)]}
+        for k, v in self.params.items():
+            out[k] = present(v)
+        for cols in (self.series, self.distributions):
+            for k, r in cols.items():
+                out[k] = r.take(rows)
+        for k, v in self.observables.items():
+            out[k] = present(v)
+        return out
+
+    def step_data(self, i: int) -> Dict[str, Any]:
+        """Estimator input for a single step (ragged rows are zero-copy views)."""
+        out: Dict[str, Any] = {}
+        for k, v in self.params.items():
+            if not np.isnan(v[i]):
+                out[k] = float(v[i])
+        for cols in (self.series, self.distributions):
+            for k, r in cols.items():
+                if r.offsets[i + 1] > r.offsets[i]:
+                    out[k] = r[i]
+        for k, v in self.observables.items():
+            if not np.isnan(v[i]):
+                out[k] = float(v[i])
+        return out
+
+    def _extra(self, i: int) -> Dict[str, Any]:
+        if self.extra is None or self.extra.offsets[i + 1] == self.extra.offsets[i]:
+            return {}
+        return json.loads(bytes(self.extra[i]).decode("utf-8"))
+
+    def step(self, i: int) -> RGStep:
+        """Materialize step ``i`` as an ``RGStep``."""
+        extra = self._extra(i)
+        obs = {k: float(v[i]) for k, v in self.observables.items() if not np.isnan(v[i])}
+        obs.update({k: r[i].tolist() for k, r in self.series.items() if r.offsets[i + 1] > r.offsets[i]})
+        obs.update(extra.get("observables", {}))
+        dists = {k: r[i].tolist() for k, r in self.distributions.items() if r.offsets[i + 1] > r.offsets[i]}
+        dists.update(extra.get("distributions", {}))
+        meta = dict(extra.get("meta", {}))
+        if "merged_from" in self.meta:
+            meta.setdefault("run_index", int(self.run[i]))
+        return RGStep(
+            index=int(self.index[i]),
+            scale=None if np.isnan(self.scale[i]) else float(self.scale[i]),
+            level=int(self.level[i]) if self.has_level[i] else None,
+            params={k: float(v[i]) for k, v in self.params.items() if not np.isnan(v[i])},
+            observables=obs,
+            distributions=dists,
+            meta=meta,
+        )
+
+    def to_dataset(self) -> RGDataset:
+        return RGDataset(name=self.name, kind=self.kind, meta=dict(self.meta),
+                         steps=[self.step(i) for i in range(len(self))])
+
+    @classmethod
+    def from_dataset(cls, ds: RGDataset) -> "ColumnarRGDataset":
+        b = _ColumnBuilder()
+        for s in ds.steps:
+            b.add(s)
+        return b.finish(ds.name, ds.kind, ds.meta)
+
+
+class _ColumnBuilder:
+    """Accumulates normalized steps column by column (one pass, no step objects kept)."""
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.index: List[int] = []
+        self.scale: List[float] = []
+        self.level: List[int] = []
+        self.has_level: List[bool] = []
+        self.run: List[int] = []
+        self.scalars: Dict[str, Dict[str, Tuple[List[int], List[float]]]] = {"params": {}, "observables": {}}
+        self.ragged: Dict[str, Dict[str, Tuple[List[int], List[np.ndarray]]]] = {"series": {}, "distributions": {}}
+        self.extra: Tuple[List[int], List[bytes]] = ([], [])
+
+    def _scalar(self, group: str, k: str, v: float) -> None:
+        rows, vals = self.scalars[group].setdefault(k, ([], []))
+        rows.append(self.n)
+        vals.append(v)
+
+    def _row(self, group: str, k: str, a: np.ndarray) -> None:
+        rows, vals = self.ragged[group].setdefault(k, ([], []))
+        rows.append(self.n)
+        vals.append(a)
+
+    def add(self, s: RGStep, run: int = 0) -> None:
+        self.index.append(s.index)
+        self.scale.append(np.nan if s.scale is None else s.scale)
+        self.level.append(0 if s.level is None else s.level)
+        self.has_level.append(s.level is not None)
+        self.run.append(run)
+        for k, v in s.params.items():
+            self._scalar("params", k, v)
+        extra: Dict[str, Any] = {}
+        for group, payload, seq_group in (("observables", s.observables, "series"),
+                                          ("distributions", s.distributions, "distributions")):
+            rest = {}
+            for k, v in payload.items():
+                if group == "observables" and _is_num(v) and not np.isnan(v):
+                    self._scalar(group, k, float(v))
+                    continue
+                a = _num_seq(v)
+                if a is not None:
+                    self._row(seq_group, k, a)
+                else:
+                    rest[k] = v
+            if rest:
+                extra[group] = rest
+        if s.meta:
+            extra["meta"] = s.meta
+        if extra:
+            self.extra[0].append(self.n)
+            self.extra[1].append(json.dumps(extra).encode("utf-8"))
+        self.n += 1
+
+    def _ragged(self, rows: List[int], vals: List[Any], dtype: Any) -> Ragged:
+        lens = np.zeros(self.n, dtype=np.int64)
+        lens[rows] = [len(v) for v in vals]
+        offsets = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(lens, out=offsets[1:])
+        flat = np.empty(int(offsets[-1]), dtype=dtype)
+        for r, v in zip(rows, vals):
+            flat[offsets[r]:offsets[r + 1]] = np.frombuffer(v, dtype=np.uint8) if dtype == np.uint8 else v
+        return Ragged(flat, offsets)
+
+    def finish(self, name: str, kind: str, meta: Mapping[str, Any]) -> ColumnarRGDataset:
+        def scalar_cols(group: str) -> Dict[str, np.ndarray]:
+            out = {}
+            for k, (rows, vals) in self.scalars[group].items():
+                col = np.full(self.n, np.nan)
+                col[rows] = vals
+                out[k] = col
+            return out
+
+        return ColumnarRGDataset(
+            name=name,
+            kind=kind,
+            meta=dict(meta),
+            index=np.asarray(self.index, dtype=np.int64),
+            scale=np.asarray(self.scale, dtype=float),
+            level=np.asarray(self.level, dtype=np.int64),
+            has_level=np.asarray(self.has_level, dtype=bool),
+            run=np.asarray(self.run, dtype=np.int32),
+            params=scalar_cols("params"),
+            observables=scalar_cols("observables"),
+            series={k: self._ragged(r, v, float) for k, (r, v) in self.ragged["series"].items()},
+            distributions={k: self._ragged(r, v, float) for k, (r, v) in self.ragged["distributions"].items()},
+            extra=self._ragged(*self.extra, np.uint8),
+        )
+
+
+def _iter_jsonl(path: Path):
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield json.loads(line)
+
+
+def columns_from_records(
+    records: Iterable[Mapping[str, Any]],
+    *,
+    name: str = "rg_dataset",
+    kind: str = "auto",
+    meta: Optional[Mapping[str, Any]] = None,
+) -> ColumnarRGDataset:
+    """Columnar counterpart of ``from_records``; ``records`` may be any iterator."""
+    b = _ColumnBuilder()
+    for i, r in enumerate(records):
+        b.add(_normalize_step(r, i))
+    return b.finish(name, kind, meta or {})
+
+
+def source_hash(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """sha256 of a file's contents (streamed)."""
+    h = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def save_columns(cols: ColumnarRGDataset, directory: Union[str, Path]) -> Path:
+    """Write ``cols`` as a directory of ``.npy`` files plus ``manifest.json``.
+
+    Plain ``.npy`` (unlike ``.npz``) can be memory-mapped on reload.  The directory
+    is written next to its final location and renamed into place.
+    """
+    out = Path(directory)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=out.name + ".", dir=out.parent))
+    try:
+        manifest: Dict[str, Any] = {"version": _CACHE_VERSION, "name": cols.name, "kind": cols.kind,
+                                    "meta": cols.meta}
+        for k in ("index", "scale", "level", "has_level", "run"):
+            np.save(tmp / f"{k}.npy", getattr(cols, k))
+        for group, prefix in (("params", "p"), ("observables", "o")):
+            keys = list(getattr(cols, group))
+            manifest[group] = keys
+            for j, k in enumerate(keys):
+                np.save(tmp / f"{prefix}{j}.npy", getattr(cols, group)[k])
+        ragged = [(f"{prefix}{j}", r) for group, prefix in (("series", "s"), ("distributions", "d"))
+                  for j, r in enumerate(getattr(cols, group).values())]
+        for group in ("series", "distributions"):
+            manifest[group] = list(getattr(cols, group))
+        if cols.extra is not None:
+            ragged.append(("extra", cols.extra))
+        for stem, r in ragged:
+            np.save(tmp / f"{stem}.values.npy", r.values)
+            np.save(tmp / f"{stem}.offsets.npy", r.offsets)
+        (tmp / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+        if out.exists():
+            shutil.rmtree(out)
+        os.replace(tmp, out)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return out
+
+
+def open_columns(directory: Union[str, Path], *, mmap: bool = True) -> ColumnarRGDataset:
+    """Load a ``save_columns`` directory; arrays are read-only memory maps if ``mmap``."""
+    d = Path(directory)
+    manifest = json.loads((d / "manifest.json").read_text(encoding="utf-8"))
+    if manifest.get("version") != _CACHE_VERSION:
+        raise ValueError(f"Unsupported column cache version in {d}")
+    mode = "r" if mmap else None
+    arr = lambda stem: np.load(d / f"{stem}.npy", mmap_mode=mode)  # noqa: E731
+    rag = lambda stem: Ragged(arr(f"{stem}.values"), arr(f"{stem}.offsets"))  # noqa: E731
+    return ColumnarRGDataset(
+        name=manifest["name"],
+        kind=manifest["kind"],
+        meta=manifest["meta"],
+        index=arr("index"),
+        scale=arr("scale"),
+        level=arr("level"),
+        has_level=arr("has_level"),
+        run=arr("run"),
+        params={k: arr(f"p{j}") for j, k in enumerate(manifest["params"])},
+        observables={k: arr(f"o{j}") for j, k in enumerate(manifest["observables"])},
+        series={k: rag(f"s{j}") for j, k in enumerate(manifest["series"])},
+        distributions={k: rag(f"d{j}") for j, k in enumerate(manifest["distributions"])},
+        extra=rag("extra") if (d / "extra.values.npy").exists() else None,
+    )
+
+
+def load_rg_columns(
+    path: Union[str, Path],
+    *,
+    kind: str = "auto",
+    name: Optional[str] = None,
+    cache_dir: Optional[Union[str, Path]] = None,
+    mmap: bool = True,
+) -> ColumnarRGDataset:
+    """Columnar ``load_rg_dataset``: .jsonl is ingested line by line.
+
+    With ``cache_dir`` the columns are cached there keyed by the source's content
+    hash; later loads of the same content memory-map the cache instead of parsing.
+    """
+    p = Path(path)
+    nm = name or p.stem
+    cache = None
+    digest = ""
+    if cache_dir is not None:
+        digest = source_hash(p)
+        cache = Path(cache_dir) / f"{p.stem}-{digest[:16]}.{kind}.cols"
+        if (cache / "manifest.json").exists():
+            cols = open_columns(cache, mmap=mmap)
+            if cols.meta.get("source_hash") == digest:
+                cols.name = nm
+                return cols
+
+    if p.suffix.lower() in {".jsonl", ".ndjson"}:
+        cols = columns_from_records(_iter_jsonl(p), name=nm, kind=kind, meta={"source": str(p)})
+    else:
+        cols = ColumnarRGDataset.from_dataset(load_rg_dataset(p, kind=kind, name=nm))
+    if cache is None:
+        return cols
+    cols.meta["source_hash"] = digest
+    save_columns(cols, cache)
+    return open_columns(cache, mmap=mmap) if mmap else cols
+
+
+def merge_columns(*datasets: ColumnarRGDataset, name: str = "merged") -> ColumnarRGDataset:
+    """Columnar ``merge_datasets``: concatenates arrays, recording the run index."""
+    n = [len(d) for d in datasets]
+
+    def scalars(group: str) -> Dict[str, np.ndarray]:
+        keys = list(dict.fromkeys(k for d in datasets for k in getattr(d, group)))
+        return {k: np.concatenate([getattr(d, group).get(k, np.full(len(d), np.nan)) for d in datasets])
+                for k in keys}
+
+    def ragged(group: str) -> Dict[str, Ragged]:
+        keys = list(dict.fromkeys(k for d in datasets for k in getattr(d, group)))
+        return {k: Ragged.concat([getattr(d, group)[k] if k in getattr(d, group) else Ragged.empty(len(d))
+                                  for d in datasets])
+                for k in keys}
+
+    extras = [d.extra if d.extra is not None else Ragged.empty(len(d), np.uint8) for d in datasets]
+    return ColumnarRGDataset(
+        name=name,
+        kind="merged",
+        meta={"merged_from": [d.name for d in datasets]},
+        index=np.concatenate([d.index for d in datasets]) if datasets else np.empty(0, np.int64),
+        scale=np.concatenate([d.scale for d in datasets]) if datasets else np.empty(0),
+        level=np.concatenate([d.level for d in datasets]) if datasets else np.empty(0, np.int64),
+        has_level=np.concatenate([d.has_level for d in datasets]) if datasets else np.empty(0, bool),
+        run=np.repeat(np.arange(len(datasets), dtype=np.int32), n),
+        params=scalars("params"),
+        observables=scalars("observables"),
+        series=ragged("series"),
+        distributions=ragged("distributions"),
+        extra=Ragged.concat(extras),
+    )
@@ -2,7 +2,7 @@
 
 Core features:
 - effective (local) scaling exponents from log-derivatives
-- finite-size scaling (FSS) rescaling + collapse scoring
+- finite-size scaling (FSS) rescaling + collapse scoring (scalar and vectorized)
 - hyperscaling consistency checks for exponent sets
 - bootstrap resampling and simple error propagation
 """
@@ -13,6 +13,9 @@ from dataclasses import dataclass
 from typing import Callable, Dict, Iterable, Mapping, Optional, Sequence, Tuple
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
 def _as_1d(a) -> np.ndarray:
     a = np.asarray(a)
     return a.ravel() if a.ndim else a.reshape(1)
@@ -43,6 +46,9 @@ def moving_window_exponent(x, y, *, k: int = 5) -> Tuple[np.ndarray, np.ndarray]
     """Least-squares local exponent over a moving window in log-log space.
 
     Fits log(y)=a*log(x)+b on windows of size k; returns window centers.
+    Windows are solved in blocks as strided views, each centered on its own mean
+    before forming a = sum(du*dv) / sum(du^2), so accuracy does not degrade with
+    series length; windows with constant x give NaN.
     """
     x = _as_1d(x).astype(float)
     y = _as_1d(y).astype(float)
@@ -50,16 +56,23 @@ def moving_window_exponent(x, y, *, k: int = 5) -> Tuple[np.ndarray, np.ndarray]
         raise ValueError("k must satisfy 3 <= k <= len(x)")
     if np.any(x <= 0) or np.any(y <= 0):
         raise ValueError("requires x>0 and y>0")
-    lx, ly = np.log(x), np.log(y)
-    alphas, xc = [], []
-    for i in range(x.size - k + 1):
-        X = lx[i : i + k]
-        Y = ly[i : i + k]
-        A = np.vstack([X, np.ones_like(X)]).T
-        a, _b = np.linalg.lstsq(A, Y, rcond=None)[0]
-        alphas.append(a)
-        xc.append(np.exp(np.mean(X)))
-    return np.asarray(xc), np.asarray(alphas)
+    X = sliding_window_view(np.log(x), k)
+    Y = sliding_window_view(np.log(y), k)
+    m = X.shape[0]
+    alphas, xc = np.empty(m), np.empty(m)
+    step = max(1, (1 << 20) // k)
+    for i in range(0, m, step):
+        xw, yw = X[i : i + step], Y[i : i + step]
+        mx = xw.mean(axis=1)
+        du = xw - mx[:, None]
+        dv = yw - yw.mean(axis=1)[:, None]
+        den = np.einsum("ij,ij->i", du, du)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            alphas[i : i + step] = np.where(den > 0, np.einsum("ij,ij->i", du, dv) / den, np.nan)
+        xc[i : i + step] = np.exp(mx)
+    return xc, alphas
+
+
 @dataclass(frozen=True)
 class FSSRescale:
     """Finite-size scaling rescaling map.
@@ -114,6 +127,95 @@ def collapse_score(
             if np.isfinite(v) and np.isfinite(mu) and mu != 0:
                 scores.append(v / (mu * mu))
     return float(np.nanmean(scores)) if scores else np.inf
+def collapse_scores(
+    g_list: Sequence[np.ndarray],
+    O_list: Sequence[np.ndarray],
+    L_list: Sequence[float],
+    nu,
+    yO,
+    gc,
+    *,
+    nbins: int = 30,
+    block: int = 4096,
+) -> np.ndarray:
+    """Vectorized :func:`collapse_score` for many (nu, yO, gc) at once.
+
+    ``nu``, ``yO`` and ``gc`` are broadcast against each other; the result has the
+    broadcast shape.  Parameters are processed ``block`` at a time: every curve is
+    rescaled for the whole block with broadcasting, points are binned against the
+    same ``linspace`` edges as the scalar path, and per-(curve, bin) sums come from
+    one ``bincount``.  Scores match :func:`collapse_score` to floating-point rounding.
+    """
+    nu, yO, gc = np.broadcast_arrays(*(np.asarray(a, float) for a in (nu, yO, gc)))
+    shape = nu.shape
+    nu, yO, gc = nu.ravel(), yO.ravel(), gc.ravel()
+    if len(g_list) < 2:
+        raise ValueError("need at least two curves")
+    g = [np.asarray(a, float).ravel() for a in g_list]
+    O = [np.asarray(a, float).ravel() for a in O_list]
+    L = [float(a) for a in L_list]
+    out = np.empty(nu.size, dtype=float)
+    for lo in range(0, nu.size, max(1, int(block))):
+        sl = slice(lo, lo + max(1, int(block)))
+        out[sl] = _collapse_scores_block(g, O, L, nu[sl], yO[sl], gc[sl], nbins)
+    return out.reshape(shape)
+
+
+def _collapse_scores_block(g, O, L, nu, yO, gc, nbins: int) -> np.ndarray:
+    P, C = nu.size, len(g)
+    sizes = np.array([a.size for a in g])
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    cid = np.repeat(np.arange(C), sizes)
+    # Same arithmetic as FSSRescale.transform, broadcast over the parameter block.
+    X = np.concatenate(
+        [((gi - gc[:, None]) / gc[:, None]) * (Li ** (1.0 / nu[:, None])) for gi, Li in zip(g, L)], axis=1
+    )
+    Y = np.concatenate([Oi * (Li ** yO[:, None]) for Oi, Li in zip(O, L)], axis=1)
+
+    xmin = np.minimum.reduceat(X, starts, axis=1).max(axis=1)
+    xmax = np.maximum.reduceat(X, starts, axis=1).min(axis=1)
+    ok = np.isfinite(xmin) & np.isfinite(xmax) & (xmax > xmin)
+    scores = np.full(P, np.inf)
+    if not ok.any():
+        return scores
+    xmin, xmax = np.where(ok, xmin, 0.0), np.where(ok, xmax, 1.0)
+    edges = np.linspace(xmin, xmax, nbins + 1, axis=1)  # (P, nbins+1)
+
+    # Bin index with the scalar path's half-open [lo, hi) semantics: estimate
+    # arithmetically, then correct by +-1 against the exact edges.
+    with np.errstate(invalid="ignore"):
+        k = np.floor((X - xmin[:, None]) / ((xmax - xmin) / nbins)[:, None])
+    k = np.nan_to_num(k, nan=-1.0).clip(-1, nbins).astype(np.int64)
+    kc = k.clip(0, nbins)
+    k = np.where((k >= 0) & (X < np.take_along_axis(edges, kc, axis=1)), k - 1, k)
+    kc = (k + 1).clip(0, nbins)
+    k = np.where((k < nbins) & (X >= np.take_along_axis(edges, kc, axis=1)), k + 1, k)
+    inb = (k >= 0) & (k < nbins) & ok[:, None]
+
+    # Per-(param, curve, bin) totals from one bincount.
+    flat = (np.arange(P)[:, None] * C + cid[None, :]) * nbins + k
+    flat, Yv = flat[inb], Y[inb]
+    fin = ~np.isnan(Yv)
+    size = P * C * nbins
+    n_pts = np.bincount(flat, minlength=size).reshape(P, C, nbins)
+    n_fin = np.bincount(flat[fin], minlength=size).reshape(P, C, nbins)
+    tot = np.bincount(flat[fin], weights=Yv[fin], minlength=size).reshape(P, C, nbins)
+
+    present = n_pts > 0  # curve contributes a (possibly NaN) value to this bin
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = tot / n_fin
+        valid = present & (n_fin > 0)
+        cnt = valid.sum(axis=1)
+        mu = np.where(valid, means, 0.0).sum(axis=1) / cnt
+        var = np.where(valid, (means - mu[:, None, :]) ** 2, 0.0).sum(axis=1) / cnt
+        bin_score = var / (mu * mu)
+    use = (present.sum(axis=1) >= 2) & np.isfinite(var) & np.isfinite(mu) & (mu != 0)
+    n_use = use.sum(axis=1)
+    with np.errstate(invalid="ignore"):
+        mean_score = np.where(use, bin_score, 0.0).sum(axis=1) / n_use
+    return np.where(ok & (n_use > 0), mean_score, np.inf)
+
+
 def grid_search_collapse(
     g_list: Sequence[np.ndarray],
     O_list: Sequence[np.ndarray],
@@ -123,24 +225,109 @@ def grid_search_collapse(
     yOs: Sequence[float],
     gcs: Sequence[float],
     nbins: int = 30,
+    engine: str = "vectorized",
+    block: int = 4096,
+    refine: Optional[str] = None,
 ) -> Dict[str, float]:
-    """Brute-force search for best FSS collapse parameters.
+    """Search for best FSS collapse parameters over a (nu, yO, gc) grid.
 
     Inputs are per-size arrays: g_list[i], O_list[i] for system size L_list[i].
-    Returns dict with best nu, yO, gc, score.
+    Returns dict with best nu, yO, gc, score.  ``engine="loop"`` is the original
+    brute-force triple loop; ``"vectorized"`` scores the grid in parameter blocks via
+    :func:`collapse_scores` and returns the same dict.  ``refine`` ("zoom" or
+    "nelder-mead") polishes the grid optimum with :func:`refine_collapse`.
     """
     if not (len(g_list) == len(O_list) == len(L_list) >= 2):
         raise ValueError("g_list, O_list, L_list must have same length >= 2")
     best = {"nu": np.nan, "yO": np.nan, "gc": np.nan, "score": np.inf}
-    for nu in nus:
-        for yO in yOs:
-            for gc in gcs:
-                tr = FSSRescale(nu=float(nu), yO=float(yO), gc=float(gc))
-                curves = [tr.transform(g, O, L) for g, O, L in zip(g_list, O_list, L_list)]
-                sc = collapse_score(curves, nbins=nbins)
-                if sc < best["score"]:
-                    best = {"nu": float(nu), "yO": float(yO), "gc": float(gc), "score": float(sc)}
+    if engine == "loop":
+        for nu in nus:
+            for yO in yOs:
+                for gc in gcs:
+                    tr = FSSRescale(nu=float(nu), yO=float(yO), gc=float(gc))
+                    curves = [tr.transform(g, O, L) for g, O, L in zip(g_list, O_list, L_list)]
+                    sc = collapse_score(curves, nbins=nbins)
+                    if sc < best["score"]:
+                        best = {"nu": float(nu), "yO": float(yO), "gc": float(gc), "score": float(sc)}
+    elif engine == "vectorized":
+        N, Y, G = np.meshgrid(
+            np.asarray(nus, float), np.asarray(yOs, float), np.asarray(gcs, float), indexing="ij"
+        )
+        sc = collapse_scores(g_list, O_list, L_list, N, Y, G, nbins=nbins, block=block).ravel()
+        if sc.size and np.isfinite(sc).any():
+            i = int(np.argmin(sc))  # first minimum in (nu, yO, gc) loop order
+            best = {"nu": float(N.flat[i]), "yO": float(Y.flat[i]), "gc": float(G.flat[i]), "score": float(sc[i])}
+    else:
+        raise ValueError(f"unknown engine {engine!r}; expected 'loop' or 'vectorized'")
+    if refine is not None and np.isfinite(best["score"]):
+        best = refine_collapse(g_list, O_list, L_list, best, method=refine, nbins=nbins,
+                               steps=tuple(_grid_step(v) for v in (nus, yOs, gcs)))
+    return best
+
+
+def _grid_step(values: Sequence[float]) -> float:
+    v = np.unique(np.asarray(values, float))
+    return float(np.min(np.diff(v))) if v.size > 1 else max(abs(float(v[0])) * 0.05, 1e-3)
+
+
+def refine_collapse(
+    g_list: Sequence[np.ndarray],
+    O_list: Sequence[np.ndarray],
+    L_list: Sequence[float],
+    start: Mapping[str, float],
+    *,
+    method: str = "zoom",
+    steps: Tuple[float, float, float] = (0.05, 0.05, 0.01),
+    nbins: int = 30,
+    levels: int = 4,
+    points: int = 9,
+    maxiter: int = 400,
+) -> Dict[str, float]:
+    """Polish a collapse optimum starting from ``start`` (a best-fit dict).
+
+    ``"zoom"``: repeated coarse-to-fine grids of ``points``^3 around the incumbent,
+    shrinking the half-width by 2/(points-1) each level.  ``"nelder-mead"``: scipy
+    simplex search with the initial simplex scaled by ``steps``.  The result is never
+    worse than ``start``.
+    """
+    x0 = np.array([start["nu"], start["yO"], start["gc"]], float)
+    best = {"nu": float(x0[0]), "yO": float(x0[1]), "gc": float(x0[2]), "score": float(start["score"])}
+
+    def consider(x, sc):
+        nonlocal best
+        if np.isfinite(sc) and sc < best["score"]:
+            best = {"nu": float(x[0]), "yO": float(x[1]), "gc": float(x[2]), "score": float(sc)}
+
+    if method == "zoom":
+        half = np.asarray(steps, float)
+        for _ in range(int(levels)):
+            c = np.array([best["nu"], best["yO"], best["gc"]])
+            axes = [np.linspace(ci - hi, ci + hi, int(points)) for ci, hi in zip(c, half)]
+            axes[0] = axes[0][axes[0] > 0]  # nu > 0
+            axes[2] = axes[2][axes[2] != 0]  # gc != 0
+            N, Y, G = np.meshgrid(*axes, indexing="ij")
+            sc = collapse_scores(g_list, O_list, L_list, N, Y, G, nbins=nbins).ravel()
+            if sc.size and np.isfinite(sc).any():
+                i = int(np.argmin(sc))
+                consider((N.flat[i], Y.flat[i], G.flat[i]), sc[i])
+            half = half * 2.0 / (int(points) - 1)
+    elif method == "nelder-mead":
+        from scipy.optimize import minimize
+
+        def f(x):
+            if x[0] <= 0 or x[2] == 0:
+                return np.inf
+            return float(collapse_scores(g_list, O_list, L_list, x[0], x[1], x[2], nbins=nbins))
+
+        simplex = np.vstack([x0] + [x0 + np.eye(3)[i] * steps[i] for i in range(3)])
+        res = minimize(f, x0, method="Nelder-Mead",
+                       options={"initial_simplex": simplex, "maxiter": int(maxiter), "xatol": 1e-6, "fatol": 1e-12})
+        consider(res.x, f(res.x))
+    else:
+        raise ValueError(f"unknown refine method {method!r}; expected 'zoom' or 'nelder-mead'")
     return best
+
+
 def hyperscaling_residuals(exponents: Mapping[str, float], *, d: Optional[float] = None) -> Dict[str, float]:
     """Return residuals of common hyperscaling/scaling relations.
 
@@ -182,23 +369,55 @@ def propagate_uncertainty(
 
 def bootstrap(
     data: np.ndarray,
-    stat: Callable[[np.ndarray], np.ndarray],
+    stat: Callable[..., np.ndarray],
     *,
     n: int = 500,
     rng: Optional[np.random.Generator] = None,
     ci: float = 0.68,
+    vectorized: bool = False,
+    batch: Optional[int] = None,
 ) -> Dict[str, np.ndarray]:
-    """Bootstrap a statistic over first axis; returns mean/std and central CI."""
+    """Bootstrap a statistic over first axis; returns mean/std and central CI.
+
+    With ``vectorized=True`` the resample indices are drawn as one (n, m) array and
+    ``stat`` is called on a stack of resamples with an ``axis`` keyword: it must
+    reduce ``axis=1`` of an array shaped (b, m, ...) to (b, ...), as ``np.mean``
+    and friends do, and agree with ``stat(resample)``, so for multi-column data
+    the default reduction must be over the first axis.  The first resample is
+    checked against the plain call; a scalar-only ``stat`` raises TypeError or
+    ValueError instead of returning wrong intervals.  ``batch`` caps b to bound
+    memory (default: all n at once).  For a given ``rng`` state both modes draw
+    the same resamples.
+    """
     rng = np.random.default_rng() if rng is None else rng
     x = np.asarray(data)
     if x.ndim == 0:
         raise ValueError("data must be array-like")
     m = x.shape[0]
-    reps = []
-    for _ in range(int(n)):
-        idx = rng.integers(0, m, size=m)
-        reps.append(np.asarray(stat(x[idx])))
-    reps = np.stack(reps, axis=0)
+    n = int(n)
+    if vectorized:
+        step = n if batch is None else max(1, int(batch))
+        chunks = []
+        for start in range(0, n, step):
+            idx = rng.integers(0, m, size=(min(step, n - start), m))
+            try:
+                r = np.asarray(stat(x[idx], axis=1))
+            except TypeError as e:
+                raise TypeError("vectorized=True needs a stat taking an axis keyword, e.g. np.mean") from e
+            if r.shape[:1] != idx.shape[:1]:
+                raise ValueError("vectorized stat must reduce axis=1 and keep the resample axis")
+            if start == 0:
+                one = np.asarray(stat(x[idx[0]]))
+                if one.shape != r.shape[1:] or not np.allclose(one, r[0], equal_nan=True):
+                    raise ValueError("vectorized stat(resamples, axis=1) disagrees with stat(resample)")
+            chunks.append(r)
+        reps = np.concatenate(chunks, axis=0)
+    else:
+        reps = []
+        for _ in range(n):
+            idx = rng.integers(0, m, size=m)
+            reps.append(np.asarray(stat(x[idx])))
+        reps = np.stack(reps, axis=0)
     mean = np.nanmean(reps, axis=0)
     std = np.nanstd(reps, axis=0, ddof=1)
     lo = np.nanquantile(reps, (1 - ci) / 2, axis=0)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from sf_gft_diagnostics import metrics
+
+
+def _dtw_cells(x, y, p=2.0, window=None):
+    # the original O(nm) cell loop, with an optional Sakoe-Chiba band
+    x = x[:, None] if x.ndim == 1 else x
+    y = y[:, None] if y.ndim == 1 else y
+    n, m = x.shape[0], y.shape[0]
+    w = max(n, m) if window is None else max(window, abs(n - m))
+    D = np.full((n + 1, m + 1), np.inf)
+    D[0, 0] = 0.0
+    for i in range(1, n + 1):
+        for j in range(max(1, i - w), min(m, i + w) + 1):
+            cost = np.linalg.norm(x[i - 1] - y[j - 1], ord=p)
+            D[i, j] = cost + min(D[i - 1, j], D[i, j - 1], D[i - 1, j - 1])
+    return float(D[n, m])
+
+
+@pytest.mark.parametrize("p", [1.0, 2.0, 3.0, np.inf])
+@pytest.mark.parametrize("shape", [(17, 23, None), (20, 20, 2), (9, 31, 3)])
+def test_dtw_matches_cell_loop(p, shape) -> None:
+    n, m, d = shape
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(n,) if d is None else (n, d))
+    y = rng.normal(size=(m,) if d is None else (m, d))
+    for window in (None, 0, 3, 40):
+        ref = _dtw_cells(x, y, p=p, window=window)
+        assert metrics.dtw_distance(x, y, p=p, window=window) == pytest.approx(ref, rel=1e-12)
+
+
+def test_pairwise_distances_match_per_pair_metrics() -> None:
+    rng = np.random.default_rng(1)
+    seqs = [rng.normal(size=(int(n), 2)).cumsum(axis=0) for n in rng.choice([12, 15], 7)]
+    D = metrics.pairwise_distances(seqs, "dtw", batch=2, window=4)
+    ref = np.array([[metrics.dtw_distance(a, b, window=4) for b in seqs] for a in seqs])
+    np.testing.assert_allclose(D, ref, rtol=1e-12)
+    np.testing.assert_array_equal(metrics.pairwise_distances(seqs, "dtw", workers=2, window=4), D)
+
+    curves = [(np.sort(rng.uniform(0, 10, 30)), rng.normal(size=30)) for _ in range(5)]
+    D = metrics.pairwise_distances(curves, "curve_rms", n_grid=50)
+    ref = np.array([[metrics.curve_rms_distance(*a, *b, n_grid=50) for b in curves] for a in curves])
+    np.testing.assert_allclose(D, ref, rtol=1e-12, atol=1e-15)
+
+    pmfs = [rng.dirichlet(np.ones(6)) for _ in range(4)]
+    D = metrics.pairwise_distances(pmfs, "kl")
+    ref = np.array([[metrics.kl_divergence(a, b) for b in pmfs] for a in pmfs])
+    np.testing.assert_allclose(D, ref, rtol=1e-12, atol=1e-15)
+    assert not np.allclose(D, D.T)
@@ -0,0 +1,114 @@
+import json
+
+import numpy as np
+import pytest
+
+from sf_gft_diagnostics import observables, rg_io
+
+
+def _records():
+    rng = np.random.default_rng(0)
+    recs = []
+    for i in range(6):
+        obs = {"volume": float(i + 1), "spin": rng.random(3).tolist()}
+        if i == 5:
+            del obs["volume"]  # a step without the key
+        rec = {"scale": 2.0**-i, "level": i, "params": {"g": 0.1 * i}, "observables": obs}
+        if i == 2:
+            rec.pop("scale")
+            rec["params"] = {}
+        recs.append(rec)
+    return recs
+
+
+def _pooled(ds, key):
+    # row-oriented pooling: the key's value from every step that has it
+    vals = []
+    for s in ds.steps:
+        v = s.observables.get(key, s.params.get(key))
+        if v is not None:
+            vals.extend(v if isinstance(v, list) else [v])
+    return np.asarray(vals, dtype=float)
+
+
+@pytest.mark.parametrize("rows", [None, slice(1, 6), np.array([0, 2, 5])])
+def test_columnar_data_matches_row_pooling_with_missing_keys(rows) -> None:
+    ds = rg_io.from_records(_records())
+    cols = rg_io.columns_from_records(_records())
+    sub = ds if rows is None else rg_io.RGDataset(name=ds.name, kind=ds.kind,
+                                                 steps=list(np.asarray(ds.steps, dtype=object)[rows]))
+    data = cols.data(rows)
+    for key in ("volume", "spin", "g"):
+        np.testing.assert_array_equal(data[key], _pooled(sub, key))
+    np.testing.assert_array_equal(data["scale"], [s.scale for s in sub.steps if s.scale is not None])
+    names = ["mean_volume", "binder_volume", "spin_mean"]
+    expected = observables.compute_many(names, {k: _pooled(sub, k) for k in ("volume", "spin")})
+    got = observables.compute_columns(names, cols, rows)
+    assert got == pytest.approx(expected)
+    assert np.isfinite(got["binder_volume"])
+
+
+def _rich_records(shift=0.0):
+    recs = _records()
+    recs[0]["observables"]["label"] = "coarse"  # non-numeric: kept in the per-step JSON blob
+    recs[1]["distributions"] = {"hist": [1.0, 2.0 + shift, 3.0], "edges": {"lo": 0}}
+    recs[3]["run_tag"] = "b"  # unrecognized top-level key -> step meta
+    recs[4]["level"] = None
+    return recs
+
+
+def test_to_dataset_round_trips_from_dataset() -> None:
+    ds = rg_io.from_records(_rich_records(), name="flow", kind="gft", meta={"source": "mem"})
+    cols = rg_io.ColumnarRGDataset.from_dataset(ds)
+    assert set(cols.series) == {"spin"} and set(cols.distributions) == {"hist"}
+    assert cols.to_dataset().to_dict() == ds.to_dict()
+
+
+def test_save_and_open_columns_memory_maps_on_reload(tmp_path) -> None:
+    cols = rg_io.columns_from_records(_rich_records(), name="flow")
+    out = rg_io.save_columns(cols, tmp_path / "flow.cols")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["flow.cols"]  # temp dir renamed into place
+    mapped = rg_io.open_columns(out)
+    assert isinstance(mapped.scale, np.memmap) and isinstance(mapped.series["spin"].values, np.memmap)
+    assert not mapped.observables["volume"].flags.writeable
+    assert not isinstance(rg_io.open_columns(out, mmap=False).scale, np.memmap)
+    assert mapped.to_dataset().to_dict() == cols.to_dataset().to_dict()
+    for key, v in cols.data().items():
+        np.testing.assert_array_equal(mapped.data()[key], v)
+
+
+def test_load_rg_columns_caches_by_source_hash(tmp_path, monkeypatch) -> None:
+    src = tmp_path / "flow.jsonl"
+    src.write_text("\n".join(json.dumps(r) for r in _rich_records()), encoding="utf-8")
+    cache = tmp_path / "cache"
+    first = rg_io.load_rg_columns(src, cache_dir=cache)
+    digest = rg_io.source_hash(src)
+    assert first.meta["source_hash"] == digest and isinstance(first.scale, np.memmap)
+    assert [p.name for p in cache.iterdir()] == [f"flow-{digest[:16]}.auto.cols"]
+
+    def no_parse(*args, **kwargs):
+        raise AssertionError("cached columns were re-parsed")
+
+    with monkeypatch.context() as m:
+        m.setattr(rg_io, "columns_from_records", no_parse)
+        again = rg_io.load_rg_columns(src, cache_dir=cache, name="renamed")
+    assert again.name == "renamed"
+    assert again.to_dataset().steps == first.to_dataset().steps
+
+    src.write_text("\n".join(json.dumps(r) for r in _rich_records(shift=1.0)), encoding="utf-8")
+    changed = rg_io.load_rg_columns(src, cache_dir=cache)
+    assert changed.meta["source_hash"] == rg_io.source_hash(src) != digest
+    assert len(list(cache.iterdir())) == 2
+    np.testing.assert_array_equal(changed.distributions["hist"][1], [1.0, 3.0, 3.0])
+
+
+def test_merge_columns_matches_merge_datasets() -> None:
+    a = rg_io.from_records(_rich_records(), name="a")
+    b = rg_io.from_records([{"scale": 0.5, "params": {"h": 1.0}, "observables": {"energy": -1.0, "spin": [0.5]}},
+                            {"level": 3, "observables": {"volume": 9.0}}], name="b")
+    merged = rg_io.merge_columns(rg_io.ColumnarRGDataset.from_dataset(a), rg_io.ColumnarRGDataset.from_dataset(b))
+    assert len(merged) == 8
+    np.testing.assert_array_equal(merged.run, [0] * 6 + [1] * 2)
+    assert np.isnan(merged.params["h"][:6]).all() and np.isnan(merged.observables["energy"][:6]).all()
+    assert merged.series["spin"].lengths().tolist() == [3] * 6 + [1, 0]
+    assert merged.to_dataset().to_dict() == rg_io.merge_datasets(a, b).to_dict()
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from sf_gft_diagnostics import scaling
+
+
+def _lstsq_windows(x, y, k):
+    lx, ly = np.log(x), np.log(y)
+    out = []
+    for i in range(x.size - k + 1):
+        A = np.vstack([lx[i : i + k], np.ones(k)]).T
+        out.append(np.linalg.lstsq(A, ly[i : i + k], rcond=None)[0][0])
+    return np.asarray(out)
+
+
+@pytest.mark.parametrize("n", [200, 100_000])
+def test_moving_window_exponent_matches_per_window_lstsq(n: int) -> None:
+    rng = np.random.default_rng(0)
+    x = np.logspace(0, 6, n)
+    y = x**1.7 * np.exp(rng.normal(0.0, 0.05, n))
+    xc, a = scaling.moving_window_exponent(x, y, k=25)
+    ref = _lstsq_windows(x, y, 25)
+    assert a.shape == ref.shape == (n - 24,)
+    np.testing.assert_allclose(a, ref, rtol=1e-7, atol=1e-9)
+    np.testing.assert_allclose(xc[:3], [np.exp(np.log(x[i : i + 25]).mean()) for i in range(3)])
+
+
+def test_moving_window_exponent_constant_x_window_is_nan() -> None:
+    x = np.array([1.0, 2.0, 2.0, 2.0, 3.0, 4.0])
+    _, a = scaling.moving_window_exponent(x, x**2, k=3)
+    assert np.isnan(a[1]) and a[0] == pytest.approx(2.0) and a[-1] == pytest.approx(2.0)
+
+
+def _fss_data(rng, nan=False):
+    nu, yO, gc = 1.2, 0.4, 0.5
+    g_list, O_list, L_list = [], [], [8.0, 16.0, 32.0, 64.0]
+    for L, n in zip(L_list, (40, 55, 60, 37)):
+        g = np.sort(rng.uniform(0.3, 0.7, n))
+        O = L ** (-yO) * (1.0 + np.tanh((g - gc) / gc * L ** (1.0 / nu))) * (1 + rng.normal(0, 0.01, n))
+        if nan:
+            O[rng.integers(0, n, 3)] = np.nan
+        g_list.append(g)
+        O_list.append(O)
+    return g_list, O_list, L_list
+
+
+@pytest.mark.parametrize("nan", [False, True])
+def test_collapse_scores_match_scalar_collapse_score(nan: bool) -> None:
+    g_list, O_list, L_list = _fss_data(np.random.default_rng(1), nan=nan)
+    nus, yOs, gcs = np.linspace(0.6, 2.0, 6), np.linspace(0.0, 0.8, 5), np.linspace(0.45, 0.55, 4)
+    N, Y, G = np.meshgrid(nus, yOs, gcs, indexing="ij")
+    got = scaling.collapse_scores(g_list, O_list, L_list, N, Y, G, nbins=12, block=7)
+    ref = np.empty(N.shape)
+    for idx in np.ndindex(N.shape):
+        tr = scaling.FSSRescale(nu=N[idx], yO=Y[idx], gc=G[idx])
+        ref[idx] = scaling.collapse_score([tr.transform(g, O, L) for g, O, L in zip(g_list, O_list, L_list)], nbins=12)
+    np.testing.assert_allclose(got, ref, rtol=1e-10, atol=0.0)
+
+    kw = dict(nus=nus, yOs=yOs, gcs=gcs, nbins=12)
+    loop = scaling.grid_search_collapse(g_list, O_list, L_list, engine="loop", **kw)
+    vec = scaling.grid_search_collapse(g_list, O_list, L_list, **kw)
+    assert {k: vec[k] for k in ("nu", "yO", "gc")} == {k: loop[k] for k in ("nu", "yO", "gc")}
+    assert vec["score"] == pytest.approx(loop["score"], rel=1e-10)
+    assert scaling.grid_search_collapse(g_list, O_list, L_list, refine="zoom", **kw)["score"] <= vec["score"]
+
+
+def _q75(a, axis=0):
+    return np.percentile(a, 75, axis=axis)
+
+
+@pytest.mark.parametrize("batch", [None, 37, 1])
+@pytest.mark.parametrize("stat,shape", [(np.mean, (50,)), (_q75, (50, 3))])
+def test_vectorized_bootstrap_matches_loop(stat, shape, batch) -> None:
+    x = np.random.default_rng(1).normal(size=shape)
+    loop = scaling.bootstrap(x, stat, n=200, rng=np.random.default_rng(5))
+    vec = scaling.bootstrap(x, stat, n=200, rng=np.random.default_rng(5), vectorized=True, batch=batch)
+    assert np.shape(vec["mean"]) == shape[1:]
+    for k in loop:
+        np.testing.assert_allclose(vec[k], loop[k], rtol=0, atol=1e-12)
+
+
+def test_vectorized_bootstrap_rejects_stats_without_axis() -> None:
+    x = np.random.default_rng(2).normal(size=(40, 2))
+    with pytest.raises(TypeError, match="axis keyword"):
+        scaling.bootstrap(x, lambda a: float(np.median(a)), n=10, vectorized=True)
+    with pytest.raises(ValueError, match="keep the resample axis"):
+        scaling.bootstrap(x, lambda a, axis=None: float(np.median(a)), n=10, vectorized=True)
+    with pytest.raises(ValueError, match="disagrees"):
+        scaling.bootstrap(x, np.mean, n=10, vectorized=True)  # axis=None pools the columns
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Benchmark graph builders and sparse Laplacians at fixed mean degree.
+
+Run from the project root:
+  python -m scripts.bench_graph_builders --n 1000 10000 100000 1000000 --degree 8 --ref-max 10000
+
+For each n prints build time and time per vertex of ``random_geometric`` (cell
+list, torus), ``erdos_renyi(method="skip")``, ``grid_2d`` and the CSR Laplacian;
+a flat us/vertex column means linear scaling.  Up to --ref-max the original
+all-pairs random_geometric loop is timed too and its edge set compared.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from src.lib.graphs import erdos_renyi, grid_2d, random_geometric
+
+
+def _reference_rgg(x: np.ndarray, radius: float) -> np.ndarray:
+    """The original per-vertex O(n^2) loop (torus metric), kept as the baseline."""
+    edges = []
+    for i in range(len(x)):
+        d = np.abs(x[i + 1:] - x[i])
+        d = np.minimum(d, 1.0 - d)
+        js = np.where(np.sqrt(np.sum(d * d, axis=1)) <= radius)[0]
+        edges.extend((i, i + 1 + int(o)) for o in js)
+    return np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--n", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    p.add_argument("--degree", type=float, default=8.0, help="target mean degree")
+    p.add_argument("--ref-max", type=int, default=10000, help="largest n for the O(n^2) reference")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args(argv)
+
+    print(f"{'n':>8} {'builder':>14} {'edges':>10} {'time_s':>9} {'us/vertex':>10}")
+    for n in args.n:
+        radius = float(np.sqrt(args.degree / (np.pi * n)))
+        L = int(round(np.sqrt(n)))
+        rows = []
+        g, t = _timed(lambda: random_geometric(n, radius, rng=np.random.default_rng(args.seed)))
+        rows.append(("rgg_cells", g.m, t))
+        _, t = _timed(lambda: g.laplacian(sparse=True))
+        rows.append(("laplacian_csr", g.m, t))
+        if n <= args.ref_max:
+            ref, t = _timed(lambda: _reference_rgg(g.coords, radius))
+            assert np.array_equal(ref, g.edges), "cell list disagrees with reference"
+            rows.append(("rgg_reference", len(ref), t))
+        er, t = _timed(lambda: erdos_renyi(n, args.degree / (n - 1), rng=np.random.default_rng(args.seed),
+                                           method="skip"))
+        rows.append(("er_skip", er.m, t))
+        grid, t = _timed(lambda: grid_2d(L, L, periodic=True))
+        rows.append(("grid_2d", grid.m, t))
+        for name, m, t in rows:
+            print(f"{n:>8} {name:>14} {m:>10} {t:>9.4f} {1e6 * t / n:>10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Benchmark TFIM Hamiltonian construction and ground states: dense kron vs bitwise Pauli.
+
+Run from the project root:
+  python -m scripts.bench_tfim_hamiltonian --n 8 10 12 14 16 18 20 --dense-max 12
+
+Prints one row per (n, method) with build time, ground-state time, peak operator
+memory (bytes held by H) and the ground-state energy, so agreement is visible too.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from scipy.linalg import eigh
+from scipy.sparse.linalg import eigsh
+
+from src.experiments.entanglement_diagnostics import (
+    tfim_hamiltonian,
+    tfim_operator,
+    tfim_sparse_hamiltonian,
+)
+
+
+def _nbytes(H) -> int:
+    if isinstance(H, np.ndarray):
+        return H.nbytes
+    if hasattr(H, "data") and hasattr(H, "indices"):
+        return H.data.nbytes + H.indices.nbytes + H.indptr.nbytes
+    return 0  # matrix-free: only O(2^n) coefficient vectors, not counted
+
+
+def bench(n: int, method: str, J: float, h: float) -> dict:
+    t0 = time.perf_counter()
+    if method == "dense":
+        H = tfim_hamiltonian(n, J=J, h=h)
+    elif method == "sparse":
+        H = tfim_sparse_hamiltonian(n, J=J, h=h)
+    else:
+        H = tfim_operator(n, J=J, h=h)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    if method == "dense":
+        e0 = float(eigh(H, eigvals_only=True, subset_by_index=[0, 0])[0])
+    else:
+        e0 = float(eigsh(H, k=1, which="SA", v0=np.ones(H.shape[0]), return_eigenvectors=False)[0])
+    t_gs = time.perf_counter() - t0
+    return {"n": n, "method": method, "build_s": t_build, "ground_s": t_gs,
+            "H_bytes": _nbytes(H), "E0": e0}
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--n", type=int, nargs="+", default=[8, 10, 12, 14, 16])
+    p.add_argument("--dense-max", type=int, default=12, help="largest n for the dense path")
+    p.add_argument("--J", type=float, default=1.0)
+    p.add_argument("--h", type=float, default=1.0)
+    args = p.parse_args(argv)
+
+    print(f"{'n':>3} {'method':>12} {'build_s':>9} {'ground_s':>9} {'H_MB':>9} {'E0':>16}")
+    for n in args.n:
+        for method in ("dense", "sparse", "matrix_free"):
+            if method == "dense" and n > args.dense_max:
+                continue
+            r = bench(n, method, args.J, args.h)
+            print(f"{r['n']:>3} {r['method']:>12} {r['build_s']:>9.4f} {r['ground_s']:>9.4f} "
+                  f"{r['H_bytes'] / 2**20:>9.2f} {r['E0']:>16.10f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,10 +11,14 @@ from typing import Dict, Iterable, List, Sequence, Tuple
 
 import numpy as np
 
+from src.lib import ptrace
+from src.lib.pauli import pauli_sum_operator, pauli_sum_sparse, tfim_terms
+
 try:
     from scipy.linalg import eigh
+    from scipy.sparse.linalg import eigsh
 except Exception as _e:  # pragma: no cover
-    eigh = None
+    eigh = eigsh = None
 # --- Basic quantum utilities ---
 
 
@@ -60,16 +64,7 @@ def graph_state(n: int, edges: Sequence[Tuple[int, int]]) -> np.ndarray:
     return psi
 def reduced_density_matrix(psi: np.ndarray, keep: Sequence[int], n: int) -> np.ndarray:
     """Reduced density matrix ρ_keep for a pure state |ψ> on n qubits."""
-    keep = list(keep)
-    if any((k < 0 or k >= n) for k in keep):
-        raise ValueError("keep indices out of range")
-    if len(set(keep)) != len(keep):
-        raise ValueError("keep has duplicates")
-    psi_t = psi.reshape((2,) * n)
-    trace = [i for i in range(n) if i not in keep]
-    rho = np.tensordot(psi_t, psi_t.conj(), axes=(trace, trace))
-    d = 2 ** len(keep)
-    return rho.reshape((d, d))
+    return ptrace.reduced_density_from_state(psi, (2,) * n, keep)
 
 
 def von_neumann_entropy(rho: np.ndarray, base: float = 2.0) -> float:
@@ -81,17 +76,15 @@ def von_neumann_entropy(rho: np.ndarray, base: float = 2.0) -> float:
 
 
 def entanglement_entropy(psi: np.ndarray, A: Sequence[int], n: int) -> float:
-    return von_neumann_entropy(reduced_density_matrix(psi, A, n))
+    """S(ρ_A) from the Schmidt spectrum of |ψ> across A | rest."""
+    return ptrace.subsystem_entropy(psi, (2,) * n, A)
 
 
 def mutual_information(psi: np.ndarray, A: Sequence[int], B: Sequence[int], n: int) -> float:
     A, B = list(A), list(B)
     if set(A) & set(B):
         raise ValueError("A and B must be disjoint")
-    S_A = entanglement_entropy(psi, A, n)
-    S_B = entanglement_entropy(psi, B, n)
-    S_AB = entanglement_entropy(psi, sorted(A + B), n)
-    return S_A + S_B - S_AB
+    return entanglement_entropy(psi, A, n) + entanglement_entropy(psi, B, n) - entanglement_entropy(psi, sorted(A + B), n)
 # --- Spin chain: transverse-field Ising model (exact diagonalization) ---
 
 _PAULI_X = np.array([[0, 1], [1, 0]], dtype=complex)
@@ -123,13 +116,50 @@ def tfim_hamiltonian(n: int, J: float = 1.0, h: float = 1.0, periodic: bool = Fa
     return H
 
 
-def tfim_ground_state(n: int, J: float = 1.0, h: float = 1.0, periodic: bool = False) -> np.ndarray:
+def tfim_sparse_hamiltonian(n: int, J: float = 1.0, h: float = 1.0, periodic: bool = False, fmt: str = "csr"):
+    """Same H as :func:`tfim_hamiltonian`, as a scipy.sparse matrix (O(n 2^n) memory)."""
+    return pauli_sum_sparse(n, tfim_terms(n, J=J, h=h, periodic=periodic), fmt=fmt)
+
+
+def tfim_operator(n: int, J: float = 1.0, h: float = 1.0, periodic: bool = False):
+    """Same H as :func:`tfim_hamiltonian`, as a matrix-free LinearOperator (O(2^n) memory)."""
+    return pauli_sum_operator(n, tfim_terms(n, J=J, h=h, periodic=periodic))
+
+
+TFIM_METHODS = ("auto", "dense", "sparse", "matrix_free")
+
+
+def tfim_ground_state(
+    n: int, J: float = 1.0, h: float = 1.0, periodic: bool = False, method: str = "auto"
+) -> np.ndarray:
+    """Ground state of the TFIM.
+
+    ``method="dense"`` diagonalizes the full kron-built H; ``"sparse"`` and
+    ``"matrix_free"`` run Lanczos (``eigsh``) on the bitwise Pauli builder, which
+    keeps n ~ 20 in memory.  ``"auto"`` picks dense for n <= 10, sparse for n <= 16.
+    """
     if eigh is None:
         raise ImportError("scipy is required for TFIM diagonalization")
-    H = tfim_hamiltonian(n, J=J, h=h, periodic=periodic)
-    vals, vecs = eigh(H)
-    psi0 = vecs[:, np.argmin(vals)]
+    if method == "auto":
+        method = "dense" if n <= 10 else ("sparse" if n <= 16 else "matrix_free")
+    if method == "dense":
+        H = tfim_hamiltonian(n, J=J, h=h, periodic=periodic)
+        vals, vecs = eigh(H)
+        psi0 = vecs[:, np.argmin(vals)]
+    elif method in ("sparse", "matrix_free"):
+        if method == "sparse":
+            H = tfim_sparse_hamiltonian(n, J=J, h=h, periodic=periodic)
+        else:
+            H = tfim_operator(n, J=J, h=h, periodic=periodic)
+        # Deterministic start vector; |+...+> overlaps the (stoquastic) ground state.
+        v0 = np.ones(H.shape[0], dtype=H.dtype)
+        vals, vecs = eigsh(H, k=1, which="SA", v0=v0)
+        psi0 = vecs[:, 0].astype(complex)
+    else:
+        raise ValueError(f"unknown method {method!r}; expected one of {TFIM_METHODS}")
     return psi0 / np.linalg.norm(psi0)
+
+
 @dataclass(frozen=True)
 class EntanglementResult:
     name: str
@@ -157,6 +187,156 @@ def diagnose_state(name: str, psi: np.ndarray, A: Sequence[int], B: Sequence[int
     S_B = entanglement_entropy(psi, B, n)
     I_AB = mutual_information(psi, A, B, n)
     return EntanglementResult(name=name, n=n, partition=(tuple(A), tuple(B)), S_A=S_A, S_B=S_B, I_AB=I_AB)
+# --- Partition scans with memoized subsystem spectra ---
+
+
+def subset_mask(sites: Iterable[int]) -> int:
+    """Bitmask with bit k set for every qubit k in ``sites``."""
+    m = 0
+    for k in sites:
+        m |= 1 << int(k)
+    return m
+
+
+def mask_sites(mask: int, n: int) -> Tuple[int, ...]:
+    return tuple(k for k in range(n) if mask >> k & 1)
+
+
+class SpectrumCache:
+    """Entanglement spectra of one pure state, memoized by subset bitmask.
+
+    For a pure state S(A) = S(complement of A), so each subset and its complement
+    share one entry (keyed by the smaller mask).  Entropies of A, B and AB are
+    therefore computed once and reused across every pair that needs them.
+    """
+
+    def __init__(self, psi: np.ndarray, n: int, base: float = 2.0):
+        self.psi = np.asarray(psi)
+        self.n = int(n)
+        self.base = base
+        self._full = (1 << self.n) - 1
+        self._spectra: Dict[int, np.ndarray] = {}
+        self._entropy: Dict[int, float] = {}
+
+    def _key(self, mask: int) -> int:
+        return min(mask, self._full ^ mask)
+
+    def matches(self, psi: np.ndarray, n: int) -> bool:
+        """True if this cache was built for state ``psi`` on ``n`` qubits."""
+        psi = np.asarray(psi)
+        return int(n) == self.n and (psi is self.psi or (psi.shape == self.psi.shape and np.array_equal(psi, self.psi)))
+
+    def spectrum(self, sites_or_mask) -> np.ndarray:
+        """Schmidt spectrum (ascending) of the cut between ``sites_or_mask`` and its complement.
+
+        The entry is shared with the complement, so it holds min(2**|A|, 2**(n-|A|))
+        values - the length of the complement partition when that is the smaller
+        side - rather than the 2**|A| eigenvalues of rho_A; the rest are zero.
+        """
+        mask = sites_or_mask if isinstance(sites_or_mask, (int, np.integer)) else subset_mask(sites_or_mask)
+        key = self._key(int(mask))
+        vals = self._spectra.get(key)
+        if vals is None:
+            vals = ptrace.entanglement_spectrum(self.psi, (2,) * self.n, mask_sites(key, self.n))
+            self._spectra[key] = vals
+        return vals
+
+    def entropy(self, sites_or_mask) -> float:
+        mask = sites_or_mask if isinstance(sites_or_mask, (int, np.integer)) else subset_mask(sites_or_mask)
+        key = self._key(int(mask))
+        val = self._entropy.get(key)
+        if val is None:
+            val = ptrace.entropy_from_spectrum(self.spectrum(key), base=self.base)
+            self._entropy[key] = val
+        return val
+
+    def mutual_information(self, A: Sequence[int], B: Sequence[int]) -> float:
+        a, b = subset_mask(A), subset_mask(B)
+        if a & b:
+            raise ValueError("A and B must be disjoint")
+        return self.entropy(a) + self.entropy(b) - self.entropy(a | b)
+
+
+@dataclass(frozen=True)
+class PartitionScan:
+    """Columnar result of :func:`scan_partitions`; row k describes pair (A_k, B_k)."""
+
+    n: int
+    mask_A: np.ndarray
+    mask_B: np.ndarray
+    S_A: np.ndarray
+    S_B: np.ndarray
+    S_AB: np.ndarray
+    I_AB: np.ndarray
+
+    def rows(self) -> List[Dict[str, object]]:
+        return [
+            {
+                "A": list(mask_sites(int(a), self.n)),
+                "B": list(mask_sites(int(b), self.n)),
+                "S_A": float(sa),
+                "S_B": float(sb),
+                "S_AB": float(sab),
+                "I_AB": float(i),
+            }
+            for a, b, sa, sb, sab, i in zip(self.mask_A, self.mask_B, self.S_A, self.S_B, self.S_AB, self.I_AB)
+        ]
+
+
+def _state_cache(psi: np.ndarray, n: int, cache: SpectrumCache | None) -> SpectrumCache:
+    if cache is None:
+        return SpectrumCache(psi, n)
+    if not cache.matches(psi, n):
+        raise ValueError("cache was built for a different state")
+    return cache
+
+
+def scan_partitions(
+    psi: np.ndarray,
+    n: int,
+    partitions: Iterable[Tuple[Sequence[int], Sequence[int]]],
+    cache: SpectrumCache | None = None,
+) -> PartitionScan:
+    """S(A), S(B), S(AB) and I(A:B) for many disjoint (A, B) pairs of one state."""
+    cache = _state_cache(psi, n, cache)
+    mA, mB = [], []
+    for A, B in partitions:
+        a, b = subset_mask(A), subset_mask(B)
+        if a & b:
+            raise ValueError("A and B must be disjoint")
+        mA.append(a)
+        mB.append(b)
+    S_A = np.array([cache.entropy(a) for a in mA], dtype=float)
+    S_B = np.array([cache.entropy(b) for b in mB], dtype=float)
+    S_AB = np.array([cache.entropy(a | b) for a, b in zip(mA, mB)], dtype=float)
+    return PartitionScan(
+        n=n,
+        mask_A=np.array(mA, dtype=np.int64),
+        mask_B=np.array(mB, dtype=np.int64),
+        S_A=S_A,
+        S_B=S_B,
+        S_AB=S_AB,
+        I_AB=S_A + S_B - S_AB,
+    )
+
+
+def contiguous_cut_entropies(psi: np.ndarray, n: int, cache: SpectrumCache | None = None) -> np.ndarray:
+    """S([0..k)) for every cut k = 0..n (length n+1, zero at both ends for pure states)."""
+    cache = _state_cache(psi, n, cache)
+    return np.array([cache.entropy((1 << k) - 1) for k in range(n + 1)], dtype=float)
+
+
+def pairwise_mutual_information(psi: np.ndarray, n: int, cache: SpectrumCache | None = None) -> np.ndarray:
+    """Symmetric (n, n) matrix of single-site I(i:j); the diagonal is 2 S(i)."""
+    cache = _state_cache(psi, n, cache)
+    S1 = np.array([cache.entropy(1 << i) for i in range(n)])
+    out = np.diag(2.0 * S1)
+    for i in range(n):
+        for j in range(i + 1, n):
+            out[i, j] = out[j, i] = S1[i] + S1[j] - cache.entropy((1 << i) | (1 << j))
+    return out
+
+
 # --- Reproducible toy experiment suite ---
 
 
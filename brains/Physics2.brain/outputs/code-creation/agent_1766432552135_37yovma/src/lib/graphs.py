@@ -3,35 +3,39 @@
 This module provides tiny, dependency-light graph builders used by the toy
 emergence / entanglement diagnostics. Graphs are undirected and simple by
 construction (no self-loops, no parallel edges).
+
+Builders are vectorized so 10^5-10^6 vertex graphs are practical: edges are held
+as one (m, 2) integer array, ``random_geometric`` uses a (torus-aware) cell list
+instead of all-pairs distances, and ``adjacency``/``laplacian`` can return CSR
+matrices (``sparse=True``, needs scipy) instead of dense n x n arrays.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
+from itertools import product
 from typing import Iterable, Optional, Sequence, Tuple
 
 import numpy as np
 Edge = Tuple[int, int]
 
-
-def _canon_edge(u: int, v: int) -> Edge:
-    if u == v:
-        raise ValueError("self-loops are not allowed")
-    return (u, v) if u < v else (v, u)
+_PAIR_BLOCK = 1 << 22  # candidate pairs materialized at once by the cell list
 
 
-def _unique_edges(edges: Iterable[Edge], n: int) -> Tuple[Edge, ...]:
-    seen = set()
-    out = []
-    for (u, v) in edges:
-        if not (0 <= u < n and 0 <= v < n):
-            raise ValueError("edge endpoint out of range")
-        e = _canon_edge(int(u), int(v))
-        if e not in seen:
-            seen.add(e)
-            out.append(e)
-    return tuple(out)
-@dataclass(frozen=True)
+def _unique_edges(edges: Iterable[Edge], n: int) -> np.ndarray:
+    """Canonical (u<v), de-duplicated (m, 2) edge array in first-occurrence order."""
+    e = edges if isinstance(edges, np.ndarray) else np.array(list(edges), dtype=np.int64)
+    e = np.asarray(e, dtype=np.int64).reshape(-1, 2)
+    if e.size and (e.min() < 0 or e.max() >= n):
+        raise ValueError("edge endpoint out of range")
+    u, v = e[:, 0], e[:, 1]
+    if np.any(u == v):
+        raise ValueError("self-loops are not allowed")
+    lo, hi = np.minimum(u, v), np.maximum(u, v)
+    _, first = np.unique(lo * n + hi, return_index=True)
+    first.sort()
+    return np.stack([lo[first], hi[first]], axis=1)
+@dataclass(frozen=True, eq=False)
 class Graph:
     """Simple undirected graph container.
 
@@ -39,86 +43,202 @@ class Graph:
     ----------
     n : int
         Number of vertices labeled 0..n-1.
-    edges : tuple[(u,v), ...]
-        Canonical undirected edge list with u<v.
+    edges : np.ndarray
+        Canonical undirected edge list with u<v, as an (m, 2) int64 array (any
+        sequence of pairs is accepted and converted).
     coords : np.ndarray | None
         Optional vertex coordinates (n, d), useful for geometric graphs/lattices.
+
+    Graphs compare equal when n, edges and coords match; the hash covers n and edges.
     """
 
     n: int
-    edges: Tuple[Edge, ...]
+    edges: np.ndarray
     coords: Optional[np.ndarray] = None
 
-    def adjacency(self, *, dtype=float) -> np.ndarray:
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "edges", np.asarray(self.edges, dtype=np.int64).reshape(-1, 2))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Graph):
+            return NotImplemented
+        if self.n != other.n or not np.array_equal(self.edges, other.edges):
+            return False
+        if self.coords is None or other.coords is None:
+            return self.coords is None and other.coords is None
+        return np.array_equal(self.coords, other.coords)
+
+    def __hash__(self) -> int:
+        return hash((self.n, self.edges.tobytes()))
+
+    @property
+    def m(self) -> int:
+        return len(self.edges)
+
+    def _csr(self, dtype):
+        import scipy.sparse as sp
+
+        rows = np.concatenate([self.edges[:, 0], self.edges[:, 1]])
+        cols = np.concatenate([self.edges[:, 1], self.edges[:, 0]])
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self.n), out=indptr[1:])
+        return sp.csr_matrix((np.ones(len(rows), dtype=dtype), cols[order], indptr), shape=(self.n, self.n))
+
+    def adjacency(self, *, dtype=float, sparse: bool = False):
+        """Adjacency matrix: dense ndarray, or scipy CSR with ``sparse=True``."""
+        if sparse:
+            return self._csr(dtype)
         a = np.zeros((self.n, self.n), dtype=dtype)
-        for u, v in self.edges:
-            a[u, v] = 1
-            a[v, u] = 1
+        a[self.edges[:, 0], self.edges[:, 1]] = 1
+        a[self.edges[:, 1], self.edges[:, 0]] = 1
         return a
 
-    def laplacian(self, *, dtype=float) -> np.ndarray:
+    def laplacian(self, *, dtype=float, sparse: bool = False):
+        """Graph Laplacian D - A: dense ndarray, or scipy CSR with ``sparse=True``."""
+        if sparse:
+            import scipy.sparse as sp
+
+            return (sp.diags(self.degrees().astype(dtype)) - self._csr(dtype)).tocsr()
         a = self.adjacency(dtype=dtype)
         deg = np.sum(a, axis=1)
         return np.diag(deg) - a
 
     def degrees(self) -> np.ndarray:
-        d = np.zeros(self.n, dtype=int)
-        for u, v in self.edges:
-            d[u] += 1
-            d[v] += 1
-        return d
+        return np.bincount(self.edges.ravel(), minlength=self.n).astype(int)
 def path_graph(n: int) -> Graph:
     n = int(n)
     if n < 1:
         raise ValueError("n must be >= 1")
-    edges = [(i, i + 1) for i in range(n - 1)]
-    return Graph(n=n, edges=_unique_edges(edges, n))
+    i = np.arange(n - 1)
+    return Graph(n=n, edges=_unique_edges(np.stack([i, i + 1], axis=1), n))
 
 
 def cycle_graph(n: int) -> Graph:
     n = int(n)
     if n < 3:
         raise ValueError("n must be >= 3")
-    edges = [(i, (i + 1) % n) for i in range(n)]
-    return Graph(n=n, edges=_unique_edges(edges, n))
+    i = np.arange(n)
+    return Graph(n=n, edges=_unique_edges(np.stack([i, (i + 1) % n], axis=1), n))
 
 
 def grid_2d(Lx: int, Ly: int, *, periodic: bool = False) -> Graph:
-    """2D square lattice with optional periodic boundaries."""
+    """2D square lattice with optional periodic boundaries (vertex id = y * Lx + x)."""
     Lx, Ly = int(Lx), int(Ly)
     if Lx < 1 or Ly < 1:
         raise ValueError("Lx,Ly must be >= 1")
-    def vid(x: int, y: int) -> int:
-        return y * Lx + x
-
-    edges = []
-    for y in range(Ly):
-        for x in range(Lx):
-            if x + 1 < Lx:
-                edges.append((vid(x, y), vid(x + 1, y)))
-            elif periodic and Lx > 1:
-                edges.append((vid(x, y), vid(0, y)))
-            if y + 1 < Ly:
-                edges.append((vid(x, y), vid(x, y + 1)))
-            elif periodic and Ly > 1:
-                edges.append((vid(x, y), vid(x, 0)))
-    coords = np.array([(x, y) for y in range(Ly) for x in range(Lx)], dtype=float)
+    v = np.arange(Lx * Ly)
+    x, y = v % Lx, v // Lx
+    # per vertex: the +x edge then the +y edge (wrapping when periodic), in vertex order
+    ends = np.stack([y * Lx + (x + 1) % Lx, ((y + 1) % Ly) * Lx + x], axis=1)
+    ok = np.stack([(x + 1 < Lx) | (periodic and Lx > 1), (y + 1 < Ly) | (periodic and Ly > 1)], axis=1)
+    edges = np.stack([np.repeat(v, 2), ends.ravel()], axis=1)[ok.ravel()]
+    coords = np.stack([x, y], axis=1).astype(float)
     return Graph(n=Lx * Ly, edges=_unique_edges(edges, Lx * Ly), coords=coords)
-def erdos_renyi(n: int, p: float, *, rng: Optional[np.random.Generator] = None) -> Graph:
-    """G(n,p) with independent edges."""
+
+
+def _row_pairs(n: int, k: np.ndarray) -> np.ndarray:
+    """(i, j) for linear indices ``k`` into the row-major upper triangle i<j."""
+    starts = np.concatenate([[0], np.cumsum(np.arange(n - 1, 0, -1, dtype=np.int64))])
+    i = np.searchsorted(starts, k, side="right") - 1
+    return np.stack([i, i + 1 + (k - starts[i])], axis=1)
+
+
+def erdos_renyi(
+    n: int,
+    p: float,
+    *,
+    rng: Optional[np.random.Generator] = None,
+    method: str = "rows",
+) -> Graph:
+    """G(n,p) with independent edges.
+
+    ``method="rows"`` draws one uniform per vertex pair in row order (the original
+    random stream, vectorized in blocks; O(n^2) draws).  ``method="skip"`` draws
+    geometric gaps between successive edges instead: O(n + m), for large sparse
+    graphs, with a different (equally valid) random stream.
+    """
     n = int(n)
     if n < 1:
         raise ValueError("n must be >= 1")
     if not (0.0 <= p <= 1.0):
         raise ValueError("p must be in [0,1]")
     rng = np.random.default_rng() if rng is None else rng
-    edges = []
-    for i in range(n):
-        r = rng.random(n - i - 1)
-        js = np.where(r < p)[0]
-        for off in js:
-            edges.append((i, i + 1 + int(off)))
-    return Graph(n=n, edges=_unique_edges(edges, n))
+    total = n * (n - 1) // 2
+    hits = []
+    if method == "rows":
+        for k0 in range(0, total, _PAIR_BLOCK):
+            r = rng.random(min(_PAIR_BLOCK, total - k0))
+            hits.append(k0 + np.flatnonzero(r < p))
+    elif method == "skip":
+        if p > 0.0 and total:
+            pos = -1
+            batch = max(1024, int(1.1 * total * p) + 64)
+            while pos < total:
+                k = pos + np.cumsum(rng.geometric(p, size=min(batch, _PAIR_BLOCK)))
+                hits.append(k[k < total])
+                pos = int(k[-1])
+    else:
+        raise ValueError(f"unknown method {method!r}; use 'rows' or 'skip'")
+    k = np.concatenate(hits) if hits else np.empty(0, dtype=np.int64)
+    return Graph(n=n, edges=_row_pairs(n, k))
+
+
+def _radius_pairs(x: np.ndarray, radius: float, periodic: bool) -> np.ndarray:
+    """All pairs i<j with (minimum-image) distance <= radius, lexicographically sorted.
+
+    Cell list: cells have side >= radius, so neighbours lie in the 3^dim adjacent
+    cells; points are visited in cell order so candidate blocks stay contiguous.
+    """
+    n, dim = x.shape
+    m = max(1, int(np.floor(1.0 / radius)))
+    m = min(m, max(1, int(np.ceil((2.0 * n) ** (1.0 / dim)))))  # at most ~2n cells
+    cell = np.minimum((x * m).astype(np.int64), m - 1)
+    strides = m ** np.arange(dim - 1, -1, -1, dtype=np.int64)
+    cid = cell @ strides
+    order = np.argsort(cid, kind="stable")
+    cell, xs = cell[order], x[order]
+    counts = np.bincount(cid, minlength=m**dim)
+    start = np.concatenate([[0], np.cumsum(counts)])
+
+    if periodic:
+        # distinct neighbour offsets per axis (with m < 3, -1 and +1 coincide mod m)
+        steps = sorted({o % m: o for o in (-1, 0, 1)}.values())
+    else:
+        steps = [-1, 0, 1]
+    out = []
+    for off in product(steps, repeat=dim):
+        nc = cell + np.asarray(off, dtype=np.int64)
+        if periodic:
+            nc %= m
+            valid = np.ones(n, dtype=bool)
+        else:
+            valid = np.all((nc >= 0) & (nc < m), axis=1)
+            nc = np.clip(nc, 0, m - 1)
+        ncid = nc @ strides
+        cnt = np.where(valid, counts[ncid], 0)
+        cs = np.cumsum(cnt)
+        if not n or cs[-1] == 0:
+            continue
+        cuts = np.searchsorted(cs, np.arange(_PAIR_BLOCK, cs[-1], _PAIR_BLOCK), side="left")
+        for a, b in zip(np.concatenate([[0], cuts]), np.concatenate([cuts, [n]])):
+            c = cnt[a:b]
+            tot = int(c.sum())
+            if not tot:
+                continue
+            pi = np.repeat(np.arange(a, b), c)
+            pj = np.repeat(start[ncid[a:b]] - (np.cumsum(c) - c), c) + np.arange(tot)
+            ii, jj = order[pi], order[pj]
+            keep = ii < jj
+            pi, pj, ii, jj = pi[keep], pj[keep], ii[keep], jj[keep]
+            d = xs[pj] - xs[pi]
+            if periodic:
+                d = np.abs(d)
+                d = np.minimum(d, 1.0 - d)
+            close = np.sqrt(np.sum(d * d, axis=1)) <= radius
+            out.append(ii[close] * n + jj[close])
+    key = np.sort(np.concatenate(out)) if out else np.empty(0, dtype=np.int64)
+    return np.stack([key // n, key % n], axis=1) if n else np.empty((0, 2), dtype=np.int64)
 
 
 def random_geometric(
@@ -129,7 +249,10 @@ def random_geometric(
     periodic: bool = True,
     rng: Optional[np.random.Generator] = None,
 ) -> Graph:
-    """Random geometric graph on [0,1)^dim with optional torus metric."""
+    """Random geometric graph on [0,1)^dim with optional torus metric.
+
+    Neighbour search uses a cell list (expected O(n) for fixed mean degree).
+    """
     n, dim = int(n), int(dim)
     if n < 1 or dim < 1:
         raise ValueError("n, dim must be >= 1")
@@ -137,26 +260,16 @@ def random_geometric(
         raise ValueError("radius must be > 0")
     rng = np.random.default_rng() if rng is None else rng
     x = rng.random((n, dim))
-    edges = []
-    for i in range(n):
-        d = x[i + 1 :] - x[i]
-        if periodic:
-            d = np.minimum(np.abs(d), 1.0 - np.abs(d))
-        dist = np.sqrt(np.sum(d * d, axis=1))
-        js = np.where(dist <= radius)[0]
-        for off in js:
-            edges.append((i, i + 1 + int(off)))
-    return Graph(n=n, edges=_unique_edges(edges, n), coords=x)
+    return Graph(n=n, edges=_radius_pairs(x, float(radius), periodic), coords=x)
 def subgraph(g: Graph, nodes: Sequence[int]) -> Graph:
     """Induced subgraph on `nodes`, relabeled to 0..k-1 in given order."""
-    idx = [int(u) for u in nodes]
+    idx = np.asarray([int(u) for u in nodes], dtype=np.int64)
     k = len(idx)
-    pos = {u: i for i, u in enumerate(idx)}
-    edges = []
-    for u, v in g.edges:
-        if u in pos and v in pos:
-            edges.append((pos[u], pos[v]))
+    pos = np.full(g.n, -1, dtype=np.int64)
+    pos[idx] = np.arange(k)
+    e = pos[g.edges]
+    e = e[np.all(e >= 0, axis=1)]
     coords = None
     if g.coords is not None:
         coords = np.asarray(g.coords, dtype=float)[idx]
-    return Graph(n=k, edges=_unique_edges(edges, k), coords=coords)
+    return Graph(n=k, edges=_unique_edges(e, k), coords=coords)
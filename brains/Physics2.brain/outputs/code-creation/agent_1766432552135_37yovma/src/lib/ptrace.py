@@ -0,0 +1,157 @@
+"""Partial-trace / entanglement-spectrum kernel shared by the quantum utility modules.
+
+Reduced states are computed straight from statevectors: the ket is permuted to
+(keep, traced) order and reshaped to a (d_keep, d_traced) matrix M, so
+rho_keep = M M^dagger and the entanglement spectrum is the squared singular
+values of M (Schmidt decomposition).  |psi><psi| is never formed.  Density-matrix
+inputs use one einsum whose subscripts are built once per (dims, keep); rank-1
+(pure) density matrices are detected cheaply and routed to the Schmidt path.
+
+Kept subsystems are always returned in ascending index order.
+"""
+
+from __future__ import annotations
+
+import functools
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
+
+_LETTERS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+@dataclass(frozen=True)
+class TracePlan:
+    dims: Tuple[int, ...]
+    keep: Tuple[int, ...]
+    perm: Tuple[int, ...]  # axis order (keep..., traced...)
+    d_keep: int
+    d_traced: int
+    rho_subscripts: str  # einsum for the (dims + dims)-shaped density matrix
+
+
+@functools.lru_cache(maxsize=1024)
+def trace_plan(dims: Tuple[int, ...], keep: Tuple[int, ...]) -> TracePlan:
+    """Contraction plan for tracing out everything except ``keep`` (cached)."""
+    n = len(dims)
+    if any(k < 0 or k >= n for k in keep):
+        raise ValueError("keep indices out of range")
+    if len(set(keep)) != len(keep):
+        raise ValueError("keep has duplicates")
+    keep = tuple(sorted(keep))
+    traced = tuple(i for i in range(n) if i not in keep)
+    d_keep = int(np.prod([dims[i] for i in keep])) if keep else 1
+    d_traced = int(np.prod([dims[i] for i in traced])) if traced else 1
+    if 2 * n > len(_LETTERS):
+        subs = ""  # too many axes for einsum letters; fall back to the matrix route
+    else:
+        row = _LETTERS[:n]
+        col = "".join(row[i] if i in traced else _LETTERS[n + i] for i in range(n))
+        out = "".join(row[i] for i in keep) + "".join(col[i] for i in keep)
+        subs = f"{row}{col}->{out}"
+    return TracePlan(dims, keep, keep + traced, d_keep, d_traced, subs)
+
+
+def _plan(dims: Sequence[int], keep: Sequence[int]) -> TracePlan:
+    return trace_plan(tuple(int(d) for d in dims), tuple(int(k) for k in keep))
+
+
+def schmidt_matrix(psi: np.ndarray, dims: Sequence[int], keep: Sequence[int]) -> np.ndarray:
+    """(d_keep, d_traced) matrix M of a ket, with rho_keep = M M^dagger."""
+    p = _plan(dims, keep)
+    psi = np.asarray(psi)
+    if psi.size != p.d_keep * p.d_traced:
+        raise ValueError("state size incompatible with dims")
+    t = psi.reshape(p.dims)
+    if p.perm != tuple(range(len(p.dims))):
+        t = t.transpose(p.perm)
+    return t.reshape(p.d_keep, p.d_traced)
+
+
+def reduced_density_from_state(psi: np.ndarray, dims: Sequence[int], keep: Sequence[int]) -> np.ndarray:
+    """rho_keep for a pure state, without forming |psi><psi|."""
+    M = schmidt_matrix(psi, dims, keep)
+    return M @ M.conj().T
+
+
+def _pure_ket(rho: np.ndarray, tol: float = 1e-10) -> np.ndarray | None:
+    """Return a ket if rho is (numerically) rank-1, else None.  O(D^2)."""
+    tr = np.trace(rho).real
+    if tr <= 0:
+        return None
+    purity = np.vdot(rho, rho).real / tr**2  # Tr(rho^2) for Hermitian rho
+    if abs(purity - 1.0) > tol:
+        return None
+    k = int(np.argmax(np.real(np.diagonal(rho))))
+    return rho[:, k] / np.sqrt(rho[k, k].real * tr)
+
+
+def reduced_density(rho_or_psi: np.ndarray, dims: Sequence[int], keep: Sequence[int]) -> np.ndarray:
+    """rho_keep from a ket (1-D) or density matrix (2-D)."""
+    a = np.asarray(rho_or_psi)
+    if a.ndim == 1:
+        return reduced_density_from_state(a, dims, keep)
+    p = _plan(dims, keep)
+    D = p.d_keep * p.d_traced
+    if a.shape != (D, D):
+        raise ValueError(f"rho shape {a.shape} incompatible with dims (D={D})")
+    if p.rho_subscripts:
+        out = np.einsum(p.rho_subscripts, a.reshape(p.dims + p.dims))
+    else:
+        perm = p.perm + tuple(len(p.dims) + i for i in p.perm)
+        r = a.reshape(p.dims + p.dims).transpose(perm).reshape(p.d_keep, p.d_traced, p.d_keep, p.d_traced)
+        out = np.einsum("ajbj->ab", r)
+    return out.reshape(p.d_keep, p.d_keep)
+
+
+def entanglement_spectrum(rho_or_psi: np.ndarray, dims: Sequence[int], keep: Sequence[int]) -> np.ndarray:
+    """Eigenvalues of rho_keep (ascending, clipped to >= 0).
+
+    Kets - and density matrices that are numerically pure - use the Schmidt/SVD
+    route on the smaller side of the cut; mixed states use eigvalsh of rho_keep.
+    """
+    a = np.asarray(rho_or_psi)
+    psi = a if a.ndim == 1 else _pure_ket(a)
+    if psi is not None:
+        s = np.linalg.svd(schmidt_matrix(psi, dims, keep), compute_uv=False)
+        vals = np.sort(s.real**2)
+    else:
+        r = reduced_density(a, dims, keep)
+        vals = np.linalg.eigvalsh((r + r.conj().T) / 2).real
+    return np.clip(vals, 0.0, None)
+
+
+def entropy_from_spectrum(vals: np.ndarray, base: float = 2.0, tol: float = 1e-15) -> float:
+    """-sum p log p over the eigenvalues in (tol, 1] (values are clipped to [0, 1] first)."""
+    vals = np.clip(np.asarray(vals, dtype=float), 0.0, 1.0)
+    nz = vals[vals > tol]
+    if nz.size == 0:
+        return 0.0
+    return float(-(nz * (np.log(nz) / np.log(base))).sum())
+
+
+def subsystem_entropy(
+    rho_or_psi: np.ndarray, dims: Sequence[int], keep: Sequence[int], base: float = 2.0, tol: float = 1e-15
+) -> float:
+    """Von Neumann entropy of the reduced state on ``keep``; eigenvalues <= ``tol`` are dropped."""
+    return entropy_from_spectrum(entanglement_spectrum(rho_or_psi, dims, keep), base=base, tol=tol)
+
+
+def mutual_information(
+    rho_or_psi: np.ndarray,
+    dims: Sequence[int],
+    A: Sequence[int],
+    B: Sequence[int],
+    base: float = 2.0,
+    tol: float = 1e-15,
+) -> float:
+    """I(A:B) = S(A) + S(B) - S(A u B).  Plans for A, B and AB are cached across calls.
+
+    A and B may overlap (AB is their union); callers that require disjoint
+    subsystems check that themselves.
+    """
+    A = sorted(set(map(int, A)))
+    B = sorted(set(map(int, B)))
+    S = lambda keep: subsystem_entropy(rho_or_psi, dims, keep, base=base, tol=tol)  # noqa: E731
+    return S(A) + S(B) - S(sorted(set(A) | set(B)))
@@ -7,6 +7,8 @@ All functions are NumPy-only and deterministic given inputs/RNG.
 from __future__ import annotations
 
 import numpy as np
+
+from src.lib import ptrace
 # ---- Basic building blocks ----
 
 def kron(*ops: np.ndarray) -> np.ndarray:
@@ -86,28 +88,14 @@ def partial_trace(rho: np.ndarray, keep: list[int], dims: list[int]) -> np.ndarr
         keep: subsystem indices to keep (0..N-1).
         dims: list of subsystem dimensions.
     """
-    dims = list(map(int, dims))
-    N = len(dims)
     keep = sorted(set(map(int, keep)))
-    if any(k < 0 or k >= N for k in keep):
-        raise ValueError("keep indices out of range")
-    rho = np.asarray(rho, dtype=complex)
-    D = int(np.prod(dims))
-    if rho.shape != (D, D):
-        raise ValueError(f"rho shape {rho.shape} incompatible with dims (D={D})")
-    traced = [i for i in range(N) if i not in keep]
-    out = rho.reshape(dims + dims)
-    for s in sorted(traced, reverse=True):
-        out = np.trace(out, axis1=s, axis2=s + N)
-        dims.pop(s)
-        N -= 1
-    d = int(np.prod(dims)) if dims else 1
-    return out.reshape(d, d)
+    return ptrace.reduced_density(np.asarray(rho, dtype=complex), dims=dims, keep=keep)
 
 
 def reduced_density(psi: np.ndarray, keep: list[int], dims: list[int]) -> np.ndarray:
-    """Reduced density matrix from a pure state ket."""
-    return partial_trace(dm(psi), keep=keep, dims=dims)
+    """Reduced density matrix from a pure state ket (never forms |psi><psi|)."""
+    psi = np.asarray(psi, dtype=complex).reshape(-1)
+    return ptrace.reduced_density_from_state(psi, dims=dims, keep=sorted(set(map(int, keep))))
 # ---- Entropies / mutual information ----
 
 def entropy_vn(rho: np.ndarray, base: float = 2.0, tol: float = 1e-12) -> float:
@@ -125,14 +113,13 @@ def entropy_vn(rho: np.ndarray, base: float = 2.0, tol: float = 1e-12) -> float:
 
 
 def mutual_information(rho: np.ndarray, A: list[int], B: list[int], dims: list[int]) -> float:
-    """I(A:B) = S(A)+S(B)-S(AB) for a joint density matrix."""
-    A = sorted(set(map(int, A)))
-    B = sorted(set(map(int, B)))
-    AB = sorted(set(A + B))
-    rhoA = partial_trace(rho, keep=A, dims=dims)
-    rhoB = partial_trace(rho, keep=B, dims=dims)
-    rhoAB = partial_trace(rho, keep=AB, dims=dims)
-    return entropy_vn(rhoA) + entropy_vn(rhoB) - entropy_vn(rhoAB)
+    """I(A:B) = S(A)+S(B)-S(AB) for a joint density matrix (or ket).
+
+    A and B may overlap (AB is their union). Entropies drop eigenvalues <= 1e-12,
+    as ``entropy_vn`` does. Pure inputs are reduced via Schmidt decompositions;
+    see :mod:`src.lib.ptrace`.
+    """
+    return ptrace.mutual_information(np.asarray(rho, dtype=complex), dims, A, B, tol=1e-12)
 # ---- Simple evolutions (unitaries) ----
 
 I2 = np.eye(2, dtype=complex)
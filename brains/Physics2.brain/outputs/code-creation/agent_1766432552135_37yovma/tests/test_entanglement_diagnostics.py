@@ -0,0 +1,60 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.experiments import entanglement_diagnostics as ed
+
+
+def _dense_entropy(psi, A, n):
+    # the per-pair computation the scan replaced: rho_A by an explicit partial trace, then eigvalsh
+    A = sorted(A)
+    rest = [k for k in range(n) if k not in A]
+    t = np.transpose(psi.reshape((2,) * n), A + rest).reshape(2 ** len(A), -1)
+    return ed.von_neumann_entropy(t @ t.conj().T)
+
+
+def _random_state(n, seed=0):
+    rng = np.random.default_rng(seed)
+    psi = rng.normal(size=2**n) + 1j * rng.normal(size=2**n)
+    return psi / np.linalg.norm(psi)
+
+
+def test_scan_partitions_matches_per_pair_dense_entropies():
+    n = 5
+    psi = _random_state(n)
+    pairs = [(A, B) for r in (1, 2) for A in itertools.combinations(range(n), r)
+             for B in itertools.combinations([k for k in range(n) if k not in A], 2)]
+    scan = ed.scan_partitions(psi, n, pairs)
+    for k, (A, B) in enumerate(pairs):
+        S_A, S_B, S_AB = (_dense_entropy(psi, s, n) for s in (A, B, A + B))
+        assert scan.S_A[k] == pytest.approx(S_A, abs=1e-10)
+        assert scan.S_AB[k] == pytest.approx(S_AB, abs=1e-10)
+        assert scan.I_AB[k] == pytest.approx(S_A + S_B - S_AB, abs=1e-10)
+        assert scan.I_AB[k] == pytest.approx(ed.mutual_information(psi, A, B, n), abs=1e-10)
+
+    cuts = ed.contiguous_cut_entropies(psi, n)
+    np.testing.assert_allclose(cuts, [_dense_entropy(psi, list(range(k)), n) for k in range(n + 1)], atol=1e-10)
+    mi = ed.pairwise_mutual_information(psi, n)
+    assert mi[1, 3] == pytest.approx(_dense_entropy(psi, [1], n) + _dense_entropy(psi, [3], n)
+                                     - _dense_entropy(psi, [1, 3], n), abs=1e-10)
+
+
+def test_spectrum_is_shared_with_the_complement():
+    n = 5
+    psi = _random_state(n, seed=1)
+    cache = ed.SpectrumCache(psi, n)
+    spec = cache.spectrum([0, 1, 2])
+    assert spec is cache.spectrum([3, 4]) and spec.shape == (4,)
+    assert spec.sum() == pytest.approx(1.0)
+
+
+def test_cache_built_for_another_state_is_rejected():
+    n = 4
+    psi, other = _random_state(n, seed=2), _random_state(n, seed=3)
+    cache = ed.SpectrumCache(psi, n)
+    assert ed.contiguous_cut_entropies(psi.copy(), n, cache=cache)[2] == cache.entropy([0, 1])
+    with pytest.raises(ValueError, match="different state"):
+        ed.scan_partitions(other, n, [([0], [1])], cache=cache)
+    with pytest.raises(ValueError, match="different state"):
+        ed.pairwise_mutual_information(np.kron(psi, [1, 0]), n + 1, cache=cache)
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from src.lib import graphs as G
+
+
+def _ref_unique(edges, n):
+    seen, out = set(), []
+    for u, v in edges:
+        e = (int(min(u, v)), int(max(u, v)))
+        if e not in seen:
+            seen.add(e)
+            out.append(e)
+    return out
+
+
+def _ref_erdos_renyi(n, p, rng):
+    # the original per-row loop
+    edges = []
+    for i in range(n):
+        js = np.where(rng.random(n - i - 1) < p)[0]
+        edges.extend((i, i + 1 + int(off)) for off in js)
+    return edges
+
+
+def _ref_random_geometric(x, radius, periodic):
+    # the original all-pairs distances, row by row
+    edges = []
+    for i in range(len(x)):
+        d = x[i + 1 :] - x[i]
+        if periodic:
+            d = np.minimum(np.abs(d), 1.0 - np.abs(d))
+        js = np.where(np.sqrt(np.sum(d * d, axis=1)) <= radius)[0]
+        edges.extend((i, i + 1 + int(off)) for off in js)
+    return edges
+
+
+def _edge_list(g):
+    return [tuple(map(int, e)) for e in g.edges]
+
+
+@pytest.mark.parametrize("n,p", [(1, 0.5), (60, 0.0), (60, 0.1), (150, 0.5), (40, 1.0)])
+def test_erdos_renyi_rows_reproduces_loop_builder(n, p):
+    g = G.erdos_renyi(n, p, rng=np.random.default_rng(3))
+    assert _edge_list(g) == _ref_erdos_renyi(n, p, np.random.default_rng(3))
+
+
+def test_erdos_renyi_skip_edge_density():
+    n, p = 2000, 0.002
+    g = G.erdos_renyi(n, p, rng=np.random.default_rng(0), method="skip")
+    total = n * (n - 1) // 2
+    assert abs(g.m - p * total) < 5 * np.sqrt(p * total)
+    assert np.all(g.edges[:, 0] < g.edges[:, 1])
+    assert len(np.unique(g.edges[:, 0] * n + g.edges[:, 1])) == g.m
+
+
+@pytest.mark.parametrize("dim,periodic", [(1, True), (2, True), (2, False), (3, True), (3, False)])
+@pytest.mark.parametrize("radius", [0.04, 0.3, 0.7])
+def test_cell_list_geometric_graph_matches_all_pairs(dim, periodic, radius):
+    g = G.random_geometric(300, radius, dim=dim, periodic=periodic, rng=np.random.default_rng(1))
+    assert _edge_list(g) == _ref_random_geometric(g.coords, radius, periodic)
+
+
+def test_lattices_match_loop_builders():
+    def ref_grid(Lx, Ly, periodic):
+        edges = []
+        for y in range(Ly):
+            for x in range(Lx):
+                if x + 1 < Lx:
+                    edges.append((y * Lx + x, y * Lx + x + 1))
+                elif periodic and Lx > 1:
+                    edges.append((y * Lx + x, y * Lx))
+                if y + 1 < Ly:
+                    edges.append((y * Lx + x, (y + 1) * Lx + x))
+                elif periodic and Ly > 1:
+                    edges.append((y * Lx + x, x))
+        return _ref_unique(edges, Lx * Ly)
+
+    for Lx, Ly, periodic in [(1, 1, False), (4, 3, False), (4, 3, True), (2, 5, True), (1, 4, True)]:
+        assert _edge_list(G.grid_2d(Lx, Ly, periodic=periodic)) == ref_grid(Lx, Ly, periodic)
+    assert _edge_list(G.path_graph(5)) == [(0, 1), (1, 2), (2, 3), (3, 4)]
+    assert _edge_list(G.cycle_graph(4)) == [(0, 1), (1, 2), (2, 3), (0, 3)]
+    g = G.grid_2d(4, 4, periodic=True)
+    sub = G.subgraph(g, [5, 1, 4, 6])
+    assert _edge_list(sub) == [(0, 1), (0, 2), (0, 3)]
+
+
+def test_matrices_and_degrees():
+    g = G.random_geometric(80, 0.2, rng=np.random.default_rng(2))
+    a = g.adjacency()
+    assert np.array_equal(g.adjacency(sparse=True).toarray(), a)
+    assert np.array_equal(g.laplacian(sparse=True).toarray(), g.laplacian())
+    assert np.array_equal(g.degrees(), a.sum(axis=1))
+
+
+def test_graph_equality_and_hash():
+    a = G.erdos_renyi(30, 0.2, rng=np.random.default_rng(5))
+    b = G.erdos_renyi(30, 0.2, rng=np.random.default_rng(5))
+    c = G.erdos_renyi(30, 0.2, rng=np.random.default_rng(6))
+    assert a == b and hash(a) == hash(b) and a != c
+    assert G.Graph(3, [(0, 1)]) == G.Graph(3, np.array([[0, 1]]))
+    assert len({a, b, c}) == 2
+    assert G.grid_2d(3, 3) == G.grid_2d(3, 3)
+    assert G.grid_2d(3, 3) != G.Graph(9, G.grid_2d(3, 3).edges)  # coords differ
+    assert a != "graph"
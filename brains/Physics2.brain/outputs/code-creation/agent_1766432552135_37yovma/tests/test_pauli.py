@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from src.experiments import entanglement_diagnostics as ed
+from src.lib import pauli
+
+_P = {
+    "I": np.eye(2, dtype=complex),
+    "X": np.array([[0, 1], [1, 0]], dtype=complex),
+    "Y": np.array([[0, -1j], [1j, 0]], dtype=complex),
+    "Z": np.array([[1, 0], [0, -1]], dtype=complex),
+}
+
+
+def _dense(n, terms):
+    # kron-chain reference, qubit 0 leftmost
+    H = np.zeros((2**n, 2**n), dtype=complex)
+    for c, ops in terms:
+        H += c * ed._kron_all([_P[ops.get(k, "I")] for k in range(n)])
+    return H
+
+
+def test_pauli_sum_matches_kron_chains():
+    rng = np.random.default_rng(0)
+    n = 4
+    terms = []
+    for _ in range(12):
+        sites = rng.choice(n, size=int(rng.integers(1, n + 1)), replace=False)
+        terms.append((complex(rng.normal(), rng.normal()), {int(s): str(rng.choice(list("XYZ"))) for s in sites}))
+    terms.append((0.5, {}))  # identity
+    ref = _dense(n, terms)
+    np.testing.assert_allclose(pauli.pauli_sum_sparse(n, terms).toarray(), ref, atol=1e-12)
+    v = rng.normal(size=2**n) + 1j * rng.normal(size=2**n)
+    np.testing.assert_allclose(pauli.pauli_sum_operator(n, terms) @ v, ref @ v, atol=1e-12)
+    with pytest.raises(ValueError):
+        pauli.pauli_sum_sparse(n, [(1.0, {0: "Q"})])
+
+
+@pytest.mark.parametrize("periodic", [False, True])
+def test_tfim_builders_match_dense_hamiltonian(periodic):
+    n = 5
+    H = ed.tfim_hamiltonian(n, J=0.8, h=1.3, periodic=periodic)
+    np.testing.assert_allclose(ed.tfim_sparse_hamiltonian(n, J=0.8, h=1.3, periodic=periodic).toarray(), H, atol=1e-12)
+    op = ed.tfim_operator(n, J=0.8, h=1.3, periodic=periodic)
+    np.testing.assert_allclose(op @ np.eye(2**n), H, atol=1e-12)
+
+    ref = np.linalg.eigh(H)[1][:, 0]
+    for method in ("dense", "sparse", "matrix_free"):
+        psi = ed.tfim_ground_state(n, J=0.8, h=1.3, periodic=periodic, method=method)
+        assert abs(np.vdot(ref, psi)) == pytest.approx(1.0, abs=1e-8)
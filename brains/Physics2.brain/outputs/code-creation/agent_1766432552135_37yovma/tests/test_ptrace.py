@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from src.experiments import entanglement_diagnostics as ed
+from src.lib import ptrace, quantum
+
+
+def _dense_partial_trace(rho, keep, dims):
+    # the original loop: trace out one subsystem at a time from the full density matrix
+    dims = list(dims)
+    n = len(dims)
+    keep = sorted(set(keep))
+    out = rho.reshape(dims + dims)
+    for s in sorted((i for i in range(n) if i not in keep), reverse=True):
+        out = np.trace(out, axis1=s, axis2=s + n)
+        dims.pop(s)
+        n -= 1
+    d = int(np.prod(dims)) if dims else 1
+    return out.reshape(d, d)
+
+
+def _entropy_vn(rho, tol):
+    evals = np.clip(np.linalg.eigvalsh((rho + rho.conj().T) / 2.0).real, 0.0, 1.0)
+    evals = evals[evals > tol]
+    return float(-(evals * np.log2(evals)).sum()) if evals.size else 0.0
+
+
+def _ket(rng, D):
+    psi = rng.normal(size=D) + 1j * rng.normal(size=D)
+    return psi / np.linalg.norm(psi)
+
+
+def _mixed(rng, D, rank=3):
+    K = rng.normal(size=(D, rank)) + 1j * rng.normal(size=(D, rank))
+    rho = K @ K.conj().T
+    return rho / np.trace(rho).real
+
+
+DIMS = [(2, 2, 2, 2), (2, 3, 2), (3, 1, 2, 2)]
+KEEPS = [(), (0,), (2, 0), (1, 3), (0, 1, 2), (3, 2, 1, 0)]
+
+
+@pytest.mark.parametrize("dims", DIMS)
+def test_reduced_states_match_dense_partial_trace(dims):
+    rng = np.random.default_rng(0)
+    D = int(np.prod(dims))
+    psi, rho = _ket(rng, D), _mixed(rng, D)
+    for keep in KEEPS:
+        keep = [k for k in keep if k < len(dims)]
+        ref_pure = _dense_partial_trace(np.outer(psi, psi.conj()), keep, dims)
+        np.testing.assert_allclose(ptrace.reduced_density(psi, dims, keep), ref_pure, atol=1e-12)
+        np.testing.assert_allclose(ptrace.reduced_density(np.outer(psi, psi.conj()), dims, keep), ref_pure, atol=1e-12)
+        ref_mixed = _dense_partial_trace(rho, keep, dims)
+        np.testing.assert_allclose(ptrace.reduced_density(rho, dims, keep), ref_mixed, atol=1e-12)
+        for state, ref in ((psi, ref_pure), (np.outer(psi, psi.conj()), ref_pure), (rho, ref_mixed)):
+            # the Schmidt route returns min(d_keep, d_traced) values; the rest of rho_keep's are 0
+            spec = ptrace.entanglement_spectrum(state, dims, keep)
+            full = np.clip(np.linalg.eigvalsh(ref), 0, None)
+            np.testing.assert_allclose(spec, full[len(full) - len(spec):], atol=1e-12)
+            np.testing.assert_allclose(full[: len(full) - len(spec)], 0.0, atol=1e-12)
+    with pytest.raises(ValueError):
+        ptrace.reduced_density(psi, dims, [0, 0])
+
+
+def test_more_axes_than_einsum_letters_uses_matrix_route():
+    dims = (1,) * 25 + (2, 2, 2)
+    rng = np.random.default_rng(1)
+    rho = _mixed(rng, 8)
+    assert ptrace.trace_plan(dims, (26,)).rho_subscripts == ""
+    np.testing.assert_allclose(ptrace.reduced_density(rho, dims, [26]), _dense_partial_trace(rho, [26], dims), atol=1e-12)
+
+
+def test_quantum_mutual_information_keeps_overlap_and_cutoff():
+    rng = np.random.default_rng(2)
+    dims = [2, 2, 2]
+    for rho in (_mixed(rng, 8), np.outer(*(2 * [_ket(rng, 8)])).conj()):
+        for A, B in (([0], [1]), ([0, 1], [1, 2]), ([2], [2])):
+            ref = sum(s * _entropy_vn(_dense_partial_trace(rho, keep, dims), 1e-12)
+                      for s, keep in ((1, A), (1, B), (-1, sorted(set(A + B)))))
+            assert quantum.mutual_information(rho, A, B, dims) == pytest.approx(ref, abs=1e-10)
+    # eigenvalues of 1e-13, between the two cutoffs: dropped by quantum (1e-12), kept by ptrace's default
+    rho = np.diag([0.5, 0.5 - 1e-13, 1e-13, 0.0]).astype(complex)
+    for tol, mi in ((1e-12, quantum.mutual_information(rho, [0], [1], [2, 2])),
+                    (1e-15, ptrace.mutual_information(rho, [2, 2], [0], [1]))):
+        ref = sum(s * _entropy_vn(_dense_partial_trace(rho, keep, [2, 2]), tol)
+                  for s, keep in ((1, [0]), (1, [1]), (-1, [0, 1])))
+        assert mi == pytest.approx(ref, abs=1e-14)
+    s_old, s_new = (ptrace.subsystem_entropy(rho, [2, 2], [0], tol=tol) for tol in (1e-12, 1e-15))
+    assert s_new - s_old == pytest.approx(-1e-13 * np.log2(1e-13), rel=1e-6)
+
+
+def test_diagnostics_mutual_information_matches_dense_and_rejects_overlap():
+    rng = np.random.default_rng(3)
+    n = 5
+    psi = _ket(rng, 2**n)
+    full = np.outer(psi, psi.conj())
+    for A, B in (([0], [4]), ([1, 2], [0, 3])):
+        ref = sum(s * _entropy_vn(_dense_partial_trace(full, keep, [2] * n), 1e-15)
+                  for s, keep in ((1, A), (1, B), (-1, sorted(A + B))))
+        assert ed.mutual_information(psi, A, B, n) == pytest.approx(ref, abs=1e-10)
+    with pytest.raises(ValueError):
+        ed.mutual_information(psi, [0, 1], [1], n)
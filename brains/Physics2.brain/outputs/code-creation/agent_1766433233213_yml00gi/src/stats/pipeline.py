@@ -5,11 +5,15 @@ confronting swampland-constrained cosmology models with data:
 - Likelihood composition (Gaussian & multivariate Gaussian)
 - Priors and transforms (uniform/log-uniform/normal)
 - Posterior evaluation + a small MCMC sampler (random-walk Metropolis)
+- Array-native batched posterior + affine-invariant ensemble sampler
 - Simple evidence/model comparison surrogates (AIC/BIC + Laplace evidence)
 - Forecast hooks (Fisher matrix via numerical derivatives)
 
 The intent is to be backend-agnostic: a "model" is any callable mapping
-a parameter dict -> observable dict or vector.
+a parameter dict -> observable dict or vector.  Batched evaluation passes a
+"column dict" {name: (n_walkers,) array}; likelihoods built with
+``vectorized=True`` hand it to ``predict`` in one call, otherwise ``predict`` is
+called once per walker.
 """
 
 from __future__ import annotations
@@ -21,16 +25,39 @@ import numpy as np
 
 Array = np.ndarray
 Params = Dict[str, float]
+Columns = Dict[str, Array]
+
+
+def _rows(theta: Columns) -> List[Params]:
+    """Split a column dict into per-walker parameter dicts."""
+    keys = list(theta)
+    n = len(next(iter(theta.values()))) if keys else 0
+    return [{k: float(theta[k][i]) for k in keys} for i in range(n)]
+
+
+def _solve_lower(L: Array, b: Array) -> Array:
+    try:
+        from scipy.linalg import solve_triangular
+    except ImportError:  # pragma: no cover - scipy is optional
+        return np.linalg.solve(L, b)
+    return solve_triangular(L, b, lower=True, check_finite=False)
 
 
 # ---------------------------- Likelihoods --------------------------------- #
 
 @dataclass(frozen=True)
 class Likelihood:
-    """Base class: implement __call__(theta)->logL."""
+    """Base class: implement __call__(theta)->logL.
+
+    ``batch(columns)`` evaluates many parameter points at once and returns an
+    (n_walkers,) array; the default loops over __call__.
+    """
     def __call__(self, theta: Params) -> float:  # pragma: no cover
         raise NotImplementedError
 
+    def batch(self, theta: Columns) -> Array:
+        return np.array([self(t) for t in _rows(theta)], dtype=float)
+
 
 @dataclass(frozen=True)
 class GaussianLikelihood(Likelihood):
@@ -38,6 +65,16 @@ class GaussianLikelihood(Likelihood):
     data: Mapping[str, float]
     sigma: Mapping[str, float]
     predict: Callable[[Params], Mapping[str, float]]
+    vectorized: bool = False  # predict accepts/returns column dicts
+
+    def __post_init__(self):
+        keys = list(self.data)
+        y = np.array([float(self.data[k]) for k in keys])
+        s = np.array([float(self.sigma[k]) for k in keys])
+        object.__setattr__(self, "_keys", keys)
+        object.__setattr__(self, "_y", y)
+        object.__setattr__(self, "_inv_sigma", 1.0 / s)
+        object.__setattr__(self, "_lognorm", float(0.5 * np.sum(np.log(2 * math.pi * s * s))))
 
     def __call__(self, theta: Params) -> float:
         pred = self.predict(theta)
@@ -48,26 +85,51 @@ class GaussianLikelihood(Likelihood):
             ll += -0.5 * (r * r + math.log(2 * math.pi * s * s))
         return float(ll)
 
+    def batch(self, theta: Columns) -> Array:
+        if self.vectorized:
+            pred = self.predict(theta)
+            P = np.column_stack([np.asarray(pred[k], dtype=float) for k in self._keys])
+        else:
+            P = np.array([[float(p[k]) for k in self._keys] for p in map(self.predict, _rows(theta))])
+        r = (P.reshape(-1, len(self._keys)) - self._y) * self._inv_sigma
+        return -0.5 * np.einsum("ij,ij->i", r, r) - self._lognorm
+
 
 @dataclass(frozen=True)
 class MVGaussianLikelihood(Likelihood):
-    """Multivariate Gaussian likelihood for a vector-valued observable."""
+    """Multivariate Gaussian likelihood for a vector-valued observable.
+
+    The covariance is Cholesky-factored once (cov = L L^T); the quadratic form is
+    |L^{-1} r|^2 from a triangular solve, never an explicit inverse.
+    """
     y: Array
     cov: Array
     predict: Callable[[Params], Array]
+    vectorized: bool = False  # predict maps a column dict to an (n_walkers, n) array
 
     def __post_init__(self):
-        ic = np.linalg.inv(self.cov)
-        object.__setattr__(self, "_icov", ic)
-        sign, logdet = np.linalg.slogdet(self.cov)
-        if sign <= 0:
-            raise ValueError("Covariance must be positive definite.")
+        try:
+            L = np.linalg.cholesky(np.asarray(self.cov, dtype=float))
+        except np.linalg.LinAlgError:
+            raise ValueError("Covariance must be positive definite.") from None
+        object.__setattr__(self, "_chol", L)
+        object.__setattr__(self, "_y", np.asarray(self.y, dtype=float))
+        logdet = 2.0 * float(np.sum(np.log(np.diag(L))))
         object.__setattr__(self, "_lognorm", 0.5 * (len(self.y) * math.log(2 * math.pi) + logdet))
 
     def __call__(self, theta: Params) -> float:
-        r = np.asarray(self.predict(theta), dtype=float) - np.asarray(self.y, dtype=float)
-        q = float(r.T @ self._icov @ r)
-        return float(-0.5 * q - self._lognorm)
+        r = np.asarray(self.predict(theta), dtype=float) - self._y
+        z = _solve_lower(self._chol, r)
+        return float(-0.5 * float(z @ z) - self._lognorm)
+
+    def batch(self, theta: Columns) -> Array:
+        if self.vectorized:
+            P = np.asarray(self.predict(theta), dtype=float)
+        else:
+            P = np.array([np.asarray(self.predict(t), dtype=float) for t in _rows(theta)])
+        R = P.reshape(-1, self._y.size) - self._y
+        Z = _solve_lower(self._chol, R.T)  # one solve for all walkers
+        return -0.5 * np.einsum("ij,ij->j", Z, Z) - self._lognorm
 
 
 @dataclass(frozen=True)
@@ -76,6 +138,9 @@ class SumLikelihood(Likelihood):
     def __call__(self, theta: Params) -> float:
         return float(sum(p(theta) for p in self.parts))
 
+    def batch(self, theta: Columns) -> Array:
+        return np.sum([p.batch(theta) for p in self.parts], axis=0)
+
 
 # ------------------------------ Priors ------------------------------------ #
 
@@ -86,6 +151,9 @@ class Prior:
         raise NotImplementedError
     def sample(self, rng: np.random.Generator) -> float:  # pragma: no cover
         raise NotImplementedError
+    def logpdf_array(self, x: Array) -> Array:
+        """Vectorized logpdf; subclasses override the per-element fallback."""
+        return np.array([self.logpdf(float(v)) for v in np.ravel(x)], dtype=float)
 
 
 @dataclass(frozen=True)
@@ -96,6 +164,9 @@ class UniformPrior(Prior):
         if self.lo <= x <= self.hi:
             return -math.log(self.hi - self.lo)
         return -math.inf
+    def logpdf_array(self, x: Array) -> Array:
+        x = np.asarray(x, dtype=float)
+        return np.where((x >= self.lo) & (x <= self.hi), -math.log(self.hi - self.lo), -np.inf)
     def sample(self, rng: np.random.Generator) -> float:
         return float(rng.uniform(self.lo, self.hi))
 
@@ -111,6 +182,12 @@ class LogUniformPrior(Prior):
         if self.lo <= x <= self.hi:
             return -math.log(x) - math.log(math.log(self.hi / self.lo))
         return -math.inf
+    def logpdf_array(self, x: Array) -> Array:
+        x = np.asarray(x, dtype=float)
+        inside = (x >= self.lo) & (x <= self.hi)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lp = -np.log(x) - math.log(math.log(self.hi / self.lo))
+        return np.where(inside, lp, -np.inf)
     def sample(self, rng: np.random.Generator) -> float:
         u = rng.uniform(0.0, 1.0)
         return float(self.lo * (self.hi / self.lo) ** u)
@@ -123,6 +200,9 @@ class NormalPrior(Prior):
     def logpdf(self, x: float) -> float:
         z = (x - self.mu) / self.sigma
         return float(-0.5 * (z * z + math.log(2 * math.pi * self.sigma * self.sigma)))
+    def logpdf_array(self, x: Array) -> Array:
+        z = (np.asarray(x, dtype=float) - self.mu) / self.sigma
+        return -0.5 * (z * z + math.log(2 * math.pi * self.sigma * self.sigma))
     def sample(self, rng: np.random.Generator) -> float:
         return float(rng.normal(self.mu, self.sigma))
 
@@ -136,6 +216,17 @@ def log_prior(theta: Params, priors: Sequence[Prior]) -> float:
     return float(lp)
 
 
+def log_prior_batch(theta: Array, priors: Sequence[Prior]) -> Array:
+    """log prior for an (n_walkers, d) array whose columns follow ``priors``."""
+    theta = np.atleast_2d(np.asarray(theta, dtype=float))
+    if theta.shape[1] != len(priors):
+        raise ValueError(f"theta has {theta.shape[1]} columns for {len(priors)} priors")
+    lp = np.zeros(theta.shape[0])
+    for j, p in enumerate(priors):
+        lp += p.logpdf_array(theta[:, j])
+    return np.where(np.isfinite(lp), lp, -np.inf)
+
+
 def sample_from_priors(priors: Sequence[Prior], rng: Optional[np.random.Generator] = None) -> Params:
     rng = np.random.default_rng() if rng is None else rng
     return {p.name: p.sample(rng) for p in priors}
@@ -183,6 +274,206 @@ def metropolis_hastings(
     return out, np.asarray(lps, dtype=float), acc / max(1, n)
 
 
+# -------------------- Batched posterior + ensemble MCMC -------------------- #
+
+def _like_chunk(like: Likelihood, names: Sequence[str], theta: Array) -> Array:
+    return like.batch({k: theta[:, j] for j, k in enumerate(names)})
+
+
+@dataclass(frozen=True)
+class Posterior:
+    """Array-native posterior: theta is an (n_walkers, d) array, columns = ``priors`` order.
+
+    Priors are evaluated column-wise; the likelihood sees a column dict for the
+    walkers with finite prior only.  With ``executor`` (e.g. a ProcessPoolExecutor)
+    those rows are split into ``chunks`` likelihood calls run concurrently, which
+    pays off when ``predict`` is expensive; ``like`` must then be picklable.
+    """
+    like: Likelihood
+    priors: Sequence[Prior]
+
+    @property
+    def names(self) -> List[str]:
+        return [p.name for p in self.priors]
+
+    def log_prob(self, theta: Array, executor=None, chunks: int = 1) -> Array:
+        theta = np.atleast_2d(np.asarray(theta, dtype=float))
+        lp = log_prior_batch(theta, self.priors)
+        ok = np.flatnonzero(np.isfinite(lp))
+        if ok.size:
+            sub = theta[ok]
+            if executor is None or chunks <= 1 or ok.size < 2:
+                ll = _like_chunk(self.like, self.names, sub)
+            else:
+                parts = np.array_split(sub, min(int(chunks), ok.size))
+                futs = [executor.submit(_like_chunk, self.like, self.names, part) for part in parts]
+                ll = np.concatenate([f.result() for f in futs])
+            lp[ok] += np.asarray(ll, dtype=float)
+        return np.where(np.isnan(lp), -np.inf, lp)
+
+    def to_array(self, theta: Mapping[str, float]) -> Array:
+        return np.array([float(theta[k]) for k in self.names])
+
+    def to_params(self, row: Array) -> Params:
+        return {k: float(v) for k, v in zip(self.names, row)}
+
+
+@dataclass(frozen=True)
+class EnsembleResult:
+    """Output of :func:`ensemble_sampler` (chain axes: kept step, walker, parameter)."""
+    names: List[str]
+    chain: Array       # (n_kept, n_walkers, d)
+    logpost: Array     # (n_kept, n_walkers)
+    acceptance: Array  # (n_walkers,) acceptance fraction over all steps
+
+    def flat(self) -> Array:
+        return self.chain.reshape(-1, self.chain.shape[-1])
+
+    def samples(self) -> List[Params]:
+        return [{k: float(v) for k, v in zip(self.names, row)} for row in self.flat()]
+
+
+def _initial_ensemble(
+    post: Posterior,
+    init: Union[Params, Array],
+    n_walkers: int,
+    scatter: Optional[Mapping[str, float]],
+    rng: np.random.Generator,
+    executor,
+    chunks: int,
+    tries: int = 100,
+) -> Tuple[Array, Array]:
+    if isinstance(init, Mapping):
+        center = post.to_array(init)
+        scale = np.array([
+            float(scatter[k]) if scatter and k in scatter else 1e-3 * (1.0 + abs(c))
+            for k, c in zip(post.names, center)
+        ])
+        X = center + scale * rng.standard_normal((n_walkers, center.size))
+    else:
+        X = np.array(init, dtype=float)
+        if X.shape != (n_walkers, len(post.names)):
+            raise ValueError(f"init array must have shape ({n_walkers}, {len(post.names)})")
+        center, scale = None, None
+    lp = post.log_prob(X, executor, chunks)
+    for _ in range(tries):
+        bad = ~np.isfinite(lp)
+        if not bad.any() or center is None:
+            break
+        X[bad] = center + scale * rng.standard_normal((int(bad.sum()), center.size))
+        lp[bad] = post.log_prob(X[bad], executor, chunks)
+    if not np.all(np.isfinite(lp)):
+        raise ValueError("initial walkers must all have finite log posterior")
+    return X, lp
+
+
+def ensemble_sampler(
+    init: Union[Params, Array],
+    like: Likelihood,
+    priors: Sequence[Prior],
+    n: int,
+    n_walkers: Optional[int] = None,
+    burn: int = 0,
+    thin: int = 1,
+    a: float = 2.0,
+    scatter: Optional[Mapping[str, float]] = None,
+    workers: int = 1,
+    rng: Optional[np.random.Generator] = None,
+) -> EnsembleResult:
+    """Affine-invariant ensemble MCMC (Goodman & Weare stretch move).
+
+    All walkers advance in lockstep: each step updates the two halves of the
+    ensemble in turn, proposing Y = X_j + z (X_k - X_j) against a random walker of
+    the other half with z ~ g(z) ∝ 1/sqrt(z) on [1/a, a], and accepting with
+    log u < (d-1) log z + lp(Y) - lp(X).  One :meth:`Posterior.log_prob` call per
+    half-step scores all proposals.
+
+    ``init`` is a parameter dict (walkers start in a Gaussian ball of width
+    ``scatter[name]``, default 1e-3 (1 + |x|)) or an (n_walkers, d) array.
+    ``n_walkers`` (the row count of an init array, else max(2d, 16)) must be even
+    and at least 2d; anything else raises ValueError.  ``workers > 1``
+    evaluates the likelihood in a process pool (``like`` must be picklable).
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    post = Posterior(like, list(priors))
+    d = len(post.names)
+    if n_walkers is None:
+        n_walkers = np.shape(init)[0] if not isinstance(init, Mapping) else max(2 * d, 16)
+    n_walkers = int(n_walkers)
+    if n_walkers % 2:
+        raise ValueError(f"n_walkers must be even (the stretch move updates two equal halves), got {n_walkers}")
+    if n_walkers < 2 * d:
+        raise ValueError("n_walkers must be at least twice the number of parameters")
+    if a <= 1.0:
+        raise ValueError("stretch scale a must exceed 1")
+
+    executor = None
+    chunks = 1
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(max_workers=int(workers))
+        chunks = int(workers)
+    try:
+        X, lp = _initial_ensemble(post, init, n_walkers, scatter, rng, executor, chunks)
+        halves = (np.arange(0, n_walkers // 2), np.arange(n_walkers // 2, n_walkers))
+        accepted = np.zeros(n_walkers, dtype=np.int64)
+        chain: List[Array] = []
+        lps: List[Array] = []
+        for i in range(int(n)):
+            for h in (0, 1):
+                S, C = halves[h], halves[1 - h]
+                m = S.size
+                z = ((a - 1.0) * rng.uniform(size=m) + 1.0) ** 2 / a
+                partners = X[C[rng.integers(0, C.size, size=m)]]
+                Y = partners + z[:, None] * (X[S] - partners)
+                lpY = post.log_prob(Y, executor, chunks)
+                log_ratio = (d - 1) * np.log(z) + lpY - lp[S]
+                acc = np.log(rng.uniform(size=m)) < log_ratio
+                idx = S[acc]
+                X[idx] = Y[acc]
+                lp[idx] = lpY[acc]
+                accepted[idx] += 1
+            if i >= burn and ((i - burn) % thin == 0):
+                chain.append(X.copy())
+                lps.append(lp.copy())
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    shape = (len(chain), n_walkers, d)
+    return EnsembleResult(
+        names=post.names,
+        chain=np.asarray(chain, dtype=float).reshape(shape),
+        logpost=np.asarray(lps, dtype=float).reshape(shape[:2]),
+        acceptance=accepted / max(1, int(n)),
+    )
+
+
+def integrated_autocorr_time(x: Array, c: float = 5.0) -> Array:
+    """Integrated autocorrelation time per parameter for a chain.
+
+    ``x`` is (n_steps,), (n_steps, d) or an ensemble chain (n_steps, n_walkers, d);
+    the autocorrelation is averaged over walkers (FFT estimate, Sokal's automatic
+    window M >= c tau).  Effective sample size ~ n_steps * n_walkers / tau.
+    """
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 1:
+        x = x[:, None, None]
+    elif x.ndim == 2:
+        x = x[:, None, :]
+    n = x.shape[0]
+    f = np.fft.rfft(x - x.mean(axis=0), n=2 * n, axis=0)
+    acf = np.fft.irfft(f * np.conj(f), axis=0)[:n].mean(axis=1)
+    acf = acf / np.where(acf[0] > 0, acf[0], 1.0)
+    taus = 2.0 * np.cumsum(acf, axis=0) - 1.0
+    out = np.empty(taus.shape[1])
+    for j in range(taus.shape[1]):
+        window = np.arange(n) < c * taus[:, j]
+        M = int(np.argmin(window)) if not window.all() else n - 1
+        out[j] = taus[M, j]
+    return out
+
+
 # ------------------------- Model comparison -------------------------------- #
 
 def aic_bic(max_loglike: float, k: int, n_data: int) -> Tuple[float, float]:
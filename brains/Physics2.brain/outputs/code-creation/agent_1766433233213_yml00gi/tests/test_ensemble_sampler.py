@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.stats import pipeline as P  # noqa: E402
+
+
+def _model(theta):
+    a, b = theta["a"], theta["b"]
+    return {"x": a + b, "y": a * b, "z": np.exp(-a)}
+
+
+def _model_vec(theta):
+    return np.stack([theta["a"] - theta["b"], theta["a"] ** 2], axis=-1)  # (2,) or (n_walkers, 2)
+
+
+PRIORS = [P.UniformPrior("a", -1.0, 2.0), P.LogUniformPrior("b", 0.1, 10.0)]
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_batched_log_posterior_matches_scalar(vectorized):
+    gl = P.GaussianLikelihood({"x": 1.0, "y": 0.3, "z": 0.5}, {"x": 0.1, "y": 0.2, "z": 0.05}, _model,
+                              vectorized=vectorized)
+    mv = P.MVGaussianLikelihood(np.array([0.2, 0.5]), np.array([[0.04, 0.01], [0.01, 0.09]]),
+                                _model_vec, vectorized=vectorized)
+    like = P.SumLikelihood([gl, mv])
+    rng = np.random.default_rng(0)
+    theta = np.column_stack([rng.uniform(-1.5, 2.5, 40), rng.uniform(-1.0, 12.0, 40)])  # some outside the priors
+    post = P.Posterior(like, PRIORS)
+    ref = np.array([P.log_posterior(post.to_params(row), like, PRIORS) for row in theta])
+    got = post.log_prob(theta)
+    assert np.isneginf(ref).any() and np.isfinite(ref).any()
+    np.testing.assert_array_equal(np.isneginf(got), np.isneginf(ref))
+    ok = np.isfinite(ref)
+    np.testing.assert_allclose(got[ok], ref[ok], rtol=1e-12)
+    np.testing.assert_allclose(P.log_prior_batch(theta, PRIORS), [P.log_prior(post.to_params(r), PRIORS) for r in theta])
+
+
+def test_ensemble_sampler_recovers_a_gaussian():
+    mu = np.array([0.5, -1.0])
+    cov = np.array([[0.09, 0.05], [0.05, 0.16]])
+    like = P.MVGaussianLikelihood(mu, cov, lambda t: np.array([t["u"], t["v"]]))
+    priors = [P.UniformPrior("u", -10.0, 10.0), P.UniformPrior("v", -10.0, 10.0)]
+    res = P.ensemble_sampler({"u": 0.0, "v": 0.0}, like, priors, n=2500, n_walkers=32, burn=500,
+                             scatter={"u": 0.5, "v": 0.5}, rng=np.random.default_rng(1))
+    flat = res.flat()
+    assert res.chain.shape == (2000, 32, 2)
+    assert 0.4 < res.acceptance.mean() < 0.9
+    np.testing.assert_allclose(flat.mean(axis=0), mu, atol=0.03)
+    np.testing.assert_allclose(np.cov(flat.T), cov, rtol=0.1, atol=0.005)
+
+
+def test_ensemble_sampler_rejects_odd_walker_counts():
+    like = P.MVGaussianLikelihood(np.zeros(2), np.eye(2), lambda t: np.array([t["u"], t["v"]]))
+    priors = [P.NormalPrior("u", 0.0, 1.0), P.NormalPrior("v", 0.0, 1.0)]
+    with pytest.raises(ValueError, match="even"):
+        P.ensemble_sampler({"u": 0.0, "v": 0.0}, like, priors, n=5, n_walkers=9)
+    init = np.random.default_rng(2).normal(size=(7, 2))
+    with pytest.raises(ValueError, match="even"):
+        P.ensemble_sampler(init, like, priors, n=5)
+    res = P.ensemble_sampler(init[:6], like, priors, n=5, rng=np.random.default_rng(3))
+    np.testing.assert_array_equal(res.chain[0].shape, (6, 2))
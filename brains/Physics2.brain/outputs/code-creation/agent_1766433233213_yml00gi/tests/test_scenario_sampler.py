@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core import robustness as R  # noqa: E402
+
+
+def _normal_prior(rng):
+    return rng.normal(1.0, 0.5)
+
+
+SAMPLER = R.ScenarioSampler(
+    base={"N": 50.0, "a": 0.0},
+    priors={"a": (0.0, 2.0), "b": (-1.0, 1.0), "c": _normal_prior, "d": lambda rng: rng.exponential(2.0)},
+    corr=(["b", "c"], np.array([[1.0, 0.7], [0.7, 1.0]])),
+)
+
+
+def test_sample_array_is_seeded_and_matches_row_layout():
+    a = SAMPLER.sample_array(300, seed=5)
+    np.testing.assert_array_equal(a, SAMPLER.sample_array(300, seed=5))
+    assert not np.array_equal(a["b"], SAMPLER.sample_array(300, seed=6)["b"])
+    rows = SAMPLER.sample(3, seed=5)
+    assert list(a.dtype.names) == SAMPLER.keys and set(rows[0]) == set(SAMPLER.keys)
+    assert np.all(a["N"] == 50.0)
+    np.testing.assert_array_equal(R._to_array(R.scenarios_from_array(a)), a)
+
+
+def test_columnar_and_row_wise_samplers_draw_the_same_distribution():
+    stats = pytest.importorskip("scipy.stats")
+    n = 600
+    cols = SAMPLER.sample_array(n, seed=0)
+    rows = R._to_array(SAMPLER.sample(n, seed=0))[list(SAMPLER.keys)]
+    for k in ("a", "b", "c", "d"):
+        assert stats.ks_2samp(cols[k], rows[k]).pvalue > 1e-3, k
+    # the copula's rank correlation is 6/pi asin(rho/2) for both samplers
+    target = 6.0 / np.pi * np.arcsin(0.35)
+    for arr in (cols, rows):
+        assert stats.spearmanr(arr["b"], arr["c"])[0] == pytest.approx(target, abs=0.08)
+        assert abs(stats.spearmanr(arr["a"], arr["b"])[0]) < 0.12
+    big = SAMPLER.sample_array(200_000, seed=1, m=1 << 16)  # finer quantile table for the moments
+    assert big["b"].min() >= -1.0 and big["b"].max() <= 1.0
+    assert big["c"].mean() == pytest.approx(1.0, abs=0.01) and big["c"].std() == pytest.approx(0.5, abs=0.01)
+    assert stats.spearmanr(big["b"], big["c"])[0] == pytest.approx(target, abs=0.01)
+
+
+def test_psd_correlation_uses_an_eigen_factor():
+    s = R.ScenarioSampler(base={}, priors={"x": (0.0, 1.0), "y": (0.0, 1.0)},
+                          corr=(["x", "y"], np.ones((2, 2))))
+    a = s.sample_array(1000, seed=0)
+    np.testing.assert_allclose(a["x"], a["y"], atol=1e-6)
+
+
+def _evaluate(s):
+    return {"pass": s["b"] < s["c"], "signature": s["a"] * s["c"] + s["N"]}
+
+
+def test_vectorized_and_pooled_evaluation_match_row_wise():
+    arr = SAMPLER.sample_array(50, seed=3)
+    ref = [_evaluate(s) for s in R.scenarios_from_array(arr)]
+    assert R.evaluate_scenarios(_evaluate, arr, vectorized=True) == ref
+    assert R.evaluate_scenarios(_evaluate, R.scenarios_from_array(arr), workers=2, chunk_size=7) == ref
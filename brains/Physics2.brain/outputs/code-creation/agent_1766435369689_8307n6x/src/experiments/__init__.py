@@ -6,7 +6,7 @@ stable public interface for discovery and execution via the experiment registry.
 The registry implementation lives in :mod:`experiments.registry` (added in later
 stages). This module keeps imports lightweight by delegating to that module at
 call time rather than import time.
-""""
+"""
 from __future__ import annotations
 
 from importlib import import_module
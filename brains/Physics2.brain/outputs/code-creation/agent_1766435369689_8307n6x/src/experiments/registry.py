@@ -7,13 +7,26 @@ uniform execution interface.
 An experiment entrypoint is a dotted path: "pkg.mod:function". The function is
 called as: fn(params: dict, *, seed: int|None=None, out_dir: Path|None=None) -> dict
 and should return a JSON-serializable dict with results/artifacts.
-""""
+
+Results can be memoized in a content-addressed on-disk ``ResultCache`` keyed by
+(spec name/version, canonicalized params, seed, entrypoint code hash), and
+``run_batch`` expands parameter grids and runs the uncached cells in a process
+pool, so interrupted sweeps resume from what is already cached.
+"""
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from importlib import import_module
+from importlib.util import find_spec
+from itertools import product
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+import functools
+import hashlib
+import json
+import math
+import os
 @dataclass(frozen=True)
 class ExperimentSpec:
     name: str
@@ -67,6 +80,7 @@ def get_spec(name: str) -> ExperimentSpec:
         raise KeyError(f"Unknown experiment {name!r}. Available: {sorted(_REGISTRY)}") from e
 
 
+@functools.lru_cache(maxsize=None)
 def _load_callable(entrypoint: str) -> Callable[..., Any]:
     if ":" not in entrypoint:
         raise ValueError(f"Invalid entrypoint {entrypoint!r}; expected 'module:function'")
@@ -96,21 +110,237 @@ def _validate_minimal(inputs: Mapping[str, Mapping[str, Any]], params: Mapping[s
             elif t == "dict": ok = isinstance(v, dict)
             if not ok:
                 raise TypeError(f"Param {k} expected {t}, got {type(v).__name__}")
-def run(name: str, params: Optional[Mapping[str, Any]] = None, *, seed: Optional[int] = None, out_dir: Optional[Path] = None) -> Dict[str, Any]:
-    """Run an experiment by name and return a standardized result dict."""
-    spec = get_spec(name)
+def _execute(spec: ExperimentSpec, p: Dict[str, Any], seed: Optional[int], out_dir: Optional[Path]) -> Dict[str, Any]:
     call = _load_callable(spec.entrypoint)
-    p = _apply_defaults(spec.inputs, params or {})
-    _validate_minimal(spec.inputs, p)
     res = call(p, seed=seed, out_dir=Path(out_dir) if out_dir is not None else None)
     if not isinstance(res, dict):
-        raise TypeError(f"Experiment {name!r} returned {type(res).__name__}, expected dict")
+        raise TypeError(f"Experiment {spec.name!r} returned {type(res).__name__}, expected dict")
     return {"experiment": spec.as_dict(), "params": p, "result": res}
 
 
+def _prepare(name: str, params: Optional[Mapping[str, Any]]) -> Tuple[ExperimentSpec, Dict[str, Any]]:
+    spec = get_spec(name)
+    p = _apply_defaults(spec.inputs, params or {})
+    _validate_minimal(spec.inputs, p)
+    return spec, p
+# -----------------------------
+# Result cache
+# -----------------------------
+
+def _canonical(obj: Any) -> Any:
+    """JSON-stable form of params: sorted mappings, lists for tuples, plain numbers."""
+    if isinstance(obj, Mapping):
+        return {str(k): _canonical(v) for k, v in sorted(obj.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    if isinstance(obj, (str, bool)) or obj is None:
+        return obj
+    if hasattr(obj, "item") and not hasattr(obj, "__len__"):  # numpy scalar
+        obj = obj.item()
+    if isinstance(obj, int):
+        return obj
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else repr(obj)
+    raise TypeError(f"Param value of type {type(obj).__name__} cannot be cached; use JSON-like values")
+
+
+@functools.lru_cache(maxsize=256)
+def _file_digest(path: str, mtime_ns: int, size: int) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def code_hash(entrypoint: str) -> str:
+    """Hash of the source file defining an entrypoint's module (not imported).
+
+    Only that file is hashed; bump ``ExperimentSpec.version`` when behaviour
+    changes through other modules.
+    """
+    mod = entrypoint.split(":", 1)[0]
+    origin = getattr(find_spec(mod), "origin", None)
+    if not origin or not os.path.isfile(origin):
+        return "unknown"
+    st = os.stat(origin)
+    return _file_digest(origin, st.st_mtime_ns, st.st_size)
+
+
+def cache_key(spec: ExperimentSpec, params: Mapping[str, Any], seed: Optional[int]) -> str:
+    """Content address of one experiment cell."""
+    payload = {"name": spec.name, "version": spec.version, "params": _canonical(params),
+               "seed": seed, "code": code_hash(spec.entrypoint)}
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Content-addressed JSON result store with size-based LRU eviction.
+
+    Entries live at ``root/<key[:2]>/<key>.json``, are written atomically and
+    have their mtime refreshed on every hit; when the total size exceeds
+    ``max_bytes`` the least recently used entries are deleted.
+    """
+
+    def __init__(self, root: Union[str, Path], *, max_bytes: Optional[int] = 1 << 30):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        out = []
+        for f in self.root.glob("*/*.json"):
+            try:
+                st = f.stat()
+            except FileNotFoundError:
+                continue
+            out.append((st.st_mtime, st.st_size, f))
+        return out
+
+    def size(self) -> int:
+        if self._size is None:
+            self._size = sum(s for _, s, _ in self._entries())
+        return self._size
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        f = self._path(key)
+        try:
+            data = json.loads(f.read_text(encoding="utf-8"))
+            os.utime(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return data
+
+    def put(self, key: str, value: Mapping[str, Any]) -> None:
+        f = self._path(key)
+        f.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(value, sort_keys=True).encode("utf-8")
+        tmp = f.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        size = self.size()  # scanned before the replace, so the new entry is counted once
+        old = f.stat().st_size if f.exists() else 0
+        os.replace(tmp, f)
+        self._size = size + len(data) - old
+        if self.max_bytes is not None and self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used entries until within ``max_bytes``; returns count."""
+        entries = sorted(self._entries(), key=lambda e: e[0])
+        total = sum(s for _, s, _ in entries)
+        removed = 0
+        for _, s, f in entries:
+            if self.max_bytes is None or total <= self.max_bytes:
+                break
+            f.unlink(missing_ok=True)
+            total -= s
+            removed += 1
+        self._size = total
+        return removed
+
+    def clear(self) -> None:
+        for _, _, f in self._entries():
+            f.unlink(missing_ok=True)
+        self._size = 0
+
+
+def _as_cache(cache: Union[None, str, Path, ResultCache]) -> Optional[ResultCache]:
+    return cache if cache is None or isinstance(cache, ResultCache) else ResultCache(cache)
+def run(
+    name: str,
+    params: Optional[Mapping[str, Any]] = None,
+    *,
+    seed: Optional[int] = None,
+    out_dir: Optional[Path] = None,
+    cache: Union[None, str, Path, ResultCache] = None,
+) -> Dict[str, Any]:
+    """Run an experiment by name and return a standardized result dict.
+
+    With ``cache`` (a ``ResultCache`` or directory) a previously computed cell is
+    returned without running; artifacts it wrote to ``out_dir`` are not rewritten.
+    """
+    spec, p = _prepare(name, params)
+    rc = _as_cache(cache)
+    if rc is None:
+        return _execute(spec, p, seed, out_dir)
+    key = cache_key(spec, p, seed)
+    hit = rc.get(key)
+    if hit is not None:
+        return hit
+    res = _execute(spec, p, seed, out_dir)
+    rc.put(key, res)
+    return res
+
+
+def expand_grid(grid: Optional[Mapping[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Cartesian product of a parameter grid.
+
+    Each value is a list/tuple of candidate values (wrap list-valued params, e.g.
+    ``{"shape": [[2, 2], [4, 4]]}``); any other value is held fixed.
+    """
+    grid = dict(grid or {})
+    axes = [(k, list(v) if isinstance(v, (list, tuple)) else [v]) for k, v in grid.items()]
+    return [dict(zip([k for k, _ in axes], combo)) for combo in product(*[vals for _, vals in axes])]
+
+
+def run_batch(
+    name: str,
+    grid: Optional[Mapping[str, Any]] = None,
+    *,
+    params: Optional[Mapping[str, Any]] = None,
+    seeds: Sequence[Optional[int]] = (None,),
+    out_dir: Optional[Path] = None,
+    cache: Union[None, str, Path, ResultCache] = None,
+    workers: int = 1,
+) -> List[Dict[str, Any]]:
+    """Run every (grid cell, seed) combination, skipping cells already in ``cache``.
+
+    ``params`` are base values overridden by each grid cell.  Uncached cells run in
+    a process pool of ``workers`` processes (in-process when ``workers <= 1``);
+    each result is cached as soon as it finishes, so an interrupted sweep resumes
+    where it stopped.  With ``out_dir`` each cell writes to ``out_dir/<key[:16]>``.
+    Results are returned in grid order (seeds innermost).
+    """
+    rc = _as_cache(cache)
+    cells = []
+    for cell in expand_grid(grid):
+        spec, p = _prepare(name, {**dict(params or {}), **cell})
+        for seed in seeds:
+            cells.append((p, seed, cache_key(spec, p, seed)))
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(cells)
+    todo = []
+    for i, (p, seed, key) in enumerate(cells):
+        hit = rc.get(key) if rc is not None else None
+        if hit is None:
+            todo.append(i)
+        else:
+            results[i] = hit
+
+    def cell_dir(key: str) -> Optional[Path]:
+        return None if out_dir is None else Path(out_dir) / key[:16]
+
+    def done(i: int, res: Dict[str, Any]) -> None:
+        results[i] = res
+        if rc is not None:
+            rc.put(cells[i][2], res)
+
+    if workers <= 1 or len(todo) <= 1:
+        for i in todo:
+            p, seed, key = cells[i]
+            done(i, _execute(spec, p, seed, cell_dir(key)))
+    else:
+        with ProcessPoolExecutor(max_workers=min(int(workers), len(todo))) as ex:
+            futs = {ex.submit(_execute, spec, cells[i][0], cells[i][1], cell_dir(cells[i][2])): i for i in todo}
+            for fut in as_completed(futs):
+                done(futs[fut], fut.result())
+    return [r for r in results if r is not None]
+
+
 def export_metadata() -> List[Dict[str, Any]]:
     """JSON-ready metadata list for CLI discovery."""
     return [s.as_dict() for s in list_specs()]
 
 
-__all__ = ["ExperimentSpec", "register", "registered", "list_specs", "get_spec", "run", "export_metadata"]
+__all__ = ["ExperimentSpec", "register", "registered", "list_specs", "get_spec", "run", "run_batch",
+           "expand_grid", "ResultCache", "cache_key", "code_hash", "export_metadata"]
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from src.experiments import pauli, toy_lattice_decoherence as tld
+
+_P = {
+    "I": np.eye(2, dtype=complex),
+    "X": np.array([[0, 1], [1, 0]], dtype=complex),
+    "Y": np.array([[0, -1j], [1j, 0]], dtype=complex),
+    "Z": np.array([[1, 0], [0, -1]], dtype=complex),
+}
+
+
+def _dense(n, terms):
+    # kron-chain reference, qubit 0 leftmost
+    H = np.zeros((2**n, 2**n), dtype=complex)
+    for c, ops in terms:
+        H += c * tld.kron([_P[ops.get(k, "I")] for k in range(n)])
+    return H
+
+
+def _random_terms(n, count, rng):
+    terms = []
+    for _ in range(count):
+        sites = rng.choice(n, size=int(rng.integers(1, n + 1)), replace=False)
+        terms.append((complex(rng.normal(), rng.normal()), {int(s): str(rng.choice(list("XYZ"))) for s in sites}))
+    return terms
+
+
+def test_pauli_sum_matches_kron_chains():
+    rng = np.random.default_rng(0)
+    n = 4
+    terms = _random_terms(n, 12, rng)
+    ref = _dense(n, terms)
+    np.testing.assert_allclose(pauli.pauli_sum_sparse(n, terms).toarray(), ref, atol=1e-12)
+    v = rng.normal(size=2**n) + 1j * rng.normal(size=2**n)
+    np.testing.assert_allclose(pauli.pauli_sum_operator(n, terms) @ v, ref @ v, atol=1e-12)
+    with pytest.raises(ValueError):
+        pauli.pauli_sum_sparse(n, [(1.0, {n: "X"})])
+
+
+def test_star_chain_hamiltonian_matches_dense_builder():
+    n_env, g, j = 4, 0.7, 0.3
+    H = pauli.pauli_sum_sparse(n_env + 1, tld.star_chain_terms(n_env, g, j)).toarray()
+    np.testing.assert_allclose(H, _dense(n_env + 1, tld.star_chain_terms(n_env, g, j)), atol=1e-12)
+    # Z_0 commutes with H: the system-|0> block is H_+, the system-|1> block its bit-flipped copy
+    d = 2**n_env
+    Hp = tld.env_hamiltonian(n_env, g, j)
+    np.testing.assert_allclose(H[:d, :d], Hp, atol=1e-12)
+    np.testing.assert_allclose(H[d:, d:], Hp[::-1, ::-1], atol=1e-12)
+    assert not np.any(H[:d, d:])
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from src.experiments import random_circuit_entanglement as rce
+
+
+def _random_states(B, n, rng):
+    s = rng.normal(size=(B, 2**n)) + 1j * rng.normal(size=(B, 2**n))
+    return s / np.linalg.norm(s, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("n", [3, 7])
+def test_batched_gate_matches_per_sample_and_kron(n):
+    rng = np.random.default_rng(0)
+    B = 3
+    states = _random_states(B, n, rng)
+    for i in range(n - 1):  # covers both the folded small-tail and the strided branch
+        Us = rce.haar_unitaries(4, B, rng)
+        out = rce.apply_two_qubit_gate_batched(states, Us, i, n, np.empty_like(states))
+        for b in range(B):
+            full = np.kron(np.kron(np.eye(2**i), Us[b]), np.eye(2 ** (n - i - 2)))
+            np.testing.assert_allclose(rce.apply_two_qubit_gate(states[b], Us[b], i, n), full @ states[b], atol=1e-12)
+            np.testing.assert_allclose(out[b], full @ states[b], atol=1e-12)
+
+
+def test_haar_unitaries_and_batched_entropy():
+    rng = np.random.default_rng(1)
+    Us = rce.haar_unitaries(4, 5, rng)
+    np.testing.assert_allclose(Us @ Us.conj().transpose(0, 2, 1), np.broadcast_to(np.eye(4), Us.shape), atol=1e-12)
+    n = 6
+    states = _random_states(4, n, rng)
+    states[0] = 0.0
+    states[0, 0] = 1.0  # product state, S = 0
+    got = rce.entanglement_entropy_midcut_batched(states, n)
+    np.testing.assert_allclose(got, [rce.entanglement_entropy_midcut(s, n) for s in states], atol=1e-12)
+    assert got[0] == pytest.approx(0.0, abs=1e-12)
+
+
+def test_engines_sample_the_same_ensemble():
+    n, depth, samples = 6, 6, 200
+    loop = rce.run_experiment(n, depth, samples, seed=0, engine="loop")
+    batched = rce.run_experiment(n, depth, samples, seed=1, engine="batched", batch=64)
+    assert loop.mean_S[0] == batched.mean_S[0] == 0.0
+    se = np.hypot(loop.std_S[1:], batched.std_S[1:]) / np.sqrt(samples)
+    assert np.all(np.abs(loop.mean_S[1:] - batched.mean_S[1:]) < 5 * se + 1e-12)
+    with pytest.raises(ValueError):
+        rce.run_experiment(n, depth, 2, seed=0, engine="gpu")
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from src.experiments import registry as reg
+
+CALLS = []
+
+
+def _cell(params, *, seed=None, out_dir=None):
+    CALLS.append((params["a"], params["b"], seed))
+    rng = np.random.default_rng(seed)
+    return {"value": params["a"] * params["b"] + float(rng.random()), "dir": None if out_dir is None else out_dir.name}
+
+
+SPEC = reg.register(reg.ExperimentSpec(
+    name="test_registry_cell", summary="grid cell", entrypoint=f"{__name__}:_cell",
+    inputs={"a": {"type": "int", "required": True}, "b": {"type": "float", "default": 0.5}},
+))
+
+
+def test_run_batch_matches_individual_runs_and_resumes_from_cache(tmp_path):
+    grid, seeds = {"a": [1, 2, 3], "b": [0.5, 2.0]}, (0, 7)
+    ref = [reg.run(SPEC.name, cell, seed=s) for cell in reg.expand_grid(grid) for s in seeds]
+    assert [r["params"] for r in ref[::2]] == reg.expand_grid(grid)
+
+    cache = reg.ResultCache(tmp_path / "cache")
+    CALLS.clear()
+    first = reg.run_batch(SPEC.name, {"a": [1, 2, 3]}, params={"b": 0.5}, seeds=seeds, cache=cache)
+    assert first == [r for r in ref if r["params"]["b"] == 0.5] and len(CALLS) == 6
+
+    CALLS.clear()
+    full = reg.run_batch(SPEC.name, grid, seeds=seeds, cache=cache)
+    assert full == ref and len(CALLS) == 6  # only the b=2.0 cells ran
+    CALLS.clear()
+    assert reg.run(SPEC.name, {"a": 3, "b": 2.0}, seed=7, cache=cache) == ref[-1] and not CALLS
+
+    parallel = reg.run_batch(SPEC.name, grid, seeds=seeds, workers=2)
+    assert parallel == ref
+
+
+def test_cache_key_is_canonical_and_eviction_respects_budget(tmp_path):
+    k = reg.cache_key(SPEC, {"a": 1, "b": 0.5}, 0)
+    assert k == reg.cache_key(SPEC, {"b": 0.5, "a": np.int64(1)}, 0)
+    assert k != reg.cache_key(SPEC, {"a": 1, "b": 0.5}, 1)
+    with pytest.raises(TypeError):
+        reg.cache_key(SPEC, {"a": object()}, 0)
+
+    cache = reg.ResultCache(tmp_path, max_bytes=200)
+    for i in range(10):
+        cache.put(f"{i:064x}", {"i": i, "pad": "x" * 50})
+    assert cache.size() <= 200
+    assert cache.get(f"{9:064x}") == {"i": 9, "pad": "x" * 50}
+    assert cache.get(f"{0:064x}") is None
+
+
+def test_cache_size_counts_each_entry_once(tmp_path):
+    cache = reg.ResultCache(tmp_path, max_bytes=None)
+    cache.put("ab" * 32, {"i": 0})
+    first = (tmp_path / "ab" / f"{'ab' * 32}.json").stat().st_size
+    assert cache.size() == first
+    cache.put("ab" * 32, {"i": 0, "pad": "x" * 10})
+    cache.put("cd" * 32, {"i": 1})
+    assert cache.size() == reg.ResultCache(tmp_path).size() == sum(f.stat().st_size for f in tmp_path.glob("*/*.json"))
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from src.experiments import toy_lattice_decoherence as tld
+from src.experiments.pauli import pauli_sum_sparse
+
+
+@pytest.mark.parametrize("n_env,g,j", [(3, 1.0, 0.2), (5, 0.4, 0.9), (4, 0.0, 0.3)])
+def test_spectral_engine_matches_dense_reference(n_env, g, j):
+    dense = tld.simulate(n_env, g, j, t_max=8.0, n_t=25, engine="dense")
+    spectral = tld.simulate(n_env, g, j, t_max=8.0, n_t=25, engine="spectral")
+    np.testing.assert_allclose(spectral.coherence, dense.coherence, atol=1e-9)
+    np.testing.assert_allclose(spectral.purity, dense.purity, atol=1e-9)
+    np.testing.assert_allclose(spectral.entropy, dense.entropy, atol=1e-9)
+    assert spectral.coherence[0] == pytest.approx(1.0)
+
+
+def test_spectral_evolver_matches_matrix_exponential():
+    n = 4
+    H = pauli_sum_sparse(n, tld.star_chain_terms(n - 1, 0.7, 0.3)).toarray()
+    rng = np.random.default_rng(0)
+    psi0 = rng.normal(size=2**n) + 1j * rng.normal(size=2**n)
+    t = np.array([0.0, 0.3, 2.5])
+    psi_t = tld.SpectralEvolver.from_hamiltonian(H.astype(complex)).evolve(psi0, t)
+    for k, tk in enumerate(t):
+        np.testing.assert_allclose(psi_t[k], tld.unitary_from_h(H, tk) @ psi0, atol=1e-12)
+    rho = np.einsum("ti,tj->tij", psi_t, psi_t.conj())
+    np.testing.assert_allclose(tld.reduced_states(psi_t), [tld.ptrace_env(r) for r in rho], atol=1e-12)
+    with pytest.raises(ValueError):
+        tld.simulate(engine="gpu")
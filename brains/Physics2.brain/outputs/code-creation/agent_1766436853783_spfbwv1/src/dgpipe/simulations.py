@@ -7,12 +7,17 @@ produce synthetic datasets for inference tests.
 The models here are intentionally lightweight: a free scalar field in 1D with
 periodic boundary conditions and a causal-set/discrete-microstructure inspired
 modified dispersion relation.
+
+Correlators are discrete mode sums.  The mode grid and dispersion are cached per
+(SimConfig, DiscreteParams), and whole (t, x) grids are evaluated in one blocked
+pass (see ``correlator_grid``) with an FFT (chirp-z) path for uniform x grids.
 """
 
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass, asdict
-from typing import Any, Dict, Iterable, Literal, Mapping, Optional, Tuple
+from typing import Any, Dict, Iterable, Literal, Mapping, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
@@ -67,21 +72,176 @@ def _omega(k: np.ndarray, dp: DiscreteParams) -> np.ndarray:
     return w0 * corr
 
 
-def _wightman(t: float, x: np.ndarray, cfg: SimConfig, dp: DiscreteParams) -> np.ndarray:
-    """Discrete-mode approximation to <phi(t,x) phi(0,0)> in vacuum."""
+@dataclass(frozen=True)
+class ModeTable:
+    """Cached mode grid k and dispersion omega(k) for one (SimConfig, DiscreteParams).
+
+    omega depends on |k| only, so modes are also grouped by |k|: ``order`` sorts
+    modes by |k|, ``starts`` marks each group in that order and ``w_unique`` is
+    omega per group.  Time phases then need one cos/sin per distinct frequency.
+    """
+
+    k: np.ndarray
+    w: np.ndarray
+    order: np.ndarray
+    starts: np.ndarray
+    w_unique: np.ndarray
+
+
+@functools.lru_cache(maxsize=64)
+def mode_table(cfg: SimConfig, dp: DiscreteParams) -> ModeTable:
     k = _k_grid(cfg, dp)
     w = _omega(k, dp)
-    phase = np.outer(k, x) - (w[:, None] * t)
+    order = np.argsort(np.abs(k), kind="stable")
+    _, starts = np.unique(np.abs(k)[order], return_index=True)
+    w_unique = w[order][starts]
+    for a in (k, w, order, starts, w_unique):
+        a.setflags(write=False)
+    return ModeTable(k=k, w=w, order=order, starts=starts, w_unique=w_unique)
+
+
+CorrelatorKind = Literal["phi", "pi"]
+
+# Working-set cap (array elements) for one (time block x mode block) trig tile.
+_MAX_TILE = 1 << 22
+
+
+def _mode_weights(kinds: Sequence[str], w: np.ndarray) -> np.ndarray:
+    rows = []
+    for kind in kinds:
+        if kind == "phi":  # <phi phi>: 1/(2w)
+            rows.append(1.0 / (2.0 * w))
+        elif kind == "pi":  # <pi pi>: w/2
+            rows.append(w / 2.0)
+        else:
+            raise ValueError(f"Unknown correlator kind: {kind!r}")
+    return np.asarray(rows, dtype=float)
+
+
+def _uniform_step(x: np.ndarray, rtol: float = 1e-9) -> Optional[float]:
+    if x.size < 2:
+        return None
+    d = np.diff(x)
+    dx = (x[-1] - x[0]) / (x.size - 1)
+    if dx == 0 or np.max(np.abs(d - dx)) > rtol * abs(dx) * x.size:
+        return None
+    return float(dx)
+
+
+def _direct_sum(t, x, tab, W, mode_block):
+    """sum_k W_k cos(k x - w t), tiled over blocks of |k| groups and of time.
+
+    cos(kx - wt) = cos(wt) cos(kx) + sin(wt) sin(kx); the x factors are summed
+    within each |k| group (the sin part cancels for +-k pairs and is skipped), so
+    each tile is a (time x group) @ (group x x) matrix product.
+    """
+    out = np.zeros((W.shape[0], t.size, x.size))
+    k, order, starts, wu = tab.k[tab.order], tab.order, tab.starts, tab.w_unique
+    Wo = W[:, order]
+    Ws = np.where(k == 0, 0.0, Wo)  # sin(0 x) = 0: keeps an infinite k = 0 weight (phi at m = 0) out of B
+    bounds = np.append(starts, k.size)
+    mb = max(1, min(mode_block, _MAX_TILE // (2 * max(1, x.size))))
+    for u0 in range(0, wu.size, mb):
+        u1 = min(u0 + mb, wu.size)
+        s0, s1 = bounds[u0], bounds[u1]
+        kx = np.outer(k[s0:s1], x)
+        cx, sx = np.cos(kx), np.sin(kx)
+        local = starts[u0:u1] - s0
+        A = [np.add.reduceat(Wo[j, s0:s1, None] * cx, local, axis=0) for j in range(W.shape[0])]
+        B = [np.add.reduceat(Ws[j, s0:s1, None] * sx, local, axis=0) for j in range(W.shape[0])]
+        has_sin = np.flatnonzero(np.any([np.any(b != 0.0, axis=1) for b in B], axis=0))
+        ws = wu[u0:u1]
+        bt = max(1, _MAX_TILE // (u1 - u0))
+        for t0 in range(0, t.size, bt):
+            tb = t[t0:t0 + bt]
+            ct = np.cos(np.outer(tb, ws))
+            st = np.sin(np.outer(tb, ws[has_sin])) if has_sin.size else None
+            for j in range(W.shape[0]):
+                out[j, t0:t0 + bt] += ct @ A[j]
+                if st is not None:
+                    out[j, t0:t0 + bt] += st @ B[j][has_sin]
+    return out
+
+
+def _fft_sum(t, x, dx, k, w, W):
+    """Same sum for uniform x via a chirp-z transform over the (uniform) k grid.
+
+    The k = 0 mode is constant in x and is added separately, so an infinite
+    weight there (phi at m = 0) gives inf rather than spreading NaN through the
+    transform.
+    """
+    from scipy.signal import czt
+
+    zero = k == 0
+    W0, w0 = W[:, zero], w[zero]
+    W = np.where(zero, 0.0, W)
+    dk = float(k[1] - k[0])
+    n = np.arange(k.size)
+    pre = np.exp(1j * n * dk * x[0])  # e^{i (k - k0) x0}
+    post = np.exp(1j * k[0] * x)  # e^{i k0 x}
+    out = np.empty((W.shape[0], t.size, x.size))
+    bt = max(1, _MAX_TILE // max(1, k.size))
+    for t0 in range(0, t.size, bt):
+        ph = np.exp(-1j * np.outer(t[t0:t0 + bt], w)) * pre
+        c0 = np.cos(np.outer(t[t0:t0 + bt], w0))
+        for j in range(W.shape[0]):
+            z = czt(ph * W[j], m=x.size, w=np.exp(1j * dk * dx), a=1.0, axis=-1)
+            out[j, t0:t0 + bt] = (z * post).real + (c0 @ W0[j])[:, None]
+    return out
+
+
+def correlator_grid(
+    t: Union[float, Iterable[float]],
+    x: Union[float, Iterable[float]],
+    cfg: SimConfig,
+    dp: DiscreteParams,
+    *,
+    kind: Union[CorrelatorKind, Sequence[CorrelatorKind]] = "phi",
+    method: Literal["auto", "direct", "fft"] = "auto",
+    mode_block: int = 4096,
+) -> np.ndarray:
+    """Vacuum mode-sum correlators on a whole (t, x) grid, shape (len(t), len(x)).
+
+    kind "phi": <phi(t,x) phi(0,0)> = (1/L) sum_k cos(kx - wt) / (2w);
+    kind "pi":  <pi(t,x) pi(0,0)>   = (1/L) sum_k w cos(kx - wt) / 2.
+    A sequence of kinds returns a stacked (n_kinds, nt, nx) array sharing the trig work.
+
+    "direct" splits cos(kx - wt) into cos/sin products, folds +-k pairs and
+    accumulates matrix products over blocks of at most ``mode_block`` |k| groups
+    and time blocks sized to keep each tile near 4M elements, so memory is
+    O(nt*nx + tile) rather than O(K*nt*nx).
+    "fft" (uniform x, uniform k) uses a chirp-z transform per time row,
+    O(nt K log K).  "auto" picks fft for uniform x grids with >= 64 points.
+    """
+    kinds = (kind,) if isinstance(kind, str) else tuple(kind)
+    t = np.atleast_1d(np.asarray(t, dtype=float))
+    x = np.atleast_1d(np.asarray(x, dtype=float))
+    tab = mode_table(cfg, dp)
+    k, w = tab.k, tab.w
+    W = _mode_weights(kinds, w) / cfg.L
+    dx = _uniform_step(x)
+    if method == "auto":
+        method = "fft" if dx is not None and x.size >= 64 and k.size > 1 else "direct"
+    if method == "fft":
+        if dx is None or k.size < 2:
+            raise ValueError("fft method needs a uniform x grid and at least two modes")
+        out = _fft_sum(t, x, dx, k, w, W)
+    elif method == "direct":
+        out = _direct_sum(t, x, tab, W, max(1, int(mode_block)))
+    else:
+        raise ValueError(f"Unknown method: {method!r}")
+    return out[0] if isinstance(kind, str) else out
+
+
+def _wightman(t: float, x: np.ndarray, cfg: SimConfig, dp: DiscreteParams) -> np.ndarray:
+    """Discrete-mode approximation to <phi(t,x) phi(0,0)> in vacuum."""
     # (1/L) sum_k (e^{i(kx - wt)})/(2w)
-    return (np.cos(phase) / (2.0 * w[:, None])).sum(axis=0) / cfg.L
+    return correlator_grid(t, x, cfg, dp, kind="phi", method="direct")[0]
 
 
 def _pi_pi(t: float, x: np.ndarray, cfg: SimConfig, dp: DiscreteParams) -> np.ndarray:
     """Discrete-mode approximation to <pi(t,x) pi(0,0)> with pi=dot(phi)."""
-    k = _k_grid(cfg, dp)
-    w = _omega(k, dp)
-    phase = np.outer(k, x) - (w[:, None] * t)
-    return ((w[:, None] * np.cos(phase)) / 2.0).sum(axis=0) / cfg.L
+    return correlator_grid(t, x, cfg, dp, kind="pi", method="direct")[0]
 def _add_noise(y: np.ndarray, noise: NoiseModel) -> Tuple[np.ndarray, np.ndarray]:
     rng = np.random.default_rng(noise.seed)
     eps = rng.normal(0.0, noise.sigma, size=y.shape)
@@ -120,7 +280,7 @@ def simulate_time_correlator(
     noise: Optional[NoiseModel] = None,
 ) -> Dict[str, Any]:
     t = np.asarray(list(t), dtype=float)
-    y = np.array([_wightman(float(tt), np.array([x]), cfg, dp)[0] for tt in t], dtype=float)
+    y = correlator_grid(t, [x], cfg, dp, kind="phi", method="direct")[:, 0]
     if noise is not None:
         y, yerr = _add_noise(y, noise)
     else:
@@ -160,8 +320,7 @@ def simulate_logneg_two_mode(
     (q1,p1,q2,p2). Partial transpose corresponds to p2 -> -p2.
     """
     xs = np.array([0.0, abs(x2 - x1)], dtype=float)
-    qq = _wightman(0.0, xs, cfg, dp)
-    pp = _pi_pi(0.0, xs, cfg, dp)
+    qq, pp = correlator_grid(0.0, xs, cfg, dp, kind=("phi", "pi"), method="direct")[:, 0]
     # Covariance matrix: V_ij = <{R_i,R_j}>/2 with cross qp set to 0 (vacuum, equal time)
     V = np.zeros((4, 4), dtype=float)
     V[0, 0] = qq[0]
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+
+def _reference(t, x, cfg, dp, kind):
+    import dgpipe.simulations as sim
+
+    k = sim._k_grid(cfg, dp)
+    w = sim._omega(k, dp)
+    phase = np.outer(k, x) - w[:, None] * t
+    weight = 1.0 / (2.0 * w) if kind == "phi" else w / 2.0
+    return (weight[:, None] * np.cos(phase)).sum(axis=0) / cfg.L
+
+
+@pytest.mark.parametrize("k_cut", [None, 2.0])
+@pytest.mark.parametrize("method", ["direct", "fft"])
+def test_correlator_grid_matches_dense_mode_sum(method, k_cut):
+    import dgpipe.simulations as sim
+
+    cfg = sim.SimConfig(L=64.0, N_modes=256, k_cut=k_cut)
+    dp = sim.DiscreteParams(a=0.1, alpha=0.2, power=2, m=0.1)
+    t = np.linspace(0.0, 5.0, 9)
+    x = np.linspace(-3.0, 7.0, 80)
+    out = sim.correlator_grid(t, x, cfg, dp, kind=("phi", "pi"), method=method, mode_block=7)
+    assert out.shape == (2, t.size, x.size)
+    for j, kind in enumerate(("phi", "pi")):
+        ref = np.array([_reference(tt, x, cfg, dp, kind) for tt in t])
+        np.testing.assert_allclose(out[j], ref, rtol=0, atol=1e-11 * np.abs(ref).max())
+
+
+def test_time_correlator_uses_cached_modes_and_matches_reference():
+    import dgpipe.simulations as sim
+
+    cfg = sim.SimConfig(L=32.0, N_modes=128)
+    dp = sim.DiscreteParams(a=0.5, alpha=0.1, power=2, m=0.2)
+    t = np.linspace(0.0, 3.0, 25)
+    out = sim.simulate_time_correlator(t, x=0.7, cfg=cfg, dp=dp)
+    ref = [_reference(tt, np.array([0.7]), cfg, dp, "phi")[0] for tt in t]
+    np.testing.assert_allclose(out["y"], ref, rtol=0, atol=1e-13)
+    assert sim.mode_table(cfg, dp) is sim.mode_table(cfg, dp)
+
+
+def test_fft_method_requires_uniform_grid():
+    import dgpipe.simulations as sim
+
+    with pytest.raises(ValueError):
+        sim.correlator_grid(0.0, [0.0, 0.5, 2.0], sim.SimConfig(), sim.DiscreteParams(), method="fft")
+
+
+@pytest.mark.parametrize("method", ["direct", "fft"])
+def test_massless_zero_mode_matches_dense_mode_sum(method):
+    import dgpipe.simulations as sim
+
+    cfg = sim.SimConfig(L=64.0, N_modes=256)
+    dp = sim.DiscreteParams(a=0.1, alpha=0.2, power=2, m=0.0)
+    t = np.linspace(0.0, 5.0, 9)
+    x = np.linspace(-3.0, 7.0, 80)
+    with np.errstate(divide="ignore"):
+        out = sim.correlator_grid(t, x, cfg, dp, kind=("phi", "pi"), method=method, mode_block=7)
+        ref = [np.array([_reference(tt, x, cfg, dp, kind) for tt in t]) for kind in ("phi", "pi")]
+    assert np.all(np.isposinf(out[0])) and np.all(np.isposinf(ref[0]))
+    np.testing.assert_allclose(out[1], ref[1], rtol=0, atol=1e-11 * np.abs(ref[1]).max())
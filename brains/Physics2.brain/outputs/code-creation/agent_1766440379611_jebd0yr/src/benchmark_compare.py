@@ -183,13 +183,17 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     p.add_argument("--tolerances", help="JSON object of tolerances keyed by path/name/'*'.")
     p.add_argument("--seed", type=int, default=0, help="Seed for deterministic tie-breaking.")
     p.add_argument("--diff", action="store_true", help="Print JSON diff on mismatch.")
+    p.add_argument("--stream", action="store_true", help="Compare incrementally without loading either file.")
+    p.add_argument("--max-diffs", type=int, default=None, help="Stop after this many diffs (implies --stream).")
     args = p.parse_args(list(argv) if argv is not None else None)
 
-    actual = load_json(args.actual_json)
-    expected = load_json(args.expected_json)
     tolerances = json.loads(args.tolerances) if args.tolerances else None
+    if args.stream or args.max_diffs is not None:
+        from stream_compare import stream_diff
 
-    d = diff(actual, expected, tolerances, seed=args.seed)
+        d = stream_diff(args.actual_json, args.expected_json, tolerances, seed=args.seed, max_diffs=args.max_diffs)
+    else:
+        d = diff(load_json(args.actual_json), load_json(args.expected_json), tolerances, seed=args.seed)
     ok = not d
     if not ok and args.diff:
         print(json.dumps(d, indent=2, sort_keys=True))
@@ -56,7 +56,8 @@ def _path_last(path: str) -> str:
     # path format like $.a[0].b
     for sep in (".", "]"):
         path = path.replace(sep, ".")
-    return [p for p in path.split(".") if p and p != "$"][-1] if path else 
+    parts = [p for p in path.split(".") if p and p != "$"]
+    return parts[-1] if parts else ""
 def resolve_tolerance(
     path: str, tolerances: Optional[Mapping[str, Any]] = None, default: Tolerance = Tolerance()
 ) -> Tolerance:
@@ -0,0 +1,506 @@
+"""Streaming tolerance diff for large benchmark JSON outputs.
+
+Same structured-diff semantics as ``benchmark_compare.diff`` (tolerance resolution,
+sorted object keys, list length checks, identifier-based list alignment), but the
+two documents are read incrementally side by side instead of being loaded whole:
+
+- the tolerance mapping is compiled once into a ``TolerancePolicy`` whose path
+  prefixes form a trie, so exact-path lookups cost one set probe per step and stop
+  as soon as no tolerance key can match below a node;
+- object members and array elements are compared as they are parsed; only
+  subtrees that cannot be aligned in stream order (keys in different order, lists
+  aligned by identifier, type mismatches) are materialized;
+- runs of numbers inside arrays are parsed and compared in bulk with NumPy;
+- ``max_diffs`` / ``on_diff`` report the first diffs as soon as their position in
+  the output order is settled and stop parsing once enough were found.
+
+Output matches ``diff()`` entry for entry.  Order matches too when object keys
+appear sorted (as written with ``sort_keys=True``); objects whose keys arrive
+unsorted after some of their members were reported may list the rest in a
+different order.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, IO, List, Mapping, Optional, Sequence, Tuple, Union
+import argparse
+import json
+import re
+
+import numpy as np
+
+from benchmark_compare import Tolerance, _path_last, diff as memory_diff, numeric_close, _is_number
+
+_WS = re.compile(r"[ \t\n\r]*")
+_NUM = r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|NaN|-?Infinity"
+_RUN = re.compile(rf"(?:{_NUM})(?:[ \t\n\r]*,[ \t\n\r]*(?:{_NUM}))*")
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"')
+_NUM_START = frozenset("-0123456789NI")
+_ID_KEYS = ("id", "name", "key", "observable")
+
+Path = Tuple[str, ...]
+Diff = Dict[str, Any]
+
+
+def _render(path: Path) -> str:
+    return "".join(path)
+
+
+class TolerancePolicy:
+    """Tolerance mapping compiled for incremental path resolution.
+
+    Resolution order is that of ``resolve_tolerance``: exact path, last path
+    segment, ``"*"``, default.  A traversal node is the current path string while it
+    is still a prefix of some exact-path key (the trie of key prefixes), else None.
+    """
+
+    def __init__(self, tolerances: Optional[Mapping[str, Any]] = None, default: Tolerance = Tolerance()):
+        self.raw = dict(tolerances or {})
+        self.tols = {k: Tolerance.coerce(v) for k, v in self.raw.items()}
+        self.default = default
+        self.fallback = self.tols.get("*", default)
+        self.prefixes = {k[:i] for k in self.tols for i in range(1, len(k) + 1)}
+        self.index_keys = {int(k): t for k, t in self.tols.items() if k.isdigit()}
+
+    def root(self, path: str) -> Optional[str]:
+        return path if path in self.prefixes else None
+
+    def child(self, node: Optional[str], fragment: str) -> Optional[str]:
+        if node is None:
+            return None
+        s = node + fragment
+        return s if s in self.prefixes else None
+
+    def leaf(self, node: Optional[str], last: str) -> Tolerance:
+        if not self.tols:
+            return self.default
+        if node is not None and node in self.tols:
+            return self.tols[node]
+        if last and last in self.tols:
+            return self.tols[last]
+        return self.fallback
+
+    def index_tolerances(self, node: Optional[str], start: int, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-element (atol, rtol) arrays for elements start..start+n-1 of an array."""
+        atol = np.full(n, self.fallback.atol)
+        rtol = np.full(n, self.fallback.rtol)
+        overrides: Dict[int, Tolerance] = {i: t for i, t in self.index_keys.items() if start <= i < start + n}
+        if node is not None:
+            head = node + "["
+            for k, t in self.tols.items():
+                if k.startswith(head) and k.endswith("]") and k[len(head):-1].isdigit():
+                    i = int(k[len(head):-1])
+                    if start <= i < start + n:
+                        overrides[i] = t
+        for i, t in overrides.items():
+            atol[i - start], rtol[i - start] = t.atol, t.rtol
+        return atol, rtol
+
+
+class JsonStream:
+    """Incremental pull parser over a text stream (one value at a time)."""
+
+    LOOKAHEAD = 64  # chars kept past a token so truncated numbers are never accepted
+
+    def __init__(self, fp: IO[str], chunk_size: int = 1 << 20):
+        self.fp = fp
+        self.chunk = int(chunk_size)
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self._dec = json.JSONDecoder()
+
+    def _fill(self, n: Optional[int] = None) -> None:
+        data = self.fp.read(n or self.chunk)
+        if not data:
+            self.eof = True
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+
+    def _ensure(self, n: int) -> None:
+        while not self.eof and len(self.buf) - self.pos < n:
+            self._fill()
+
+    def _error(self, what: str) -> ValueError:
+        return ValueError(f"malformed JSON: expected {what} near {self.buf[self.pos:self.pos + 32]!r}")
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if self.eof:
+                return ""
+            self._fill()
+
+    def expect(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise self._error(repr(ch))
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Parse and return the next complete value."""
+        self.peek()
+        while True:
+            self._ensure(self.LOOKAHEAD)
+            try:
+                v, end = self._dec.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self._fill(max(self.chunk, len(self.buf) - self.pos))
+                continue
+            if not self.eof and end > len(self.buf) - self.LOOKAHEAD:
+                self._fill(max(self.chunk, len(self.buf) - self.pos))
+                continue
+            self.pos = end
+            return v
+
+    def key(self, first: bool) -> Optional[str]:
+        """Next object key (consuming ',' and ':'), or None after the closing '}'."""
+        c = self.peek()
+        if c == "}":
+            self.pos += 1
+            return None
+        if not first:
+            self.expect(",")
+            self.peek()
+        while True:
+            m = _STRING.match(self.buf, self.pos)
+            if m is not None and (self.eof or m.end() < len(self.buf)):
+                break
+            if self.eof:
+                raise self._error("object key")
+            self._fill(max(self.chunk, len(self.buf) - self.pos))
+        tok = m.group()
+        self.pos = m.end()
+        self.expect(":")
+        return json.loads(tok) if "\\" in tok else tok[1:-1]
+
+    def array_next(self, first: bool) -> bool:
+        """Position at the next array element; False (consuming ']') at the end."""
+        c = self.peek()
+        if c == "]":
+            self.pos += 1
+            return False
+        if not first:
+            self.expect(",")
+        return True
+
+    def at_number(self) -> bool:
+        return self.peek() in _NUM_START
+
+    def number_run(self) -> Tuple[np.ndarray, List[str]]:
+        """Consume a run of consecutive numeric array elements (at least one).
+
+        Stops before a non-numeric element, the closing ']' or the buffer edge;
+        returns the values and their source tokens.
+        """
+        self.peek()
+        while True:
+            self._ensure(self.LOOKAHEAD)
+            m = _RUN.match(self.buf, self.pos)
+            if m is None:
+                raise self._error("number")
+            text = m.group()
+            if not self.eof and m.end() > len(self.buf) - self.LOOKAHEAD:
+                cut = text.rfind(",")  # the number after the last comma may be truncated
+                if cut <= 0:
+                    self._fill(max(self.chunk, len(self.buf) - self.pos))
+                    continue
+                text = text[:cut]
+            self.pos += len(text)
+            toks = text.split(",")
+            return np.array([float(t) for t in toks], dtype=float), toks
+
+
+class _Cursor:
+    """Element cursor over one array, with a carry of already-parsed numbers."""
+
+    __slots__ = ("lex", "first", "at_elem", "done", "vals", "toks", "ci")
+
+    def __init__(self, lex: JsonStream):
+        self.lex = lex
+        self.first = True
+        self.at_elem = False
+        self.done = False
+        self.vals: np.ndarray = np.empty(0)
+        self.toks: List[str] = []
+        self.ci = 0
+
+    def carry(self) -> int:
+        return len(self.toks) - self.ci
+
+    def has_next(self) -> bool:
+        if self.carry() or self.at_elem:
+            return True
+        if self.done:
+            return False
+        ok = self.lex.array_next(self.first)
+        self.first = False
+        self.at_elem = ok
+        self.done = not ok
+        return ok
+
+    def peek(self) -> str:
+        return "0" if self.carry() else self.lex.peek()
+
+    def is_number(self) -> bool:
+        return bool(self.carry()) or self.lex.at_number()
+
+    def numbers(self) -> Tuple[np.ndarray, List[str]]:
+        if not self.carry():
+            self.vals, self.toks = self.lex.number_run()
+            self.ci = 0
+            self.at_elem = False
+        return self.vals[self.ci:], self.toks[self.ci:]
+
+    def consume(self, n: int) -> None:
+        self.ci += n
+
+    def take(self) -> Any:
+        if self.carry():
+            tok = self.toks[self.ci]
+            self.ci += 1
+            return json.loads(tok)
+        self.at_elem = False
+        return self.lex.value()
+
+    def rest(self) -> List[Any]:
+        out = []
+        while self.has_next():
+            out.append(self.take())
+        return out
+
+    def skip_count(self) -> int:
+        n = 0
+        while self.has_next():
+            if self.is_number():
+                vals, _ = self.numbers()
+                n += len(vals)
+                self.consume(len(vals))
+            else:
+                self.take()
+                n += 1
+        return n
+
+
+class _Stop(Exception):
+    pass
+
+
+class _Engine:
+    def __init__(self, tolerances: Optional[Mapping[str, Any]], seed: int,
+                 max_diffs: Optional[int], on_diff: Optional[Callable[[Diff], None]]):
+        self.tolerances = tolerances
+        self.policy = TolerancePolicy(tolerances)
+        self.seed = seed
+        self.max_diffs = max_diffs
+        self.on_diff = on_diff
+        self.out: List[Diff] = []
+
+    # -- sinks ---------------------------------------------------------------
+    def emit(self, d: Diff) -> None:
+        self.out.append(d)
+        if self.on_diff is not None:
+            self.on_diff(d)
+        if self.max_diffs is not None and len(self.out) >= self.max_diffs:
+            raise _Stop
+
+    def _budget(self) -> Optional[int]:
+        return None if self.max_diffs is None else self.max_diffs - len(self.out)
+
+    # -- leaves ----------------------------------------------------------------
+    def _last(self, path: Path) -> str:
+        """``_path_last`` of the rendered path, without rendering it in the common cases."""
+        frag = path[-1]
+        if len(path) > 1 and frag[0] == "[":
+            return frag[1:-1]
+        if len(path) > 1 and frag[1:] and frag[1:] != "$" and not any(c in frag[1:] for c in ".[]"):
+            return frag[1:]
+        return _path_last(_render(path))
+
+    def memory(self, a: Any, e: Any, path: Path, node: Optional[str], sink: Callable[[Diff], None]) -> None:
+        if _is_number(a) and _is_number(e):
+            tol = self.policy.leaf(node, self._last(path))
+            if not numeric_close(a, e, tol):
+                sink({"path": _render(path), "actual": a, "expected": e, "atol": tol.atol, "rtol": tol.rtol})
+            return
+        if isinstance(a, (dict, list)) or isinstance(e, (dict, list)):
+            for d in memory_diff(a, e, self.tolerances, seed=self.seed, path=_render(path)):
+                sink(d)
+            return
+        if a != e:
+            sink({"path": _render(path), "actual": a, "expected": e})
+
+    # -- streaming -------------------------------------------------------------
+    def value(self, A: JsonStream, B: JsonStream, path: Path, node: Optional[str],
+              sink: Callable[[Diff], None]) -> None:
+        ca, cb = A.peek(), B.peek()
+        if ca == "{" and cb == "{":
+            self.obj(A, B, path, node, sink)
+        elif ca == "[" and cb == "[":
+            self.arr(A, B, path, node, sink)
+        else:
+            self.memory(A.value(), B.value(), path, node, sink)
+
+    def obj(self, A: JsonStream, B: JsonStream, path: Path, node: Optional[str],
+            sink: Callable[[Diff], None]) -> None:
+        A.expect("{")
+        B.expect("{")
+        ka, kb = A.key(True), B.key(True)
+        pend_a: Dict[str, Any] = {}
+        pend_b: Dict[str, Any] = {}
+        held: Optional[Dict[str, List[Diff]]] = None  # per-key diffs once order is unsettled
+        last: Optional[str] = None
+        while ka is not None or kb is not None:
+            if ka is not None and ka == kb:
+                k = ka
+                if held is None and (last is None or k > last):
+                    child = sink
+                    last = k
+                else:
+                    held = {} if held is None else held
+                    child = held.setdefault(k, []).append
+                frag = "." + k
+                self.value(A, B, path + (frag,), self.policy.child(node, frag), child)
+                ka, kb = A.key(False), B.key(False)
+                continue
+            held = {} if held is None else held
+            if kb is None or (ka is not None and ka < kb):
+                v, k, own, other = A.value(), ka, pend_a, pend_b
+                ka = A.key(False)
+            else:
+                v, k, own, other = B.value(), kb, pend_b, pend_a
+                kb = B.key(False)
+            if k in other:
+                a, e = (v, other.pop(k)) if own is pend_a else (other.pop(k), v)
+                frag = "." + k
+                self.memory(a, e, path + (frag,), self.policy.child(node, frag), held.setdefault(k, []).append)
+            else:
+                own[k] = v
+        if held is None:
+            return
+        for k, v in pend_a.items():
+            held[k] = [{"path": _render(path + ("." + k,)), "actual": v, "expected": None, "missing": "expected"}]
+        for k, v in pend_b.items():
+            held[k] = [{"path": _render(path + ("." + k,)), "actual": None, "expected": v, "missing": "actual"}]
+        for k in sorted(held):
+            for d in held[k]:
+                sink(d)
+
+    def arr(self, A: JsonStream, B: JsonStream, path: Path, node: Optional[str],
+            sink: Callable[[Diff], None]) -> None:
+        A.expect("[")
+        B.expect("[")
+        ca, cb = _Cursor(A), _Cursor(B)
+        held: List[Diff] = []
+        budget = self._budget()
+        i = 0
+        while ca.has_next() and cb.has_next():
+            if budget is not None and len(held) >= budget:
+                break  # enough diffs: only the lengths still matter
+            if ca.is_number() and cb.is_number():
+                va, ta = ca.numbers()
+                vb, tb = cb.numbers()
+                n = min(len(va), len(vb))
+                self._bulk(va[:n], vb[:n], ta, tb, i, path, node, held.append)
+                ca.consume(n)
+                cb.consume(n)
+                i += n
+                continue
+            pa, pb = ca.peek(), cb.peek()
+            frag = f"[{i}]"
+            if i == 0 and pa == "{" and pb == "{":
+                a0, e0 = ca.take(), cb.take()
+                if any(k in a0 and k in e0 for k in _ID_KEYS):
+                    # identifier-aligned list: needs the whole list, as diff() does
+                    self.memory([a0] + ca.rest(), [e0] + cb.rest(), path, node, sink)
+                    return
+                self.memory(a0, e0, path + (frag,), self.policy.child(node, frag), held.append)
+            elif pa == pb and pa in "{[":
+                ca.at_elem = cb.at_elem = False
+                self.value(A, B, path + (frag,), self.policy.child(node, frag), held.append)
+            else:
+                self.memory(ca.take(), cb.take(), path + (frag,), self.policy.child(node, frag), held.append)
+            i += 1
+        na, nb = i + ca.skip_count(), i + cb.skip_count()
+        if na != nb:
+            sink({"path": _render(path), "actual_len": na, "expected_len": nb})
+            return
+        for d in held:
+            sink(d)
+
+    def _bulk(self, a: np.ndarray, e: np.ndarray, ta: Sequence[str], tb: Sequence[str], start: int,
+              path: Path, node: Optional[str], sink: Callable[[Diff], None]) -> None:
+        if not a.size:
+            return
+        atol, rtol = self.policy.index_tolerances(node, start, a.size)
+        with np.errstate(invalid="ignore"):
+            close = np.abs(a - e) <= np.maximum(atol, rtol * np.maximum(np.abs(a), np.abs(e)))
+            inf = np.isinf(a) | np.isinf(e)
+            ok = (np.isnan(a) & np.isnan(e)) | np.where(inf, a == e, close)
+        for j in np.flatnonzero(~ok):
+            idx = start + int(j)
+            sink({"path": _render(path) + f"[{idx}]", "actual": json.loads(ta[j]),
+                  "expected": json.loads(tb[j]), "atol": float(atol[j]), "rtol": float(rtol[j])})
+
+
+def stream_diff(
+    actual: Union[str, IO[str]],
+    expected: Union[str, IO[str]],
+    tolerances: Optional[Mapping[str, Any]] = None,
+    *,
+    seed: int = 0,
+    path: str = "$",
+    max_diffs: Optional[int] = None,
+    on_diff: Optional[Callable[[Diff], None]] = None,
+    chunk_size: int = 1 << 20,
+) -> List[Diff]:
+    """Structured diff of two JSON documents (file paths or text streams).
+
+    Returns the same entries as ``benchmark_compare.diff`` on the loaded documents.
+    With ``max_diffs`` parsing stops after that many diffs have been reported;
+    ``on_diff`` is called with each diff as soon as it is reported.
+    """
+    eng = _Engine(tolerances, seed, max_diffs, on_diff)
+    opened: List[IO[str]] = []
+
+    def _open(src: Union[str, IO[str]]) -> IO[str]:
+        if isinstance(src, str):
+            fp = open(src, "r", encoding="utf-8")
+            opened.append(fp)
+            return fp
+        return src
+
+    try:
+        A = JsonStream(_open(actual), chunk_size)
+        B = JsonStream(_open(expected), chunk_size)
+        eng.value(A, B, (path,), eng.policy.root(path), eng.emit)
+    except _Stop:
+        pass
+    finally:
+        for fp in opened:
+            fp.close()
+    return eng.out
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Streaming comparison of large benchmark JSON outputs.")
+    p.add_argument("actual_json")
+    p.add_argument("expected_json")
+    p.add_argument("--tolerances", help="JSON object of tolerances keyed by path/name/'*'.")
+    p.add_argument("--seed", type=int, default=0, help="Seed for deterministic tie-breaking.")
+    p.add_argument("--max-diffs", type=int, default=None, help="Stop after this many diffs.")
+    p.add_argument("--diff", action="store_true", help="Print diffs as JSON lines as they are found.")
+    args = p.parse_args(list(argv) if argv is not None else None)
+
+    tolerances = json.loads(args.tolerances) if args.tolerances else None
+    show = (lambda d: print(json.dumps(d, sort_keys=True), flush=True)) if args.diff else None
+    d = stream_diff(args.actual_json, args.expected_json, tolerances, seed=args.seed,
+                    max_diffs=args.max_diffs, on_diff=show)
+    return 0 if not d else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
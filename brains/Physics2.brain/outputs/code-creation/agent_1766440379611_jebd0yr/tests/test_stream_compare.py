@@ -0,0 +1,109 @@
+import io
+import json
+import math
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import benchmark_compare  # noqa: E402
+import numeric_compare  # noqa: E402
+from stream_compare import stream_diff  # noqa: E402
+
+SPECIAL = [0.0, -0.0, 1e-300, 1e300, math.inf, -math.inf, math.nan]
+
+
+def _doc(rng, depth=0):
+    r = rng.random()
+    if depth > 3 or r < 0.3:
+        return rng.choice([rng.uniform(-10, 10), rng.randint(-5, 5), rng.choice(SPECIAL), "s", None, True])
+    if r < 0.55:
+        return [rng.uniform(-1, 1) for _ in range(rng.randint(0, 12))] + [_doc(rng, depth + 1)] * rng.randint(0, 1)
+    if r < 0.7:
+        return [{"id": f"k{i}", "v": rng.uniform(0, 1), "w": [rng.random(), rng.choice(SPECIAL)]}
+                for i in rng.sample(range(8), rng.randint(1, 5))]
+    return {f"{c}{rng.randint(0, 9)}": _doc(rng, depth + 1) for c in rng.sample("abcdefgh", rng.randint(1, 5))}
+
+
+def _perturb(x, rng):
+    if isinstance(x, float) and math.isfinite(x) and rng.random() < 0.4:
+        return x * (1 + rng.choice([1e-9, 1e-6, 1e-3, -0.1])) + rng.choice([0.0, 1e-12])
+    if isinstance(x, float) and rng.random() < 0.1:
+        return rng.choice(SPECIAL)
+    if isinstance(x, list):
+        out = [_perturb(v, rng) for v in x]
+        if out and isinstance(out[0], dict) and "id" in out[0] and rng.random() < 0.5:
+            rng.shuffle(out)
+        if rng.random() < 0.1:
+            out.append(1.0)
+        if rng.random() < 0.05 and out and not isinstance(out[0], dict):
+            out[rng.randrange(len(out))] = "swapped"
+        return out
+    if isinstance(x, dict):
+        out = {k: _perturb(v, rng) for k, v in x.items() if rng.random() > 0.05}
+        if rng.random() < 0.1:
+            out["zz"] = [1, 2]
+        return out
+    return x
+
+
+def _canon(diffs):
+    return [json.dumps(d, sort_keys=True) for d in diffs]
+
+
+def _both(a, e, tol=None, **kw):
+    ref = benchmark_compare.diff(a, e, tol)
+    got = stream_diff(io.StringIO(json.dumps(a, sort_keys=True)), io.StringIO(json.dumps(e, sort_keys=True)), tol, **kw)
+    return got, ref
+
+
+TOLS = [None, {"*": 1e-6}, {"v": {"rtol": 1e-4}, "$.a1": 1e-2, "*": [0.0, 1e-8]}, {"2": 0.5, "w": 1e-3}]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_random_nested_documents_match_in_memory_diff(seed):
+    rng = random.Random(seed)
+    a = {"root": _doc(rng), "a1": _doc(rng), "b": [_doc(rng) for _ in range(3)]}
+    e = _perturb(a, rng)
+    for tol in TOLS:
+        got, ref = _both(a, e, tol, chunk_size=7 if seed % 2 else 1 << 20)
+        assert _canon(got) == _canon(ref)
+        if tol is None or "2" not in tol:  # numeric_compare has no index-key tolerances
+            assert _canon(got) == _canon(numeric_compare.diff(a, e, tol))
+    # keys written in arbitrary order: same entries, possibly in a different order
+    got = stream_diff(io.StringIO(json.dumps(a)), io.StringIO(json.dumps(dict(reversed(list(e.items()))))), {"*": 1e-6})
+    assert sorted(_canon(got)) == sorted(_canon(benchmark_compare.diff(a, e, {"*": 1e-6})))
+
+
+def test_tolerance_boundaries_and_resolution_order():
+    a = {"m": {"rmse": 1.0, "bias": 1.0, "mae": 1.0}, "v": [1.0, 2.0, 3.0, 4.0]}
+    e = {"m": {"rmse": 1.5, "bias": 1.25, "mae": 1.3}, "v": [1.0, 2.5, 3.1, 4.0 + 2.0**-20]}
+    tol = {"$.m.rmse": 0.5, "rmse": 0.0, "bias": {"rtol": 0.2}, "mae": [0.0, 0.2],
+           "$.v[1]": 0.5, "2": 0.05, "*": 2.0**-20}
+    got, ref = _both(a, e, tol)
+    assert _canon(got) == _canon(ref)
+    # differences equal to atol or rtol * max(|a|, |e|) pass; just above them fail
+    assert [d["path"] for d in got] == ["$.m.mae", "$.v[2]"]
+    assert got[1]["atol"] == 0.05
+
+
+def test_nan_and_infinity():
+    a = {"x": [math.nan, math.inf, -math.inf, 1.0, math.nan, math.inf], "y": math.nan, "z": math.inf}
+    e = {"x": [math.nan, math.inf, math.inf, math.nan, 2.0, 1e308], "y": math.nan, "z": -math.inf}
+    got, ref = _both(a, e, {"*": 1e300})
+    assert _canon(got) == _canon(ref)
+    assert [d["path"] for d in got] == ["$.x[2]", "$.x[3]", "$.x[4]", "$.x[5]", "$.z"]
+
+
+def test_max_diffs_reports_a_prefix_and_lengths_still_count():
+    a = {"a": list(range(100)), "b": [0] * 5}
+    e = {"a": [x + 1 for x in range(100)], "b": [0] * 6}
+    full = benchmark_compare.diff(a, e)
+    seen = []
+    got = stream_diff(io.StringIO(json.dumps(a)), io.StringIO(json.dumps(e)), max_diffs=3, on_diff=seen.append)
+    assert got == seen == full[:3]
+    got, ref = _both({"a": [1.0] * 50}, {"a": [2.0] * 49})
+    assert got == ref == [{"path": "$.a", "actual_len": 50, "expected_len": 49}]
@@ -0,0 +1,67 @@
+"""Benchmark claims_audit BM25 retrieval: per-claim ``query`` vs batched ``search_many``.
+
+  python scripts/bench_claims_retrieval.py --passages 200000 --claims 5000
+
+Builds a synthetic Zipf-distributed corpus, then times index build, ``query``
+over a sample of claims and ``search_many`` over all claims, and checks that
+both return the same rankings.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from claims_audit.retrieval import RetrievalEngine  # noqa: E402
+
+
+def _texts(rng: np.random.Generator, vocab: np.ndarray, n: int, length: int) -> list:
+    p = 1.0 / np.arange(1, len(vocab) + 1)
+    p /= p.sum()
+    words = vocab[rng.choice(len(vocab), size=(n, length), p=p)]
+    return [" ".join(row) for row in words]
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--passages", type=int, default=200_000)
+    ap.add_argument("--claims", type=int, default=5_000)
+    ap.add_argument("--passage-len", type=int, default=60)
+    ap.add_argument("--claim-len", type=int, default=12)
+    ap.add_argument("--vocab", type=int, default=50_000)
+    ap.add_argument("--top-k", type=int, default=5)
+    ap.add_argument("--sample", type=int, default=200, help="claims timed through query()")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    vocab = np.array([f"w{i}" for i in range(args.vocab)])
+    docs = [{"id": f"p{i:07d}", "text": t} for i, t in enumerate(_texts(rng, vocab, args.passages, args.passage_len))]
+    claims = _texts(rng, vocab, args.claims, args.claim_len)
+
+    t0 = time.perf_counter()
+    engine = RetrievalEngine("bm25").build(docs)
+    print(f"build      {time.perf_counter() - t0:8.2f} s  ({args.passages} passages, {engine._bm25_tf.nnz} postings)")
+
+    sample = claims[: args.sample]
+    t0 = time.perf_counter()
+    single = [engine.query(c, top_k=args.top_k) for c in sample]
+    t_q = (time.perf_counter() - t0) / max(1, len(sample))
+    print(f"query      {1e3 * t_q:8.2f} ms/claim")
+
+    t0 = time.perf_counter()
+    batch = engine.search_many(claims, top_k=args.top_k)
+    t_b = time.perf_counter() - t0
+    print(f"search_many{t_b:8.2f} s  ({1e3 * t_b / max(1, len(claims)):.2f} ms/claim, {len(claims)} claims)")
+    same = all([e.doc_id for e in a] == [e.doc_id for e in b] for a, b in zip(single, batch))
+    print(f"rankings identical on sample: {same}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
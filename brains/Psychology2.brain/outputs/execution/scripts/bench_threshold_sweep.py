@@ -0,0 +1,61 @@
+"""Benchmark the sort-and-cumsum threshold sweeps.
+
+  python scripts/bench_threshold_sweep.py --n 1000000
+
+Times ``calibration.sweep_thresholds`` / ``fit_threshold`` (one threshold per
+distinct score), a grouped curve over a fixed grid with bootstrap bands, and
+``threshold_sweep.sweep`` over per-claim dicts, on synthetic scored claims.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import threshold_sweep as TS  # noqa: E402
+from verifier_policy import calibration as C  # noqa: E402
+
+
+def _timed(label: str, fn):
+    t0 = time.perf_counter()
+    out = fn()
+    print(f"{label:<34}{time.perf_counter() - t0:8.3f} s")
+    return out
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--n", type=int, default=1_000_000)
+    ap.add_argument("--decimals", type=int, default=4, help="score rounding; sets the number of distinct thresholds")
+    ap.add_argument("--n-boot", type=int, default=1000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    scores = np.round(rng.random(args.n), args.decimals)
+    labels = (rng.random(args.n) < scores).astype(np.int64)
+    domains = rng.choice(["bio", "econ", "psych", "med"], size=args.n)
+
+    rows = _timed("sweep_thresholds", lambda: C.sweep_thresholds(labels, scores))
+    print(f"  {len(rows)} thresholds")
+    fit = _timed("fit_threshold (f1, min_precision)", lambda: C.fit_threshold(labels, scores, min_precision=0.7))
+    print(f"  threshold={fit.threshold:.4f}")
+
+    heldout = [{"score": s, "label": y, "domain": d} for s, y, d in zip(scores.tolist(), labels.tolist(), domains.tolist())]
+    grid = np.linspace(0.0, 1.0, 101)
+    _timed(f"sweep_curves by domain, {args.n_boot} boot",
+           lambda: C.sweep_curves(heldout, grid, group_key="domain", n_boot=args.n_boot, seed=args.seed))
+
+    records = [{"uncertainty": s, "risk_tier": d, "correct": bool(y)} for s, y, d in zip(scores.tolist(), labels.tolist(), domains.tolist())]
+    _timed("threshold_sweep.sweep (21 x 4)",
+           lambda: TS.sweep(records, [i / 20 for i in range(21)], [0.5, 0.8, 0.9, None]))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,15 +1,17 @@
 from __future__ import annotations
-import json, re, time, uuid, csv, os
-from dataclasses import dataclass, asdict
+import json, re, time, uuid, csv, os, threading
 from pathlib import Path
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError, URLError
+from urllib.parse import parse_qs, urlsplit
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from socketserver import ThreadingMixIn
 
-ROOT = Path('/Users/jtr/_JTR23_/COSMO/runtime/outputs/execution')
+from doi_pipeline import FAIL_INVALID, FAIL_NETWORK, FAIL_TIMEOUT, DOIResult
+from doi_resolver import DEFAULT_WORKERS, DOIResolver
+
+ROOT = Path(__file__).resolve().parents[1]
 OUT_CSV = ROOT / 'runtime/_build/tables/doi_results.csv'
 OUT_JSON = ROOT / 'runtime/_build/reports/doi_run_report.json'
+DOI_CACHE = ROOT / 'runtime/_build/cache/doi_responses.sqlite'
 
 DOI_TEST_SET = [
     {'doi':'10.1038/nphys1170','notes':'Nature Physics classic; should resolve'},
@@ -19,87 +21,70 @@ DOI_TEST_SET = [
     {'doi':'doi:10.1000/182','notes':'Example DOI format; may not resolve'},
 ]
 
-_DOI_RE = re.compile(r'^10\.\d{4,9}/\S+$', re.I)
-
 def _now_iso():
     return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
 
-def normalize_doi(s: str) -> str:
-    s = (s or '').strip()
-    s = re.sub(r'^doi:\s*', '', s, flags=re.I)
-    s = re.sub(r'^https?://(dx\.)?doi\.org/', '', s, flags=re.I)
-    return s.strip()
-
-def is_valid_doi(doi: str) -> bool:
-    return bool(_DOI_RE.match(doi or ''))
-
-def _http_json(url: str, headers=None, timeout=15):
-    req = Request(url, headers=headers or {'Accept':'application/json','User-Agent':'cosmo-doi-test/1.0'})
-    with urlopen(req, timeout=timeout) as r:
-        return r.getcode(), json.loads(r.read().decode('utf-8', errors='replace'))
-
-def _crossref(doi: str):
-    url = f'https://api.crossref.org/works/{doi}'
-    code, data = _http_json(url)
-    item = (data or {}).get('message') or {}
-    title = (item.get('title') or [''])[0] if isinstance(item.get('title'), list) else (item.get('title') or '')
-    year = None
-    for key in ('published-print','published-online','issued','created'):
-        dp = (item.get(key) or {}).get('date-parts')
-        if isinstance(dp, list) and dp and isinstance(dp[0], list) and dp[0]:
-            year = dp[0][0]
-            break
-    return {'provider':'crossref','http_status':code,'title':title,'year':year,'url':item.get('URL')}
-
-def _datacite(doi: str):
-    url = f'https://api.datacite.org/dois/{doi}'
-    code, data = _http_json(url)
-    attr = ((data or {}).get('data') or {}).get('attributes') or {}
-    titles = attr.get('titles') or []
-    title = ''
-    if isinstance(titles, list) and titles:
-        title = (titles[0] or {}).get('title') or ''
-    year = attr.get('publicationYear')
-    urlv = attr.get('url') or (attr.get('doi') and f'https://doi.org/{attr.get("doi")}') or ''
-    return {'provider':'datacite','http_status':code,'title':title,'year':year,'url':urlv}
-
-def resolve_doi(doi_raw: str):
-    normalized = normalize_doi(doi_raw)
-    base = {'doi': doi_raw, 'normalized_doi': normalized, 'ok': False, 'provider': None,
-            'status': 'failed', 'reason': None, 'title': '', 'year': None, 'url': '', 'http_status': None}
-    if not normalized:
-        base.update(reason='invalid_doi:empty')
-        return base
-    if not is_valid_doi(normalized):
-        base.update(reason='invalid_doi:regex_mismatch')
+_RESOLVER = None
+_RESOLVER_LOCK = threading.Lock()
+
+def _resolver():
+    # One resolver per process: its connection pool, host rate limits and cache are shared by every run.
+    global _RESOLVER
+    with _RESOLVER_LOCK:
+        if _RESOLVER is None:
+            _RESOLVER = DOIResolver(workers=int(os.environ.get('DOI_WORKERS', DEFAULT_WORKERS)),
+                                    cache=os.environ.get('DOI_CACHE_PATH') or DOI_CACHE)
+        return _RESOLVER
+
+def _year(md: dict):
+    # Crossref records carry date-parts, DataCite a "published" year string.
+    pub = md.get('published') or {}
+    dp = pub.get('date-parts') if isinstance(pub, dict) else None
+    if isinstance(dp, list) and dp and isinstance(dp[0], list) and dp[0]:
+        return dp[0][0]
+    m = re.match(r'\d{4}', str(pub.get('published') or '') if isinstance(pub, dict) else '')
+    return int(m.group(0)) if m else None
+
+def _row(doi_raw: str, res: DOIResult) -> dict:
+    base = {'doi': doi_raw, 'normalized_doi': res.doi or '', 'ok': res.ok, 'provider': res.provider,
+            'status': 'success' if res.ok else 'failed', 'reason': 'resolved', 'title': '', 'year': None,
+            'url': '', 'http_status': None}
+    if res.ok:
+        md = res.metadata
+        base.update(title=md.get('title') or '', year=_year(md), url=md.get('url') or '',
+                    http_status=res.attempts[-1].http_status)
         return base
-    providers = [_crossref, _datacite]
-    last_err = None
-    for fn in providers:
-        try:
-            r = fn(normalized)
-            base.update(provider=r.get('provider'), http_status=r.get('http_status'),
-                        title=r.get('title') or '', year=r.get('year'), url=r.get('url') or '')
-            base.update(ok=True, status='success', reason='resolved')
-            return base
-        except HTTPError as e:
-            code = getattr(e, 'code', None)
-            base.update(provider=getattr(fn, '__name__', 'provider').lstrip('_'), http_status=code)
-            if code in (404, 410):
-                last_err = f'not_found:http_{code}'
-            elif code in (429,):
-                last_err = f'rate_limited:http_{code}'
-            else:
-                last_err = f'http_error:http_{code}'
-        except URLError as e:
-            last_err = f'network_error:{getattr(e, "reason", e)}'
-        except TimeoutError:
-            last_err = 'timeout'
-        except Exception as e:
-            last_err = f'parse_or_unknown_error:{type(e).__name__}'
-    base.update(reason=last_err or 'unresolved')
+    # As in the original sequential resolver: provider/http_status come from the last HTTP error,
+    # the reason from the last provider tried.
+    for a in res.attempts:
+        if a.http_status:
+            base.update(provider=a.provider, http_status=a.http_status)
+    base.update(reason=_reason(res))
     return base
 
+def _reason(res: DOIResult) -> str:
+    # Reason strings of the original single-DOI resolver; see docs/doi_test_set_and_provenance.md.
+    if res.category == FAIL_INVALID:
+        return 'invalid_doi:empty' if not res.doi else 'invalid_doi:regex_mismatch'
+    if not res.attempts:
+        return 'unresolved'
+    last = res.attempts[-1]
+    code = last.http_status
+    if code and not 200 <= code < 300:
+        if code in (404, 410):
+            return f'not_found:http_{code}'
+        if code == 429:
+            return f'rate_limited:http_{code}'
+        return f'http_error:http_{code}'
+    if last.category == FAIL_TIMEOUT:
+        return 'timeout'
+    if last.category == FAIL_NETWORK:
+        return f'network_error:{last.reason}'
+    return f'parse_or_unknown_error:{last.reason}'
+
+def resolve_doi(doi_raw: str):
+    return _row(doi_raw, _resolver().resolve(doi_raw))
+
 def write_outputs(results: list[dict], run_id: str, started: str, finished: str):
     OUT_CSV.parent.mkdir(parents=True, exist_ok=True)
     OUT_JSON.parent.mkdir(parents=True, exist_ok=True)
@@ -124,18 +109,57 @@ def write_outputs(results: list[dict], run_id: str, started: str, finished: str)
     OUT_JSON.write_text(json.dumps(report, ensure_ascii=False, indent=2) + '\n', encoding='utf-8')
     return report
 
-def run_doi_test_set():
+def run_doi_test_set(progress=None):
     run_id = f'doi_run_{time.strftime("%Y%m%d_%H%M%S", time.gmtime())}_{uuid.uuid4().hex[:8]}'
     started = _now_iso()
+    dois = [item.get('doi', '') for item in DOI_TEST_SET]
     results = []
-    for item in DOI_TEST_SET:
-        r = resolve_doi(item.get('doi',''))
+    for item, res in zip(DOI_TEST_SET, _resolver().resolve_all(dois, progress=progress)):
+        r = _row(item.get('doi', ''), res)
         r['notes'] = item.get('notes','')
         results.append(r)
     finished = _now_iso()
     report = write_outputs(results, run_id, started, finished)
     return report
 
+_JOBS: dict = {}
+_JOBS_LOCK = threading.Lock()
+_JOBS_MAX = 100  # finished jobs kept for polling; running jobs are never dropped
+
+def start_doi_job() -> dict:
+    """Run the DOI test set on a background thread; poll ``/doi/jobs/<job_id>`` for the report.
+
+    Only the newest ``_JOBS_MAX`` finished jobs stay pollable; older ones answer ``unknown_job``.
+    """
+    job_id = uuid.uuid4().hex[:12]
+    job = {'job_id': job_id, 'status': 'running', 'started_at': _now_iso(), 'done': 0, 'total': len(DOI_TEST_SET)}
+    with _JOBS_LOCK:
+        _JOBS[job_id] = job
+        finished = [k for k, j in _JOBS.items() if j['status'] != 'running']
+        for k in finished[:max(0, len(_JOBS) - _JOBS_MAX)]:
+            del _JOBS[k]
+
+    def progress(done, total):
+        with _JOBS_LOCK:
+            job.update(done=done, total=total)
+
+    def work():
+        try:
+            report = run_doi_test_set(progress)
+            update = {'status': 'finished', 'report': report}
+        except Exception as e:
+            update = {'status': 'failed', 'error': f'{type(e).__name__}: {e}'}
+        with _JOBS_LOCK:
+            job.update(update, finished_at=_now_iso())
+
+    threading.Thread(target=work, name=f'doi-job-{job_id}', daemon=True).start()
+    return dict(job)
+
+def get_doi_job(job_id: str):
+    with _JOBS_LOCK:
+        job = _JOBS.get(job_id)
+        return dict(job) if job is not None else None
+
 class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
     daemon_threads = True
 
@@ -151,13 +175,22 @@ class Handler(BaseHTTPRequestHandler):
     def do_GET(self):
         if self.path in ('/health', '/'):
             return self._send(200, {'ok': True, 'service': 'api_server', 'time': _now_iso(),
-                                    'endpoints': ['/health', '/doi/run'], 'artifacts': {'csv': str(OUT_CSV), 'json': str(OUT_JSON)}})
-        if self.path.startswith('/doi/run'):
+                                    'endpoints': ['/health', '/doi/run', '/doi/run?wait=1', '/doi/jobs/<job_id>'], 'artifacts': {'csv': str(OUT_CSV), 'json': str(OUT_JSON)}})
+        url = urlsplit(self.path)
+        if url.path == '/doi/run':
+            if parse_qs(url.query).get('wait', ['0'])[0] not in ('1', 'true'):
+                job = start_doi_job()
+                return self._send(202, {'ok': True, **job, 'poll': f"/doi/jobs/{job['job_id']}"})
             try:
                 report = run_doi_test_set()
                 return self._send(200, report)
             except Exception as e:
                 return self._send(500, {'ok': False, 'error': f'{type(e).__name__}: {e}'})
+        if url.path.startswith('/doi/jobs/'):
+            job = get_doi_job(url.path.rsplit('/', 1)[-1])
+            if job is None:
+                return self._send(404, {'ok': False, 'error': 'unknown_job'})
+            return self._send(200, {'ok': job['status'] != 'failed', **job})
         return self._send(404, {'ok': False, 'error': 'not_found'})
 
 def main():
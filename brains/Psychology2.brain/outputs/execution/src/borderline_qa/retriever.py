@@ -7,9 +7,16 @@ import hashlib
 import json
 import math
 import re
+import os
 import urllib.request
+from collections import Counter
 from html.parser import HTMLParser
 
+try:
+    import numpy as np
+except Exception:  # pragma: no cover
+    np = None
+
 
 _TOKEN_RE = re.compile(r"[A-Za-z0-9]+(?:[-'][A-Za-z0-9]+)?")
 _WS_RE = re.compile(r"\s+")
@@ -63,14 +70,16 @@ class _TextExtractor(HTMLParser):
         return " ".join(self._buf)
 
 
-def _split_passages(text: str, max_chars: int = 900, overlap: int = 120) -> List[Tuple[int, int, str]]:
+def _split_passages(
+    text: str, max_chars: int = 900, overlap: int = 120, max_spans: Optional[int] = None
+) -> List[Tuple[int, int, str]]:
     t = _norm_ws(text)
     if not t:
         return []
     out: List[Tuple[int, int, str]] = []
     i = 0
     n = len(t)
-    while i < n:
+    while i < n and (max_spans is None or len(out) < max_spans):
         j = min(n, i + max_chars)
         if j < n:
             k = t.rfind(". ", i + max(200, max_chars // 2), j)
@@ -133,6 +142,200 @@ class TfidfIndex:
         return out[:k]
 
 
+_INDEX_FORMAT = 1
+_INDEX_ARRAYS = ("vocab", "idf", "indptr", "post_doc", "post_tf", "post_rank", "passage_ptr", "passage_span")
+
+
+def corpus_hash(docs: Sequence[Dict[str, Any]], *parts: Any) -> str:
+    """Content hash of the indexed fields (doc_id, text) of ``docs`` plus any extra ``parts``."""
+    h = hashlib.sha256(json.dumps([_INDEX_FORMAT, *parts]).encode("utf-8"))
+    for d in docs:
+        for v in (str(d.get("doc_id", "")), d.get("text", "") or ""):
+            b = v.encode("utf-8", "ignore")
+            h.update(len(b).to_bytes(8, "little"))
+            h.update(b)
+    return h.hexdigest()
+
+
+class SparseTfidfIndex:
+    """Inverted-index (term -> postings CSR) backend with the same scores and ranking as TfidfIndex.
+
+    Only the postings of query terms are touched and top-k is selected with
+    ``np.argpartition``.  Per-doc sums are accumulated in the order TfidfIndex
+    uses (query-term order for the dot product, first-occurrence order within
+    the doc for the norm), so scores are bit-identical and ties keep doc order.
+    The arrays (sorted vocab, idf, postings, and the first ``stored_passages``
+    passage offsets per doc) can be saved to a directory and memory-mapped back;
+    see ``cached``.
+    """
+
+    def __init__(self, arrays: Dict[str, Any], meta: Dict[str, Any]) -> None:
+        self.arrays = arrays
+        self.meta = meta
+        self.N = int(meta["N"])
+        self.vocab = arrays["vocab"]
+        self.idf_arr = arrays["idf"]
+
+    @classmethod
+    def from_docs(
+        cls,
+        docs: Sequence[Dict[str, Any]],
+        passage_chars: int = 900,
+        passage_overlap: int = 120,
+        stored_passages: int = 4,
+    ) -> "SparseTfidfIndex":
+        term_id: Dict[str, int] = {}
+        p_doc: List[int] = []
+        p_term: List[int] = []
+        p_tf: List[int] = []
+        p_rank: List[int] = []
+        spans: List[Tuple[int, int]] = []
+        passage_ptr = [0]
+        for i, d in enumerate(docs):
+            text = d.get("text", "") or ""
+            tf = Counter(_tokens(text))  # insertion order == first occurrence in the doc
+            p_doc.extend([i] * len(tf))
+            p_term.extend(term_id.setdefault(t, len(term_id)) for t in tf)
+            p_tf.extend(tf.values())
+            p_rank.extend(range(len(tf)))
+            spans.extend((a, b) for a, b, _ in _split_passages(text, passage_chars, passage_overlap, max_spans=stored_passages))
+            passage_ptr.append(len(spans))
+        terms = sorted(term_id)
+        remap = np.empty(len(terms), dtype=np.int64)
+        remap[[term_id[t] for t in terms]] = np.arange(len(terms))
+        term = remap[np.asarray(p_term, dtype=np.int64)]
+        doc = np.asarray(p_doc, dtype=np.int64)
+        order = np.lexsort((doc, term))
+        N = max(1, len(docs))
+        df = np.bincount(term, minlength=len(terms))
+        arrays = {
+            "vocab": np.array([t.encode("ascii") for t in terms], dtype=f"S{max([1, *map(len, terms)])}"),
+            "idf": np.array([math.log((N + 1) / (int(c) + 1)) + 1.0 for c in df], dtype=np.float64),
+            "indptr": np.concatenate([[0], np.cumsum(df)]).astype(np.int64),
+            "post_doc": doc[order].astype(np.int32),
+            "post_tf": np.asarray(p_tf, dtype=np.int32)[order],
+            "post_rank": np.asarray(p_rank, dtype=np.int32)[order],
+            "passage_ptr": np.asarray(passage_ptr, dtype=np.int64),
+            "passage_span": np.asarray(spans, dtype=np.int64).reshape(-1, 2),
+        }
+        meta = {
+            "format": _INDEX_FORMAT,
+            "N": N,
+            "n_docs": len(docs),
+            "passage_chars": int(passage_chars),
+            "passage_overlap": int(passage_overlap),
+            "stored_passages": int(stored_passages),
+        }
+        return cls(arrays, meta)
+
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        tmp = path.with_name(path.name + f".tmp{os.getpid()}")
+        tmp.mkdir(parents=True, exist_ok=True)
+        for name in _INDEX_ARRAYS:
+            np.save(tmp / f"{name}.npy", np.ascontiguousarray(self.arrays[name]))
+        (tmp / "meta.json").write_text(json.dumps(self.meta, indent=2, sort_keys=True), encoding="utf-8")
+        try:
+            tmp.rename(path)
+        except OSError:  # another process saved the same index first
+            for f in tmp.iterdir():
+                f.unlink()
+            tmp.rmdir()
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path, mmap: bool = True) -> "SparseTfidfIndex":
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        if meta.get("format") != _INDEX_FORMAT:
+            raise ValueError(f"unsupported index format in {path}: {meta.get('format')!r}")
+        mode = "r" if mmap else None
+        return cls({name: np.load(path / f"{name}.npy", mmap_mode=mode) for name in _INDEX_ARRAYS}, meta)
+
+    @classmethod
+    def cached(
+        cls,
+        docs: Sequence[Dict[str, Any]],
+        cache_dir: str | Path,
+        passage_chars: int = 900,
+        passage_overlap: int = 120,
+        stored_passages: int = 4,
+    ) -> "SparseTfidfIndex":
+        """Load the index for ``docs`` from ``cache_dir/<corpus hash>``, building and saving it on a miss."""
+        path = Path(cache_dir) / corpus_hash(docs, int(passage_chars), int(passage_overlap), int(stored_passages))
+        if (path / "meta.json").exists():
+            try:
+                return cls.load(path)
+            except (OSError, ValueError):
+                pass
+        index = cls.from_docs(docs, passage_chars, passage_overlap, stored_passages)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        index.save(path)
+        return index
+
+    def _lookup(self, terms: Sequence[str]) -> List[int]:
+        if not len(self.vocab):
+            return [-1] * len(terms)
+        # a term longer than the widest vocab entry cannot be in the vocab, and casting it to the
+        # vocab dtype would truncate it onto a prefix, so such terms are never looked up
+        width = self.vocab.dtype.itemsize
+        raw = [t.encode("ascii", "replace") for t in terms]
+        fits = [len(b) <= width for b in raw]
+        keys = np.array([b if ok else b"" for b, ok in zip(raw, fits)], dtype=self.vocab.dtype)
+        pos = np.minimum(np.searchsorted(self.vocab, keys), len(self.vocab) - 1)
+        return [int(p) if ok and self.vocab[p] == key else -1 for p, key, ok in zip(pos, keys, fits)]
+
+    def passage_spans(self, i: int, limit: int) -> Optional[List[Tuple[int, int]]]:
+        """The first ``limit`` passage offsets of doc ``i``, or None if more than were stored."""
+        if limit > self.meta["stored_passages"]:
+            return None
+        ptr = self.arrays["passage_ptr"]
+        return [(int(a), int(b)) for a, b in self.arrays["passage_span"][ptr[i]:min(ptr[i + 1], ptr[i] + limit)]]
+
+    def score(self, query: str, k: int = 8) -> List[Tuple[int, float]]:
+        q = _tokens(query)
+        if not q:
+            return []
+        qtf = Counter(q)
+        tids = dict(zip(qtf, self._lookup(list(qtf))))
+        qv: Dict[str, float] = {t: qtf[t] * (float(self.idf_arr[tids[t]]) if tids[t] >= 0 else 0.0) for t in qtf}
+        qnorm = math.sqrt(sum(v * v for v in qv.values())) or 1.0
+        indptr, post_doc = self.arrays["indptr"], self.arrays["post_doc"]
+        hits = [(qv[t], tids[t], int(indptr[tids[t]]), int(indptr[tids[t] + 1])) for t in qv if tids[t] >= 0]
+        if not hits:
+            return []
+        docs = np.unique(np.concatenate([post_doc[a:b] for _, _, a, b in hits]))
+        dot = np.zeros(len(docs))
+        pos_l, val_l, rank_l = [], [], []
+        for qw, tid, a, b in hits:  # query-term order, as in TfidfIndex
+            pos = np.searchsorted(docs, post_doc[a:b])
+            val = self.arrays["post_tf"][a:b] * self.idf_arr[tid]
+            dot[pos] += qw * val
+            pos_l.append(pos)
+            val_l.append(val)
+            rank_l.append(self.arrays["post_rank"][a:b])
+        pos, val, rank = np.concatenate(pos_l), np.concatenate(val_l), np.concatenate(rank_l)
+        order = np.lexsort((rank, pos))  # per doc, first-occurrence order of its terms
+        pos, val = pos[order], val[order]
+        start = np.searchsorted(pos, pos, side="left")
+        within = np.arange(len(pos)) - start
+        sq = np.zeros(len(docs))
+        for r in range(int(within.max()) + 1):
+            sel = within == r
+            sq[pos[sel]] += val[sel] * val[sel]
+        scores = dot / (qnorm * np.sqrt(sq))
+        k = max(0, min(int(k), len(docs)))
+        if k == 0:
+            return []
+        if k < len(docs):
+            thr = scores[np.argpartition(-scores, k - 1)[k - 1]]
+            keep = np.flatnonzero(scores >= thr)
+        else:
+            keep = np.arange(len(docs))
+        top = keep[np.lexsort((docs[keep], -scores[keep]))][:k]
+        return [(int(docs[i]), float(scores[i])) for i in top]
+
+
 def load_local_corpus(paths: Sequence[Path]) -> List[Dict[str, Any]]:
     docs: List[Dict[str, Any]] = []
     for p in paths:
@@ -169,7 +372,13 @@ class Retriever:
         default_urls: Optional[Sequence[str]] = None,
         passage_chars: int = 900,
         passage_overlap: int = 120,
+        engine: str = "sparse",
+        index_cache_dir: Optional[str | Path] = None,
     ) -> None:
+        """``engine="sparse"`` (default, needs numpy) uses SparseTfidfIndex, persisted under
+        ``index_cache_dir`` when given; ``engine="reference"`` keeps the pure-Python TfidfIndex."""
+        if engine not in {"sparse", "reference"}:
+            raise ValueError(f"unknown engine {engine!r}; use 'sparse' or 'reference'")
         self.passage_chars = int(passage_chars)
         self.passage_overlap = int(passage_overlap)
         self.default_urls = list(default_urls or [])
@@ -177,11 +386,24 @@ class Retriever:
         if corpus_paths:
             paths = [Path(p) for p in corpus_paths]
             self.docs = load_local_corpus(paths)
-        self.index = TfidfIndex(self.docs) if self.docs else None
+        self.index: Optional[TfidfIndex | SparseTfidfIndex] = None
+        if self.docs:
+            if engine == "reference" or np is None:
+                self.index = TfidfIndex(self.docs)
+            elif index_cache_dir is not None:
+                self.index = SparseTfidfIndex.cached(self.docs, index_cache_dir, self.passage_chars, self.passage_overlap)
+            else:
+                self.index = SparseTfidfIndex.from_docs(self.docs, self.passage_chars, self.passage_overlap)
 
-    def _doc_passages(self, doc: Dict[str, Any], base_score: float, limit: int) -> List[Passage]:
+    def _doc_passages(
+        self, doc: Dict[str, Any], base_score: float, limit: int, offsets: Optional[List[Tuple[int, int]]] = None
+    ) -> List[Passage]:
         text = doc.get("text", "") or ""
-        spans = _split_passages(text, max_chars=self.passage_chars, overlap=self.passage_overlap)
+        if offsets is None:
+            spans = _split_passages(text, max_chars=self.passage_chars, overlap=self.passage_overlap)
+        else:  # precomputed by the index: same spans as _split_passages, without re-scanning the doc
+            t = _norm_ws(text)
+            spans = [(a, b, t[a:b].strip()) for a, b in offsets]
         out: List[Passage] = []
         for (a, b, seg) in spans[: max(1, limit)]:
             url = doc.get("url") or doc.get("source_url")
@@ -213,7 +435,10 @@ class Retriever:
         if self.index:
             ranked = self.index.score(query, k=max(8, k))
             for i, s in ranked:
-                out.extend(self._doc_passages(self.docs[i], base_score=s, limit=per_doc_passages))
+                offsets = None
+                if isinstance(self.index, SparseTfidfIndex):
+                    offsets = self.index.passage_spans(i, max(1, per_doc_passages))
+                out.extend(self._doc_passages(self.docs[i], base_score=s, limit=per_doc_passages, offsets=offsets))
         if fetch_web:
             for u in list(urls or self.default_urls)[: max(0, k)]:
                 try:
@@ -1,8 +1,6 @@
 from __future__ import annotations
-import os
-os.chdir(r'/Users/jtr/_JTR23_/COSMO/runtime/outputs/execution')
-
 
+from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
 import json
@@ -11,7 +9,12 @@ import re
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+import scipy.sparse as sp
+
+try:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+except Exception:  # pragma: no cover
+    TfidfVectorizer = None
 
 
 _WORD_RE = re.compile(r"[A-Za-z0-9]+(?:'[A-Za-z0-9]+)?")
@@ -60,6 +63,12 @@ class RetrievalEngine:
     Lightweight, deterministic retrieval over a small reference corpus.
     Supported methods: 'tfidf', 'bm25'
     Corpus item fields (recommended): {'id': str, 'text': str, 'meta': dict}
+
+    BM25 term frequencies are kept as a CSC matrix (docs x terms) next to the
+    per-document length normalizers k1 * (1 - b + b * dl / avgdl): a query
+    gathers the columns of its terms and applies the saturation formula to those
+    entries only, and top-k uses argpartition.  ``search_many`` scores a whole
+    batch of queries with sparse matrix products.
     """
 
     def __init__(self, method: str = "bm25"):
@@ -70,11 +79,15 @@ class RetrievalEngine:
         self._doc_ids: List[str] = []
         self._texts: List[str] = []
         self._metas: List[Dict[str, Any]] = []
+        self._id_rank: Optional[np.ndarray] = None
+        self._by_id: Optional[np.ndarray] = None
         self._tfidf: Optional[TfidfVectorizer] = None
         self._tfidf_X = None
         self._bm25_vocab: Dict[str, int] = {}
         self._bm25_idf: Optional[np.ndarray] = None
-        self._bm25_tf: Optional[List[Dict[int, int]]] = None
+        self._bm25_tf: Optional[sp.csc_matrix] = None
+        self._bm25_norm: Optional[np.ndarray] = None
+        self._bm25_wt: Optional[sp.csr_matrix] = None
         self._bm25_dl: Optional[np.ndarray] = None
         self._bm25_avgdl: float = 0.0
 
@@ -88,8 +101,14 @@ class RetrievalEngine:
             self._doc_ids.append(doc_id)
             self._texts.append(text)
             self._metas.append(dict(meta))
+        # ranking tie-break is (-score, doc_id): rank of every doc in doc_id order
+        self._by_id = np.array(sorted(range(len(self._doc_ids)), key=self._doc_ids.__getitem__), dtype=np.int64)
+        self._id_rank = np.empty(len(self._doc_ids), dtype=np.int64)
+        self._id_rank[self._by_id] = np.arange(len(self._doc_ids))
 
         if self.method == "tfidf":
+            if TfidfVectorizer is None:
+                raise RuntimeError("scikit-learn is required for method='tfidf' (TfidfVectorizer missing).")
             self._tfidf = TfidfVectorizer(lowercase=True, token_pattern=r"(?u)\b\w+\b")
             self._tfidf_X = self._tfidf.fit_transform(self._texts)
         else:
@@ -97,33 +116,61 @@ class RetrievalEngine:
         return self
 
     def _build_bm25(self, k1: float = 1.5, b: float = 0.75) -> None:
-        toks = [_tokenize(t) for t in self._texts]
         vocab: Dict[str, int] = {}
-        tf_list: List[Dict[int, int]] = []
-        df: Dict[int, int] = {}
-        dl = np.zeros(len(toks), dtype=np.int32)
-        for i, ts in enumerate(toks):
+        indptr = [0]
+        indices: List[int] = []
+        counts: List[int] = []
+        dl = np.zeros(len(self._texts), dtype=np.int64)
+        for i, t in enumerate(self._texts):
+            ts = _tokenize(t)
             dl[i] = len(ts)
-            tf: Dict[int, int] = {}
-            seen: set[int] = set()
-            for w in ts:
-                j = vocab.setdefault(w, len(vocab))
-                tf[j] = tf.get(j, 0) + 1
-                if j not in seen:
-                    df[j] = df.get(j, 0) + 1
-                    seen.add(j)
-            tf_list.append(tf)
-
-        N = max(1, len(toks))
-        idf = np.zeros(len(vocab), dtype=np.float64)
-        for j, dfi in df.items():
-            idf[j] = math.log(1.0 + (N - dfi + 0.5) / (dfi + 0.5))
+            tf = Counter(vocab.setdefault(w, len(vocab)) for w in ts)
+            indices.extend(tf.keys())
+            counts.extend(tf.values())
+            indptr.append(len(indices))
+        tf_csr = sp.csr_matrix(
+            (np.asarray(counts, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(self._texts), len(vocab)),
+        )
+        tf_csc = tf_csr.tocsc()
+        tf_csc.sort_indices()
+
+        N = max(1, len(self._texts))
+        df = np.diff(tf_csc.indptr).astype(np.float64)
+        idf = np.array([math.log(1.0 + (N - dfi + 0.5) / (dfi + 0.5)) for dfi in df], dtype=np.float64)
         self._bm25_vocab = vocab
         self._bm25_idf = idf
-        self._bm25_tf = tf_list
+        self._bm25_tf = tf_csc
         self._bm25_dl = dl.astype(np.float64)
         self._bm25_avgdl = float(dl.mean()) if len(dl) else 0.0
         self._bm25_k1, self._bm25_b = float(k1), float(b)
+        avgdl = self._bm25_avgdl or 1.0
+        self._bm25_norm = k1 * (1.0 - b + b * (self._bm25_dl / avgdl))
+        self._bm25_wt = None
+
+    def _evidence(self, i: int, score: float) -> Evidence:
+        return Evidence(doc_id=self._doc_ids[i], score=float(score), text=self._texts[i], meta=self._metas[i])
+
+    def _top_k(self, docs: np.ndarray, scores: np.ndarray, top_k: int) -> List[Tuple[int, float]]:
+        """Best ``top_k`` of all documents by (-score, doc_id), given the (non-negative) scores of
+        ``docs``; every other document scores 0.  Only the candidates above the k-th score are sorted."""
+        assert self._id_rank is not None and self._by_id is not None
+        hit = scores > 0.0
+        docs, scores = docs[hit], scores[hit]
+        if len(docs) > top_k:
+            thr = scores[np.argpartition(-scores, top_k - 1)[top_k - 1]]
+            keep = np.flatnonzero(scores >= thr)
+            docs, scores = docs[keep], scores[keep]
+        order = np.lexsort((self._id_rank[docs], -scores))[:top_k]
+        out = [(int(docs[i]), float(scores[i])) for i in order]
+        if len(out) < top_k:  # ties at 0: the remaining documents in doc_id order
+            taken = set(int(d) for d in docs)
+            for d in self._by_id:
+                if len(out) >= top_k:
+                    break
+                if int(d) not in taken:
+                    out.append((int(d), 0.0))
+        return out
 
     def query(self, text: str, top_k: int = 5) -> List[Evidence]:
         if not self._docs:
@@ -133,45 +180,81 @@ class RetrievalEngine:
             assert self._tfidf is not None and self._tfidf_X is not None
             q = self._tfidf.transform([text or ""])
             scores = (self._tfidf_X @ q.T).toarray().ravel()
+            ranked = self._top_k(np.arange(len(scores)), scores, top_k)
         else:
-            scores = self._score_bm25(text or "")
-        order = sorted(range(len(scores)), key=lambda i: (-float(scores[i]), self._doc_ids[i]))
-        out: List[Evidence] = []
-        for i in order[:top_k]:
-            out.append(
-                Evidence(
-                    doc_id=self._doc_ids[i],
-                    score=float(scores[i]),
-                    text=self._texts[i],
-                    meta=self._metas[i],
-                )
-            )
-        return out
+            ranked = self._top_k(*self._score_bm25_sparse(text or ""), top_k)
+        return [self._evidence(i, s) for i, s in ranked]
 
-    def _score_bm25(self, query: str) -> np.ndarray:
-        assert self._bm25_idf is not None and self._bm25_tf is not None and self._bm25_dl is not None
-        q_terms = _tokenize(query)
-        if not q_terms:
-            return np.zeros(len(self._docs), dtype=np.float64)
-        q_idx = [self._bm25_vocab.get(w) for w in q_terms]
-        q_idx = [j for j in q_idx if j is not None]
+    def _query_terms(self, query: str) -> List[int]:
+        q_idx = [self._bm25_vocab.get(w) for w in _tokenize(query)]
+        return [j for j in q_idx if j is not None]
+
+    def _score_bm25_sparse(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(docs, scores) for the documents containing at least one query term."""
+        assert self._bm25_idf is not None and self._bm25_tf is not None and self._bm25_norm is not None
+        q_idx = self._query_terms(query)
         if not q_idx:
-            return np.zeros(len(self._docs), dtype=np.float64)
-        idf = self._bm25_idf
-        k1, b = self._bm25_k1, self._bm25_b
-        avgdl = self._bm25_avgdl or 1.0
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+        X, idf, k1 = self._bm25_tf, self._bm25_idf, self._bm25_k1
+        cols = [(X.indices[X.indptr[j]:X.indptr[j + 1]], X.data[X.indptr[j]:X.indptr[j + 1]], j) for j in q_idx]
+        docs = np.unique(np.concatenate([r for r, _, _ in cols]))
+        scores = np.zeros(len(docs), dtype=np.float64)
+        for rows, f, j in cols:  # query-term order, one saturated column at a time
+            pos = np.searchsorted(docs, rows)
+            scores[pos] += float(idf[j]) * (f * (k1 + 1.0)) / (f + self._bm25_norm[rows])
+        return docs.astype(np.int64), scores
+
+    def _score_bm25(self, query: str) -> np.ndarray:
+        docs, s = self._score_bm25_sparse(query)
         scores = np.zeros(len(self._docs), dtype=np.float64)
-        for i, tf in enumerate(self._bm25_tf):
-            dl = float(self._bm25_dl[i])
-            denom_base = k1 * (1.0 - b + b * (dl / avgdl))
-            s = 0.0
-            for j in q_idx:
-                f = tf.get(j, 0)
-                if f:
-                    s += float(idf[j]) * (f * (k1 + 1.0)) / (f + denom_base)
-            scores[i] = s
+        scores[docs] = s
         return scores
 
+    def _bm25_weights_t(self) -> sp.csr_matrix:
+        """Saturated BM25 weights as a (terms x docs) CSR matrix, computed once on first use."""
+        if self._bm25_wt is None:
+            X = self._bm25_tf
+            f = X.data
+            rows = X.indices
+            col = np.repeat(np.arange(X.shape[1]), np.diff(X.indptr))
+            data = self._bm25_idf[col] * (f * (self._bm25_k1 + 1.0)) / (f + self._bm25_norm[rows])
+            self._bm25_wt = sp.csr_matrix((data, X.indices, X.indptr), shape=(X.shape[1], X.shape[0]))
+        return self._bm25_wt
+
+    def search_many(self, queries: Sequence[str], top_k: int = 5, max_pairs: int = 1 << 24) -> List[List[Evidence]]:
+        """``query`` for every text in ``queries``, scored in batches of sparse matrix products.
+
+        Queries are grouped so that each batch touches at most ``max_pairs``
+        (query, document) postings, which bounds memory on large corpora.
+        """
+        if not self._docs:
+            return [[] for _ in queries]
+        top_k = max(1, int(top_k))
+        if self.method == "tfidf":
+            return [self.query(q, top_k=top_k) for q in queries]
+        WT = self._bm25_weights_t()
+        df = np.diff(WT.indptr)
+        terms = [self._query_terms(q or "") for q in queries]
+        out: List[List[Evidence]] = []
+        start = 0
+        while start < len(terms):
+            stop, pairs = start, 0
+            while stop < len(terms) and (stop == start or pairs + int(df[terms[stop]].sum()) <= max_pairs):
+                pairs += int(df[terms[stop]].sum())
+                stop += 1
+            batch = terms[start:stop]
+            # one row per query; repeated terms stay separate entries, in query order, like query()
+            indptr = np.concatenate([[0], np.cumsum([len(t) for t in batch])]).astype(np.int64)
+            idx = np.fromiter((j for t in batch for j in t), dtype=np.int32, count=int(indptr[-1]))
+            Q = sp.csr_matrix((np.ones(len(idx)), idx, indptr), shape=(len(batch), WT.shape[0]))
+            S = (Q @ WT).tocsr()
+            for r in range(len(batch)):
+                a, b = S.indptr[r], S.indptr[r + 1]
+                ranked = self._top_k(S.indices[a:b].astype(np.int64), S.data[a:b], top_k)
+                out.append([self._evidence(i, s) for i, s in ranked])
+            start = stop
+        return out
+
 
 def build_engine_from_path(corpus_path: Path, method: str = "bm25") -> RetrievalEngine:
     docs = load_corpus(Path(corpus_path))
@@ -0,0 +1,81 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+import json
+import sqlite3
+import threading
+import time
+
+DEFAULT_TTL_S = 30 * 24 * 3600.0
+DEFAULT_NEGATIVE_TTL_S = 24 * 3600.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    provider    TEXT    NOT NULL,
+    doi         TEXT    NOT NULL,
+    ok          INTEGER NOT NULL,
+    http_status INTEGER,
+    payload     TEXT    NOT NULL,
+    fetched_at  REAL    NOT NULL,
+    expires_at  REAL    NOT NULL,
+    PRIMARY KEY (provider, doi)
+)
+"""
+
+class ResponseCache:
+    """SQLite store of normalized provider responses keyed by (provider, DOI).
+
+    Successful lookups live for ``ttl_s``; definitive misses (404, rejected DOI)
+    are cached as negative entries for ``negative_ttl_s`` so re-runs do not hit
+    the provider again. Transient failures are never stored.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:", ttl_s: float = DEFAULT_TTL_S,
+                 negative_ttl_s: float = DEFAULT_NEGATIVE_TTL_S, clock: Callable[[], float] = time.time):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_s = float(ttl_s)
+        self.negative_ttl_s = float(negative_ttl_s)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        if self.path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+
+    def get(self, provider: str, doi: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT ok, http_status, payload, fetched_at FROM responses WHERE provider=? AND doi=? AND expires_at>?",
+                (provider, doi, self._clock()),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"ok": bool(row[0]), "http_status": row[1], "payload": json.loads(row[2]), "fetched_at": row[3]}
+
+    def put(self, provider: str, doi: str, payload: Dict[str, Any], *, ok: bool = True,
+            http_status: Optional[int] = None) -> None:
+        now = self._clock()
+        ttl = self.ttl_s if ok else self.negative_ttl_s
+        if ttl <= 0:
+            return
+        blob = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (provider, doi, int(ok), http_status, blob, now, now + ttl),
+            )
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._db.execute("DELETE FROM responses WHERE expires_at<=?", (self._clock(),)).rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+import http.client
+import threading
+import time
+
+DEFAULT_TIMEOUT_S = 12
+# requests/second and burst per host; Crossref and DataCite both ask clients to stay in the low tens.
+DEFAULT_HOST_RATES: Dict[str, Tuple[float, float]] = {
+    "api.crossref.org": (10.0, 10.0),
+    "api.datacite.org": (8.0, 8.0),
+}
+DEFAULT_RATE = (5.0, 5.0)
+MAX_REDIRECTS = 10  # as urllib's HTTPRedirectHandler
+_REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+def host_of(url: str) -> str:
+    return (urlsplit(url).netloc or "").lower()
+
+class TokenBucket:
+    """Thread-safe token bucket in its virtual-scheduling (GCRA) form.
+
+    ``acquire`` reserves the next slot under the lock and sleeps outside it, so
+    concurrent callers are spaced at ``1/rate`` once ``burst`` is spent.
+    ``pause`` pushes the next slot out, e.g. to honour a ``Retry-After``.
+    """
+
+    def __init__(self, rate: Optional[float], burst: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rate = float(rate) if rate else 0.0
+        self.burst = max(1.0, float(burst))
+        self._clock, self._sleep = clock, sleep
+        self._interval = 1.0 / self.rate if self.rate > 0 else 0.0
+        self._tolerance = (self.burst - 1.0) * self._interval
+        self._tat = clock()  # theoretical arrival time of the next request
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = self._clock()
+            tat = max(self._tat, now)
+            wait = max(0.0, tat - self._tolerance - now)
+            self._tat = tat + self._interval
+            return wait
+
+    def acquire(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._tat = max(self._tat, self._clock() + max(0.0, seconds) + self._tolerance)
+
+class HostRateLimiter:
+    """One :class:`TokenBucket` per host, created on first use."""
+
+    def __init__(self, rates: Optional[Dict[str, Tuple[float, float]]] = None,
+                 default: Tuple[float, float] = DEFAULT_RATE,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rates = dict(DEFAULT_HOST_RATES if rates is None else rates)
+        self.default = default
+        self._clock, self._sleep = clock, sleep
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            b = self._buckets.get(host)
+            if b is None:
+                rate, burst = self.rates.get(host, self.default)
+                b = self._buckets[host] = TokenBucket(rate, burst, clock=self._clock, sleep=self._sleep)
+            return b
+
+    def acquire(self, host: str) -> float:
+        return self.bucket(host).acquire()
+
+    def pause(self, host: str, seconds: float) -> None:
+        self.bucket(host).pause(seconds)
+
+_Key = Tuple[str, str, Optional[int]]
+
+class ConnectionPool:
+    """Keep-alive ``http.client`` connections, at most ``max_per_host`` per origin.
+
+    Responses are read in full so the connection can go back to the idle list;
+    a reused connection the server has meanwhile closed is retried once on a
+    fresh one. Redirects are followed (up to ``MAX_REDIRECTS``) as urllib does.
+    """
+
+    def __init__(self, max_per_host: int = 8, timeout_s: float = DEFAULT_TIMEOUT_S):
+        self.max_per_host = max(1, int(max_per_host))
+        self.timeout_s = float(timeout_s)
+        self.created = 0
+        self.requests = 0
+        self._idle: Dict[_Key, List[http.client.HTTPConnection]] = {}
+        self._open: Dict[_Key, int] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def _checkout(self, key: _Key) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._cond:
+            while True:
+                idle = self._idle.get(key)
+                if idle:
+                    return idle.pop(), True
+                if self._open.get(key, 0) < self.max_per_host:
+                    self._open[key] = self._open.get(key, 0) + 1
+                    self.created += 1
+                    break
+                self._cond.wait()
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=self.timeout_s), False
+
+    def _checkin(self, key: _Key, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        with self._cond:
+            if reusable and not self._closed:
+                self._idle.setdefault(key, []).append(conn)
+            else:
+                conn.close()
+                self._open[key] -= 1
+            self._cond.notify()
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        for _ in range(MAX_REDIRECTS):
+            status, hdrs, body = self._request_once(method, url, headers)
+            if status not in _REDIRECT_CODES or not hdrs.get("location"):
+                return status, hdrs, body
+            url = urljoin(url, hdrs["location"])
+        return self._request_once(method, url, headers)
+
+    def _request_once(self, method: str, url: str, headers: Optional[Dict[str, str]]) -> Tuple[int, Dict[str, str], bytes]:
+        parts = urlsplit(url)
+        key = (parts.scheme.lower() or "http", parts.hostname or "", parts.port)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        while True:
+            conn, reused = self._checkout(key)
+            try:
+                conn.request(method, path, headers=dict(headers or {}))
+                resp = conn.getresponse()
+                body = resp.read()
+            except (ConnectionResetError, BrokenPipeError, http.client.BadStatusLine):
+                self._checkin(key, conn, False)
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                self._checkin(key, conn, False)
+                raise
+            with self._cond:
+                self.requests += 1
+            self._checkin(key, conn, not resp.will_close)
+            return resp.status, {k.lower(): v for k, v in resp.getheaders()}, body
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            for key, conns in self._idle.items():
+                for c in conns:
+                    c.close()
+                self._open[key] -= len(conns)
+            self._idle.clear()
@@ -13,6 +13,8 @@ FAIL_TIMEOUT = "timeout"
 FAIL_NETWORK = "network_error"
 FAIL_UNEXPECTED = "unexpected"
 FAIL_NO_SUCCESS = "no_providers_succeeded"
+# Lower wins when several providers fail: the most actionable category is reported.
+FAIL_PRIORITY = {FAIL_RATE_LIMITED: 1, FAIL_TIMEOUT: 2, FAIL_NETWORK: 3, FAIL_PROVIDER_ERROR: 4, FAIL_NOT_FOUND: 5, FAIL_UNEXPECTED: 6}
 def normalize_doi(value: str) -> str:
     s = (value or "").strip()
     s = re.sub(r"^doi\s*:\s*", "", s, flags=re.IGNORECASE)
@@ -27,7 +29,7 @@ def validate_doi(doi: str) -> Tuple[bool, str]:
         return False, "contains whitespace"
     if not DOI_RE.match(doi):
         return False, "does not match DOI pattern"
-    return True, 
+    return True, ""
 @dataclass
 class ProviderAttempt:
     provider: str
@@ -36,6 +38,7 @@ class ProviderAttempt:
     reason: Optional[str] = None
     http_status: Optional[int] = None
     elapsed_ms: Optional[int] = None
+    cached: bool = False
 
 @dataclass
 class DOIResult:
@@ -142,10 +145,8 @@ def resolve_doi(
 
         if best_fail is None:
             best_fail = attempts[-1]
-        else:
-            prio = {FAIL_RATE_LIMITED: 1, FAIL_TIMEOUT: 2, FAIL_NETWORK: 3, FAIL_PROVIDER_ERROR: 4, FAIL_NOT_FOUND: 5, FAIL_UNEXPECTED: 6}
-            if prio.get(attempts[-1].category or "", 9) < prio.get(best_fail.category or "", 9):
-                best_fail = attempts[-1]
+        elif FAIL_PRIORITY.get(attempts[-1].category or "", 9) < FAIL_PRIORITY.get(best_fail.category or "", 9):
+            best_fail = attempts[-1]
 
     reason = (best_fail.reason if best_fail else "no providers configured") or "no providers succeeded"
     category = (best_fail.category if best_fail else FAIL_NO_SUCCESS) or FAIL_NO_SUCCESS
@@ -157,7 +158,9 @@ def resolve_many(
     results: List[DOIResult] = []
     for d in dois:
         results.append(resolve_doi(d, providers))
+    return summarize(results)
 
+def summarize(results: Sequence[DOIResult]) -> Dict[str, Any]:
     summary = {
         "total": len(results),
         "ok": sum(1 for r in results if r.ok),
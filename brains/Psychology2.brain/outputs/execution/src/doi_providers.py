@@ -1,8 +1,10 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict, Optional, Tuple
-import json, time, random
-import urllib.request, urllib.error
+import http.client, json, time, random
+import urllib.parse, urllib.request, urllib.error
+
+from doi_http import ConnectionPool, HostRateLimiter, host_of
 
 DEFAULT_TIMEOUT_S = 12
 UA = "cosmo-doi-pipeline/0.1 (+https://example.invalid; mailto:devnull@example.invalid)"
@@ -46,46 +48,74 @@ class BaseProvider:
     base_url: str = ""
     headers: Dict[str, str] = {"User-Agent": UA, "Accept": "application/json"}
 
-    def __init__(self, timeout_s: float = DEFAULT_TIMEOUT_S, max_attempts: int = 4):
+    def __init__(self, timeout_s: float = DEFAULT_TIMEOUT_S, max_attempts: int = 4, *,
+                 base_url: Optional[str] = None, http: Optional[ConnectionPool] = None,
+                 limiter: Optional[HostRateLimiter] = None):
+        # With ``http`` requests reuse pooled keep-alive connections; with ``limiter``
+        # they draw from a per-host token bucket, and 429/5xx backoff pauses that
+        # bucket for every worker instead of sleeping only the calling thread.
         self.timeout_s = float(timeout_s)
         self.max_attempts = int(max_attempts)
+        if base_url is not None:
+            self.base_url = base_url
+        self.http = http
+        self.limiter = limiter
+
+    def _fetch(self, url: str) -> Tuple[int, Optional[float], bytes]:
+        if self.http is not None:
+            status, hdrs, raw = self.http.request("GET", url, headers=self.headers)
+            return status, _parse_retry_after(hdrs.get("retry-after")), raw
+        req = urllib.request.Request(url, headers=dict(self.headers), method="GET")
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout_s) as resp:
+                return getattr(resp, "status", None) or 200, None, resp.read()
+        except urllib.error.HTTPError as e:
+            retry_after = _parse_retry_after(e.headers.get("Retry-After") if hasattr(e, "headers") else None)
+            return int(getattr(e, "code", 0) or 0), retry_after, b""
+
+    def _backoff(self, url: str, attempt: int, retry_after: Optional[float]) -> None:
+        if self.limiter is None:
+            _sleep_backoff(attempt, retry_after)
+            return
+        if retry_after is not None and retry_after > 0:
+            delay = min(60.0, retry_after)
+        else:
+            delay = min(8.0, 0.6 * (2 ** max(0, attempt - 1))) + random.uniform(0.0, 0.25)
+        self.limiter.pause(host_of(url), delay)
 
     def _get_json(self, url: str) -> Dict[str, Any]:
         last_err: Optional[ProviderError] = None
         for attempt in range(1, self.max_attempts + 1):
-            req = urllib.request.Request(url, headers=dict(self.headers), method="GET")
+            if self.limiter is not None:
+                self.limiter.acquire(host_of(url))
             try:
-                with urllib.request.urlopen(req, timeout=self.timeout_s) as resp:
-                    status = getattr(resp, "status", None) or 200
-                    raw = resp.read()
-                    try:
-                        return json.loads(raw.decode("utf-8"))
-                    except Exception as e:
-                        raise ProviderError(self.name, "parse_error", f"Invalid JSON: {e}", status=status, retriable=False)
-            except urllib.error.HTTPError as e:
-                status = int(getattr(e, "code", 0) or 0)
-                retry_after = _parse_retry_after(e.headers.get("Retry-After") if hasattr(e, "headers") else None)
-                if status == 404:
-                    raise ProviderError(self.name, "not_found", "DOI not found", status=status, retriable=False)
-                if status in (400, 422):
-                    raise ProviderError(self.name, "bad_request", "Bad request for DOI", status=status, retriable=False)
-                if status == 429:
-                    last_err = ProviderError(self.name, "rate_limited", "Rate limited", status=status, retriable=True)
-                    _sleep_backoff(attempt, retry_after)
-                    continue
-                if 500 <= status < 600:
-                    last_err = ProviderError(self.name, "upstream_error", f"Upstream HTTP {status}", status=status, retriable=True)
-                    _sleep_backoff(attempt, retry_after)
-                    continue
-                raise ProviderError(self.name, "http_error", f"HTTP {status}", status=status, retriable=False)
-            except urllib.error.URLError as e:
-                last_err = ProviderError(self.name, "network_error", f"Network error: {e}", status=None, retriable=True)
-                _sleep_backoff(attempt, None)
-                continue
+                status, retry_after, raw = self._fetch(url)
             except TimeoutError as e:
                 last_err = ProviderError(self.name, "timeout", f"Timeout: {e}", status=None, retriable=True)
-                _sleep_backoff(attempt, None)
+                self._backoff(url, attempt, None)
+                continue
+            except (OSError, http.client.HTTPException) as e:
+                last_err = ProviderError(self.name, "network_error", f"Network error: {e}", status=None, retriable=True)
+                self._backoff(url, attempt, None)
                 continue
+            if 200 <= status < 300:
+                try:
+                    return json.loads(raw.decode("utf-8"))
+                except Exception as e:
+                    raise ProviderError(self.name, "parse_error", f"Invalid JSON: {e}", status=status, retriable=False)
+            if status == 404:
+                raise ProviderError(self.name, "not_found", "DOI not found", status=status, retriable=False)
+            if status in (400, 422):
+                raise ProviderError(self.name, "bad_request", "Bad request for DOI", status=status, retriable=False)
+            if status == 429:
+                last_err = ProviderError(self.name, "rate_limited", "Rate limited", status=status, retriable=True)
+                self._backoff(url, attempt, retry_after)
+                continue
+            if 500 <= status < 600:
+                last_err = ProviderError(self.name, "upstream_error", f"Upstream HTTP {status}", status=status, retriable=True)
+                self._backoff(url, attempt, retry_after)
+                continue
+            raise ProviderError(self.name, "http_error", f"HTTP {status}", status=status, retriable=False)
         assert last_err is not None
         raise last_err
 
@@ -103,6 +133,23 @@ def _first_str(x: Any) -> Optional[str]:
                 return v.strip()
     return None
 
+def _crossref_published(msg: Dict[str, Any]) -> Dict[str, Any]:
+    # Print date first, then online, issue and record creation dates.
+    for key in ("published-print", "published-online", "issued", "created"):
+        v = msg.get(key)
+        dp = v.get("date-parts") if isinstance(v, dict) else None
+        if isinstance(dp, list) and dp and isinstance(dp[0], list) and dp[0]:
+            return v
+    return {}
+
+def _datacite_title(attrs: Dict[str, Any]) -> Optional[str]:
+    # DataCite titles are objects: [{"title": ..., "lang": ...}, ...]
+    for t in attrs.get("titles") or []:
+        v = _first_str(t.get("title")) if isinstance(t, dict) else _first_str(t)
+        if v:
+            return v
+    return None
+
 def _authors_from_crossref(msg: Dict[str, Any]) -> list:
     out = []
     for a in msg.get("author") or []:
@@ -138,7 +185,7 @@ class CrossrefProvider(BaseProvider):
             "doi": (msg.get("DOI") or doi),
             "title": _first_str(msg.get("title")),
             "publisher": msg.get("publisher") if isinstance(msg.get("publisher"), str) else None,
-            "published": (msg.get("created") or msg.get("issued") or {}),
+            "published": _crossref_published(msg),
             "type": msg.get("type") if isinstance(msg.get("type"), str) else None,
             "url": msg.get("URL") if isinstance(msg.get("URL"), str) else None,
             "authors": _authors_from_crossref(msg),
@@ -160,14 +207,14 @@ class DataCiteProvider(BaseProvider):
             "provider": self.name,
             "raw": data,
             "doi": (attrs.get("doi") or doi),
-            "title": _first_str(attrs.get("titles")),
+            "title": _datacite_title(attrs),
             "publisher": attrs.get("publisher") if isinstance(attrs.get("publisher"), str) else None,
-            "published": {"published": attrs.get("published") or attrs.get("publicationYear")},
+            "published": {"published": attrs.get("publicationYear") or attrs.get("published")},
             "type": attrs.get("types") or {},
-            "url": attrs.get("url") if isinstance(attrs.get("url"), str) else None,
+            "url": attrs.get("url") if isinstance(attrs.get("url"), str) else (f"https://doi.org/{attrs['doi']}" if attrs.get("doi") else None),
             "authors": _authors_from_datacite(attrs),
             "source": "datacite",
         }
 
-def get_default_providers(timeout_s: float = DEFAULT_TIMEOUT_S) -> Tuple[BaseProvider, ...]:
-    return (CrossrefProvider(timeout_s=timeout_s), DataCiteProvider(timeout_s=timeout_s))
+def get_default_providers(timeout_s: float = DEFAULT_TIMEOUT_S, **kwargs: Any) -> Tuple[BaseProvider, ...]:
+    return (CrossrefProvider(timeout_s=timeout_s, **kwargs), DataCiteProvider(timeout_s=timeout_s, **kwargs))
@@ -0,0 +1,130 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+import time
+
+from doi_cache import ResponseCache
+from doi_http import ConnectionPool, HostRateLimiter
+from doi_pipeline import (
+    FAIL_INVALID, FAIL_NETWORK, FAIL_NOT_FOUND, FAIL_NO_SUCCESS, FAIL_PRIORITY, FAIL_PROVIDER_ERROR,
+    FAIL_RATE_LIMITED, FAIL_TIMEOUT, FAIL_UNEXPECTED, DOIResult, ProviderAttempt, normalize_doi,
+    summarize, validate_doi,
+)
+from doi_providers import DEFAULT_TIMEOUT_S, ProviderError, get_default_providers
+
+DEFAULT_WORKERS = 8
+
+# ProviderError.category -> doi_pipeline failure category
+_CATEGORY = {
+    "not_found": FAIL_NOT_FOUND,
+    "rate_limited": FAIL_RATE_LIMITED,
+    "timeout": FAIL_TIMEOUT,
+    "network_error": FAIL_NETWORK,
+}
+# Definitive answers worth a negative cache entry; everything else may succeed on retry.
+_NEGATIVE = ("not_found", "bad_request")
+
+class DOIResolver:
+    """Resolve DOIs concurrently through a provider chain with a shared response cache.
+
+    DOIs are resolved on a pool of ``workers`` threads; within one DOI the
+    providers are still tried in order and the first success wins, exactly as in
+    :func:`doi_pipeline.resolve_doi`. The default providers share one
+    keep-alive :class:`ConnectionPool` and one :class:`HostRateLimiter`, so the
+    per-host request rate holds across all workers. Duplicate DOIs in a batch
+    are resolved once.
+    """
+
+    def __init__(self, providers: Optional[Sequence[Any]] = None, *, workers: int = DEFAULT_WORKERS,
+                 cache: Union[ResponseCache, str, Path, None] = None, timeout_s: float = DEFAULT_TIMEOUT_S,
+                 pool: Optional[ConnectionPool] = None, limiter: Optional[HostRateLimiter] = None):
+        self.workers = max(1, int(workers))
+        self.pool = pool if pool is not None else ConnectionPool(max_per_host=self.workers, timeout_s=timeout_s)
+        self.limiter = limiter if limiter is not None else HostRateLimiter()
+        if providers is None:
+            providers = get_default_providers(timeout_s, http=self.pool, limiter=self.limiter)
+        self.providers = tuple(providers)
+        self.cache = ResponseCache(cache) if isinstance(cache, (str, Path)) else cache
+
+    def _attempt(self, provider: Any, doi: str) -> tuple:
+        name = provider.name
+        if self.cache is not None:
+            hit = self.cache.get(name, doi)
+            if hit is not None:
+                if hit["ok"]:
+                    return ProviderAttempt(provider=name, ok=True, http_status=hit["http_status"], elapsed_ms=0, cached=True), hit["payload"]
+                err = hit["payload"]
+                return ProviderAttempt(provider=name, ok=False, category=_CATEGORY.get(err.get("category"), FAIL_PROVIDER_ERROR),
+                                       reason=err.get("message"), http_status=hit["http_status"], elapsed_ms=0, cached=True), None
+        t0 = time.time()
+        try:
+            rec = provider.resolve(doi)
+        except ProviderError as e:
+            elapsed = int((time.time() - t0) * 1000)
+            if self.cache is not None and e.category in _NEGATIVE:
+                self.cache.put(name, doi, e.as_dict(), ok=False, http_status=e.status)
+            return ProviderAttempt(provider=name, ok=False, category=_CATEGORY.get(e.category, FAIL_PROVIDER_ERROR),
+                                   reason=e.message, http_status=e.status, elapsed_ms=elapsed), None
+        except Exception as e:
+            elapsed = int((time.time() - t0) * 1000)
+            return ProviderAttempt(provider=name, ok=False, category=FAIL_UNEXPECTED,
+                                   reason=str(e) or e.__class__.__name__, elapsed_ms=elapsed), None
+        elapsed = int((time.time() - t0) * 1000)
+        md = {k: v for k, v in rec.items() if k != "raw"}
+        if self.cache is not None:
+            self.cache.put(name, doi, md, ok=True, http_status=200)
+        return ProviderAttempt(provider=name, ok=True, http_status=200, elapsed_ms=elapsed), md
+
+    def resolve(self, doi_input: str) -> DOIResult:
+        doi = normalize_doi(doi_input)
+        valid, v_reason = validate_doi(doi)
+        if not valid:
+            return DOIResult(doi_input=doi_input, doi=doi or None, ok=False, category=FAIL_INVALID, reason=v_reason)
+        attempts: List[ProviderAttempt] = []
+        best_fail: Optional[ProviderAttempt] = None
+        for p in self.providers:
+            a, md = self._attempt(p, doi)
+            attempts.append(a)
+            if a.ok:
+                return DOIResult(doi_input=doi_input, doi=doi, ok=True, provider=a.provider, metadata=md or {}, attempts=attempts)
+            if best_fail is None or FAIL_PRIORITY.get(a.category or "", 9) < FAIL_PRIORITY.get(best_fail.category or "", 9):
+                best_fail = a
+        reason = (best_fail.reason if best_fail else "no providers configured") or "no providers succeeded"
+        category = (best_fail.category if best_fail else FAIL_NO_SUCCESS) or FAIL_NO_SUCCESS
+        return DOIResult(doi_input=doi_input, doi=doi, ok=False, category=category, reason=reason, attempts=attempts)
+
+    def resolve_all(self, dois: Iterable[str],
+                    progress: Optional[Callable[[int, int], None]] = None) -> List[DOIResult]:
+        dois = list(dois)
+        first: Dict[str, str] = {}
+        for d in dois:
+            first.setdefault(normalize_doi(d), d)
+        done: Dict[str, DOIResult] = {}
+        with ThreadPoolExecutor(max_workers=min(self.workers, max(1, len(first)))) as ex:
+            for i, (key, r) in enumerate(zip(first, ex.map(self.resolve, first.values())), 1):
+                done[key] = r
+                if progress is not None:
+                    progress(i, len(first))
+        out = []
+        for d in dois:
+            r = done[normalize_doi(d)]
+            out.append(r if r.doi_input == d else replace(r, doi_input=d))
+        return out
+
+    def resolve_many(self, dois: Iterable[str],
+                     progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """Drop-in for :func:`doi_pipeline.resolve_many`: same payload, input order kept."""
+        return summarize(self.resolve_all(dois, progress))
+
+    def close(self) -> None:
+        self.pool.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self) -> "DOIResolver":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
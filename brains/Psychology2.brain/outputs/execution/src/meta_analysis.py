@@ -1,5 +1,5 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Iterable, Optional, Sequence, Tuple, Dict, Any
 import math
 import pandas as pd
@@ -13,6 +13,8 @@ REQUIRED_COLS_DEFAULT = ("effect", "se")
 class MetaResult:
     table: pd.DataFrame
     details: Dict[str, Any]
+    leave_one_out: Optional[pd.DataFrame] = None
+    bootstrap: Optional[pd.DataFrame] = None
 
 
 def read_extraction_csv(path: str | "os.PathLike[str]") -> pd.DataFrame:
@@ -29,18 +31,23 @@ def _z_pvalue(z: float) -> float:
     return 2.0 * (1.0 - _norm_cdf(abs(z)))
 
 
-def _ensure_effect_inputs(df: pd.DataFrame, effect_col: str, se_col: str, var_col: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+def _effect_arrays(df: pd.DataFrame, effect_col: str, se_col: str, var_col: Optional[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     if effect_col not in df.columns:
         raise ValueError(f"Missing effect column: {effect_col}")
-    yi = pd.to_numeric(df[effect_col], errors="coerce").to_numpy()
+    yi = pd.to_numeric(df[effect_col], errors="coerce").to_numpy(dtype=float)
     if se_col in df.columns:
-        sei = pd.to_numeric(df[se_col], errors="coerce").to_numpy()
+        sei = pd.to_numeric(df[se_col], errors="coerce").to_numpy(dtype=float)
     elif var_col and var_col in df.columns:
-        vi = pd.to_numeric(df[var_col], errors="coerce").to_numpy()
+        vi = pd.to_numeric(df[var_col], errors="coerce").to_numpy(dtype=float)
         sei = np.sqrt(vi)
     else:
         raise ValueError(f"Missing SE/VAR columns: need '{se_col}' or '{var_col}'")
     m = np.isfinite(yi) & np.isfinite(sei) & (sei > 0)
+    return yi, sei, m
+
+
+def _ensure_effect_inputs(df: pd.DataFrame, effect_col: str, se_col: str, var_col: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+    yi, sei, m = _effect_arrays(df, effect_col, se_col, var_col)
     return yi[m], sei[m]
 
 
@@ -85,17 +92,331 @@ def _pool_random_dl(yi: np.ndarray, sei: np.ndarray) -> Dict[str, float]:
     }
 
 
-def meta_analyze(
-    df: pd.DataFrame,
+# --- grouped engine -------------------------------------------------------------
+#
+# Studies are sorted by group so every group is one contiguous segment; all
+# per-group sums are then one ``np.add.reduceat`` each. Every fit also carries a
+# per-study multiplicity ``c`` (1 normally, 0 to drop a study, k for a study
+# drawn k times), which lets leave-one-out and the bootstrap reuse the same
+# code on expanded segment layouts.
+
+TAU2_METHODS = ("DL", "PM", "REML")
+
+
+def _segsum(x: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    # reduceat returns x[start] for empty segments and rejects start == len(x); pad and mask.
+    out = np.add.reduceat(np.append(x, 0.0), starts) if len(starts) else np.zeros(0)
+    out[lengths == 0] = 0.0
+    return out
+
+
+def _z_pvalues(z: np.ndarray) -> np.ndarray:
+    return np.array([_z_pvalue(float(v)) if np.isfinite(v) else float("nan") for v in z], dtype=float)
+
+
+def _tau2_pm(y, v, c, starts, lengths, k, tau2_dl, tol, max_iter):
+    # Paule-Mandel: generalised Q(tau2) = k - 1, Q decreasing in tau2; bisection on all segments at once.
+    def excess(t):
+        w = c / (v + np.repeat(t, lengths))
+        mu = _segsum(w * y, starts, lengths) / _segsum(w, starts, lengths)
+        return _segsum(w * (y - np.repeat(mu, lengths)) ** 2, starts, lengths) - (k - 1)
+
+    lo = np.zeros(len(starts))
+    active = (k > 1) & (excess(lo) > 0)
+    hi = np.where(active, np.maximum(2.0 * tau2_dl, 1e-8), 0.0)
+    for _ in range(200):
+        grow = active & (excess(hi) > 0)
+        if not grow.any():
+            break
+        hi = np.where(grow, 2.0 * hi, hi)
+    for _ in range(max_iter):
+        mid = 0.5 * (lo + hi)
+        pos = excess(mid) > 0
+        lo, hi = np.where(active & pos, mid, lo), np.where(active & ~pos, mid, hi)
+        if np.all(hi - lo <= tol * np.maximum(1.0, hi)):
+            break
+    return np.where(active, 0.5 * (lo + hi), 0.0)
+
+
+def _reml_score(y, v, c, starts, lengths, t):
+    # d/dtau2 of the restricted log-likelihood and the (observed, else expected) information
+    w = 1.0 / (v + np.repeat(t, lengths))
+    cw = c * w
+    sw, sw2, sw3 = (_segsum(cw * w ** j, starts, lengths) for j in (0, 1, 2))
+    r = y - np.repeat(_segsum(cw * y, starts, lengths) / sw, lengths)
+    rw2 = _segsum(cw * w * r, starts, lengths)
+    r2 = _segsum(cw * w * r ** 2, starts, lengths)
+    r3 = _segsum(cw * w ** 2 * r ** 2, starts, lengths)
+    score = 0.5 * (r2 - sw + sw2 / sw)
+    expected = 0.5 * sw2 - sw3 / sw + 0.5 * (sw2 / sw) ** 2
+    observed = r3 - rw2 ** 2 / sw - expected
+    return score, np.where(observed > 0, observed, expected)
+
+
+def _tau2_reml(y, v, c, starts, lengths, k, tau2_dl, tol, max_iter):
+    # REML: root of the score on [0, inf), 0 if the score is not positive at 0. Newton steps
+    # from the DL estimate, falling back to bisection whenever a step leaves the bracket.
+    score = lambda t: _reml_score(y, v, c, starts, lengths, t)[0]  # noqa: E731
+    lo = np.zeros(len(starts))
+    active = (k > 1) & (score(lo) > 0)
+    hi = np.where(active, np.maximum(2.0 * tau2_dl, 1e-8), 0.0)
+    for _ in range(200):
+        grow = active & (score(hi) > 0)
+        if not grow.any():
+            break
+        hi = np.where(grow, 2.0 * hi, hi)
+    t = np.where((tau2_dl > lo) & (tau2_dl < hi), tau2_dl, 0.5 * (lo + hi))
+    for _ in range(max_iter):
+        sc, info = _reml_score(y, v, c, starts, lengths, t)
+        lo, hi = np.where(sc > 0, t, lo), np.where(sc > 0, hi, t)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = t + sc / info
+        new = np.where((info > 0) & (step > lo) & (step < hi), step, 0.5 * (lo + hi))
+        done = (np.abs(new - t) <= tol * np.maximum(1.0, t)) | (hi - lo <= tol * np.maximum(1.0, hi))
+        t = np.where(active, new, t)
+        if np.all(done | ~active):
+            break
+    return np.where(active, t, 0.0)
+
+
+def _fit_segments(
+    y: np.ndarray,
+    v: np.ndarray,
+    c: np.ndarray,
+    starts: np.ndarray,
+    lengths: np.ndarray,
+    method: str = "DL",
+    tol: float = 1e-12,
+    max_iter: int = 200,
+) -> Dict[str, np.ndarray]:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w = c / v
+        k = _segsum(c, starts, lengths)
+        sw = _segsum(w, starts, lengths)
+        mu_f = _segsum(w * y, starts, lengths) / sw
+        q = _segsum(w * (y - np.repeat(mu_f, lengths)) ** 2, starts, lengths)
+        cc = sw - _segsum(c / v ** 2, starts, lengths) / sw
+        tau2 = np.where((k > 1) & (cc > 0), np.maximum(0.0, (q - (k - 1)) / cc), 0.0)
+        i2 = np.where((k > 1) & (q > 0), np.maximum(0.0, (q - (k - 1)) / q), 0.0)
+        if method == "PM":
+            tau2 = _tau2_pm(y, v, c, starts, lengths, k, tau2, tol, max_iter)
+        elif method == "REML":
+            tau2 = _tau2_reml(y, v, c, starts, lengths, k, tau2, tol, max_iter)
+        elif method != "DL":
+            raise ValueError(f"Unknown tau2 method: {method!r} (expected one of {TAU2_METHODS})")
+        wr = c / (v + np.repeat(tau2, lengths))
+        swr = _segsum(wr, starts, lengths)
+        mu_r = _segsum(wr * y, starts, lengths) / swr
+        se_f = np.sqrt(1.0 / sw)
+        se_r = np.where(swr > 0, np.sqrt(1.0 / swr), np.nan)
+    return {"k": k, "fixed": mu_f, "fixed_se": se_f, "random": mu_r, "random_se": se_r, "tau2": tau2, "Q": q, "I2": i2}
+
+
+def _codes(codes: Optional[Sequence[int]], n: int, n_groups: Optional[int]) -> Tuple[np.ndarray, int]:
+    codes = np.zeros(n, dtype=np.int64) if codes is None else np.asarray(codes, dtype=np.int64)
+    if n_groups is None:
+        n_groups = int(codes.max()) + 1 if n else 0
+    return codes, int(n_groups)
+
+
+def _layout(codes: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(n_groups + 1))
+    return order, bounds[:-1], np.diff(bounds)
+
+
+def pool_grouped(
+    yi: Sequence[float],
+    vi: Sequence[float],
+    codes: Optional[Sequence[int]] = None,
     *,
-    effect_col: str = "effect",
-    se_col: str = "se",
-    var_col: Optional[str] = "var",
-    group_cols: Optional[Sequence[str]] = None,
-) -> MetaResult:
-    group_cols = list(group_cols) if group_cols else []
+    method: str = "DL",
+    n_groups: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """Fixed and random-effects pooling for every group at once.
+
+    ``codes`` assigns each study to a group ``0 .. G-1`` (all zeros if omitted;
+    ``n_groups`` defaults to ``max(codes) + 1``, empty groups come out as NaN).
+    Returns per-group arrays ``k, fixed, fixed_se, random, random_se, tau2, Q, I2``;
+    ``Q`` and ``I2`` are the usual fixed-effect heterogeneity statistics whatever
+    the ``tau2`` estimator.
+    """
+    y, v = np.asarray(yi, dtype=float), np.asarray(vi, dtype=float)
+    codes, n_groups = _codes(codes, len(y), n_groups)
+    order, starts, lengths = _layout(codes, n_groups)
+    return _fit_segments(y[order], v[order], np.ones(len(y)), starts, lengths, method)
+
+
+def _owner_chunks(cost: np.ndarray, max_cells: int):
+    # consecutive ranges [a, b) of owners whose summed cost stays within max_cells (at least one each)
+    cum = np.cumsum(cost)
+    a = 0
+    while a < len(cost):
+        base = cum[a - 1] if a else 0
+        b = max(a + 1, int(np.searchsorted(cum, base + max_cells, side="right")))
+        yield a, b
+        a = b
+
+
+def _loo_segments(owners: np.ndarray, group_start: np.ndarray, pos_in_group: np.ndarray, seg_len: np.ndarray):
+    # for each owner (a sorted position), the other members of its group as one segment
+    lens = seg_len[owners]
+    total = int(lens.sum())
+    seg_starts = np.concatenate([[0], np.cumsum(lens)[:-1]]).astype(np.int64) if len(owners) else np.zeros(0, dtype=np.int64)
+    j = np.arange(total) - np.repeat(seg_starts, lens)
+    j = j + (j >= np.repeat(pos_in_group[owners], lens))
+    return np.repeat(group_start[owners], lens) + j, seg_starts, lens
+
+
+def _loo_dl(ys, vs, starts, lengths, g, tau2_full, max_cells):
+    # DL without study i, from the group sums minus study i's terms: O(n) for tau2, Q, I2 and the
+    # fixed-effect estimate. The random-effects sums are taken at tau2_(-i), so they are updated
+    # the same way only where tau2_(-i) equals the group's tau2 (e.g. both 0); the remaining
+    # studies are summed over the rest of their group in bounded chunks.
+    pos_in_group = np.arange(len(ys)) - starts[g]
+    seg_len = lengths[g] - 1
+    k = seg_len.astype(float)
+    w = 1.0 / vs
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sw, sww = _segsum(w, starts, lengths), _segsum(w * w, starts, lengths)
+        z = ys - (_segsum(w * ys, starts, lengths) / sw)[g]
+        q = _segsum(w * z * z, starts, lengths)
+        sw_i = sw[g] - w
+        q_i = np.where(k > 0, np.maximum(0.0, q[g] - w * z * z - (w * z) ** 2 / sw_i), 0.0)
+        cc = sw_i - (sww[g] - w * w) / sw_i
+        tau2 = np.where((k > 1) & (cc > 0), np.maximum(0.0, (q_i - (k - 1)) / cc), 0.0)
+        i2 = np.where((k > 1) & (q_i > 0), np.maximum(0.0, (q_i - (k - 1)) / q_i), 0.0)
+        wr = 1.0 / (vs + tau2_full[g])
+        r0 = _segsum(wr, starts, lengths)[g] - wr
+        r1 = _segsum(wr * ys, starts, lengths)[g] - wr * ys
+        redo = np.flatnonzero(tau2 != tau2_full[g])
+        for a, b in _owner_chunks(seg_len[redo], max_cells):
+            own = redo[a:b]
+            members, seg_starts, lens = _loo_segments(own, starts[g], pos_in_group, seg_len)
+            wm = 1.0 / (vs[members] + np.repeat(tau2[own], lens))
+            r0[own] = _segsum(wm, seg_starts, lens)
+            r1[own] = _segsum(wm * ys[members], seg_starts, lens)
+        se_r = np.where(r0 > 0, np.sqrt(1.0 / r0), np.nan)
+        return {"random": r1 / r0, "random_se": se_r, "tau2": tau2, "Q": q_i, "I2": i2}
+
+
+def _loo_refit(ys, vs, starts, lengths, g, method, max_cells):
+    # PM/REML have no update formula: lay out every "study i removed" fit as its own segment
+    # and iterate them together, in chunks of at most max_cells expanded rows.
+    n = len(ys)
+    pos_in_group = np.arange(n) - starts[g]
+    seg_len = lengths[g] - 1
+    out = {name: np.empty(n) for name in ("random", "random_se", "tau2", "Q", "I2")}
+    for a, b in _owner_chunks(seg_len, max_cells):
+        members, seg_starts, lens = _loo_segments(np.arange(a, b), starts[g], pos_in_group, seg_len)
+        fit = _fit_segments(ys[members], vs[members], np.ones(len(members)), seg_starts, lens, method)
+        for name in out:
+            out[name][a:b] = fit[name]
+    return out
+
+
+def leave_one_out(
+    yi: Sequence[float],
+    vi: Sequence[float],
+    codes: Optional[Sequence[int]] = None,
+    *,
+    method: str = "DL",
+    n_groups: Optional[int] = None,
+    max_cells: int = 1 << 22,
+) -> Dict[str, np.ndarray]:
+    """Leave-one-out refits and influence diagnostics for every study, in input order.
+
+    Each study's fit drops it from its own group. For DL, tau2, Q and I2 come
+    in closed form from the group sums minus the study's own terms, in O(n);
+    the random-effects estimate is updated the same way wherever tau2 does not
+    move, and otherwise summed over the rest of the group, which costs
+    O(k_g) per such study. PM and REML are refitted on all
+    ``sum(k_g * (k_g - 1))`` leave-one-out rows, i.e. O(sum k_g^2) time;
+    both paths hold at most ``max_cells`` expanded rows at a time.
+
+    ``rstudent`` is the externally studentised residual
+    ``(y_i - mu_(-i)) / sqrt(v_i + tau2_(-i) + se_(-i)^2)`` and ``delta`` the
+    change in the pooled random-effects estimate.
+    """
+    y, v = np.asarray(yi, dtype=float), np.asarray(vi, dtype=float)
+    n = len(y)
+    codes, n_groups = _codes(codes, n, n_groups)
+    order, starts, lengths = _layout(codes, n_groups)
+    ys, vs = y[order], v[order]
+    full = _fit_segments(ys, vs, np.ones(n), starts, lengths, method)
+    g_sorted = codes[order]
+    if method == "DL":
+        loo = _loo_dl(ys, vs, starts, lengths, g_sorted, full["tau2"], max_cells)
+    else:
+        loo = _loo_refit(ys, vs, starts, lengths, g_sorted, method, max_cells)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rstudent = (ys - loo["random"]) / np.sqrt(vs + loo["tau2"] + loo["random_se"] ** 2)
+        delta = full["random"][g_sorted] - loo["random"]
+    out = {
+        "estimate": loo["random"],
+        "se": loo["random_se"],
+        "tau2": loo["tau2"],
+        "Q": loo["Q"],
+        "I2": loo["I2"],
+        "delta": delta,
+        "rstudent": rstudent,
+    }
+    inv = np.empty(n, dtype=np.int64)
+    inv[order] = np.arange(n)
+    return {name: arr[inv] for name, arr in out.items()}
+
+
+def bootstrap_grouped(
+    yi: Sequence[float],
+    vi: Sequence[float],
+    codes: Optional[Sequence[int]] = None,
+    *,
+    method: str = "DL",
+    n_boot: int = 1000,
+    seed: Optional[int] = 0,
+    n_groups: Optional[int] = None,
+    max_cells: int = 1 << 22,
+) -> Dict[str, np.ndarray]:
+    """Random-effects estimates and tau2 under resampling of studies within each group.
+
+    Each replicate draws ``k_g`` studies with replacement per group and refits
+    through study multiplicities, so all replicates of all groups are one
+    segment layout. Returns ``(n_boot, G)`` arrays ``estimate`` and ``tau2``.
+    """
+    y, v = np.asarray(yi, dtype=float), np.asarray(vi, dtype=float)
+    n = len(y)
+    codes, n_groups = _codes(codes, n, n_groups)
+    order, starts, lengths = _layout(codes, n_groups)
+    ys, vs = y[order], v[order]
+    k_i = lengths[codes[order]].astype(float)
+    start_i = starts[codes[order]]
+    rng = np.random.default_rng(seed)
+    est = np.empty((int(n_boot), n_groups))
+    tau2 = np.empty((int(n_boot), n_groups))
+    step = max(1, int(max_cells) // max(1, n))
+    for b0 in range(0, int(n_boot), step):
+        nb = min(step, int(n_boot) - b0)
+        # one draw per study slot: a uniform pick within that slot's group
+        picks = start_i + np.floor(rng.random((nb, n)) * k_i).astype(np.int64)
+        counts = np.bincount((np.arange(nb)[:, None] * n + picks).ravel(), minlength=nb * n).astype(float)
+        seg_starts = (np.arange(nb)[:, None] * n + starts[None, :]).ravel()
+        fit = _fit_segments(np.tile(ys, nb), np.tile(vs, nb), counts, seg_starts, np.tile(lengths, nb), method)
+        est[b0:b0 + nb] = fit["random"].reshape(nb, n_groups)
+        tau2[b0:b0 + nb] = fit["tau2"].reshape(nb, n_groups)
+    return {"estimate": est, "tau2": tau2}
+
+
+def _group_codes(df: pd.DataFrame, group_cols: Sequence[str]) -> Tuple[np.ndarray, list]:
+    if not group_cols:
+        return np.zeros(len(df), dtype=np.int64), [()]
+    codes = df.groupby(list(group_cols), dropna=False, sort=False).ngroup().to_numpy(dtype=np.int64)
+    _, first = np.unique(codes, return_index=True)
+    keys = list(df[list(group_cols)].iloc[first].itertuples(index=False, name=None))
+    return codes, keys
+
+
+def _meta_rows_reference(df: pd.DataFrame, effect_col: str, se_col: str, var_col: Optional[str], group_cols: Sequence[str]) -> list:
     rows = []
-    details: Dict[str, Any] = {"effect_col": effect_col, "se_col": se_col, "var_col": var_col, "group_cols": group_cols}
     if group_cols:
         grouped = df.groupby(group_cols, dropna=False, sort=False)
         items = list(grouped)
@@ -109,9 +430,91 @@ def meta_analyze(
         base = dict(zip(group_cols, label)) if group_cols else {}
         rows.append({**base, "model": "fixed", **fixed})
         rows.append({**base, "model": "random_dl", **random})
+    return rows
+
+
+def meta_analyze(
+    df: pd.DataFrame,
+    *,
+    effect_col: str = "effect",
+    se_col: str = "se",
+    var_col: Optional[str] = "var",
+    group_cols: Optional[Sequence[str]] = None,
+    tau2_method: str = "DL",
+    influence: bool = False,
+    n_boot: int = 0,
+    alpha: float = 0.05,
+    seed: Optional[int] = 0,
+    engine: str = "grouped",
+) -> MetaResult:
+    """Fixed and random-effects pooling per group.
+
+    ``tau2_method`` selects the between-study variance estimator (``"DL"``,
+    ``"PM"`` or ``"REML"``); the random-effects rows are labelled
+    ``random_<method>``. ``influence=True`` adds per-study leave-one-out
+    diagnostics and ``n_boot > 0`` percentile intervals from resampling studies
+    within each group. ``engine="reference"`` runs the original per-group DL loop.
+    """
+    group_cols = list(group_cols) if group_cols else []
+    method = tau2_method.upper()
+    if method not in TAU2_METHODS:
+        raise ValueError(f"Unknown tau2_method: {tau2_method!r} (expected one of {TAU2_METHODS})")
+    details: Dict[str, Any] = {"effect_col": effect_col, "se_col": se_col, "var_col": var_col, "group_cols": group_cols,
+                               "tau2_method": method, "engine": engine}
+    if engine == "reference":
+        if method != "DL" or influence or n_boot:
+            raise ValueError("engine='reference' only supports tau2_method='DL' without influence/bootstrap")
+        rows = _meta_rows_reference(df, effect_col, se_col, var_col, group_cols)
+        return MetaResult(table=_sorted_table(rows, group_cols), details=details)
+    if engine != "grouped":
+        raise ValueError(f"Unknown engine: {engine!r}")
+
+    yi, sei, valid = _effect_arrays(df, effect_col, se_col, var_col)
+    all_codes, keys = _group_codes(df, group_cols)
+    codes = all_codes[valid]
+    y, v = yi[valid], sei[valid] ** 2
+    fit = pool_grouped(y, v, codes, method=method, n_groups=len(keys))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z_f = np.where(fit["fixed_se"] > 0, fit["fixed"] / fit["fixed_se"], np.nan)
+        z_r = np.where(fit["random_se"] > 0, fit["random"] / fit["random_se"], np.nan)
+    p_f, p_r = _z_pvalues(z_f), _z_pvalues(z_r)
+    rows = []
+    for g, key in enumerate(keys):
+        base = dict(zip(group_cols, key)) if group_cols else {}
+        mu, se = float(fit["fixed"][g]), float(fit["fixed_se"][g])
+        rows.append({**base, "model": "fixed", "k": int(fit["k"][g]), "estimate": mu, "se": se,
+                     "ci_low": mu - 1.96 * se, "ci_high": mu + 1.96 * se, "z": float(z_f[g]), "p": float(p_f[g])})
+        mu, se = float(fit["random"][g]), float(fit["random_se"][g])
+        rows.append({**base, "model": f"random_{method.lower()}", "k": int(fit["k"][g]), "estimate": mu, "se": se,
+                     "ci_low": mu - 1.96 * se, "ci_high": mu + 1.96 * se, "z": float(z_r[g]), "p": float(p_r[g]),
+                     "tau2": float(fit["tau2"][g]), "Q": float(fit["Q"][g]), "I2": float(fit["I2"][g])})
+    result = MetaResult(table=_sorted_table(rows, group_cols), details=details)
+
+    if influence:
+        loo = leave_one_out(y, v, codes, method=method, n_groups=len(keys))
+        frame = df.loc[valid].copy()
+        for name, arr in loo.items():
+            frame[f"loo_{name}"] = arr
+        result = replace(result, leave_one_out=frame.reset_index(drop=True))
+    if n_boot and n_boot > 0:
+        boot = bootstrap_grouped(y, v, codes, method=method, n_boot=n_boot, seed=seed, n_groups=len(keys))
+        lo_q, hi_q = 100.0 * alpha / 2.0, 100.0 * (1.0 - alpha / 2.0)
+        brows = []
+        for g, key in enumerate(keys):
+            est, t2 = boot["estimate"][:, g], boot["tau2"][:, g]
+            brows.append({**(dict(zip(group_cols, key)) if group_cols else {}), "model": f"random_{method.lower()}",
+                          "n_boot": int(n_boot), "boot_se": float(np.nanstd(est, ddof=1)) if n_boot > 1 else float("nan"),
+                          "ci_low": float(np.nanpercentile(est, lo_q)), "ci_high": float(np.nanpercentile(est, hi_q)),
+                          "tau2_ci_low": float(np.nanpercentile(t2, lo_q)), "tau2_ci_high": float(np.nanpercentile(t2, hi_q))})
+        details["alpha"] = alpha
+        result = replace(result, bootstrap=_sorted_table(brows, group_cols))
+    return result
+
+
+def _sorted_table(rows: list, group_cols: Sequence[str]) -> pd.DataFrame:
     table = pd.DataFrame(rows)
     if group_cols:
-        table = table.sort_values(group_cols + ["model"]).reset_index(drop=True)
+        table = table.sort_values(list(group_cols) + ["model"]).reset_index(drop=True)
     else:
         table = table.sort_values(["model"]).reset_index(drop=True)
-    return MetaResult(table=table, details=details)
+    return table
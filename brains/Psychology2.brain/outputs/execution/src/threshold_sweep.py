@@ -17,6 +17,10 @@ import argparse
 import json
 from pathlib import Path
 
+import numpy as np
+
+from verifier_policy.sweep import SortedPrefix, group_codes, sorted_prefix
+
 
 @dataclass(frozen=True)
 class TierCosts:
@@ -118,6 +122,65 @@ def evaluate(
     }
 
 
+def _columns(
+    records: Sequence[Any],
+    costs_by_tier: Mapping[str, TierCosts],
+    get_uncertainty: Callable[[Any], float],
+    get_tier: Callable[[Any], str],
+    get_correct: Callable[[Any], Optional[bool]],
+) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+    """One pass over the records: tier labels and codes, uncertainties, and the
+    per-record (auto_cost, review_cost, abstain_cost, incorrect, unknown) columns."""
+    n = len(records)
+    u = np.fromiter((float(get_uncertainty(r)) for r in records), dtype=float, count=n)
+    labels, codes = group_codes([get_tier(r) for r in records])
+    corr = [get_correct(r) for r in records]
+    table = np.zeros((3, len(labels)), dtype=float)
+    for i, tier in enumerate(labels):
+        c = costs_by_tier.get(tier) or costs_by_tier.get("default") or TierCosts(tier=tier)
+        table[:, i] = (c.auto_cost, c.review_cost, c.abstain_cost)
+    cols = np.empty((5, n), dtype=float)
+    cols[:3] = table[:, codes]
+    cols[3] = np.fromiter((c is not None and not c for c in corr), dtype=bool, count=n)
+    cols[4] = np.fromiter((c is None for c in corr), dtype=bool, count=n)
+    return labels, codes, u, cols
+
+
+def _sweep_sorted(sp: SortedPrefix, pairs: Sequence[Tuple[float, Optional[float]]]) -> List[Dict[str, Any]]:
+    """``evaluate`` for every (t_auto, t_abstain) pair from one sorted prefix.
+
+    In ascending uncertainty order 'auto' is the prefix ``u <= t_auto`` cut
+    short at ``u < t_abstain`` (abstain wins ties), 'abstain' runs from
+    ``u >= t_abstain`` to the last finite value, and everything else,
+    NaN included, escalates.
+    """
+    n, nf = sp.n, sp.n_finite
+    t_auto = np.array([p[0] for p in pairs], dtype=float)
+    no_abstain = np.array([p[1] is None for p in pairs], dtype=bool)
+    t_abst = np.array([0.0 if p[1] is None else p[1] for p in pairs], dtype=float)
+    lo = np.where(no_abstain, nf, sp.index(t_abst, side="left"))
+    a = np.minimum(sp.index(t_auto, side="right"), lo)
+    auto, abst = a, nf - lo
+    cost = sp.total(0, 0, a) + sp.total(1, a, lo) + sp.total(1, nf, n) + sp.total(2, lo, nf)
+    incorrect, unknown = sp.total(3, 0, a), sp.total(4, 0, a)
+    denom = max(n, 1)
+    out: List[Dict[str, Any]] = []
+    for j, (ta, tb) in enumerate(pairs):
+        out.append({
+            "n": n,
+            "t_auto": float(ta),
+            "t_abstain": None if tb is None else float(tb),
+            "coverage_auto": int(auto[j]) / denom,
+            "escalation_rate": (n - int(auto[j]) - int(abst[j])) / denom,
+            "abstention_rate": int(abst[j]) / denom,
+            "error_rate": int(incorrect[j]) / denom,
+            "incorrect_auto": int(incorrect[j]),
+            "unknown_correct": int(unknown[j]),
+            "expected_cost": float(cost[j]),
+        })
+    return out
+
+
 def sweep(
     records: Sequence[Any],
     thresholds_auto: Sequence[float],
@@ -127,43 +190,34 @@ def sweep(
     get_tier: Callable[[Any], str] = default_get_tier,
     get_correct: Callable[[Any], Optional[bool]] = default_get_correct,
 ) -> List[Dict[str, Any]]:
+    """Same rows as calling :func:`evaluate` per tier and threshold pair, in one
+    sort per tier: counts are identical, ``expected_cost`` is summed in sorted
+    rather than input order and may differ in the last few ulps."""
     costs_by_tier = dict(costs_by_tier or {})
     if "default" not in costs_by_tier:
         costs_by_tier["default"] = TierCosts(tier="default")
 
-    tiers: Dict[str, List[Any]] = {}
-    for r in records:
-        tiers.setdefault(get_tier(r), []).append(r)
-
     if thresholds_abstain is None:
         thresholds_abstain = [None]
-
+    pairs = [
+        (float(t_auto), None if t_abstain is None else float(t_abstain))
+        for t_auto in thresholds_auto
+        for t_abstain in thresholds_abstain
+        if t_abstain is None or float(t_abstain) >= float(t_auto)
+    ]
+
+    labels, codes, u, cols = _columns(records, costs_by_tier, get_uncertainty, get_tier, get_correct)
     out: List[Dict[str, Any]] = []
-    for tier, recs in sorted(tiers.items()):
-        for t_auto in thresholds_auto:
-            for t_abstain in thresholds_abstain:
-                if t_abstain is not None and float(t_abstain) < float(t_auto):
-                    continue
-                row = evaluate(
-                    recs, float(t_auto), None if t_abstain is None else float(t_abstain),
-                    costs_by_tier=costs_by_tier,
-                    get_uncertainty=get_uncertainty, get_tier=get_tier, get_correct=get_correct,
-                )
-                row["risk_tier"] = tier
-                out.append(row)
+    for code, tier in enumerate(labels):
+        idx = np.flatnonzero(codes == code)
+        for row in _sweep_sorted(sorted_prefix(u[idx], *cols[:, idx]), pairs):
+            row["risk_tier"] = tier
+            out.append(row)
 
     # overall aggregate
-    for t_auto in thresholds_auto:
-        for t_abstain in thresholds_abstain:
-            if t_abstain is not None and float(t_abstain) < float(t_auto):
-                continue
-            row = evaluate(
-                records, float(t_auto), None if t_abstain is None else float(t_abstain),
-                costs_by_tier=costs_by_tier,
-                get_uncertainty=get_uncertainty, get_tier=get_tier, get_correct=get_correct,
-            )
-            row["risk_tier"] = "__overall__"
-            out.append(row)
+    for row in _sweep_sorted(sorted_prefix(u, *cols), pairs):
+        row["risk_tier"] = "__overall__"
+        out.append(row)
 
     return out
 
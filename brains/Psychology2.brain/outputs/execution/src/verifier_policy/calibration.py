@@ -2,7 +2,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import json
 import math
+
+import numpy as np
+
+from .sweep import bootstrap_bands, confusion_at, confusion_metrics, split_groups
 @dataclass(frozen=True)
 class ThresholdFit:
     threshold: float
@@ -65,21 +70,68 @@ def apply_threshold(scores: Sequence[float], threshold: float) -> List[int]:
     return [1 if (s is not None and float(s) >= t) else 0 for s in scores]
 
 
-def sweep_thresholds(y_true: Sequence[int], scores: Sequence[float]) -> List[Dict[str, float]]:
+def _sweep_arrays(y_true: Sequence[int], scores: Sequence[float]) -> Optional[Dict[str, np.ndarray]]:
     if len(y_true) != len(scores):
         raise ValueError("y_true and scores must be same length")
-    pairs = [(1 if int(y) else 0, float(s)) for y, s in zip(y_true, scores)]
-    uniq = sorted({s for _, s in pairs})
-    if not uniq:
+    if not len(scores):
+        return None
+    s = np.asarray(scores, dtype=float)
+    uniq = np.unique(s[~np.isnan(s)])
+    if not uniq.size:
+        return None
+    candidates = np.unique(np.concatenate([[1.0], uniq, [max(0.0, min(1.0, float(uniq[0]) - 1e-12))]]))
+    m = confusion_metrics(*confusion_at(y_true, s, candidates))
+    m["threshold"] = candidates
+    return m
+
+
+def sweep_thresholds(y_true: Sequence[int], scores: Sequence[float]) -> List[Dict[str, float]]:
+    m = _sweep_arrays(y_true, scores)
+    if m is None:
         return []
-    candidates = sorted(set([1.0] + uniq + [max(0.0, min(1.0, uniq[0] - 1e-12))]))
-    out: List[Dict[str, float]] = []
-    for t in candidates:
-        y_pred = [1 if s >= t else 0 for _, s in pairs]
-        m = metrics_from_preds([y for y, _ in pairs], y_pred)
-        m["threshold"] = float(t)
-        out.append(m)
-    return out
+    cols = {k: v.tolist() for k, v in m.items()}
+    return [dict(zip(cols, row)) for row in zip(*cols.values())]
+
+
+def sweep_curves(
+    heldout: Sequence[Dict[str, Any]],
+    thresholds: Sequence[float],
+    *,
+    score_key: str = "score",
+    label_key: str = "label",
+    group_key: Optional[str] = None,
+    n_boot: int = 0,
+    alpha: float = 0.05,
+    seed: Optional[int] = 0,
+    band_metrics: Sequence[str] = ("precision", "recall", "f1"),
+) -> Dict[str, Any]:
+    """Metric curves over a fixed threshold grid, per group (e.g. abstain category or domain).
+
+    With ``n_boot > 0`` each group also gets percentile confidence bands from a
+    record-level bootstrap within that group.
+    """
+    grid = np.asarray(thresholds, dtype=float)
+    y = np.fromiter((1 if int(it.get(label_key, 0)) else 0 for it in heldout), dtype=np.int64, count=len(heldout))
+    s = np.fromiter((float(it.get(score_key, 0.0)) for it in heldout), dtype=float, count=len(heldout))
+    if group_key:
+        parts = split_groups([it.get(group_key, "__missing__") for it in heldout])
+    else:
+        parts = [("__all__", np.arange(len(heldout)))]
+    curves: Dict[str, Any] = {}
+    for g, idx in parts:
+        m = confusion_metrics(*confusion_at(y[idx], s[idx], grid))
+        entry: Dict[str, Any] = {k: v.tolist() for k, v in m.items()}
+        if n_boot > 0:
+            bands = bootstrap_bands(y[idx], s[idx], grid, metrics=band_metrics, n_boot=n_boot, alpha=alpha, seed=seed)
+            entry["bands"] = {k: {"lo": v["lo"].tolist(), "hi": v["hi"].tolist()} for k, v in bands.items()}
+        curves[str(g)] = entry
+    return {
+        "group_key": group_key,
+        "thresholds": grid.tolist(),
+        "n_boot": int(n_boot),
+        "alpha": alpha if n_boot > 0 else None,
+        "curves": curves,
+    }
 
 
 def fit_threshold(
@@ -89,26 +141,24 @@ def fit_threshold(
     min_precision: Optional[float] = None,
     min_recall: Optional[float] = None,
 ) -> ThresholdFit:
-    sweeps = sweep_thresholds(y_true, scores)
-    if not sweeps:
+    m = _sweep_arrays(y_true, scores)
+    if m is None:
         return ThresholdFit(threshold=1.0, objective=objective, min_precision=min_precision, min_recall=min_recall, n=0, positives=0)
     obj = objective.lower().strip()
     if obj not in {"f1", "accuracy", "precision", "recall"}:
         raise ValueError(f"Unsupported objective: {objective}")
-    def ok(m: Dict[str, float]) -> bool:
-        if min_precision is not None and m["precision"] + 1e-12 < float(min_precision):
-            return False
-        if min_recall is not None and m["recall"] + 1e-12 < float(min_recall):
-            return False
-        return True
-    feasible = [m for m in sweeps if ok(m)]
-    pool = feasible if feasible else sweeps
+    feasible = np.ones(m["threshold"].shape, dtype=bool)
+    if min_precision is not None:
+        feasible &= ~(m["precision"] + 1e-12 < float(min_precision))
+    if min_recall is not None:
+        feasible &= ~(m["recall"] + 1e-12 < float(min_recall))
+    pool = np.flatnonzero(feasible) if feasible.any() else np.arange(feasible.shape[0])
     # Deterministic tie-break: higher objective, then higher precision, then higher recall, then higher threshold.
-    pool.sort(key=lambda m: (m[obj], m["precision"], m["recall"], m["threshold"]), reverse=True)
-    best = pool[0]
-    positives = sum(1 for y in y_true if int(y) == 1)
+    keys = tuple(m[k][pool] for k in ("threshold", "recall", "precision", obj))
+    best = pool[np.lexsort(keys)[-1]]
+    positives = int(np.count_nonzero(np.asarray(y_true).astype(np.int64) == 1))
     return ThresholdFit(
-        threshold=float(best["threshold"]),
+        threshold=float(m["threshold"][best]),
         objective=obj,
         min_precision=min_precision,
         min_recall=min_recall,
@@ -0,0 +1,188 @@
+"""Sort-and-cumsum kernel for threshold sweeps.
+
+Scores are sorted once and the per-record columns of interest (labels, costs,
+error flags) are turned into prefix sums. The records on either side of any
+threshold form a prefix or suffix of that order, located with
+``np.searchsorted``, so each threshold costs O(log N) and a full sweep costs
+O(N log N + T log N) instead of O(N * T).
+
+Threshold semantics match the scalar code paths exactly:
+
+* ``side="left"`` index -> number of scores ``< t`` (so ``score >= t`` is the suffix)
+* ``side="right"`` index -> number of scores ``<= t``
+
+NaN scores sort last and are kept out of both comparisons, as ``nan >= t`` and
+``nan <= t`` are both false.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SortedPrefix:
+    """Scores in ascending order plus prefix sums of aligned columns.
+
+    ``cum[k, i]`` is the sum of column ``k`` over the ``i`` smallest scores;
+    ``n_finite`` counts the non-NaN scores, which occupy ``[0, n_finite)``.
+    """
+
+    scores: np.ndarray
+    cum: np.ndarray
+    n_finite: int
+
+    @property
+    def n(self) -> int:
+        return int(self.scores.shape[0])
+
+    def index(self, thresholds: Any, side: str = "left") -> np.ndarray:
+        return np.searchsorted(self.scores[: self.n_finite], np.asarray(thresholds, dtype=float), side=side)
+
+    def total(self, k: int, lo: Any, hi: Any) -> np.ndarray:
+        """Sum of column ``k`` over sorted positions ``[lo, hi)``."""
+        return self.cum[k][hi] - self.cum[k][lo]
+
+
+def sorted_prefix(scores: Any, *columns: Any) -> SortedPrefix:
+    s = np.asarray(scores, dtype=float)
+    order = np.argsort(s, kind="stable")
+    cols = [np.asarray(c)[order] for c in columns]
+    dtype = np.result_type(*cols) if cols else np.int64
+    cum = np.zeros((len(cols), s.shape[0] + 1), dtype=dtype)
+    for k, c in enumerate(cols):
+        np.cumsum(c, out=cum[k, 1:])
+    return SortedPrefix(scores=s[order], cum=cum, n_finite=int(np.count_nonzero(~np.isnan(s))))
+
+
+def _labels(y_true: Any) -> np.ndarray:
+    # int() truncation then truthiness, as in ``1 if int(y) else 0``
+    return (np.asarray(y_true).astype(np.int64) != 0).astype(np.int64)
+
+
+def confusion_at(y_true: Any, scores: Any, thresholds: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """tp, fp, tn, fn for ``pred = score >= t`` at every threshold."""
+    y = _labels(y_true)
+    sp = sorted_prefix(scores, y)
+    k = sp.index(thresholds, side="left")
+    n, nf = sp.n, sp.n_finite
+    pos = int(sp.cum[0, n])
+    tp = sp.total(0, k, nf)
+    fp = (nf - k) - tp
+    fn = pos - tp
+    tn = (n - pos) - fp
+    return tp, fp, tn, fn
+
+
+def _div(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    num, den = np.asarray(num, dtype=float), np.asarray(den, dtype=float)
+    return np.divide(num, den, out=np.zeros(np.broadcast(num, den).shape), where=den != 0)
+
+
+def confusion_metrics(tp: Any, fp: Any, tn: Any, fn: Any) -> Dict[str, np.ndarray]:
+    """Vectorised ``calibration.metrics_from_preds``; same operation order, same floats."""
+    tp, fp, tn, fn = (np.asarray(x, dtype=float) for x in (tp, fp, tn, fn))
+    prec = _div(tp, tp + fp)
+    rec = _div(tp, tp + fn)
+    return {
+        "n": tp + fp + tn + fn,
+        "tp": tp,
+        "fp": fp,
+        "tn": tn,
+        "fn": fn,
+        "precision": prec,
+        "recall": rec,
+        "f1": _div(2 * prec * rec, prec + rec),
+        "accuracy": _div(tp + tn, tp + tn + fp + fn),
+        "fpr": _div(fp, fp + tn),
+        "fnr": _div(fn, fn + tp),
+    }
+
+
+def group_codes(groups: Sequence[Hashable]) -> Tuple[List[str], np.ndarray]:
+    """Sorted distinct ``str(group)`` labels and each record's index into them."""
+    first: Dict[str, int] = {}
+    raw = np.fromiter((first.setdefault(str(g), len(first)) for g in groups), dtype=np.int64, count=len(groups))
+    labels = sorted(first)
+    rank = np.empty(len(first), dtype=np.int64)
+    rank[[first[g] for g in labels]] = np.arange(len(labels))
+    return labels, rank[raw]
+
+
+def split_groups(groups: Sequence[Hashable]) -> List[Tuple[str, np.ndarray]]:
+    """``[(label, record indices), ...]`` in sorted label order, from one stable sort."""
+    labels, codes = group_codes(groups)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+    return [(g, order[bounds[i]:bounds[i + 1]]) for i, g in enumerate(labels)]
+
+
+def bootstrap_confusion(
+    y_true: Any,
+    scores: Any,
+    thresholds: Any,
+    n_boot: int = 1000,
+    seed: Optional[int] = 0,
+    max_cells: int = 1 << 24,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """tp, fp, tn, fn of shape ``(n_boot, T)`` under record-level resampling.
+
+    Only the class of a record and which pair of adjacent thresholds its score
+    falls between affect the counts, so a nonparametric bootstrap (N draws with
+    replacement) is exactly a multinomial draw over those ``2 * (T + 1)``
+    cells. Each replicate costs O(T) rather than O(N).
+    """
+    t = np.asarray(thresholds, dtype=float)
+    order = np.argsort(t, kind="stable")
+    y = _labels(y_true)
+    sp = sorted_prefix(scores, y)
+    n, nf = sp.n, sp.n_finite
+    k = np.concatenate([[0], sp.index(t[order], side="left"), [nf]])
+    pos_cells = np.diff(sp.cum[0][k])
+    neg_cells = np.diff(k) - pos_cells
+    # NaN scores are never predicted positive: fold them into the lowest cells.
+    nan_pos = int(sp.cum[0, n] - sp.cum[0, nf])
+    pos_cells[0] += nan_pos
+    neg_cells[0] += (n - nf) - nan_pos
+    p = np.concatenate([pos_cells, neg_cells]) / max(n, 1)
+    T = t.shape[0]
+    out = np.empty((4, int(n_boot), T), dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    step = max(1, int(max_cells) // max(1, p.shape[0]))
+    for b0 in range(0, int(n_boot), step):
+        draws = rng.multinomial(n, p, size=min(step, int(n_boot) - b0))
+        pos, neg = draws[:, : T + 1], draws[:, T + 1:]
+        # predicted positive at the j-th sorted threshold = cells j+1 .. T
+        tp = np.cumsum(pos[:, ::-1], axis=1)[:, ::-1][:, 1:]
+        fp = np.cumsum(neg[:, ::-1], axis=1)[:, ::-1][:, 1:]
+        P, N = pos.sum(axis=1, keepdims=True), neg.sum(axis=1, keepdims=True)
+        sl = slice(b0, b0 + draws.shape[0])
+        out[0, sl][:, order], out[1, sl][:, order] = tp, fp
+        out[2, sl][:, order], out[3, sl][:, order] = N - fp, P - tp
+    return out[0], out[1], out[2], out[3]
+
+
+def bootstrap_bands(
+    y_true: Any,
+    scores: Any,
+    thresholds: Any,
+    metrics: Sequence[str] = ("precision", "recall", "f1"),
+    n_boot: int = 1000,
+    alpha: float = 0.05,
+    seed: Optional[int] = 0,
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """Percentile bands ``{metric: {"lo": (T,), "hi": (T,)}}`` for the sweep curves."""
+    if n_boot <= 0:
+        raise ValueError("n_boot must be positive")
+    if not 0.0 < alpha < 1.0:
+        raise ValueError("alpha must be in (0, 1)")
+    m = confusion_metrics(*bootstrap_confusion(y_true, scores, thresholds, n_boot=n_boot, seed=seed))
+    q = [100.0 * alpha / 2.0, 100.0 * (1.0 - alpha / 2.0)]
+    out: Dict[str, Dict[str, np.ndarray]] = {}
+    for name in metrics:
+        lo, hi = np.percentile(m[name], q, axis=0)
+        out[name] = {"lo": lo, "hi": hi}
+    return out
@@ -0,0 +1,79 @@
+import math
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from claims_audit.retrieval import RetrievalEngine, _tokenize  # noqa: E402
+
+
+def _docs(n=400, seed=0):
+    rng = random.Random(seed)
+    vocab = ["default", "nudge", "framing", "salience", "loss", "aversion", "don't"] + [f"t{i}" for i in range(300)]
+    docs = [
+        {"id": f"d{rng.randint(0, 999):03d}", "text": " ".join(rng.choice(vocab) for _ in range(rng.randint(0, 60)))}
+        for _ in range(n)
+    ]
+    docs.append(dict(docs[3]))  # duplicate id and text: tie broken by corpus order
+    docs.append({"id": "zzz", "text": docs[4]["text"]})
+    return docs, vocab
+
+
+def _reference(engine, docs, query, top_k):
+    """The original per-document dict loop followed by a full sort."""
+    q_idx = [engine._bm25_vocab[w] for w in _tokenize(query) if w in engine._bm25_vocab]
+    k1, b, avgdl = engine._bm25_k1, engine._bm25_b, engine._bm25_avgdl or 1.0
+    scores = []
+    for d in docs:
+        toks = _tokenize(d["text"])
+        tf = {}
+        for w in toks:
+            tf[engine._bm25_vocab[w]] = tf.get(engine._bm25_vocab[w], 0) + 1
+        denom = k1 * (1.0 - b + b * (len(toks) / avgdl))
+        s = 0.0
+        for j in q_idx:
+            f = tf.get(j, 0)
+            if f:
+                s += float(engine._bm25_idf[j]) * (f * (k1 + 1.0)) / (f + denom)
+        scores.append(s)
+    order = sorted(range(len(docs)), key=lambda i: (-scores[i], str(docs[i]["id"])))
+    return [(str(docs[i]["id"]), scores[i]) for i in order[:top_k]]
+
+
+def test_bm25_idf_matches_formula():
+    docs, _ = _docs(50)
+    engine = RetrievalEngine("bm25").build(docs)
+    N = len(docs)
+    for w, j in list(engine._bm25_vocab.items())[:20]:
+        df = sum(w in _tokenize(d["text"]) for d in docs)
+        assert engine._bm25_idf[j] == math.log(1.0 + (N - df + 0.5) / (df + 0.5))
+
+
+def test_query_and_search_many_match_reference_exactly():
+    docs, vocab = _docs()
+    engine = RetrievalEngine("bm25").build(docs)
+    rng = random.Random(1)
+    queries = ["", "no such words", "nudge nudge default", "Don't frame"] + [
+        " ".join(rng.choice(vocab + ["unknown"]) for _ in range(rng.randint(1, 6))) for _ in range(60)
+    ]
+    for top_k in (1, 5, 40, 10_000):
+        batch = engine.search_many(queries, top_k=top_k, max_pairs=300)
+        for q, hits in zip(queries, batch):
+            ref = _reference(engine, docs, q, top_k)
+            assert [(e.doc_id, e.score) for e in engine.query(q, top_k=top_k)] == ref
+            assert [(e.doc_id, e.score) for e in hits] == ref
+
+
+def test_search_many_empty_engine_and_dense_scores():
+    assert RetrievalEngine("bm25").search_many(["a", "b"]) == [[], []]
+    docs, _ = _docs(30)
+    engine = RetrievalEngine("bm25").build(docs)
+    dense = engine._score_bm25("nudge t1 t2")
+    assert dense.shape == (len(docs),)
+    assert [e.score for e in engine.query("nudge t1 t2", top_k=3)] == sorted(dense, reverse=True)[:3]
@@ -0,0 +1,281 @@
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote
+from urllib.request import urlopen
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import api_server  # noqa: E402
+from doi_cache import ResponseCache  # noqa: E402
+from doi_http import ConnectionPool, HostRateLimiter, TokenBucket  # noqa: E402
+from doi_pipeline import DOIResult, ProviderAttempt  # noqa: E402
+from doi_providers import CrossrefProvider, DataCiteProvider  # noqa: E402
+from doi_resolver import DOIResolver  # noqa: E402
+
+
+class FakeRegistry:
+    """Crossref (/works/<doi>) and DataCite (/dois/<doi>) on one loopback port."""
+
+    def __init__(self, crossref, datacite, latency_s=0.0, throttle=()):
+        self.crossref, self.datacite = crossref, datacite
+        self.latency_s = latency_s
+        self.throttle = Counter(throttle)  # doi -> number of 429s to serve first
+        self.status = {}  # doi -> HTTP error served by both providers
+        self.redirects = {}  # doi -> doi the request is redirected to
+        self.hits = Counter()
+        self.peers = set()
+        self.lock = threading.Lock()
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                kind, _, doi = self.path.lstrip("/").partition("/")
+                doi = unquote(doi)
+                with registry.lock:
+                    registry.hits[(kind, doi)] += 1
+                    registry.peers.add(self.client_address)
+                    throttled = registry.throttle[doi] > 0
+                    if throttled:
+                        registry.throttle[doi] -= 1
+                time.sleep(registry.latency_s)
+                table = registry.crossref if kind == "works" else registry.datacite
+                if throttled:
+                    self._send(429, {"status": "too many requests"}, {"Retry-After": "0.05"})
+                elif doi in registry.status:
+                    self._send(registry.status[doi], {"status": "error"})
+                elif doi in registry.redirects:
+                    self._send(301, {}, {"Location": f"/{kind}/{registry.redirects[doi]}"})
+                elif doi in table:
+                    self._send(200, table[doi])
+                else:
+                    self._send(404, {"status": "not found"})
+
+            def _send(self, code, obj, headers=None):
+                body = json.dumps(obj).encode()
+                self.send_response(code)
+                for k, v in {"Content-Type": "application/json", "Content-Length": str(len(body)), **(headers or {})}.items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def requests(self):
+        return sum(self.hits.values())
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _crossref(doi, year):
+    return {"message": {"DOI": doi, "title": [f"Paper {doi}"], "publisher": "P", "type": "journal-article",
+                        "URL": f"https://doi.org/{doi}", "created": {"date-parts": [[year, 1, 1]]},
+                        "author": [{"given": "A", "family": "Author"}]}}
+
+
+def _datacite(doi):
+    return {"data": {"attributes": {"doi": doi, "titles": [{"title": f"Dataset {doi}"}], "publisher": "Zenodo",
+                                    "publicationYear": 2021, "url": f"https://zenodo.org/{doi}", "creators": []}}}
+
+
+@pytest.fixture
+def registry():
+    cr = {f"10.1000/cr{i}": _crossref(f"10.1000/cr{i}", 2000 + i) for i in range(30)}
+    dc = {"10.5281/zenodo.1": _datacite("10.5281/zenodo.1")}
+    reg = FakeRegistry(cr, dc)
+    yield reg
+    reg.close()
+
+
+def _resolver(reg, workers=8, cache=None, rates=None):
+    pool = ConnectionPool(max_per_host=workers, timeout_s=5)
+    limiter = HostRateLimiter(rates or {}, default=(1000.0, 1000.0))
+    providers = (CrossrefProvider(base_url=f"{reg.url}/works/", http=pool, limiter=limiter),
+                 DataCiteProvider(base_url=f"{reg.url}/dois/", http=pool, limiter=limiter))
+    return DOIResolver(providers, workers=workers, cache=cache, pool=pool, limiter=limiter)
+
+
+def test_token_bucket_spacing_and_pause():
+    now = [0.0]
+    slept = []
+
+    def sleep(s):
+        slept.append(s)
+        now[0] += s
+
+    b = TokenBucket(rate=10.0, burst=3.0, clock=lambda: now[0], sleep=sleep)
+    waits = [b.acquire() for _ in range(6)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3:] == pytest.approx([0.1, 0.1, 0.1])
+    b.pause(2.0)
+    assert b.acquire() == pytest.approx(2.0)
+    now[0] += 100.0
+    assert [b.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]  # burst refilled, not beyond
+
+
+def test_concurrent_batch_reuses_connections_and_keeps_order(registry):
+    registry.latency_s = 0.03
+    dois = [f"doi:10.1000/CR{i}" for i in range(30)] + ["10.5281/zenodo.1", "10.1000/missing", "not a doi", "10.1000/cr3"]
+    with _resolver(registry, workers=8) as res:
+        t0 = time.perf_counter()
+        out = res.resolve_many(dois)
+        elapsed = time.perf_counter() - t0
+        assert res.pool.created <= 8
+    assert elapsed < 0.6 * 0.03 * 33  # serial would take at least 33 round trips
+    assert len(registry.peers) <= 8
+    assert registry.hits[("works", "10.1000/cr3")] == 1  # duplicate DOI resolved once
+    results = out["results"]
+    assert [r["doi_input"] for r in results] == dois
+    assert results[0]["ok"] and results[0]["metadata"]["title"] == "Paper 10.1000/cr0"
+    assert "raw" not in results[0]["metadata"]
+    assert results[30]["provider"] == "datacite"
+    assert results[30]["attempts"][0]["category"] == "not_found"
+    assert results[31]["category"] == "not_found" and len(results[31]["attempts"]) == 2
+    assert results[32]["category"] == "invalid_doi"
+    assert out["summary"] == {"total": 34, "ok": 32, "failed": 2, "by_category": {"invalid_doi": 1, "not_found": 1}}
+
+
+def test_429_pauses_host_bucket_and_retries(registry):
+    registry.throttle.update({"10.1000/cr1": 2, "10.1000/cr2": 1})
+    with _resolver(registry, workers=4) as res:
+        t0 = time.perf_counter()
+        out = res.resolve_many(["10.1000/cr1", "10.1000/cr2", "10.1000/cr4"])
+        elapsed = time.perf_counter() - t0
+    assert [r["ok"] for r in out["results"]] == [True, True, True]
+    assert registry.hits[("works", "10.1000/cr1")] == 3
+    assert elapsed >= 0.1  # two Retry-After pauses on the shared crossref bucket
+
+
+def test_cache_ttl_and_negative_entries(registry, tmp_path):
+    now = [1000.0]
+    path = tmp_path / "doi.sqlite"
+    dois = ["10.1000/cr1", "10.1000/missing", "10.5281/zenodo.1"]
+    with _resolver(registry, cache=ResponseCache(path, ttl_s=100, negative_ttl_s=10, clock=lambda: now[0])) as res:
+        first = res.resolve_many(dois)
+    n = registry.requests()
+    assert n == 5
+
+    cache = ResponseCache(path, ttl_s=100, negative_ttl_s=10, clock=lambda: now[0])
+    with _resolver(registry, cache=cache) as res:
+        again = res.resolve_many(dois)
+        assert registry.requests() == n
+        assert all(a["cached"] for r in again["results"] for a in r["attempts"])
+        assert [r["metadata"] for r in again["results"]] == [r["metadata"] for r in first["results"]]
+        assert again["summary"] == first["summary"]
+
+        now[0] += 50  # negatives expired, positives still fresh
+        res.resolve_many(dois)
+        assert registry.requests() == n + 3
+        assert cache.purge_expired() == 0
+        now[0] += 100
+        stored = len(cache)
+        assert cache.purge_expired() == stored > 0
+
+
+def test_transient_failures_are_not_cached(registry, tmp_path):
+    registry.throttle.update({"10.1000/cr5": 2})  # both crossref attempts
+    cache = ResponseCache(tmp_path / "doi.sqlite")
+    with _resolver(registry, cache=cache) as res:
+        for p in res.providers:
+            p.max_attempts = 2
+        [r] = res.resolve_many(["10.1000/cr5"])["results"]
+        assert r["category"] == "rate_limited"
+        assert cache.get("crossref", "10.1000/cr5") is None
+        assert cache.get("datacite", "10.1000/cr5")["ok"] is False  # a 404 is definitive
+
+
+def test_api_server_runs_batch_as_background_job(registry, tmp_path, monkeypatch):
+    monkeypatch.setattr(api_server, "OUT_CSV", tmp_path / "doi_results.csv")
+    monkeypatch.setattr(api_server, "OUT_JSON", tmp_path / "doi_run_report.json")
+    monkeypatch.setattr(api_server, "DOI_TEST_SET", [{"doi": "10.1000/cr7", "notes": "ok"},
+                                                     {"doi": "10.1000/nope", "notes": "missing"}])
+    monkeypatch.setattr(api_server, "_RESOLVER", _resolver(registry))
+    server = api_server.ThreadingHTTPServer(("127.0.0.1", 0), api_server.Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urlopen(f"{base}/doi/run", timeout=5) as r:
+            assert r.status == 202
+            job = json.loads(r.read())
+        poll = base + job["poll"]
+        deadline = time.time() + 10
+        while job["status"] == "running" and time.time() < deadline:
+            time.sleep(0.02)
+            with urlopen(poll, timeout=5) as r:
+                job = json.loads(r.read())
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert job["status"] == "finished" and job["done"] == job["total"] == 2
+    rows = job["report"]["results"]
+    assert rows[0]["ok"] and rows[0]["year"] == 2007 and rows[0]["provider"] == "crossref"
+    assert rows[1]["reason"] == "not_found:http_404" and rows[1]["status"] == "failed"
+    assert (tmp_path / "doi_results.csv").exists()
+
+
+def test_api_rows_keep_the_original_reason_strings(registry, monkeypatch):
+    monkeypatch.setattr(api_server, "_RESOLVER", _resolver(registry))
+    reasons = {doi: api_server.resolve_doi(doi)["reason"] for doi in ("", "  ", "doi:not-a-doi", "10.1000/a b", "10.1000/nope")}
+    assert reasons == {"": "invalid_doi:empty", "  ": "invalid_doi:empty", "doi:not-a-doi": "invalid_doi:regex_mismatch",
+                       "10.1000/a b": "invalid_doi:regex_mismatch", "10.1000/nope": "not_found:http_404"}
+    timed_out = DOIResult("10.1000/x", "10.1000/x", False, category="timeout", reason="read timed out",
+                          attempts=[ProviderAttempt("crossref", False, category="timeout", reason="read timed out")])
+    assert api_server._row("10.1000/x", timed_out)["reason"] == "timeout"
+
+
+def test_api_rows_report_the_last_http_error(registry, monkeypatch):
+    registry.status.update({"10.1000/down": 503, "10.1000/gone": 410})
+    monkeypatch.setattr(api_server, "_RESOLVER", _resolver(registry))
+    for p in api_server._RESOLVER.providers:
+        p.max_attempts = 1
+    rows = {doi: api_server.resolve_doi(doi) for doi in ("10.1000/down", "10.1000/gone", "10.1000/nope")}
+    assert {d: (r["provider"], r["http_status"], r["reason"]) for d, r in rows.items()} == {
+        "10.1000/down": ("datacite", 503, "http_error:http_503"),
+        "10.1000/gone": ("datacite", 410, "not_found:http_410"),
+        "10.1000/nope": ("datacite", 404, "not_found:http_404"),
+    }
+
+
+def test_api_rows_keep_the_original_metadata_extraction(registry, monkeypatch):
+    rec = _crossref("10.1000/dated", 2019)
+    rec["message"].update({"published-print": {"date-parts": [[2017, 3]]}, "published-online": {"date-parts": [[2016]]},
+                           "issued": {"date-parts": [[2016]]}})
+    registry.crossref["10.1000/dated"] = rec
+    registry.redirects["10.1000/alias"] = "10.1000/cr4"
+    monkeypatch.setattr(api_server, "_RESOLVER", _resolver(registry))
+    cr = api_server.resolve_doi("10.1000/dated")
+    assert (cr["provider"], cr["year"], cr["http_status"]) == ("crossref", 2017, 200)
+    dc = api_server.resolve_doi("10.5281/zenodo.1")
+    assert (dc["provider"], dc["title"], dc["year"], dc["url"]) == (
+        "datacite", "Dataset 10.5281/zenodo.1", 2021, "https://zenodo.org/10.5281/zenodo.1")
+    moved = api_server.resolve_doi("10.1000/alias")
+    assert (moved["provider"], moved["title"], moved["year"]) == ("crossref", "Paper 10.1000/cr4", 2004)
+
+
+def test_finished_jobs_are_bounded(monkeypatch):
+    monkeypatch.setattr(api_server, "_JOBS", {})
+    monkeypatch.setattr(api_server, "_JOBS_MAX", 2)
+    monkeypatch.setattr(api_server, "run_doi_test_set", lambda progress=None: {"counts": {}})
+    ids = []
+    for _ in range(5):
+        ids.append(api_server.start_doi_job()["job_id"])
+        deadline = time.time() + 5
+        while api_server.get_doi_job(ids[-1])["status"] == "running" and time.time() < deadline:
+            time.sleep(0.01)
+    assert [api_server.get_doi_job(i) is not None for i in ids] == [False, False, False, True, True]
@@ -0,0 +1,155 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+import meta_analysis as M  # noqa: E402
+
+FIXTURES = [
+    ("meta_analysis/data/toy_effects.csv", dict(effect_col="effect", se_col="standard_error")),
+    ("meta_analysis/data/toy_effects.csv", dict(effect_col="effect", se_col="standard_error", group_cols=["outcome"])),
+    ("runtime/fixtures/demo_extraction.csv", dict(effect_col="estimate", se_col="standard_error", group_cols=["effect_type"])),
+    ("runtime/outputs/templates/toy_effect_sizes.csv", dict(effect_col="yi", se_col="sei", var_col="vi")),
+    ("outputs/meta_analysis_starter_kit/extraction_template.csv", dict(effect_col="yi", se_col="sei", group_cols=["outcome_type"])),
+]
+
+
+@pytest.mark.parametrize("path,kw", FIXTURES)
+def test_grouped_engine_matches_reference_on_fixtures(path, kw):
+    df = M.read_extraction_csv(ROOT / path)
+    ref = M.meta_analyze(df, engine="reference", **kw).table
+    got = M.meta_analyze(df, **kw).table
+    pd.testing.assert_frame_equal(got, ref, check_exact=False, rtol=1e-10, atol=1e-12)
+
+
+def _pm_reference(y, v):
+    from scipy.optimize import brentq
+
+    def excess(t):
+        w = 1.0 / (v + t)
+        mu = np.sum(w * y) / np.sum(w)
+        return np.sum(w * (y - mu) ** 2) - (len(y) - 1)
+
+    if len(y) < 2 or excess(0.0) <= 0:
+        return 0.0
+    hi = 1.0
+    while excess(hi) > 0:
+        hi *= 2
+    return brentq(excess, 0.0, hi, xtol=1e-14, rtol=1e-14)
+
+
+def _reml_reference(y, v):
+    from scipy.optimize import minimize_scalar
+
+    def nll(t):
+        w = 1.0 / (v + t)
+        mu = np.sum(w * y) / np.sum(w)
+        return 0.5 * (np.sum(np.log(v + t)) + np.log(np.sum(w)) + np.sum(w * (y - mu) ** 2))
+
+    r = minimize_scalar(nll, bounds=(0.0, 10.0), method="bounded", options={"xatol": 1e-12})
+    return r.x if nll(r.x) < nll(0.0) else 0.0
+
+
+def test_iterative_tau2_estimators_match_scalar_solvers():
+    pytest.importorskip("scipy")
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        k = int(rng.integers(2, 15))
+        v = rng.uniform(0.01, 0.2, k)
+        y = rng.normal(0.0, np.sqrt(v + rng.choice([0.0, 0.05, 0.3])))
+        assert M.pool_grouped(y, v, method="PM")["tau2"][0] == pytest.approx(_pm_reference(y, v), abs=1e-10)
+        assert M.pool_grouped(y, v, method="REML")["tau2"][0] == pytest.approx(_reml_reference(y, v), abs=1e-7)
+
+
+@pytest.mark.parametrize("method", M.TAU2_METHODS)
+def test_grouped_fit_and_leave_one_out_match_refits(method):
+    rng = np.random.default_rng(1)
+    n = 60
+    y, v = rng.normal(0.0, 0.5, n), rng.uniform(0.01, 0.2, n)
+    codes = rng.integers(0, 6, n)
+    codes[codes == 5] = 0  # group 5 empty, group sizes uneven
+    fit = M.pool_grouped(y, v, codes, method=method, n_groups=6)
+    assert np.isnan(fit["random"][5]) and fit["k"][5] == 0
+    for g in range(5):
+        one = M.pool_grouped(y[codes == g], v[codes == g], method=method)
+        for name in fit:
+            assert fit[name][g] == pytest.approx(one[name][0], rel=1e-9, abs=1e-12)
+    loo = M.leave_one_out(y, v, codes, method=method)
+    for i in range(n):
+        keep = codes == codes[i]
+        keep[i] = False
+        one = M.pool_grouped(y[keep], v[keep], method=method)
+        assert loo["estimate"][i] == pytest.approx(one["random"][0], rel=1e-9, abs=1e-12)
+        assert loo["tau2"][i] == pytest.approx(one["tau2"][0], rel=1e-9, abs=1e-12)
+        assert loo["delta"][i] == pytest.approx(fit["random"][codes[i]] - one["random"][0], abs=1e-12)
+        assert loo["Q"][i] == pytest.approx(one["Q"][0], rel=1e-9, abs=1e-9)
+        assert loo["I2"][i] == pytest.approx(one["I2"][0], rel=1e-9, abs=1e-9)
+
+
+@pytest.mark.parametrize("method", M.TAU2_METHODS)
+def test_leave_one_out_small_groups_and_chunking(method):
+    rng = np.random.default_rng(4)
+    n = 50
+    y, v = rng.normal(0.0, 0.6, n), rng.uniform(0.01, 0.2, n)
+    codes = np.concatenate([[0, 1, 1], rng.integers(2, 5, n - 3)])  # a singleton and a pair
+    loo = M.leave_one_out(y, v, codes, method=method)
+    assert np.isnan(loo["estimate"][0]) and loo["tau2"][0] == 0.0
+    assert loo["estimate"][1] == pytest.approx(y[2]) and loo["estimate"][2] == pytest.approx(y[1])
+    chunked = M.leave_one_out(y, v, codes, method=method, max_cells=7)
+    for name in loo:
+        np.testing.assert_allclose(chunked[name], loo[name], rtol=1e-9, atol=1e-12)
+
+
+def test_dl_leave_one_out_on_one_large_group_matches_refits():
+    rng = np.random.default_rng(5)
+    n = 3000
+    v = rng.uniform(0.01, 0.2, n)
+    for het in (0.3, 0.0):  # tau2_(-i) moving with i, and pinned at 0
+        y = rng.normal(0.0, np.sqrt(v + het))
+        loo = M.leave_one_out(y, v, max_cells=1 << 16)
+        for i in rng.integers(0, n, 10):
+            keep = np.ones(n, dtype=bool)
+            keep[i] = False
+            one = M.pool_grouped(y[keep], v[keep])
+            assert loo["estimate"][i] == pytest.approx(one["random"][0], rel=1e-9, abs=1e-12)
+            assert loo["tau2"][i] == pytest.approx(one["tau2"][0], rel=1e-9, abs=1e-12)
+
+
+def test_bootstrap_matches_resampled_refits_and_is_deterministic():
+    rng = np.random.default_rng(2)
+    n = 40
+    y, v = rng.normal(0.2, 0.4, n), rng.uniform(0.02, 0.1, n)
+    codes = rng.integers(0, 3, n)
+    a = M.bootstrap_grouped(y, v, codes, method="DL", n_boot=2000, seed=7, max_cells=1000)
+    b = M.bootstrap_grouped(y, v, codes, method="DL", n_boot=2000, seed=7)
+    assert a["estimate"].shape == (2000, 3)
+    np.testing.assert_array_equal(a["estimate"], b["estimate"])  # chunking does not change the draws
+    ref = np.empty((2000, 3))
+    for r in range(2000):
+        for g in range(3):
+            idx = np.flatnonzero(codes == g)
+            pick = rng.choice(idx, size=len(idx))
+            ref[r, g] = M.pool_grouped(y[pick], v[pick])["random"][0]
+    assert np.allclose(a["estimate"].mean(axis=0), ref.mean(axis=0), atol=0.02)
+    assert np.allclose(a["estimate"].std(axis=0), ref.std(axis=0), rtol=0.15)
+
+
+def test_meta_analyze_options():
+    df = M.read_extraction_csv(ROOT / "meta_analysis/data/toy_effects.csv")
+    res = M.meta_analyze(df, effect_col="effect", se_col="standard_error", tau2_method="reml",
+                         influence=True, n_boot=200, seed=3)
+    assert list(res.table["model"]) == ["fixed", "random_reml"]
+    assert len(res.leave_one_out) == len(df)
+    assert {"loo_estimate", "loo_rstudent", "loo_delta"} <= set(res.leave_one_out.columns)
+    boot = res.bootstrap.iloc[0]
+    assert boot["ci_low"] <= res.table["estimate"].iloc[1] <= boot["ci_high"]
+    with pytest.raises(ValueError):
+        M.meta_analyze(df, effect_col="effect", se_col="standard_error", tau2_method="HS")
+    with pytest.raises(ValueError):
+        M.meta_analyze(df, effect_col="effect", se_col="standard_error", tau2_method="PM", engine="reference")
@@ -0,0 +1,78 @@
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from borderline_qa import retriever as R  # noqa: E402
+
+
+def _corpus(n=300, seed=0):
+    rng = random.Random(seed)
+    vocab = ["nudge", "default", "framing", "salience", "choice", "architecture", "bias", "loss-aversion",
+             "anchoring", "o'neil", "x1", "x2", "x3", "x4", "rare"] + [f"w{i}" for i in range(200)]
+    docs = []
+    for i in range(n):
+        words = [rng.choice(vocab[:15] if rng.random() < 0.3 else vocab) for _ in range(rng.randint(0, 250))]
+        text = ". ".join(" ".join(words[j:j + 12]) for j in range(0, len(words), 12))
+        docs.append({"doc_id": f"d{i}", "text": text, "url": f"https://example.org/{i}", "source": "local"})
+    docs.append(dict(docs[7], doc_id="copy-of-d7"))  # exact score ties must keep corpus order
+    return docs, vocab
+
+
+def test_sparse_index_matches_reference_rankings_exactly():
+    docs, vocab = _corpus()
+    ref, sparse = R.TfidfIndex(docs), R.SparseTfidfIndex.from_docs(docs)
+    rng = random.Random(1)
+    queries = ["", "unseen words only", "Nudge NUDGE default", "d7"] + [
+        " ".join(rng.choice(vocab + ["unknown"]) for _ in range(rng.randint(1, 7))) for _ in range(200)
+    ]
+    for q in queries:
+        for k in (1, 5, 8, 1000):
+            assert sparse.score(q, k=k) == ref.score(q, k=k), (q, k)
+
+
+def test_index_persisted_by_corpus_hash_and_memory_mapped(tmp_path):
+    docs, _ = _corpus(80)
+    built = R.SparseTfidfIndex.cached(docs, tmp_path)
+    [entry] = list(tmp_path.iterdir())
+    assert entry.name == R.corpus_hash(docs, 900, 120, 4)
+    assert json.loads((entry / "meta.json").read_text())["n_docs"] == len(docs)
+    loaded = R.SparseTfidfIndex.cached(docs, tmp_path)
+    assert isinstance(loaded.arrays["post_doc"], np.memmap)
+    assert loaded.score("choice architecture bias", k=10) == built.score("choice architecture bias", k=10)
+    for i in (0, 7, 40):
+        spans = R._split_passages(docs[i]["text"], max_chars=900, overlap=120)
+        assert loaded.passage_spans(i, 3) == [(a, b) for a, b, _ in spans[:3]]
+    assert loaded.passage_spans(0, 5) is None  # only 4 stored: caller re-splits
+    changed = [dict(d) for d in docs]
+    changed[0]["text"] += " rare"
+    R.SparseTfidfIndex.cached(changed, tmp_path)
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_retriever_engines_return_identical_passages(tmp_path):
+    docs, _ = _corpus(120)
+    corpus = tmp_path / "corpus.jsonl"
+    corpus.write_text("\n".join(json.dumps(d) for d in docs) + "\n", encoding="utf-8")
+    ref = R.Retriever([corpus], engine="reference")
+    sparse = R.Retriever([corpus], index_cache_dir=tmp_path / "index")
+    assert isinstance(sparse.index, R.SparseTfidfIndex)
+    for q in ("default framing", "salience choice o'neil", "w3 w4 w5 rare"):
+        for per_doc in (1, 2, 6):
+            assert sparse.retrieve(q, k=6, per_doc_passages=per_doc) == ref.retrieve(q, k=6, per_doc_passages=per_doc)
+    with pytest.raises(ValueError):
+        R.Retriever([corpus], engine="bm25")
+
+
+def test_query_terms_longer_than_any_vocab_term_do_not_match_prefixes():
+    docs = [{"doc_id": "a", "text": "nudge framing"}, {"doc_id": "b", "text": "default choice"}]
+    ref, sparse = R.TfidfIndex(docs), R.SparseTfidfIndex.from_docs(docs)
+    for q in ("framingly", "defaults nudges", "framingly framing", "choicearchitecture"):
+        assert sparse.score(q) == ref.score(q), q
+    assert sparse.score("framingly") == []
@@ -0,0 +1,125 @@
+import math
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import threshold_sweep as TS  # noqa: E402
+from verifier_policy import calibration as C  # noqa: E402
+from verifier_policy.sweep import bootstrap_confusion, confusion_at, split_groups  # noqa: E402
+
+
+def _reference_calibration_sweep(y_true, scores):
+    """The original per-threshold loop over metrics_from_preds."""
+    pairs = [(1 if int(y) else 0, float(s)) for y, s in zip(y_true, scores)]
+    uniq = sorted({s for _, s in pairs})
+    out = []
+    for t in sorted(set([1.0] + uniq + [max(0.0, min(1.0, uniq[0] - 1e-12))])):
+        m = C.metrics_from_preds([y for y, _ in pairs], [1 if s >= t else 0 for _, s in pairs])
+        m["threshold"] = float(t)
+        out.append(m)
+    return out
+
+
+def _reference_routing_sweep(records, thresholds_auto, thresholds_abstain, costs):
+    costs = dict(costs, default=TS.TierCosts("default"))
+    tiers = {}
+    for r in records:
+        tiers.setdefault(TS.default_get_tier(r), []).append(r)
+    groups = sorted(tiers.items()) + [("__overall__", records)]
+    out = []
+    for tier, recs in groups:
+        for ta in thresholds_auto:
+            for tb in thresholds_abstain:
+                if tb is None or tb >= ta:
+                    out.append(dict(TS.evaluate(recs, ta, tb, costs), risk_tier=tier))
+    return out
+
+
+def test_calibration_sweep_and_fit_match_reference_exactly():
+    rng = random.Random(0)
+    for _ in range(40):
+        n = rng.randint(1, 300)
+        y = [rng.randint(0, 1) for _ in range(n)]
+        s = [rng.choice([round(rng.random(), 1), rng.random(), 0.0, 1.0, 1.5]) for _ in range(n)]
+        ref = _reference_calibration_sweep(y, s)
+        assert C.sweep_thresholds(y, s) == ref
+        for obj in ("f1", "accuracy", "precision", "recall"):
+            fit = C.fit_threshold(y, s, objective=obj, min_precision=0.6)
+            feasible = [m for m in ref if m["precision"] + 1e-12 >= 0.6] or ref
+            best = max(feasible, key=lambda m: (m[obj], m["precision"], m["recall"], m["threshold"]))
+            assert fit.threshold == best["threshold"]
+    assert C.sweep_thresholds([], []) == []
+    with pytest.raises(ValueError):
+        C.sweep_thresholds([1], [])
+
+
+def test_routing_sweep_matches_evaluate_per_threshold():
+    rng = random.Random(1)
+    records = [
+        {
+            "uncertainty": rng.choice([rng.random(), round(rng.random(), 1), 0.5, float("nan"), float("inf")]),
+            "risk_tier": rng.choice(["high", "low", "medium"]),
+            "correct": rng.choice([True, False, None]),
+        }
+        for _ in range(2000)
+    ]
+    costs = {"high": TS.TierCosts("high", 3.0, 0.7, 0.1), "low": TS.TierCosts("low", 0.3, 0.1)}
+    t_auto = [i / 10 for i in range(11)]
+    t_abstain = [0.3, 0.5, 0.9, float("inf"), None]
+    got = TS.sweep(records, t_auto, t_abstain, costs)
+    ref = _reference_routing_sweep(records, t_auto, t_abstain, costs)
+    assert len(got) == len(ref)
+    for a, b in zip(got, ref):
+        assert math.isclose(a.pop("expected_cost"), b.pop("expected_cost"), rel_tol=1e-12, abs_tol=1e-9)
+        assert a == b
+
+
+def test_grouped_curves_and_nan_scores():
+    rng = random.Random(2)
+    heldout = [
+        {"score": rng.random(), "label": rng.randint(0, 1), "domain": rng.choice(["bio", "econ", "psych"])}
+        for _ in range(500)
+    ]
+    heldout[0]["score"] = float("nan")
+    grid = [0.0, 0.25, 0.5, 0.75, 1.0]
+    out = C.sweep_curves(heldout, grid, group_key="domain")
+    assert sorted(out["curves"]) == ["bio", "econ", "psych"]
+    for g, curve in out["curves"].items():
+        items = [it for it in heldout if it["domain"] == g]
+        y = [it["label"] for it in items]
+        for j, t in enumerate(grid):
+            m = C.metrics_from_preds(y, C.apply_threshold([it["score"] for it in items], t))
+            assert {k: curve[k][j] for k in m} == m
+    assert [g for g, _ in split_groups(["b", 2, "a", "b"])] == ["2", "a", "b"]
+
+
+def test_bootstrap_equals_record_resampling_in_distribution():
+    rng = np.random.default_rng(3)
+    n = 400
+    s = np.round(rng.random(n), 2)
+    y = (rng.random(n) < s).astype(int)
+    grid = np.array([0.8, 0.2, 0.5])  # unsorted on purpose
+    tp, fp, tn, fn = bootstrap_confusion(y, s, grid, n_boot=4000, seed=0)
+    assert np.all(tp + fp + tn + fn == n)
+    # reference: resample records directly
+    ref = np.empty((4000, 3))
+    for b in range(4000):
+        idx = rng.integers(0, n, n)
+        ref[b] = confusion_at(y[idx], s[idx], grid)[0]
+    assert np.allclose(tp.mean(axis=0), ref.mean(axis=0), rtol=0.02)
+    assert np.allclose(tp.std(axis=0), ref.std(axis=0), rtol=0.1)
+    point = confusion_at(y, s, grid)[0]
+    assert np.allclose(tp.mean(axis=0), point, rtol=0.02)
+
+    out = C.sweep_curves([{"score": a, "label": b} for a, b in zip(s, y)], grid, n_boot=300, seed=1)
+    curve = out["curves"]["__all__"]
+    for j in range(3):
+        assert curve["bands"]["f1"]["lo"][j] <= curve["f1"][j] <= curve["bands"]["f1"]["hi"][j]
+    again = C.sweep_curves([{"score": a, "label": b} for a, b in zip(s, y)], grid, n_boot=300, seed=1)
+    assert again == out